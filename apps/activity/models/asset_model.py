@@ -2,6 +2,9 @@ from django.db import models
 from apps.peoples.models import BaseModel
 from apps.tenants.models import TenantAwareModel
 from django.contrib.gis.db.models import PointField
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
+from django.db.models.functions import Upper
 from django.utils.translation import gettext_lazy as _
 import uuid
 from django.core.serializers.json import DjangoJSONEncoder
@@ -327,6 +330,9 @@ class Asset(BaseModel, TenantAwareModel):
         encoder=DjangoJSONEncoder, blank=True, null=True, default=asset_json
     )
 
+    # Stored full-text vector, refreshed by apps.search signals
+    search_vector = SearchVectorField(null=True, editable=False)
+
     objects = AssetManager()
 
     class Meta(BaseModel.Meta):
@@ -342,6 +348,8 @@ class Asset(BaseModel, TenantAwareModel):
             models.Index(fields=['tenant', 'cdtz'], name='asset_tenant_cdtz_idx'),
             models.Index(fields=['tenant', 'identifier'], name='asset_tenant_identifier_idx'),
             models.Index(fields=['tenant', 'enable'], name='asset_tenant_enable_idx'),
+            GinIndex(fields=['search_vector'], name='asset_search_vector_gin_idx'),
+            GinIndex(OpClass(Upper('assetcode'), name='gin_trgm_ops'), name='asset_assetcode_trgm_idx'),
         ]
 
     def __str__(self):
@@ -201,7 +201,9 @@ class TaskSyncService(BaseSyncService):
         self,
         user,
         timestamp: Optional[str] = None,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        serializer_class=None
     ) -> Dict[str, Any]:
         """
         Get task changes since timestamp for delta sync.
@@ -210,9 +212,11 @@ class TaskSyncService(BaseSyncService):
             user: Authenticated user
             timestamp: ISO timestamp for delta query
             limit: Maximum records to return
+            cursor: Opaque keyset cursor from the previous page
+            serializer_class: Optional serializer applied while streaming rows
 
         Returns:
-            {items: [...], has_more: bool, next_timestamp: ...}
+            {items: [...], has_more: bool, next_cursor: ..., next_timestamp: ...}
         """
         if not user or not user.is_authenticated:
             raise ValidationError("User must be authenticated")
@@ -224,7 +228,9 @@ class TaskSyncService(BaseSyncService):
             timestamp=timestamp,
             model_class=Jobneed,
             extra_filters=extra_filters,
-            limit=limit
+            limit=limit,
+            cursor=cursor,
+            serializer_class=serializer_class
         )
 
     def _get_user_filters(self, user) -> Dict[str, Any]:
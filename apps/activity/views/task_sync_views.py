@@ -86,9 +86,9 @@ class TaskSyncView(APIView):
 
 class TaskChangesView(APIView):
     """
-    GET /api/v1/activity/changes/?since=<timestamp>&limit=100
+    GET /api/v1/activity/changes/?since=<timestamp>&limit=100[&cursor=<next_cursor>]
 
-    Delta sync: Get tasks changed since timestamp.
+    Delta sync: Get tasks changed since timestamp, paged by keyset cursor.
     """
     permission_classes = [IsAuthenticated]
 
@@ -102,14 +102,15 @@ class TaskChangesView(APIView):
             result = sync_service.get_task_changes(
                 user=request.user,
                 timestamp=request_serializer.validated_data.get('since'),
-                limit=request_serializer.validated_data.get('limit', 100)
+                limit=request_serializer.validated_data.get('limit', 100),
+                cursor=request_serializer.validated_data.get('cursor'),
+                serializer_class=TaskSyncSerializer
             )
 
-            serialized_items = TaskSyncSerializer(result['items'], many=True).data
-
             return Response({
-                'items': serialized_items,
+                'items': result['items'],
                 'has_more': result['has_more'],
+                'next_cursor': result['next_cursor'],
                 'next_timestamp': result['next_timestamp']
             }, status=status.HTTP_200_OK)
 
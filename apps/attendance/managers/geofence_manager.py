@@ -22,7 +22,10 @@ class GeofenceManagerMixin:
 
     def get_geofencetracking(self, request):
         """
-        Optimized list view for geofence tracking with improved query performance
+        Optimized list view for geofence tracking with improved query performance.
+
+        Each row is flagged with start_in_geofence / end_in_geofence, computed
+        for the whole page in one vectorized pass (None when the location is missing).
         """
         qobjs, dir, fields, length, start = utils.get_qobjs_dir_fields_start_length(
             request.GET
@@ -50,26 +53,42 @@ class GeofenceManagerMixin:
             # Use separate count query to avoid expensive operations
             total = base_qset.count()
             fcount = filtered_qset.count()
-
-            # Apply ordering and pagination to the final query
-            result_qset = (
-                filtered_qset
-                .values(*fields)
-                .order_by(dir)[start : start + length]
-            )
-
-            return total, fcount, result_qset
         else:
-            # No additional filters
-            total = base_qset.count()
-
-            result_qset = (
-                base_qset
-                .values(*fields)
-                .order_by(dir)[start : start + length]
+            filtered_qset = base_qset
+            total = fcount = base_qset.count()
+
+        # Apply ordering and pagination to the final query
+        page_qset = filtered_qset.order_by(dir)[start : start + length]
+        return total, fcount, self._rows_with_geofence_status(page_qset, fields)
+
+    def _rows_with_geofence_status(self, page_qset, fields):
+        """Evaluate a page of events and test both locations against each event's geofence."""
+        from apps.attendance.services.geofence_engine import GeofenceEngine
+        from apps.core_onboarding.models import GeofenceMaster
+
+        helper_fields = [f for f in ("geofence_id", "startlocation", "endlocation") if f not in fields]
+        rows = list(page_qset.values(*fields, *helper_fields))
+
+        fence_ids = sorted({row["geofence_id"] for row in rows if row["geofence_id"]})
+        boundaries = dict(GeofenceMaster.objects.filter(id__in=fence_ids).values_list("id", "geofence"))
+        engine = GeofenceEngine([boundaries.get(fence_id) for fence_id in fence_ids])
+        positions = {fence_id: index for index, fence_id in enumerate(fence_ids)}
+        fence_indices = [positions.get(row["geofence_id"], -1) for row in rows]
+
+        for location_field, flag in (("startlocation", "start_in_geofence"), ("endlocation", "end_in_geofence")):
+            points = [row[location_field] for row in rows]
+            inside = engine.contains_assigned(
+                [point.y if point else float("nan") for point in points],
+                [point.x if point else float("nan") for point in points],
+                fence_indices,
             )
+            for row, point, is_inside in zip(rows, points, inside):
+                row[flag] = bool(is_inside) if point else None
 
-            return total, total, result_qset
+        for row in rows:
+            for helper in helper_fields:
+                row.pop(helper)
+        return rows
 
     def get_lat_long(self, location):
         """
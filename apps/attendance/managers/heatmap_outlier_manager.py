@@ -3,13 +3,33 @@ Heatmap and outlier detection manager for PeopleEventlog.
 
 Handles spatial heatmap generation and statistical outlier detection.
 """
-from django.db import models
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, models
 from django.contrib.gis.db.models.functions import AsGeoJSON
 from django.db.models import Avg, Max, Min
 import logging
 
 logger = logging.getLogger("django")
 
+HEATMAP_CACHE_PREFIX = 'attendance:heatmap'
+HEATMAP_CACHE_TTL = 900
+
+
+def _heatmap_points(cells):
+    """(lat, lon, count, unique_people) cells -> heatmap points, densest first."""
+    heatmap_points = [
+        {
+            'lat': lat,
+            'lon': lon,
+            'count': count,
+            'unique_people_count': unique_people,
+            'intensity': min(count / 10.0, 1.0)  # Normalize for heatmap
+        }
+        for lat, lon, count, unique_people in cells
+    ]
+    return sorted(heatmap_points, key=lambda x: x['count'], reverse=True)
+
 
 class HeatmapOutlierManagerMixin:
     """
@@ -21,7 +41,7 @@ class HeatmapOutlierManagerMixin:
     - Time-based outlier detection
     """
 
-    def get_attendance_heatmap_data(self, client_id, date_from, date_to, bu_ids=None, grid_size=0.01):
+    def get_attendance_heatmap_data(self, client_id, date_from, date_to, bu_ids=None, grid_size=0.01, mode='auto'):
         """
         Generate spatial heatmap data for attendance locations.
 
@@ -30,21 +50,19 @@ class HeatmapOutlierManagerMixin:
             date_from, date_to: Date range
             bu_ids: Optional business unit filter
             grid_size: Grid size in degrees for aggregation (~0.01° = 1.1 km)
+            mode: 'postgis' (snap and count in the database, cached),
+                'python' (legacy in-memory grid) or 'auto' (postgis on PostgreSQL)
 
         Returns:
             List of coordinate grids with attendance counts
         """
-        query = (self.filter(
-            client_id=client_id,
-            datefor__range=(date_from, date_to),
-            startlocation__isnull=False
-        ).exclude(id=1))
+        if mode == 'auto':
+            mode = 'postgis' if connections[self.db].vendor == 'postgresql' else 'python'
+        if mode == 'postgis':
+            tiles = self.get_attendance_heatmap_tiles(client_id, date_from, date_to, [grid_size], bu_ids)
+            return tiles[float(grid_size)]
 
-        if bu_ids:
-            query = query.filter(bu_id__in=bu_ids)
-
-        # Extract coordinates and create grid
-        coords_data = query.extra(
+        coords_data = self._heatmap_queryset(client_id, date_from, date_to, bu_ids).extra(
             select={
                 'lat': 'ST_Y(startlocation::geometry)',
                 'lon': 'ST_X(startlocation::geometry)'
@@ -71,18 +89,87 @@ class HeatmapOutlierManagerMixin:
                 grid_data[grid_key]['count'] += 1
                 grid_data[grid_key]['unique_people'].add(record['people_id'])
 
-        # Convert sets to counts and prepare final data
-        heatmap_points = []
-        for grid_point in grid_data.values():
-            heatmap_points.append({
-                'lat': grid_point['lat'],
-                'lon': grid_point['lon'],
-                'count': grid_point['count'],
-                'unique_people_count': len(grid_point['unique_people']),
-                'intensity': min(grid_point['count'] / 10.0, 1.0)  # Normalize for heatmap
-            })
-
-        return sorted(heatmap_points, key=lambda x: x['count'], reverse=True)
+        return _heatmap_points(
+            (cell['lat'], cell['lon'], cell['count'], len(cell['unique_people']))
+            for cell in grid_data.values()
+        )
+
+    def get_attendance_heatmap_tiles(self, client_id, date_from, date_to, grid_sizes=(0.1, 0.01, 0.001),
+                                     bu_ids=None, use_cache=True):
+        """
+        Heatmap cells for several zoom levels from a single PostGIS query.
+
+        Cells are cached per (client, date range, BU filter, grid size), so
+        repeated dashboard loads only query the levels not cached yet.
+
+        Args:
+            client_id: Client ID
+            date_from, date_to: Date range
+            grid_sizes: Grid sizes in degrees, one per zoom level
+            bu_ids: Optional business unit filter
+            use_cache: Read cached tiles (fresh tiles are always stored)
+
+        Returns:
+            Dict of grid_size -> heatmap points (same shape as get_attendance_heatmap_data)
+        """
+        grid_sizes = list(dict.fromkeys(float(size) for size in grid_sizes))
+        cache_keys = {
+            size: self._heatmap_cache_key(client_id, date_from, date_to, bu_ids, size)
+            for size in grid_sizes
+        }
+        cached = cache.get_many(list(cache_keys.values())) if use_cache else {}
+        tiles = {size: cached[key] for size, key in cache_keys.items() if key in cached}
+
+        missing = [size for size in grid_sizes if size not in tiles]
+        if missing:
+            computed = self._snap_heatmap_cells(client_id, date_from, date_to, bu_ids, missing)
+            cache.set_many(
+                {cache_keys[size]: computed[size] for size in missing},
+                timeout=getattr(settings, 'ATTENDANCE_HEATMAP_CACHE_TTL', HEATMAP_CACHE_TTL)
+            )
+            tiles.update(computed)
+            logger.debug(f"Heatmap tiles computed for client {client_id}: {missing}")
+
+        return {size: tiles[size] for size in grid_sizes}
+
+    def _heatmap_queryset(self, client_id, date_from, date_to, bu_ids):
+        query = (self.filter(
+            client_id=client_id,
+            datefor__range=(date_from, date_to),
+            startlocation__isnull=False
+        ).exclude(id=1))
+
+        if bu_ids:
+            query = query.filter(bu_id__in=bu_ids)
+        return query
+
+    def _heatmap_cache_key(self, client_id, date_from, date_to, bu_ids, grid_size):
+        bu_part = ','.join(str(bu_id) for bu_id in sorted(bu_ids)) if bu_ids else 'all'
+        return (
+            f"{HEATMAP_CACHE_PREFIX}:{self.db}:{client_id}:{date_from}:{date_to}:"
+            f"bu:{bu_part}:grid:{grid_size!r}"
+        )
+
+    def _snap_heatmap_cells(self, client_id, date_from, date_to, bu_ids, grid_sizes):
+        """Snap every point to each grid with ST_SnapToGrid and count per cell in one scan."""
+        points = self._heatmap_queryset(client_id, date_from, date_to, bu_ids).values('people_id', 'startlocation')
+        points_sql, points_params = points.query.sql_with_params()
+        sql = f"""
+            SELECT sizes.grid_size, ST_Y(cell.geom), ST_X(cell.geom),
+                   COUNT(*), COUNT(DISTINCT points.people_id)
+            FROM ({points_sql}) AS points
+            CROSS JOIN unnest(%s::double precision[]) AS sizes(grid_size)
+            CROSS JOIN LATERAL (
+                SELECT ST_SnapToGrid(points.startlocation::geometry, sizes.grid_size) AS geom
+            ) AS cell
+            GROUP BY 1, 2, 3
+        """
+        cells = {size: [] for size in grid_sizes}
+        with connections[points.db].cursor() as cursor:
+            cursor.execute(sql, [*points_params, grid_sizes])
+            for size, lat, lon, count, unique_people in cursor.fetchall():
+                cells[size].append((lat, lon, count, unique_people))
+        return {size: _heatmap_points(rows) for size, rows in cells.items()}
 
     def find_attendance_outliers(self, client_id, date_from, date_to, std_deviation_threshold=2):
         """
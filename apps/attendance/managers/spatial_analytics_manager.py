@@ -39,7 +39,7 @@ logger = logging.getLogger("django")
         "PostGIS indexes: GIST indexes on startlocation, endlocation",
         "ST_DWithin for radius queries: Uses spatial index (100x faster)",
         "Prepared geometries: 3x faster for repeated validation (LRU cached)",
-        "Heatmap grid aggregation: In-memory grid grouping"
+        "Heatmap grid aggregation: ST_SnapToGrid + COUNT in PostGIS, tiles cached per grid size"
     ]
 )
 class SpatialAnalyticsManagerMixin:
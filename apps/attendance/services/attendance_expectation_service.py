@@ -21,7 +21,7 @@ Created: 2025-10-11
 
 import logging
 from typing import Dict, Any, List
-from datetime import datetime, date, timedelta
+from datetime import datetime, date, time as dtime, timedelta
 from django.db import DatabaseError
 from django.core.exceptions import ObjectDoesNotExist
 from django.utils import timezone
@@ -173,37 +173,36 @@ class AttendanceExpectationService:
             Actual attendance data
         """
         try:
-            # Get attendance records for target date
-            day_start = datetime.combine(target_date, datetime.min.time())
-            day_end = datetime.combine(target_date, datetime.max.time())
-
+            # Same day window and punch columns as the NOC batch snapshot
+            day_start = timezone.make_aware(datetime.combine(target_date, dtime.min))
             attendance = PeopleEventlog.objects.filter(
                 bu_id__in=site_ids,
                 cdtz__gte=day_start,
-                cdtz__lte=day_end
-            ).select_related('people', 'bu')
+                cdtz__lt=day_start + timedelta(days=1)
+            )
 
-            # Count present (checked in or checked out)
+            # Count present (punched in or out)
+            punched_in = Q(punchintime__isnull=False)
+            punched_out = Q(punchouttime__isnull=False)
             present = attendance.filter(
-                Q(checkin__isnull=False) | Q(checkout__isnull=False)
+                punched_in | punched_out
             ).values('people_id').distinct().count()
 
-            # Count late arrivals
-            late_count = 0
-            for record in attendance.filter(checkin__isnull=False):
-                if self._is_late_arrival(record):
-                    late_count += 1
-
-            # Breakdown by status
-            breakdown = {
-                'checked_in': attendance.filter(checkin__isnull=False, checkout__isnull=True).count(),
-                'checked_out': attendance.filter(checkout__isnull=False).count(),
-            }
+            # Late arrivals and breakdown by status in one aggregate
+            late_after = dtime(9, self.LATE_THRESHOLD_MINUTES)
+            counts = attendance.aggregate(
+                late_count=Count('id', filter=punched_in & Q(punchintime__time__gt=late_after)),
+                checked_in=Count('id', filter=punched_in & Q(punchouttime__isnull=True)),
+                checked_out=Count('id', filter=punched_out),
+            )
 
             return {
                 'present_count': present,
-                'late_count': late_count,
-                'breakdown_by_status': breakdown,
+                'late_count': counts['late_count'],
+                'breakdown_by_status': {
+                    'checked_in': counts['checked_in'],
+                    'checked_out': counts['checked_out'],
+                },
             }
 
         except (DatabaseError, ObjectDoesNotExist) as e:
@@ -213,32 +212,3 @@ class AttendanceExpectationService:
                 'late_count': 0,
                 'breakdown_by_status': {},
             }
-
-    def _is_late_arrival(self, attendance_record: PeopleEventlog) -> bool:
-        """
-        Check if attendance record represents late arrival.
-
-        Args:
-            attendance_record: PeopleEventlog instance
-
-        Returns:
-            bool: True if late
-        """
-        try:
-            if not attendance_record.checkin:
-                return False
-
-            # Get expected shift start time (simplified - would use actual shift data)
-            expected_start = datetime.combine(
-                attendance_record.checkin.date(),
-                datetime.min.time().replace(hour=9, minute=0)
-            )
-
-            # Calculate delay
-            delay_minutes = (attendance_record.checkin - expected_start).total_seconds() / 60
-
-            return delay_minutes > self.LATE_THRESHOLD_MINUTES
-
-        except (ValueError, TypeError, AttributeError) as e:
-            logger.warning(f"Error checking late arrival: {str(e)}")
-            return False
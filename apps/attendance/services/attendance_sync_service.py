@@ -30,6 +30,9 @@ class AttendanceSyncService(BaseSyncService):
     - Multi-tenant isolation
     """
 
+    # Tracking has no mdtz/updated_at; rows are stamped once on receipt
+    sync_timestamp_field = 'receiveddate'
+
     def sync_attendance(
         self,
         user,
@@ -65,7 +68,9 @@ class AttendanceSyncService(BaseSyncService):
         user,
         timestamp: Optional[str] = None,
         date_from: Optional[str] = None,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        serializer_class=None
     ) -> Dict[str, Any]:
         """
         Get attendance changes since timestamp for delta sync.
@@ -75,9 +80,11 @@ class AttendanceSyncService(BaseSyncService):
             timestamp: ISO timestamp for delta query
             date_from: Optional date filter for receiveddate
             limit: Maximum records to return
+            cursor: Opaque keyset cursor from the previous page
+            serializer_class: Optional serializer applied while streaming rows
 
         Returns:
-            {items: [...], has_more: bool, next_timestamp: ...}
+            {items: [...], has_more: bool, next_cursor: ..., next_timestamp: ...}
         """
         if not user or not user.is_authenticated:
             raise ValidationError("User must be authenticated")
@@ -92,7 +99,9 @@ class AttendanceSyncService(BaseSyncService):
             timestamp=timestamp,
             model_class=Tracking,
             extra_filters=extra_filters,
-            limit=limit
+            limit=limit,
+            cursor=cursor,
+            serializer_class=serializer_class
         )
 
     def _detect_conflict(self, server_obj, client_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
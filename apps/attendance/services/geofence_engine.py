@@ -0,0 +1,206 @@
+"""
+Vectorized Geofence Containment Engine
+
+NumPy point-in-polygon / point-in-circle tests for validating large batches
+of GPS coordinates (journey replays, tracking uploads, bulk attendance)
+against one or many geofences without building a GEOS Point per coordinate.
+
+- Bounding-box prefilter per geofence: only candidate points are tested
+- Ray casting over polygon edges, vectorized across points (holes supported)
+- Boundary points count as inside, matching GEOS contains() or touches()
+- Circular geofences use vectorized haversine distance
+- Results are aligned with the input order
+
+Following .claude/rules.md:
+- Rule #11: Specific exception handling
+- Rule #13: Comprehensive field validation (invalid coordinates never match)
+"""
+
+import logging
+from math import cos, radians
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from django.contrib.gis.geos import GEOSException, GEOSGeometry, MultiPolygon, Polygon
+
+from apps.core.utils_new.spatial.distance import haversine_distance_array
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['GeofenceEngine']
+
+KM_PER_DEGREE_LAT = 111.32
+BOUNDARY_EPSILON = 1e-12  # Degrees^2; collinearity tolerance for boundary hits
+
+GeofenceInput = Union[Polygon, MultiPolygon, str, Tuple[float, float, float], None]
+
+
+class GeofenceEngine:
+    """
+    Immutable set of geofences compiled to coordinate arrays.
+
+    Geofences may be Polygon/MultiPolygon geometries, WKT strings or
+    circular (center_lat, center_lon, radius_km) tuples. Entries that are
+    None or cannot be parsed never contain any point.
+    """
+
+    def __init__(self, geofences: Sequence[GeofenceInput], buffer_km: float = 0.0):
+        self.buffer_km = buffer_km
+        self._fences: List[Optional[Tuple[str, object]]] = []
+        self._bboxes = np.full((len(geofences), 4), np.nan)  # min_lon, min_lat, max_lon, max_lat
+        for index, geofence in enumerate(geofences):
+            self._fences.append(self._compile(index, geofence))
+
+    def __len__(self) -> int:
+        return len(self._fences)
+
+    def contains(self, lats, lons) -> np.ndarray:
+        """
+        Test every point against every geofence.
+
+        Returns:
+            (n_points, n_geofences) boolean matrix in input order
+        """
+        lats, lons, valid = self._as_arrays(lats, lons)
+        result = np.zeros((len(lats), len(self)), dtype=bool)
+        for fence_index in range(len(self)):
+            candidates = self._candidates(fence_index, lats, lons, valid)
+            if candidates.size:
+                result[candidates, fence_index] = self._fence_mask(fence_index, lats[candidates], lons[candidates])
+        return result
+
+    def contains_any(self, lats, lons) -> np.ndarray:
+        """(n_points,) mask: point lies inside at least one geofence."""
+        return self.contains(lats, lons).any(axis=1)
+
+    def contains_assigned(self, lats, lons, fence_indices) -> np.ndarray:
+        """
+        Test each point only against its own geofence (index into this engine).
+
+        Points with a negative fence index never match.
+        """
+        lats, lons, valid = self._as_arrays(lats, lons)
+        fence_indices = np.asarray(fence_indices, dtype=np.int64)
+        result = np.zeros(len(lats), dtype=bool)
+        for fence_index in np.unique(fence_indices[fence_indices >= 0]):
+            selected = valid & (fence_indices == fence_index)
+            candidates = self._candidates(int(fence_index), lats, lons, selected)
+            if candidates.size:
+                result[candidates] = self._fence_mask(int(fence_index), lats[candidates], lons[candidates])
+        return result
+
+    # ------------------------------------------------------------------
+    # Compilation
+    # ------------------------------------------------------------------
+
+    def _compile(self, index: int, geofence: GeofenceInput) -> Optional[Tuple[str, object]]:
+        try:
+            if isinstance(geofence, (tuple, list)) and len(geofence) == 3:
+                return self._compile_circle(index, *map(float, geofence))
+            if isinstance(geofence, str):
+                geofence = GEOSGeometry(geofence, srid=4326)
+            if isinstance(geofence, Polygon):
+                geofence = [geofence]
+            if isinstance(geofence, (MultiPolygon, list)):
+                return self._compile_polygons(index, list(geofence))
+        except (GEOSException, ValueError, TypeError) as e:
+            logger.warning(f"Skipping unparseable geofence at index {index}: {e}")
+            return None
+        if geofence is not None:
+            logger.warning(f"Unsupported geofence type at index {index}: {type(geofence)}")
+        return None
+
+    def _compile_circle(self, index: int, center_lat: float, center_lon: float, radius_km: float):
+        reach_km = radius_km + self.buffer_km
+        lat_pad = reach_km / KM_PER_DEGREE_LAT
+        lon_pad = reach_km / (KM_PER_DEGREE_LAT * max(cos(radians(center_lat)), 1e-6))
+        self._bboxes[index] = (center_lon - lon_pad, center_lat - lat_pad, center_lon + lon_pad, center_lat + lat_pad)
+        return 'circle', (center_lat, center_lon, radius_km)
+
+    def _compile_polygons(self, index: int, polygons: List[Polygon]):
+        parts = [[np.asarray(ring.coords, dtype=np.float64) for ring in polygon] for polygon in polygons]
+        shells = np.vstack([rings[0] for rings in parts])
+        min_lon, min_lat = shells.min(axis=0)
+        max_lon, max_lat = shells.max(axis=0)
+        lat_pad = self.buffer_km / KM_PER_DEGREE_LAT
+        lon_pad = self.buffer_km / (KM_PER_DEGREE_LAT * max(cos(radians(max(abs(min_lat), abs(max_lat)))), 1e-6))
+        self._bboxes[index] = (min_lon - lon_pad, min_lat - lat_pad, max_lon + lon_pad, max_lat + lat_pad)
+        return 'polygon', parts
+
+    # ------------------------------------------------------------------
+    # Evaluation
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _as_arrays(lats, lons) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        lats = np.asarray(lats, dtype=np.float64).reshape(-1)
+        lons = np.asarray(lons, dtype=np.float64).reshape(-1)
+        with np.errstate(invalid='ignore'):
+            valid = np.isfinite(lats) & np.isfinite(lons) & (np.abs(lats) <= 90) & (np.abs(lons) <= 180)
+        return lats, lons, valid
+
+    def _candidates(self, fence_index: int, lats: np.ndarray, lons: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """Indices of masked points inside the geofence's bounding box."""
+        if self._fences[fence_index] is None:
+            return np.empty(0, dtype=np.intp)
+        min_lon, min_lat, max_lon, max_lat = self._bboxes[fence_index]
+        in_box = mask & (lons >= min_lon) & (lons <= max_lon) & (lats >= min_lat) & (lats <= max_lat)
+        return np.nonzero(in_box)[0]
+
+    def _fence_mask(self, fence_index: int, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        kind, spec = self._fences[fence_index]
+        if kind == 'circle':
+            center_lat, center_lon, radius_km = spec
+            return haversine_distance_array(lats, lons, center_lat, center_lon) <= radius_km + self.buffer_km
+
+        inside = np.zeros(len(lats), dtype=bool)
+        for rings in spec:
+            inside |= self._in_polygon(lons, lats, rings)
+        if self.buffer_km > 0 and not inside.all():
+            outside = ~inside
+            inside[outside] = self._within_buffer(lons[outside], lats[outside], spec)
+        return inside
+
+    @classmethod
+    def _in_polygon(cls, x: np.ndarray, y: np.ndarray, rings: List[np.ndarray]) -> np.ndarray:
+        """Shell contains-or-touches, minus points strictly inside a hole."""
+        parity, on_edge = cls._ring_parity(x, y, rings[0])
+        inside = parity | on_edge
+        for hole in rings[1:]:
+            hole_parity, hole_edge = cls._ring_parity(x[inside], y[inside], hole)
+            inside[np.nonzero(inside)[0][hole_parity & ~hole_edge]] = False
+        return inside
+
+    @staticmethod
+    def _ring_parity(x: np.ndarray, y: np.ndarray, ring: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Even-odd ray casting plus on-boundary detection, one edge at a time."""
+        parity = np.zeros(len(x), dtype=bool)
+        on_edge = np.zeros(len(x), dtype=bool)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for (x1, y1), (x2, y2) in zip(ring[:-1], ring[1:]):
+                crosses = (y1 > y) != (y2 > y)
+                x_cross = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+                parity ^= crosses & (x < x_cross)
+
+                cross_product = (x2 - x1) * (y - y1) - (y2 - y1) * (x - x1)
+                on_edge |= (
+                    (np.abs(cross_product) <= BOUNDARY_EPSILON)
+                    & (x >= min(x1, x2)) & (x <= max(x1, x2))
+                    & (y >= min(y1, y2)) & (y <= max(y1, y2))
+                )
+        return parity, on_edge
+
+    def _within_buffer(self, x: np.ndarray, y: np.ndarray, parts: List[List[np.ndarray]]) -> np.ndarray:
+        """Points within buffer_km of any ring edge (local equirectangular projection)."""
+        km_per_lon = KM_PER_DEGREE_LAT * np.cos(np.radians(y))
+        min_distance = np.full(len(x), np.inf)
+        for rings in parts:
+            for ring in rings:
+                for (x1, y1), (x2, y2) in zip(ring[:-1], ring[1:]):
+                    px, py = (x - x1) * km_per_lon, (y - y1) * KM_PER_DEGREE_LAT
+                    ex, ey = (x2 - x1) * km_per_lon, (y2 - y1) * KM_PER_DEGREE_LAT
+                    length_sq = ex * ex + ey * ey
+                    with np.errstate(divide='ignore', invalid='ignore'):
+                        t = np.clip(np.where(length_sq > 0, (px * ex + py * ey) / length_sq, 0.0), 0.0, 1.0)
+                    min_distance = np.minimum(min_distance, np.hypot(px - t * ex, py - t * ey))
+        return min_distance <= self.buffer_km
@@ -14,12 +14,13 @@ import logging
 from typing import Tuple, Optional, Union, Dict, Any, List, TYPE_CHECKING
 from math import radians, sin, cos, sqrt, atan2
 from functools import lru_cache
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 import threading
 from apps.core.exceptions.patterns import BUSINESS_LOGIC_EXCEPTIONS
 
 
-from django.contrib.gis.geos import Point, Polygon, GEOSGeometry, GEOSException
+import numpy as np
+from django.contrib.gis.geos import Point, Polygon, MultiPolygon, GEOSGeometry, GEOSException
 from django.contrib.gis.geos.prepared import PreparedGeometry
 
 from django.core.exceptions import ValidationError
@@ -27,6 +28,8 @@ from django.utils.translation import gettext_lazy as _
 from django.core.cache import cache
 
 from apps.attendance.validators import validate_geofence_coordinates
+from apps.attendance.services.geofence_engine import GeofenceEngine
+from apps.attendance.services.spatial_clustering import dbscan_clusters, grid_seed_clusters
 from apps.ontology.decorators import ontology
 
 logger = logging.getLogger(__name__)
@@ -62,7 +65,9 @@ class GeofenceValidationError(GeospatialError):
         "haversine_distance_bulk": "point1 (lat, lon), points_list [(lat, lon)] -> List[distance_km]",
         "get_prepared_geometry": "geometry_wkt (str) -> PreparedGeometry (cached)",
         "validate_points_in_prepared_geofence": "coordinates_list, prepared_geofence, use_parallel, max_workers -> List[bool]",
-        "cluster_coordinates_by_proximity": "coordinates_list, radius_km -> List[List[coordinates]]"
+        "validate_points_in_geofence": "coordinates_list, geofence (Polygon/WKT/circle), buffer_km -> List[bool] (input order)",
+        "match_points_to_geofences": "coordinates_list, geofences, buffer_km -> bool matrix (points x geofences)",
+        "cluster_coordinates_by_proximity": "coordinates_list, radius_km, method ('grid'|'dbscan'), min_samples -> List[List[coordinates]]"
     },
     outputs={
         "coordinates": "Validated (longitude, latitude) tuples in WGS84 (SRID 4326)",
@@ -103,7 +108,7 @@ class GeofenceValidationError(GeospatialError):
         "Haversine formula: O(1) computation, ±0.5% accuracy vs Vincenty",
         "Prepared geometries: 3x faster for repeated contains/intersects queries",
         "LRU cache size: 1000 entries (enterprise scale with hundreds of geofences)",
-        "Bulk operations: Parallel processing for >100 coordinates (ThreadPoolExecutor)",
+        "Bulk operations: NumPy GeofenceEngine (bbox prefilter + vectorized ray casting/haversine)",
         "PostGIS integration: Uses ST_DWithin, ST_Contains for database-level filtering",
         "Coordinate precision: 6 decimal places (~10cm accuracy)",
         "Cache hit rate: ~95% for active geofences in production"
@@ -539,6 +544,74 @@ class GeospatialService:
         except (GEOSException, ValueError) as e:
             raise GeospatialError(f"Failed to prepare geometry: {e}")
 
+    @classmethod
+    @lru_cache(maxsize=1000)
+    def get_geofence_engine(cls, geometry_wkt: str) -> GeofenceEngine:
+        """
+        Get a cached vectorized containment engine for a single geofence.
+
+        Args:
+            geometry_wkt: WKT representation of the geofence polygon
+
+        Returns:
+            GeofenceEngine compiled for the geofence
+        """
+        return GeofenceEngine([geometry_wkt])
+
+    @classmethod
+    def validate_points_in_geofence(cls, coordinates_list: List[Tuple[float, float]],
+                                    geofence: Union[Polygon, str, Tuple[float, float, float]],
+                                    buffer_km: float = 0.0) -> List[bool]:
+        """
+        Validate many points against one geofence in a single vectorized pass.
+
+        Args:
+            coordinates_list: List of (lat, lon) tuples, validated in input order
+            geofence: Polygon, WKT string or (lat, lon, radius_km) tuple
+            buffer_km: Optional tolerance outside the boundary (hysteresis)
+
+        Returns:
+            List of booleans aligned with coordinates_list (invalid points are False)
+        """
+        if not coordinates_list:
+            return []
+        if isinstance(geofence, str) and not buffer_km:
+            engine = cls.get_geofence_engine(geofence)
+        else:
+            engine = GeofenceEngine([geofence], buffer_km=buffer_km)
+        lats, lons = cls._split_coordinates(coordinates_list)
+        return engine.contains(lats, lons)[:, 0].tolist()
+
+    @classmethod
+    def match_points_to_geofences(cls, coordinates_list: List[Tuple[float, float]],
+                                  geofences: List[Union[Polygon, str, Tuple[float, float, float], None]],
+                                  buffer_km: float = 0.0) -> np.ndarray:
+        """
+        Validate many points against many geofences at once.
+
+        Args:
+            coordinates_list: List of (lat, lon) tuples
+            geofences: Geofences (Polygon, WKT or circle tuple; None never matches)
+            buffer_km: Optional tolerance outside each boundary
+
+        Returns:
+            Boolean matrix of shape (len(coordinates_list), len(geofences))
+        """
+        lats, lons = cls._split_coordinates(coordinates_list)
+        return GeofenceEngine(geofences, buffer_km=buffer_km).contains(lats, lons)
+
+    @staticmethod
+    def _split_coordinates(coordinates_list: List[Tuple[float, float]]) -> Tuple[np.ndarray, np.ndarray]:
+        """(lat, lon) pairs to float arrays; unparseable entries become NaN (never match)."""
+        lats = np.full(len(coordinates_list), np.nan)
+        lons = np.full(len(coordinates_list), np.nan)
+        for index, coordinate in enumerate(coordinates_list):
+            try:
+                lats[index], lons[index] = float(coordinate[0]), float(coordinate[1])
+            except (TypeError, ValueError, IndexError):
+                logger.warning(f"Failed to parse point at index {index}: {coordinate!r}")
+        return lats, lons
+
     @classmethod
     def validate_points_in_prepared_geofence(cls, coordinates_list: List[Tuple[float, float]],
                                            prepared_geofence: PreparedGeometry,
@@ -547,19 +620,28 @@ class GeospatialService:
         """
         Validate multiple points against a prepared geofence efficiently.
 
+        Polygonal geofences are evaluated by the vectorized GeofenceEngine;
+        other geometry types fall back to per-point prepared GEOS checks.
+
         Args:
             coordinates_list: List of (lat, lon) tuples to validate
             prepared_geofence: PreparedGeometry for optimized queries
             use_parallel: Whether to use parallel processing for large datasets
+                (GEOS fallback only; ignored by the vectorized path)
             max_workers: Number of worker threads for parallel processing
 
         Returns:
-            List of boolean values indicating if each point is inside geofence
+            List of boolean values indicating if each point is inside geofence,
+            in the same order as coordinates_list
 
         Raises:
             GeofenceValidationError: If validation fails
         """
         try:
+            # PreparedGeometry keeps a reference to its source geometry
+            base_geometry = getattr(prepared_geofence, '_base_geom', None)
+            if isinstance(base_geometry, (Polygon, MultiPolygon)):
+                return cls.validate_points_in_geofence(coordinates_list, base_geometry.wkt)
             if use_parallel and len(coordinates_list) > 100:
                 return cls._parallel_geofence_validation(coordinates_list, prepared_geofence, max_workers)
             else:
@@ -587,9 +669,14 @@ class GeospatialService:
     def _parallel_geofence_validation(cls, coordinates_list: List[Tuple[float, float]],
                                     prepared_geofence: PreparedGeometry,
                                     max_workers: int) -> List[bool]:
-        """Parallel validation for larger datasets"""
+        """Parallel validation for larger datasets (results kept in input order)"""
         def validate_chunk(chunk_coords):
-            return cls._sequential_geofence_validation(chunk_coords, prepared_geofence)
+            try:
+                return cls._sequential_geofence_validation(chunk_coords, prepared_geofence)
+            except BUSINESS_LOGIC_EXCEPTIONS as e:
+                logger.error(f"Parallel validation chunk failed: {e}", exc_info=True)
+                # Fall back to False for failed chunk
+                return [False] * len(chunk_coords)
 
         # Split coordinates into chunks for parallel processing
         chunk_size = max(len(coordinates_list) // max_workers, 1)
@@ -597,17 +684,8 @@ class GeospatialService:
 
         results = []
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_chunk = {executor.submit(validate_chunk, chunk): chunk for chunk in chunks}
-
-            for future in as_completed(future_to_chunk):
-                try:
-                    chunk_results = future.result()
-                    results.extend(chunk_results)
-                except BUSINESS_LOGIC_EXCEPTIONS as e:
-                    logger.error(f"Parallel validation chunk failed: {e}", exc_info=True)
-                    # Fall back to False for failed chunk
-                    chunk = future_to_chunk[future]
-                    results.extend([False] * len(chunk))
+            for chunk_results in executor.map(validate_chunk, chunks):
+                results.extend(chunk_results)
 
         return results
 
@@ -647,42 +725,47 @@ class GeospatialService:
 
     @classmethod
     def cluster_coordinates_by_proximity(cls, coordinates_list: List[Tuple[float, float]],
-                                       radius_km: float = 1.0) -> List[List[Tuple[float, float]]]:
+                                       radius_km: float = 1.0,
+                                       method: str = 'grid',
+                                       min_samples: int = 5) -> List[List[Tuple[float, float]]]:
         """
-        Cluster coordinates by proximity using simple distance-based clustering.
+        Cluster coordinates by proximity using grid-bucketed neighbour lookups.
+
+        Methods:
+            'grid': greedy seed clustering - each cluster is the first unclustered
+                point plus every unclustered point within radius_km of it
+                (same clusters as the previous pairwise implementation)
+            'dbscan': density-based clustering with eps=radius_km; points that
+                belong to no dense cluster are returned as singleton clusters
 
         Args:
             coordinates_list: List of (lat, lon) tuples
             radius_km: Clustering radius in kilometers
+            method: 'grid' or 'dbscan'
+            min_samples: DBSCAN core-point threshold (including the point itself)
 
         Returns:
-            List of coordinate clusters
+            List of coordinate clusters (members in input order)
+
+        Raises:
+            GeospatialError: If coordinates are invalid or method is unknown
         """
         if not coordinates_list:
             return []
 
-        clusters = []
-        remaining = coordinates_list.copy()
-
-        while remaining:
-            # Start new cluster with first remaining point
-            seed = remaining.pop(0)
-            current_cluster = [seed]
-
-            # Find all points within radius of cluster seed
-            i = 0
-            while i < len(remaining):
-                point = remaining[i]
-                distance = cls.haversine_distance(seed[0], seed[1], point[0], point[1])
-
-                if distance <= radius_km:
-                    current_cluster.append(remaining.pop(i))
-                else:
-                    i += 1
+        lats, lons = cls._split_coordinates(coordinates_list)
+        if not (np.isfinite(lats).all() and np.isfinite(lons).all()):
+            raise GeospatialError("Cannot cluster coordinates containing invalid values")
 
-            clusters.append(current_cluster)
+        if method == 'grid':
+            clusters = grid_seed_clusters(lats, lons, radius_km)
+        elif method == 'dbscan':
+            clusters, noise = dbscan_clusters(lats, lons, radius_km, min_samples)
+            clusters = clusters + [noise[i:i + 1] for i in range(len(noise))]
+        else:
+            raise GeospatialError(f"Unknown clustering method: {method}")
 
-        return clusters
+        return [[coordinates_list[index] for index in members] for members in clusters]
 
 
 # Convenience functions for backward compatibility
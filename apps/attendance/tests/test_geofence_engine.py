@@ -0,0 +1,103 @@
+"""
+Tests for the vectorized geofence containment engine
+
+Verifies that GeofenceEngine agrees with the GEOS contains()/touches()
+checks, keeps results in input order and handles holes, circles,
+buffers and invalid coordinates.
+"""
+
+import random
+
+from django.test import TestCase
+from django.contrib.gis.geos import Point, Polygon, MultiPolygon
+
+from apps.attendance.services.geofence_engine import GeofenceEngine
+from apps.attendance.services.geospatial_service import GeospatialService
+
+
+class TestGeofenceEngine(TestCase):
+    """Test GeofenceEngine containment results"""
+
+    def setUp(self):
+        outer_ring = [
+            (-74.1, 40.6), (-73.9, 40.6), (-73.9, 40.8), (-74.1, 40.8), (-74.1, 40.6)
+        ]
+        inner_ring = [
+            (-74.05, 40.65), (-73.95, 40.65), (-73.95, 40.75), (-74.05, 40.75), (-74.05, 40.65)
+        ]
+        self.donut = Polygon(outer_ring, [inner_ring], srid=4326)
+        self.circle = (12.9716, 77.5946, 0.5)  # 500m around Bangalore centre
+
+    def test_matches_geos_for_random_points(self):
+        """Vectorized results must equal GEOS contains-or-touches per point"""
+        rng = random.Random(42)
+        coordinates = [(rng.uniform(40.55, 40.85), rng.uniform(-74.15, -73.85)) for _ in range(500)]
+
+        results = GeospatialService.validate_points_in_geofence(coordinates, self.donut)
+
+        expected = [
+            self.donut.contains(Point(lon, lat, srid=4326)) or self.donut.touches(Point(lon, lat, srid=4326))
+            for lat, lon in coordinates
+        ]
+        self.assertEqual(results, expected)
+
+    def test_boundary_and_hole_points(self):
+        engine = GeofenceEngine([self.donut])
+        lats = [40.62, 40.70, 40.6, 40.65, 40.90]
+        lons = [-74.02, -74.00, -74.0, -74.0, -74.00]
+
+        self.assertEqual(
+            engine.contains(lats, lons)[:, 0].tolist(),
+            [True, False, True, True, False]  # shell edge and hole edge both touch
+        )
+
+    def test_many_geofences_preserve_input_order(self):
+        engine = GeofenceEngine([self.donut, self.circle, None])
+        lats = [12.9716, 40.62, float('nan'), 12.99]
+        lons = [77.5946, -74.02, -74.02, 77.5946]
+
+        matrix = engine.contains(lats, lons)
+
+        self.assertEqual(matrix.shape, (4, 3))
+        self.assertEqual(matrix.tolist(), [
+            [False, True, False],
+            [True, False, False],
+            [False, False, False],
+            [False, False, False],
+        ])
+
+    def test_contains_assigned_checks_only_own_geofence(self):
+        engine = GeofenceEngine([self.donut, self.circle])
+        inside = engine.contains_assigned(
+            [40.62, 40.62, 12.9716, 12.9716],
+            [-74.02, -74.02, 77.5946, 77.5946],
+            [0, 1, 1, -1],
+        )
+        self.assertEqual(inside.tolist(), [True, False, True, False])
+
+    def test_buffer_extends_polygon_and_circle(self):
+        square = Polygon(((0, 0), (0.01, 0), (0.01, 0.01), (0, 0.01), (0, 0)), srid=4326)
+        lats, lons = [0.005, 0.005], [0.0105, 0.02]
+
+        self.assertEqual(GeofenceEngine([square]).contains(lats, lons)[:, 0].tolist(), [False, False])
+        self.assertEqual(GeofenceEngine([square], buffer_km=0.1).contains(lats, lons)[:, 0].tolist(), [True, False])
+
+    def test_multipolygon_and_wkt_inputs(self):
+        first = Polygon(((0, 0), (1, 0), (1, 1), (0, 1), (0, 0)), srid=4326)
+        second = Polygon(((5, 5), (6, 5), (6, 6), (5, 6), (5, 5)), srid=4326)
+        engine = GeofenceEngine([MultiPolygon(first, second, srid=4326), first.wkt])
+
+        self.assertEqual(
+            engine.contains([0.5, 5.5], [0.5, 5.5]).tolist(),
+            [[True, True], [True, False]]
+        )
+
+    def test_prepared_geofence_uses_engine_in_order(self):
+        prepared = GeospatialService.get_prepared_geometry(self.donut.wkt)
+        coordinates = [(40.62, -74.02), (40.70, -74.00), (40.79, -73.91)] * 100
+
+        results = GeospatialService.validate_points_in_prepared_geofence(
+            coordinates, prepared, use_parallel=True
+        )
+
+        self.assertEqual(results, [True, False, True] * 100)
@@ -0,0 +1,68 @@
+"""
+Tests for cached multi-zoom attendance heatmap tiles
+
+The PostGIS snapping query itself needs PostgreSQL; these tests patch it
+and verify the per-grid-size caching and result shape.
+"""
+
+from datetime import date
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from apps.attendance.managers.heatmap_outlier_manager import _heatmap_points
+from apps.attendance.models import PeopleEventlog
+
+
+def _fake_cells(client_id, date_from, date_to, bu_ids, grid_sizes):
+    return {size: _heatmap_points([(12.97, 77.59, len(grid_sizes), 1)]) for size in grid_sizes}
+
+
+class TestHeatmapTiles(SimpleTestCase):
+    """Test tile caching per (client, range, grid size)"""
+
+    def setUp(self):
+        cache.clear()
+        self.manager = PeopleEventlog.objects
+        self.range = (date(2025, 1, 1), date(2025, 1, 31))
+
+    def test_points_sorted_with_intensity(self):
+        points = _heatmap_points([(1.0, 2.0, 5, 2), (3.0, 4.0, 20, 7)])
+
+        self.assertEqual([point['count'] for point in points], [20, 5])
+        self.assertEqual(points[0]['intensity'], 1.0)
+        self.assertEqual(points[1]['intensity'], 0.5)
+        self.assertEqual(points[1]['unique_people_count'], 2)
+
+    def test_all_zoom_levels_from_one_query(self):
+        with patch.object(type(self.manager), '_snap_heatmap_cells', side_effect=_fake_cells) as mock_snap:
+            tiles = self.manager.get_attendance_heatmap_tiles(1, *self.range, grid_sizes=[0.1, 0.01, 0.001])
+
+        mock_snap.assert_called_once()
+        self.assertEqual(list(tiles), [0.1, 0.01, 0.001])
+        self.assertEqual(tiles[0.01][0]['count'], 3)
+
+    def test_cached_levels_are_not_recomputed(self):
+        with patch.object(type(self.manager), '_snap_heatmap_cells', side_effect=_fake_cells) as mock_snap:
+            self.manager.get_attendance_heatmap_tiles(1, *self.range, grid_sizes=[0.01])
+            tiles = self.manager.get_attendance_heatmap_tiles(1, *self.range, grid_sizes=[0.01, 0.001])
+
+        self.assertEqual(mock_snap.call_count, 2)
+        self.assertEqual(mock_snap.call_args.args[-1], [0.001])
+        self.assertEqual(tiles[0.01][0]['count'], 1)
+
+    def test_cache_key_separates_client_and_bu_filter(self):
+        with patch.object(type(self.manager), '_snap_heatmap_cells', side_effect=_fake_cells) as mock_snap:
+            self.manager.get_attendance_heatmap_tiles(1, *self.range, grid_sizes=[0.01])
+            self.manager.get_attendance_heatmap_tiles(2, *self.range, grid_sizes=[0.01])
+            self.manager.get_attendance_heatmap_tiles(1, *self.range, grid_sizes=[0.01], bu_ids=[5])
+            self.manager.get_attendance_heatmap_tiles(1, *self.range, grid_sizes=[0.01], bu_ids=[5])
+
+        self.assertEqual(mock_snap.call_count, 3)
+
+    def test_postgis_mode_returns_single_level(self):
+        with patch.object(type(self.manager), '_snap_heatmap_cells', side_effect=_fake_cells):
+            points = self.manager.get_attendance_heatmap_data(1, *self.range, grid_size=0.01, mode='postgis')
+
+        self.assertEqual(points[0]['lat'], 12.97)
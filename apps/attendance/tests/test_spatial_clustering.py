@@ -0,0 +1,98 @@
+"""
+Tests for grid-bucketed coordinate clustering
+
+Verifies the grid seed clustering reproduces the previous pairwise
+algorithm exactly and that the DBSCAN option returns the same cluster
+shape (lists of (lat, lon) tuples covering every input point).
+"""
+
+import random
+
+import numpy as np
+from django.test import TestCase
+
+from apps.attendance.services.geospatial_service import GeospatialService, GeospatialError
+from apps.attendance.services.spatial_clustering import dbscan_clusters, grid_seed_clusters
+from apps.core.utils_new.spatial.distance import haversine_distance_array
+
+
+def _pairwise_seed_clusters(coordinates_list, radius_km):
+    """Reference O(n^2) implementation the grid version replaces"""
+    clusters = []
+    remaining = coordinates_list.copy()
+    while remaining:
+        seed = remaining.pop(0)
+        current_cluster = [seed]
+        i = 0
+        while i < len(remaining):
+            point = remaining[i]
+            if GeospatialService.haversine_distance(seed[0], seed[1], point[0], point[1]) <= radius_km:
+                current_cluster.append(remaining.pop(i))
+            else:
+                i += 1
+        clusters.append(current_cluster)
+    return clusters
+
+
+class TestGridClustering(TestCase):
+    """Test grid seed clustering against the pairwise reference"""
+
+    def setUp(self):
+        rng = random.Random(7)
+        self.coordinates = [
+            (12.9 + rng.random() * 0.2, 77.5 + rng.random() * 0.2) for _ in range(800)
+        ]
+
+    def test_matches_pairwise_clusters(self):
+        for radius_km in (0.3, 1.0, 5.0):
+            self.assertEqual(
+                GeospatialService.cluster_coordinates_by_proximity(self.coordinates, radius_km),
+                _pairwise_seed_clusters(self.coordinates, radius_km)
+            )
+
+    def test_empty_input(self):
+        self.assertEqual(GeospatialService.cluster_coordinates_by_proximity([]), [])
+        self.assertEqual(grid_seed_clusters(np.array([]), np.array([]), 1.0), [])
+
+    def test_invalid_coordinates_rejected(self):
+        with self.assertRaises(GeospatialError):
+            GeospatialService.cluster_coordinates_by_proximity([(12.9, 77.5), (None, 77.5)])
+
+    def test_unknown_method_rejected(self):
+        with self.assertRaises(GeospatialError):
+            GeospatialService.cluster_coordinates_by_proximity(self.coordinates, method='kmeans')
+
+
+class TestDBSCANClustering(TestCase):
+    """Test DBSCAN option"""
+
+    def test_dense_groups_and_noise(self):
+        dense_a = [(12.9700 + i * 0.0001, 77.5900) for i in range(6)]
+        dense_b = [(13.0500, 77.6500 + i * 0.0001) for i in range(6)]
+        outlier = [(13.5, 78.0)]
+        coordinates = dense_a + outlier + dense_b
+
+        clusters = GeospatialService.cluster_coordinates_by_proximity(
+            coordinates, radius_km=0.1, method='dbscan', min_samples=3
+        )
+
+        self.assertEqual(clusters, [dense_a, dense_b, outlier])
+
+    def test_core_points_share_cluster_with_neighbours(self):
+        rng = np.random.default_rng(3)
+        lats = rng.uniform(0, 0.05, 400)
+        lons = rng.uniform(0, 0.05, 400)
+
+        clusters, noise = dbscan_clusters(lats, lons, eps_km=0.3, min_samples=4)
+
+        labels = np.full(400, -1)
+        for label, members in enumerate(clusters):
+            labels[members] = label
+        self.assertEqual(sum(len(members) for members in clusters) + len(noise), 400)
+
+        within = haversine_distance_array(lats[:, None], lons[:, None], lats[None, :], lons[None, :]) <= 0.3
+        core = within.sum(axis=1) >= 4
+        self.assertFalse(core[noise].any())
+        for i in np.nonzero(core)[0]:
+            core_neighbours = np.nonzero(within[i] & core)[0]
+            self.assertTrue((labels[core_neighbours] == labels[i]).all())
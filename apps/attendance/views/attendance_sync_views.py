@@ -85,14 +85,15 @@ class AttendanceChangesView(APIView):
                 user=request.user,
                 timestamp=request_serializer.validated_data.get('since'),
                 date_from=request.query_params.get('date_from'),
-                limit=request_serializer.validated_data.get('limit', 100)
+                limit=request_serializer.validated_data.get('limit', 100),
+                cursor=request_serializer.validated_data.get('cursor'),
+                serializer_class=AttendanceSyncSerializer
             )
 
-            serialized_items = AttendanceSyncSerializer(result['items'], many=True).data
-
             return Response({
-                'items': serialized_items,
+                'items': result['items'],
                 'has_more': result['has_more'],
+                'next_cursor': result['next_cursor'],
                 'next_timestamp': result['next_timestamp']
             }, status=status.HTTP_200_OK)
 
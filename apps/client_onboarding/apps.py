@@ -5,3 +5,7 @@ class ClientOnboardingConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.client_onboarding"
     verbose_name = "Client Onboarding"
+
+    def ready(self):
+        # Bt save/delete receivers that keep the cached BU hierarchy current
+        from . import bt_hierarchy  # noqa: F401
@@ -0,0 +1,144 @@
+"""
+Versioned per-process cache of the business unit (Bt) hierarchy.
+
+BtManagerORM.get_bulist() used to load every Bt row and rebuild the
+parent/child maps on each call, several times per request. The maps are now
+built once per process and database alias and reused until the alias's
+hierarchy version changes:
+
+- Bt saves and deletes drop this process's snapshot at once and bump the
+  shared version in the cache after commit, so every other process rebuilds
+  on its next lookup
+- BT_HIERARCHY_CACHE_TTL bounds staleness from writes that bypass signals
+  (queryset.update(), raw SQL)
+
+Following .claude/rules.md:
+- Rule #11: Specific exception handling
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.client_onboarding.models import Bt
+from apps.core.exceptions.patterns import CACHE_EXCEPTIONS
+from apps.core.utils_new.db.connection import get_current_db_name
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['BtHierarchy', 'get_hierarchy', 'invalidate_hierarchy']
+
+VERSION_KEY = 'bt_hierarchy_version:{alias}'
+DEFAULT_TTL = 300
+
+# Parents that end an upward walk (the -1 placeholder and the root node)
+_WALK_STOP_IDS = (-1, 1)
+
+
+class BtHierarchy:
+    """Immutable parent/child maps of every Bt row in one database."""
+
+    __slots__ = ('nodes', 'children', 'parents', 'version', 'built_at')
+
+    def __init__(self, rows: Iterable[Dict], version: Optional[int]):
+        self.nodes = {}
+        self.children = {}
+        self.parents = {}
+        for row in rows:
+            self.nodes[row['id']] = row
+            if row['parent_id'] and row['parent_id'] != -1:
+                self.children.setdefault(row['parent_id'], []).append(row['id'])
+                self.parents[row['id']] = row['parent_id']
+        self.version = version
+        self.built_at = time.monotonic()
+
+    def ancestors(self, bu_id: int) -> List[int]:
+        """Parents of bu_id up to (not including) the root node."""
+        found, seen = [], {bu_id}
+        current = bu_id
+        while current in self.parents and self.parents[current] not in _WALK_STOP_IDS:
+            current = self.parents[current]
+            if current in seen:
+                break  # parent cycle in bad data
+            seen.add(current)
+            found.append(current)
+        return found
+
+    def descendants(self, bu_id: int) -> List[int]:
+        """Every node below bu_id."""
+        found, stack, seen = [], list(self.children.get(bu_id, [])), {bu_id}
+        while stack:
+            node_id = stack.pop()
+            if node_id in seen:
+                continue
+            seen.add(node_id)
+            found.append(node_id)
+            stack.extend(self.children.get(node_id, []))
+        return found
+
+    def is_fresh(self, version: Optional[int]) -> bool:
+        ttl = getattr(settings, 'BT_HIERARCHY_CACHE_TTL', DEFAULT_TTL)
+        return self.version == version and time.monotonic() - self.built_at < ttl
+
+
+_snapshots: Dict[str, BtHierarchy] = {}
+_lock = threading.Lock()
+
+
+def get_hierarchy(using: Optional[str] = None) -> BtHierarchy:
+    """Current hierarchy of a database alias, rebuilt when stale or changed elsewhere."""
+    using = using or get_current_db_name()
+    version = _current_version(using)
+    snapshot = _snapshots.get(using)
+    if snapshot and snapshot.is_fresh(version):
+        return snapshot
+
+    with _lock:
+        # Another thread may have rebuilt it while we waited
+        snapshot = _snapshots.get(using)
+        if snapshot and snapshot.is_fresh(version):
+            return snapshot
+        rows = Bt.objects.using(using).exclude(id__in=[-1]).values('id', 'bucode', 'buname', 'parent_id')
+        snapshot = BtHierarchy(rows, version)
+        _snapshots[using] = snapshot
+    return snapshot
+
+
+def invalidate_hierarchy(using: Optional[str] = None) -> None:
+    """Drop this process's snapshot and make every other process rebuild after commit."""
+    using = using or get_current_db_name()
+    with _lock:
+        _snapshots.pop(using, None)
+    transaction.on_commit(lambda: _bump_version(using), using=using)
+
+
+def _current_version(using: str) -> Optional[int]:
+    try:
+        return cache.get(VERSION_KEY.format(alias=using), 0)
+    except CACHE_EXCEPTIONS as e:
+        logger.warning(f"BU hierarchy version unavailable, relying on TTL: {e}")
+        return None
+
+
+def _bump_version(using: str) -> None:
+    key = VERSION_KEY.format(alias=using)
+    try:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+    except ValueError:
+        # Key evicted between add() and incr()
+        cache.set(key, 1, timeout=None)
+    except CACHE_EXCEPTIONS as e:
+        logger.warning(f"Could not bump BU hierarchy version for {using}: {e}")
+
+
+@receiver([post_save, post_delete], sender=Bt)
+def bt_hierarchy_changed(sender, instance, using, **kwargs):
+    invalidate_hierarchy(using)
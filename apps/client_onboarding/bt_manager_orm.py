@@ -32,61 +32,20 @@ class BtManagerORM:
             Business unit IDs in requested format
         """
         # Import here to avoid circular import
-        from apps.client_onboarding.models import Bt
-        
-        # Get all business units for tree building
-        all_bus = list(
-            Bt.objects
-            .exclude(id__in=[-1])
-            .values('id', 'bucode', 'buname', 'parent_id')
-        )
-        
-        if not all_bus:
+        from apps.client_onboarding.bt_hierarchy import get_hierarchy
+
+        # Parent/child maps are cached per process (see bt_hierarchy)
+        hierarchy = get_hierarchy()
+        if bu_id not in hierarchy.nodes:
             return BtManagerORM._format_result([], return_type)
-        
-        # Build lookup structures
-        node_dict = {bu['id']: bu for bu in all_bus}
-        children_dict = {}
-        parent_dict = {}
-        
-        for bu in all_bus:
-            if bu['parent_id'] and bu['parent_id'] != -1:
-                children_dict.setdefault(bu['parent_id'], []).append(bu['id'])
-                parent_dict[bu['id']] = bu['parent_id']
-        
-        result_ids = set()
-        
-        # Always include the requested node
-        if bu_id in node_dict:
-            result_ids.add(bu_id)
-        
-        # Get parents if requested
-        if include_parents and bu_id in node_dict:
-            current_id = bu_id
-            while current_id in parent_dict:
-                parent_id = parent_dict[current_id]
-                if parent_id != -1 and parent_id != 1:  # Skip special nodes
-                    result_ids.add(parent_id)
-                    current_id = parent_id
-                else:
-                    break
-        
-        # Get children if requested
+
+        result_ids = {bu_id}
+        if include_parents:
+            result_ids.update(hierarchy.ancestors(bu_id))
         if include_children:
-            def get_all_children(node_id):
-                for child_id in children_dict.get(node_id, []):
-                    result_ids.add(child_id)
-                    get_all_children(child_id)
-            
-            get_all_children(bu_id)
-        
-        # Sort results
-        sorted_ids = sorted(list(result_ids))
-        
-        # Format based on return type
-        result = BtManagerORM._format_result(sorted_ids, return_type, node_dict)
-        
-        return result
+            result_ids.update(hierarchy.descendants(bu_id))
+
+        return BtManagerORM._format_result(sorted(result_ids), return_type, hierarchy.nodes)
     
     @staticmethod
     def _format_result(
@@ -2,7 +2,8 @@
 Tests for BtManagerORM Django ORM implementations.
 """
 
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
+from apps.client_onboarding.bt_hierarchy import BtHierarchy
 from apps.client_onboarding.models import Bt
 from apps.core_onboarding.models import TypeAssist
 from apps.client_onboarding.managers import BtManagerORM
@@ -191,6 +192,15 @@ class BtManagerORMTestCase(TestCase):
         self.assertIn(200, site_ids)
         self.assertIn(201, site_ids)
     
+    def test_hierarchy_reused_between_calls(self):
+        """Test that repeated lookups do not reload the Bt table"""
+        BtManagerORM.get_all_bu_of_client(100, 'array')
+
+        with self.assertNumQueries(0):
+            result = BtManagerORM.get_whole_tree(200)
+
+        self.assertEqual(result, [100, 200, 300])
+
     def test_caching(self):
         """Test that results reflect current database state"""
         # First call
@@ -212,4 +222,27 @@ class BtManagerORMTestCase(TestCase):
         self.assertIn(999, result2)
 
         # Clean up
-        new_site.delete()
\ No newline at end of file
+        new_site.delete()
+
+
+class BtHierarchyTestCase(SimpleTestCase):
+    """Traversal of the cached hierarchy maps"""
+
+    def _hierarchy(self, edges):
+        rows = [
+            {'id': node_id, 'bucode': f'BU{node_id}', 'buname': f'BU {node_id}', 'parent_id': parent_id}
+            for node_id, parent_id in edges
+        ]
+        return BtHierarchy(rows, version=1)
+
+    def test_walks_stop_at_root(self):
+        hierarchy = self._hierarchy([(1, None), (100, 1), (200, 100), (300, 200), (201, 100)])
+
+        self.assertEqual(hierarchy.ancestors(300), [200, 100])
+        self.assertEqual(sorted(hierarchy.descendants(100)), [200, 201, 300])
+
+    def test_parent_cycle_terminates(self):
+        hierarchy = self._hierarchy([(10, 11), (11, 10)])
+
+        self.assertEqual(hierarchy.ancestors(10), [11])
+        self.assertEqual(hierarchy.descendants(10), [11])
@@ -17,7 +17,8 @@ from .invalidation import (
 from .utils import (
     get_tenant_cache_key,
     get_user_cache_key,
-    cache_key_generator
+    cache_key_generator,
+    get_raw_redis_client
 )
 from .versioning import (
     CacheVersionManager,
@@ -58,6 +59,7 @@ __all__ = [
     'get_tenant_cache_key',
     'get_user_cache_key',
     'cache_key_generator',
+    'get_raw_redis_client',
     'CacheVersionManager',
     'get_versioned_cache_key',
     'bump_cache_version',
@@ -5,7 +5,7 @@ Core caching utilities for tenant-aware and intelligent cache key generation
 import hashlib
 import json
 from typing import Any, Dict, List, Optional, Union
-from django.core.cache import cache
+from django.core.cache import cache, caches
 from django.conf import settings
 from django.http import HttpRequest
 import logging
@@ -135,6 +135,28 @@ def cache_key_generator(
     return base_key
 
 
+def get_raw_redis_client(alias: str = 'default'):
+    """
+    Raw redis-py client behind a django-redis cache, for pipelines and hash
+    commands the Django cache API lacks.
+
+    Args:
+        alias: CACHES alias (default: 'default')
+
+    Returns:
+        redis.Redis for django-redis backends, None for any other backend
+    """
+    try:
+        from django_redis import get_redis_connection
+        from django_redis.cache import RedisCache
+    except ImportError:
+        return None
+    # caches[alias] is the backend itself; django.core.cache.cache is only a proxy to it
+    if not isinstance(caches[alias], RedisCache):
+        return None
+    return get_redis_connection(alias)
+
+
 def get_cache_stats() -> Dict[str, Any]:
     """
     Get comprehensive cache statistics
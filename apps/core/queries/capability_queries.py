@@ -19,30 +19,13 @@ class CapabilityQueries:
         """
         Get web capabilities hierarchy.
 
-        Replaces the recursive CTE with simple Python tree traversal.
-        Much faster and more maintainable for typical capability trees.
+        Replaces the recursive CTE with the process-wide capability tree
+        (same rows as TreeTraversal.build_tree over enabled WEB capabilities).
         """
-        from apps.peoples.models import Capability
+        from apps.peoples.services.capability_tree_service import CapabilityTreeService
 
-        capabilities = list(
-            Capability.objects
-            .filter(cfor='WEB', enable=True)
-            .select_related('parent')
-            .order_by('id')
-        )
-
-        if not capabilities:
-            return []
-
-        result = TreeTraversal.build_tree(
-            capabilities,
-            root_id=1,
-            id_field='id',
-            code_field='capscode',
-            parent_field='parent_id'
-        )
-
-        return result
+        tree = CapabilityTreeService.get_tree()
+        return [node.as_dict() for node in tree.menu('WEB', enabled_only=True, by_id=True)]
 
     @staticmethod
     def get_childrens_of_bt(bt_id: int) -> List[Dict]:
@@ -29,18 +29,25 @@ class ReportQueryRepository:
     Unified repository for all report queries.
 
     Delegates to domain-specific report classes while maintaining
-    backward compatibility with existing code.
+    backward compatibility with existing code. List reports also expose
+    *_queryset/*_row so exports can stream rows instead of building lists.
     """
 
     tasksummary_report = staticmethod(TaskReports.tasksummary_report)
     listoftasks_report = staticmethod(TaskReports.listoftasks_report)
+    listoftasks_queryset = staticmethod(TaskReports.listoftasks_queryset)
+    listoftasks_row = staticmethod(TaskReports.listoftasks_row)
 
     toursummary_report = staticmethod(TourReports.toursummary_report)
     listoftours_report = staticmethod(TourReports.listoftours_report)
+    listoftours_queryset = staticmethod(TourReports.listoftours_queryset)
+    listoftours_row = staticmethod(TourReports.listoftours_row)
     staticdetailedtoursummary_report = staticmethod(TourReports.staticdetailedtoursummary_report)
     dynamicdetailedtoursummary_report = staticmethod(TourReports.dynamicdetailedtoursummary_report)
     dynamictourlist_report = staticmethod(TourReports.dynamictourlist_report)
     statictourlist_report = staticmethod(TourReports.statictourlist_report)
+    statictourlist_queryset = staticmethod(TourReports.statictourlist_queryset)
+    statictourlist_row = staticmethod(TourReports.statictourlist_row)
 
     ppmsummary_report = staticmethod(PPMLogsheetReports.ppmsummary_report)
     logsheet_report = staticmethod(PPMLogsheetReports.logsheet_report)
@@ -50,6 +57,8 @@ class ReportQueryRepository:
 
     listoftickets_report = staticmethod(TicketWorkorderReports.listoftickets_report)
     workorderlist_report = staticmethod(TicketWorkorderReports.workorderlist_report)
+    workorderlist_queryset = staticmethod(TicketWorkorderReports.workorderlist_queryset)
+    workorderlist_row = staticmethod(TicketWorkorderReports.workorderlist_row)
 
     peopleattendancesummary_report = staticmethod(AttendanceReports.peopleattendancesummary_report)
 
@@ -5,7 +5,7 @@ Handles task summary and list reports.
 """
 
 from typing import List, Dict
-from django.db.models import Q, F, Count, Case, When, Value, CharField
+from django.db.models import Q, F, Count, Case, When, Value, CharField, QuerySet
 from django.db import models
 from datetime import datetime
 import logging
@@ -80,8 +80,8 @@ class TaskReports:
         return result
 
     @staticmethod
-    def listoftasks_report(timezone_str: str, siteids: str, from_date, upto_date) -> List[Dict]:
-        """Detailed list of tasks report."""
+    def listoftasks_queryset(timezone_str: str, siteids: str, from_date, upto_date) -> QuerySet:
+        """Tasks of the detailed list of tasks report, unevaluated (see listoftasks_row)."""
         from apps.activity.models.job_model import Jobneed
 
         site_id_list = [int(id.strip()) for id in siteids.split(',') if id.strip()]
@@ -91,7 +91,7 @@ class TaskReports:
         if isinstance(upto_date, str):
             upto_date = datetime.strptime(upto_date, '%Y-%m-%d').date()
 
-        tasks = (
+        return (
             Jobneed.objects
             .filter(
                 identifier='TASK',
@@ -119,35 +119,39 @@ class TaskReports:
             .order_by('bu__buname', '-plandatetime')
         )
 
-        result = []
-        for task in tasks:
-            result.append({
-                'id': task.bu_id,
-                'Site': task.site,
-                'Planned Date Time': task.plandatetime,
-                'jobneedid': task.id,
-                'identifier': task.identifier,
-                'Description': task.jobdesc,
-                'Assigned To': task.assigned_to,
-                'assignedto': task.people_id,
-                'jobtype': task.jobtype,
-                'Status': task.jobstatus,
-                'asset_id': task.asset_id,
-                'Performed By': task.performed_by,
-                'qsetname': task.qset_id,
-                'Expired Date Time': task.expirydatetime,
-                'Gracetime': task.gracetime,
-                'scantype': task.scantype,
-                'receivedonserver': task.receivedonserver,
-                'priority': task.priority,
-                'starttime': task.starttime,
-                'endtime': task.endtime,
-                'gpslocation': task.gpslocation,
-                'qset_id': task.qset_id,
-                'remarks': task.remarks,
-                'Asset': task.asset_name,
-                'Question Set': task.question_set,
-                'peoplename': task.people.peoplename if task.people_id != 1 else None
-            })
+    @staticmethod
+    def listoftasks_row(task) -> Dict:
+        return {
+            'id': task.bu_id,
+            'Site': task.site,
+            'Planned Date Time': task.plandatetime,
+            'jobneedid': task.id,
+            'identifier': task.identifier,
+            'Description': task.jobdesc,
+            'Assigned To': task.assigned_to,
+            'assignedto': task.people_id,
+            'jobtype': task.jobtype,
+            'Status': task.jobstatus,
+            'asset_id': task.asset_id,
+            'Performed By': task.performed_by,
+            'qsetname': task.qset_id,
+            'Expired Date Time': task.expirydatetime,
+            'Gracetime': task.gracetime,
+            'scantype': task.scantype,
+            'receivedonserver': task.receivedonserver,
+            'priority': task.priority,
+            'starttime': task.starttime,
+            'endtime': task.endtime,
+            'gpslocation': task.gpslocation,
+            'qset_id': task.qset_id,
+            'remarks': task.remarks,
+            'Asset': task.asset_name,
+            'Question Set': task.question_set,
+            'peoplename': task.people.peoplename if task.people_id != 1 else None
+        }
 
-        return result
\ No newline at end of file
+    @staticmethod
+    def listoftasks_report(timezone_str: str, siteids: str, from_date, upto_date) -> List[Dict]:
+        """Detailed list of tasks report."""
+        tasks = TaskReports.listoftasks_queryset(timezone_str, siteids, from_date, upto_date)
+        return [TaskReports.listoftasks_row(task) for task in tasks]
@@ -5,7 +5,7 @@ Handles ticket lists and work order reports.
 """
 
 from typing import List, Dict
-from django.db.models import Q, F, Case, When, Value, CharField
+from django.db.models import Q, F, Case, When, Value, CharField, QuerySet
 from django.db.models.functions import Cast, Concat
 from django.utils import timezone
 from datetime import datetime
@@ -101,8 +101,8 @@ class TicketWorkorderReports:
         return result
 
     @staticmethod
-    def workorderlist_report(timezone_str: str, siteids: str, from_date, upto_date) -> List[Dict]:
-        """Work order list report."""
+    def workorderlist_queryset(timezone_str: str, siteids: str, from_date, upto_date) -> QuerySet:
+        """Rows of the work order list report, unevaluated (see workorderlist_row)."""
         from apps.work_order_management.models import Wom
 
         site_id_list = [int(id.strip()) for id in siteids.split(',') if id.strip()]
@@ -112,7 +112,7 @@ class TicketWorkorderReports:
         if isinstance(upto_date, str):
             upto_date = datetime.strptime(upto_date, '%Y-%m-%d').date()
 
-        work_orders = (
+        return (
             Wom.objects
             .filter(
                 bu_id__in=site_id_list,
@@ -137,20 +137,24 @@ class TicketWorkorderReports:
             .order_by('bu__buname', '-plandatetime')
         )
 
-        result = []
-        for wo in work_orders:
-            result.append({
-                'wo_id': wo['id'],
-                'Created On': wo['cdtz'],
-                'Description': wo['description'],
-                'Planned Date Time': wo['plandatetime'],
-                'Completed On': wo['endtime'],
-                'Categories': wo['categories_str'],
-                'Created By': wo['cuser__peoplename'],
-                'Status': wo['workstatus'],
-                'Vendor Name': wo['vendor__name'],
-                'Priority': wo['priority'].title() if wo['priority'] else '',
-                'Site': wo['bu__buname']
-            })
+    @staticmethod
+    def workorderlist_row(wo: Dict) -> Dict:
+        return {
+            'wo_id': wo['id'],
+            'Created On': wo['cdtz'],
+            'Description': wo['description'],
+            'Planned Date Time': wo['plandatetime'],
+            'Completed On': wo['endtime'],
+            'Categories': wo['categories_str'],
+            'Created By': wo['cuser__peoplename'],
+            'Status': wo['workstatus'],
+            'Vendor Name': wo['vendor__name'],
+            'Priority': wo['priority'].title() if wo['priority'] else '',
+            'Site': wo['bu__buname']
+        }
 
-        return result
\ No newline at end of file
+    @staticmethod
+    def workorderlist_report(timezone_str: str, siteids: str, from_date, upto_date) -> List[Dict]:
+        """Work order list report."""
+        work_orders = TicketWorkorderReports.workorderlist_queryset(timezone_str, siteids, from_date, upto_date)
+        return [TicketWorkorderReports.workorderlist_row(wo) for wo in work_orders]
@@ -5,7 +5,7 @@ Handles tour summary and list reports (static and dynamic).
 """
 
 from typing import List, Dict
-from django.db.models import Q, F, Count, Case, When, Value, CharField
+from django.db.models import Q, F, Count, Case, When, Value, CharField, QuerySet
 from django.db import models
 from datetime import datetime
 import logging
@@ -76,15 +76,15 @@ class TourReports:
         return result
 
     @staticmethod
-    def listoftours_report(timezone_str: str, siteids: str, from_date, upto_date) -> List[Dict]:
-        """List of tours report."""
+    def listoftours_queryset(timezone_str: str, siteids: str, from_date, upto_date) -> QuerySet:
+        """Rows of the list of tours report, unevaluated (see listoftours_row)."""
         from apps.activity.models.job_model import Jobneed
         site_id_list = [int(id.strip()) for id in siteids.split(',') if id.strip()]
         if isinstance(from_date, str):
             from_date = datetime.strptime(from_date, '%Y-%m-%d').date()
         if isinstance(upto_date, str):
             upto_date = datetime.strptime(upto_date, '%Y-%m-%d').date()
-        tours = (Jobneed.objects.filter(identifier='INTERNALTOUR', parent_id=1, bu_id__in=site_id_list,
+        return (Jobneed.objects.filter(identifier='INTERNALTOUR', parent_id=1, bu_id__in=site_id_list,
             plandatetime__date__range=[from_date, upto_date]).exclude(id=1, bu_id=1)
             .select_related('bu', 'client', 'people', 'pgroup', 'performedby', 'asset', 'qset')
             .annotate(assigned_to=Case(When(~Q(people_id=1), then=F('people__peoplename')),
@@ -94,38 +94,50 @@ class TourReports:
             .values('client__buname', 'bu__buname', 'jobdesc', 'plandatetime', 'expirydatetime', 'assigned_to',
                 'jobtype', 'jobstatus', 'endtime', 'performedby__peoplename', 'is_time_bound')
             .order_by('bu__buname', '-plandatetime'))
-        result = []
-        for tour in tours:
-            result.append({'Client': tour['client__buname'], 'Site': tour['bu__buname'], 'Tour/Route': tour['jobdesc'],
-                'Planned Datetime': tour['plandatetime'], 'Expiry Datetime': tour['expirydatetime'],
-                'Assigned To': tour['assigned_to'], 'JobType': tour['jobtype'], 'Status': tour['jobstatus'],
-                'Performed On': tour['endtime'], 'Performed By': tour['performedby__peoplename'],
-                'Is Time Bound': tour['is_time_bound']})
-        return result
 
     @staticmethod
-    def statictourlist_report(timezone_str: str, siteids: str, from_date, upto_date) -> List[Dict]:
-        """Static tour list report."""
+    def listoftours_row(tour: Dict) -> Dict:
+        return {'Client': tour['client__buname'], 'Site': tour['bu__buname'], 'Tour/Route': tour['jobdesc'],
+            'Planned Datetime': tour['plandatetime'], 'Expiry Datetime': tour['expirydatetime'],
+            'Assigned To': tour['assigned_to'], 'JobType': tour['jobtype'], 'Status': tour['jobstatus'],
+            'Performed On': tour['endtime'], 'Performed By': tour['performedby__peoplename'],
+            'Is Time Bound': tour['is_time_bound']}
+
+    @staticmethod
+    def listoftours_report(timezone_str: str, siteids: str, from_date, upto_date) -> List[Dict]:
+        """List of tours report."""
+        tours = TourReports.listoftours_queryset(timezone_str, siteids, from_date, upto_date)
+        return [TourReports.listoftours_row(tour) for tour in tours]
+
+    @staticmethod
+    def statictourlist_queryset(timezone_str: str, siteids: str, from_date, upto_date) -> QuerySet:
+        """Rows of the static tour list report, unevaluated (see statictourlist_row)."""
         from apps.activity.models.job_model import Jobneed
         site_id_list = [int(id.strip()) for id in siteids.split(',') if id.strip()]
         if isinstance(from_date, str):
             from_date = datetime.strptime(from_date, '%Y-%m-%d').date()
         if isinstance(upto_date, str):
             upto_date = datetime.strptime(upto_date, '%Y-%m-%d').date()
-        tours = (Jobneed.objects.filter(identifier='INTERNALTOUR', parent_id=1, other_info__istimebound=True,
+        return (Jobneed.objects.filter(identifier='INTERNALTOUR', parent_id=1, other_info__istimebound=True,
             bu_id__in=site_id_list, plandatetime__date__range=[from_date, upto_date]).exclude(id=1, bu_id=1)
             .select_related('bu', 'client', 'people', 'pgroup', 'performedby', 'asset', 'qset')
             .annotate(assigned_to=Case(When(~Q(people_id=1), then=F('people__peoplename')),
                 When(~Q(pgroup_id=1), then=F('pgroup__groupname')), default=Value('NONE'), output_field=CharField()))
             .values('client__buname', 'bu__buname', 'jobdesc', 'plandatetime', 'expirydatetime', 'assigned_to',
                 'jobtype', 'jobstatus', 'endtime', 'performedby__peoplename').order_by('bu__buname', '-plandatetime'))
-        result = []
-        for tour in tours:
-            result.append({'Client': tour['client__buname'], 'Site': tour['bu__buname'], 'Tour/Route': tour['jobdesc'],
-                'Planned Datetime': tour['plandatetime'], 'Expiry Datetime': tour['expirydatetime'],
-                'Assigned To': tour['assigned_to'], 'JobType': tour['jobtype'], 'Status': tour['jobstatus'],
-                'Performed On': tour['endtime'], 'Performed By': tour['performedby__peoplename']})
-        return result
+
+    @staticmethod
+    def statictourlist_row(tour: Dict) -> Dict:
+        return {'Client': tour['client__buname'], 'Site': tour['bu__buname'], 'Tour/Route': tour['jobdesc'],
+            'Planned Datetime': tour['plandatetime'], 'Expiry Datetime': tour['expirydatetime'],
+            'Assigned To': tour['assigned_to'], 'JobType': tour['jobtype'], 'Status': tour['jobstatus'],
+            'Performed On': tour['endtime'], 'Performed By': tour['performedby__peoplename']}
+
+    @staticmethod
+    def statictourlist_report(timezone_str: str, siteids: str, from_date, upto_date) -> List[Dict]:
+        """Static tour list report."""
+        tours = TourReports.statictourlist_queryset(timezone_str, siteids, from_date, upto_date)
+        return [TourReports.statictourlist_row(tour) for tour in tours]
 
     @staticmethod
     def dynamictourlist_report(timezone_str: str, siteids: str, from_date, upto_date) -> List[Dict]:
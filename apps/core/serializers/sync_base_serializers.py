@@ -133,6 +133,12 @@ class DeltaSyncRequestSerializer(serializers.Serializer):
         max_value=1000,
         help_text='Maximum number of items to return'
     )
+    cursor = serializers.CharField(
+        required=False,
+        allow_blank=False,
+        max_length=512,
+        help_text='Opaque next_cursor from the previous page (takes precedence over since)'
+    )
 
     def validate_since(self, value):
         """Validate that since timestamp is not in the future."""
@@ -156,10 +162,15 @@ class DeltaSyncResponseSerializer(serializers.Serializer):
     has_more = serializers.BooleanField(
         help_text='Whether more results are available'
     )
+    next_cursor = serializers.CharField(
+        required=False,
+        allow_null=True,
+        help_text='Opaque cursor to pass as cursor for the next page'
+    )
     next_timestamp = serializers.DateTimeField(
         required=False,
         allow_null=True,
-        help_text='Timestamp to use for next delta sync request'
+        help_text='Timestamp of the last returned item (prefer next_cursor for paging)'
     )
 
 
@@ -171,22 +171,22 @@ class GeofenceValidationService:
                 )
                 return results
 
-            # Check each point against all geofences
-            for point_idx, (lat, lon) in enumerate(points):
-                point_key = f"point_{point_idx}"
-                results[point_key] = []
-
-                for geofence_data in geofences:
-                    geofence_polygon = geofence_data.get('geofence')
-                    if geofence_polygon and self.is_point_in_geofence(
-                        lat, lon, geofence_polygon
-                    ):
-                        results[point_key].append({
-                            'geofence_id': geofence_data['id'],
-                            'gfcode': geofence_data['gfcode'],
-                            'gfname': geofence_data['gfname'],
-                            'alerttext': geofence_data['alerttext']
-                        })
+            # Check all points against all geofences in one vectorized pass
+            from apps.attendance.services.geospatial_service import GeospatialService
+
+            matches = GeospatialService.match_points_to_geofences(
+                points, [geofence_data.get('geofence') for geofence_data in geofences]
+            )
+            for point_idx, point_matches in enumerate(matches):
+                results[f"point_{point_idx}"] = [
+                    {
+                        'geofence_id': geofences[fence_idx]['id'],
+                        'gfcode': geofences[fence_idx]['gfcode'],
+                        'gfname': geofences[fence_idx]['gfname'],
+                        'alerttext': geofences[fence_idx]['alerttext']
+                    }
+                    for fence_idx in point_matches.nonzero()[0]
+                ]
 
             logger.info(
                 f"Batch checked {len(points)} points against "
@@ -18,7 +18,10 @@ from django.utils import timezone
 from django.db.models import F, Q
 from typing import Dict, Any, List, Optional, Type, Union
 from django.db.models import Model
+from rest_framework.serializers import ModelSerializer
 
+from apps.core.services.sync.bulk_upsert import BulkSyncUpserter
+from apps.core.services.sync.delta_cursor import after_cursor, change_timestamp_field, encode_sync_cursor
 from apps.core.utils_new.db_utils import get_current_db_name
 from apps.core.validators import validate_uuid_format, validate_sync_status, validate_version_number
 
@@ -32,17 +35,28 @@ class BaseSyncService:
     Provides:
     - Bulk upsert with conflict detection
     - Version-based optimistic locking
-    - Delta sync for mobile clients
+    - Keyset-paginated delta sync for mobile clients
     - Per-item status tracking
+
+    Set bulk_upsert = True on services whose models have no save()
+    overrides or save signals to apply batches set-based
+    (see bulk_upsert.BulkSyncUpserter).
+
+    Set sync_timestamp_field on services whose model has neither
+    updated_at nor mdtz (see delta_cursor.change_timestamp_field).
     """
 
+    bulk_upsert = False
+    sync_timestamp_field = None
+
     def process_sync_batch(
         self,
         user,
         sync_data: Dict[str, Any],
         model_class: Type[Model],
         serializer_class: Type,
-        extra_filters: Optional[Dict] = None
+        extra_filters: Optional[Dict] = None,
+        bulk: Optional[bool] = None
     ) -> Dict[str, Any]:
         """
         Process bulk sync batch with conflict detection.
@@ -53,6 +67,8 @@ class BaseSyncService:
             model_class: Django model to sync
             serializer_class: Serializer for validation
             extra_filters: Additional filters for querying (e.g., bu, client)
+            bulk: Set-based upsert (one fetch, bulk_create/bulk_update);
+                defaults to the service's bulk_upsert flag
 
         Returns:
             {synced_items: [{mobile_id, status, server_version}], conflicts: [], errors: []}
@@ -63,31 +79,33 @@ class BaseSyncService:
             return {'synced_items': [], 'conflicts': [], 'errors': []}
 
         results = {'synced_items': [], 'conflicts': [], 'errors': []}
+        use_bulk = self.bulk_upsert if bulk is None else bulk
+        if use_bulk and not self._supports_bulk_upsert(serializer_class):
+            use_bulk = False
 
         try:
             with transaction.atomic(using=get_current_db_name()):
-                for entry in entries:
-                    try:
-                        result = self._upsert_item(
-                            user, entry, model_class, serializer_class, extra_filters
-                        )
-
-                        if result['status'] == 'conflict':
-                            results['conflicts'].append(result)
-                        elif result['status'] == 'error':
-                            results['errors'].append(result)
-                        else:
-                            results['synced_items'].append(result)
-
-                    except (ValidationError, IntegrityError) as e:
-                        logger.warning(
-                            f"Item sync failed for mobile_id {entry.get('mobile_id')}: {e}"
-                        )
-                        results['errors'].append({
-                            'mobile_id': entry.get('mobile_id'),
-                            'status': 'error',
-                            'error_message': str(e)
-                        })
+                if use_bulk:
+                    upserter = BulkSyncUpserter(self, user, model_class, serializer_class, extra_filters)
+                    for result in upserter.run(entries):
+                        self._record_result(results, result)
+                else:
+                    for entry in entries:
+                        try:
+                            result = self._upsert_item(
+                                user, entry, model_class, serializer_class, extra_filters
+                            )
+                            self._record_result(results, result)
+
+                        except (ValidationError, IntegrityError) as e:
+                            logger.warning(
+                                f"Item sync failed for mobile_id {entry.get('mobile_id')}: {e}"
+                            )
+                            results['errors'].append({
+                                'mobile_id': entry.get('mobile_id'),
+                                'status': 'error',
+                                'error_message': str(e)
+                            })
 
         except DatabaseError as e:
             logger.error(f"Database error during sync batch: {e}", exc_info=True)
@@ -104,6 +122,27 @@ class BaseSyncService:
 
         return results
 
+    @staticmethod
+    def _record_result(results: Dict[str, List], result: Dict[str, Any]):
+        """File a per-item result under synced_items, conflicts or errors."""
+        if result['status'] == 'conflict':
+            results['conflicts'].append(result)
+        elif result['status'] == 'error':
+            results['errors'].append(result)
+        else:
+            results['synced_items'].append(result)
+
+    def _supports_bulk_upsert(self, serializer_class: Type) -> bool:
+        """
+        Bulk writes bypass _upsert_item and serializer save(); only use them
+        when neither has been customised.
+        """
+        return (
+            type(self)._upsert_item is BaseSyncService._upsert_item
+            and getattr(serializer_class, 'create', None) is ModelSerializer.create
+            and getattr(serializer_class, 'update', None) is ModelSerializer.update
+        )
+
     def _upsert_item(
         self,
         user,
@@ -202,10 +241,16 @@ class BaseSyncService:
         timestamp: Optional[str],
         model_class: Type[Model],
         extra_filters: Optional[Dict] = None,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        serializer_class: Optional[Type] = None
     ) -> Dict[str, Any]:
         """
-        Get changes since timestamp for delta sync.
+        Get one page of changes for delta sync, oldest first.
+
+        Pages are keyed on (modification timestamp, id) in one limit+1
+        query. Clients pass next_cursor back to continue; timestamp only
+        selects the starting point when no cursor is given.
 
         Args:
             user: Authenticated user
@@ -213,38 +258,47 @@ class BaseSyncService:
             model_class: Django model to query
             extra_filters: Additional filters (e.g., bu, client)
             limit: Maximum records to return
+            cursor: Opaque cursor from a previous page
+            serializer_class: If given, items are serialized while streaming
+                rows instead of being returned as model instances
 
         Returns:
-            {items: [...], has_more: bool, next_timestamp: ...}
+            {items: [...], has_more: bool, next_cursor: ..., next_timestamp: ...}
         """
+        timestamp_field = change_timestamp_field(model_class, self.sync_timestamp_field)
         filters = Q()
+        if model_class._meta.get_field(timestamp_field).null:
+            # Rows without a timestamp cannot be keyed by the cursor
+            filters &= Q(**{f'{timestamp_field}__isnull': False})
 
-        if timestamp:
-            try:
-                filters &= Q(updated_at__gt=timestamp) | Q(created_at__gt=timestamp)
-            except (ValueError, TypeError) as e:
-                raise ValidationError(f"Invalid timestamp format: {e}")
+        if cursor:
+            filters &= after_cursor(cursor, timestamp_field)
+        elif timestamp:
+            filters &= Q(**{f'{timestamp_field}__gt': timestamp})
 
         if extra_filters:
             for key, value in extra_filters.items():
                 filters &= Q(**{key: value})
 
         try:
-            queryset = model_class.objects.filter(filters).order_by('-updated_at')[:limit + 1]
-            items = list(queryset[:limit])
-            has_more = len(list(queryset)) > limit
+            queryset = model_class.objects.filter(filters).order_by(timestamp_field, 'pk')[:limit + 1]
+            items, last_obj, has_more = [], None, False
+
+            for obj in queryset.iterator(chunk_size=limit + 1):
+                if len(items) == limit:
+                    has_more = True
+                    break
+                items.append(serializer_class(obj).data if serializer_class else obj)
+                last_obj = obj
 
-            next_timestamp = None
-            if items:
-                next_timestamp = max(
-                    item.updated_at if hasattr(item, 'updated_at') else item.created_at
-                    for item in items
-                ).isoformat()
+            if last_obj is None:
+                return {'items': [], 'has_more': False, 'next_cursor': cursor, 'next_timestamp': None}
 
             return {
                 'items': items,
                 'has_more': has_more,
-                'next_timestamp': next_timestamp
+                'next_cursor': encode_sync_cursor(last_obj, timestamp_field),
+                'next_timestamp': getattr(last_obj, timestamp_field).isoformat()
             }
 
         except DatabaseError as e:
@@ -0,0 +1,205 @@
+"""
+Set-Based Sync Upsert
+
+Applies a whole mobile sync batch with a constant number of queries:
+one locked fetch of every existing row for the batch's mobile_ids,
+in-memory conflict detection and serializer validation, then a
+bulk_create for new rows and a bulk_update for changed rows.
+
+Items that cannot be written in bulk are replayed one at a time through
+BaseSyncService._upsert_item inside their own savepoint, so they produce
+exactly the per-item results (or exceptions) of the one-by-one path:
+- serializer validation failures
+- mobile_ids repeated within the batch (after the first occurrence)
+- validated data touching non-concrete fields (e.g. many-to-many)
+- rows of a bulk write that failed as a whole
+
+Bulk writes do not call Model.save() or emit save signals; services opt
+in with BaseSyncService.bulk_upsert only for models that rely on neither.
+
+Following .claude/rules.md:
+- Rule #11: Specific exception handling
+- Rule #12: Database query optimization
+"""
+
+import logging
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Set, Tuple, Type
+
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models import Model
+from django.utils import timezone
+
+from apps.core.utils_new.db_utils import get_current_db_name
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['BulkSyncUpserter']
+
+BULK_WRITE_BATCH_SIZE = 500
+
+
+class BulkSyncUpserter:
+    """Plans and writes one sync batch for a BaseSyncService."""
+
+    def __init__(self, service, user, model_class: Type[Model], serializer_class: Type,
+                 extra_filters: Optional[Dict] = None):
+        self.service = service
+        self.user = user
+        self.model_class = model_class
+        self.serializer_class = serializer_class
+        self.extra_filters = extra_filters
+        self.db = get_current_db_name()
+        self.concrete_fields = {field.name for field in model_class._meta.concrete_fields}
+        self.outcomes: List[Tuple[int, Dict[str, Any]]] = []
+        self.fallback: List[Tuple[int, Dict[str, Any]]] = []
+
+    def run(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Upsert a batch; must be called inside a transaction.
+
+        Returns:
+            Per-item results in input order (same dicts as _upsert_item)
+        """
+        indexed = self._normalize(entries)
+        existing = self._fetch_existing(entry['mobile_id'] for _, entry in indexed)
+
+        creates, updates, seen = [], [], set()
+        for index, entry in indexed:
+            if entry['mobile_id'] in seen:
+                self.fallback.append((index, entry))
+                continue
+            seen.add(entry['mobile_id'])
+            server_obj = existing.get(entry['mobile_id'])
+            if server_obj is None:
+                self._plan_create(index, entry, creates)
+            else:
+                self._plan_update(index, entry, server_obj, updates)
+
+        self._write(creates, 'created', self._bulk_create)
+        self._write(updates, 'updated', self._bulk_update)
+        self._replay_fallback()
+        return [result for _, result in sorted(self.outcomes, key=itemgetter(0))]
+
+    # ------------------------------------------------------------------
+    # Planning
+    # ------------------------------------------------------------------
+
+    def _normalize(self, entries: List[Dict[str, Any]]) -> List[Tuple[int, Dict[str, Any]]]:
+        """Validate or generate mobile_ids; invalid ids become error results."""
+        indexed = []
+        for index, entry in enumerate(entries):
+            mobile_id = entry.get('mobile_id')
+            try:
+                entry['mobile_id'] = (
+                    self.service.validate_mobile_id(mobile_id) if mobile_id
+                    else self.service.generate_mobile_id()
+                )
+            except ValidationError as e:
+                self.outcomes.append((index, self._error(mobile_id, e)))
+                continue
+            indexed.append((index, entry))
+        return indexed
+
+    def _fetch_existing(self, mobile_ids) -> Dict[str, Model]:
+        """Lock and load every existing row of the batch in one query."""
+        filters = self.service.build_sync_filters(self.user, self.extra_filters)
+        queryset = self.model_class.objects.filter(filters, mobile_id__in=list(mobile_ids))
+        return {str(obj.mobile_id): obj for obj in queryset.select_for_update(of=('self',))}
+
+    def _plan_create(self, index: int, entry: Dict[str, Any], creates: List):
+        prepared = self.service.prepare_sync_fields(entry, is_update=False)
+        serializer = self.serializer_class(data=prepared)
+        if not serializer.is_valid() or not self._is_bulk_writable(serializer.validated_data):
+            self.fallback.append((index, entry))
+            return
+        creates.append((index, entry, self.model_class(**serializer.validated_data), None))
+
+    def _plan_update(self, index: int, entry: Dict[str, Any], server_obj: Model, updates: List):
+        conflict = self.service._detect_conflict(server_obj, entry)
+        if conflict:
+            self.outcomes.append((index, conflict))
+            return
+
+        prepared = self.service.prepare_sync_fields(entry, is_update=True)
+        serializer = self.serializer_class(server_obj, data=prepared, partial=True)
+        if not serializer.is_valid() or not self._is_bulk_writable(serializer.validated_data):
+            self.fallback.append((index, entry))
+            return
+
+        server_version = server_obj.version
+        for field, value in serializer.validated_data.items():
+            setattr(server_obj, field, value)
+        # Rows are locked by _fetch_existing, so the in-memory increment is safe
+        server_obj.version = server_version + 1
+        updates.append((index, entry, server_obj, set(serializer.validated_data)))
+
+    def _is_bulk_writable(self, validated_data: Dict[str, Any]) -> bool:
+        return set(validated_data) <= self.concrete_fields
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def _write(self, planned: List, status: str, writer):
+        """Run one bulk write in a savepoint; on failure replay its items individually."""
+        if not planned:
+            return
+        try:
+            with transaction.atomic(using=self.db):
+                writer(planned)
+        except DatabaseError as e:
+            logger.warning(
+                f"Bulk {status} of {len(planned)} {self.model_class.__name__} rows failed, "
+                f"replaying per item: {e}"
+            )
+            self.fallback.extend((index, entry) for index, entry, _, _ in planned)
+            return
+
+        for index, _, obj, _ in planned:
+            self.outcomes.append((index, {
+                'mobile_id': str(obj.mobile_id),
+                'status': status,
+                'server_version': obj.version,
+                'sync_metadata': self.service.get_sync_metadata(obj)
+            }))
+
+    def _bulk_create(self, planned: List):
+        self.model_class.objects.bulk_create(
+            [obj for _, _, obj, _ in planned], batch_size=BULK_WRITE_BATCH_SIZE
+        )
+
+    def _bulk_update(self, planned: List):
+        fields: Set[str] = {'version'}
+        for _, _, _, changed in planned:
+            fields |= changed
+
+        # bulk_update() skips pre_save(), so refresh auto_now timestamps here
+        now = timezone.now()
+        for field in self.model_class._meta.concrete_fields:
+            if getattr(field, 'auto_now', False):
+                fields.add(field.name)
+                for _, _, obj, _ in planned:
+                    setattr(obj, field.attname, now)
+
+        self.model_class.objects.bulk_update(
+            [obj for _, _, obj, _ in planned], sorted(fields), batch_size=BULK_WRITE_BATCH_SIZE
+        )
+
+    def _replay_fallback(self):
+        """One-by-one path for items the bulk plan could not handle."""
+        for index, entry in sorted(self.fallback, key=itemgetter(0)):
+            try:
+                with transaction.atomic(using=self.db):
+                    result = self.service._upsert_item(
+                        self.user, entry, self.model_class, self.serializer_class, self.extra_filters
+                    )
+            except (ValidationError, IntegrityError) as e:
+                logger.warning(f"Item sync failed for mobile_id {entry.get('mobile_id')}: {e}")
+                result = self._error(entry.get('mobile_id'), e)
+            self.outcomes.append((index, result))
+
+    @staticmethod
+    def _error(mobile_id, error: Exception) -> Dict[str, Any]:
+        return {'mobile_id': mobile_id, 'status': 'error', 'error_message': str(error)}
@@ -0,0 +1,89 @@
+"""
+Opaque Keyset Cursors for Delta Sync
+
+Delta sync pages are ordered by (change timestamp, primary key) ascending.
+The cursor handed to mobile clients encodes the key of the last row
+returned, so the next page starts strictly after it: no rows are skipped
+or repeated when many rows share a timestamp (mdtz is stored at second
+precision) or when rows change between page requests.
+
+Following .claude/rules.md:
+- Rule #11: Specific exception handling
+- Rule #13: Validated inputs (malformed cursors raise ValidationError)
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured, ValidationError
+from django.db.models import Model, Q
+from django.utils.dateparse import parse_datetime
+
+__all__ = ['encode_sync_cursor', 'decode_sync_cursor', 'change_timestamp_field', 'after_cursor']
+
+
+def change_timestamp_field(model_class, preferred: Optional[str] = None) -> str:
+    """
+    Concrete modification timestamp column for a synced model.
+
+    Uses preferred when given (e.g. receiveddate for Tracking), otherwise
+    updated_at, then mdtz. Models built on BaseModel expose updated_at only
+    as a Python alias of mdtz, which cannot be used in queries.
+
+    Raises:
+        ImproperlyConfigured: If the model has none of the candidate columns
+    """
+    candidates = (preferred,) if preferred else ('updated_at', 'mdtz')
+    for name in candidates:
+        try:
+            field = model_class._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if field.concrete:
+            return name
+    raise ImproperlyConfigured(
+        f"{model_class.__name__} has no change timestamp column ({', '.join(candidates)}); "
+        f"set sync_timestamp_field on its sync service"
+    )
+
+
+def encode_sync_cursor(obj: Model, timestamp_field: str) -> str:
+    """Cursor pointing just after obj."""
+    payload = {'t': getattr(obj, timestamp_field).isoformat(), 'id': str(obj.pk)}
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_sync_cursor(cursor: str) -> Tuple[datetime, Any]:
+    """
+    Decode a cursor into (timestamp, primary key).
+
+    Raises:
+        ValidationError: If the cursor was not produced by encode_sync_cursor
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        timestamp = parse_datetime(payload['t'])
+        pk = payload['id']
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError) as e:
+        raise ValidationError(f"Invalid sync cursor: {e}")
+    if timestamp is None:
+        raise ValidationError("Invalid sync cursor: bad timestamp")
+    return timestamp, pk
+
+
+def after_cursor(cursor: str, timestamp_field: str) -> Q:
+    """
+    Rows strictly after the cursor key.
+
+    The leading range predicate on the timestamp keeps the lookup on the
+    timestamp index; the OR only separates ties within that timestamp.
+    """
+    timestamp, pk = decode_sync_cursor(cursor)
+    return Q(**{f'{timestamp_field}__gte': timestamp}) & (
+        Q(**{f'{timestamp_field}__gt': timestamp}) | Q(pk__gt=pk)
+    )
@@ -138,7 +138,8 @@ class DomainSyncService(
         user,
         timestamp: Optional[str] = None,
         additional_filters: Optional[Dict] = None,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Get domain-specific changes for delta sync.
@@ -148,6 +149,7 @@ class DomainSyncService(
             timestamp: ISO timestamp for delta query
             additional_filters: Extra domain-specific filters
             limit: Maximum records to return
+            cursor: Opaque keyset cursor from the previous page
 
         Returns:
             Changes since timestamp with domain metadata
@@ -164,7 +166,8 @@ class DomainSyncService(
                 timestamp=timestamp,
                 model_class=self.get_model_class(),
                 extra_filters=combined_filters,
-                limit=limit
+                limit=limit,
+                cursor=cursor
             )
 
             # Enrich with domain-specific metadata
@@ -174,7 +177,7 @@ class DomainSyncService(
 
         except (ValidationError, DatabaseError) as e:
             logger.error(f"{self.DOMAIN_NAME} changes query error: {e}", exc_info=True)
-            return {'items': [], 'has_more': False, 'next_timestamp': None, 'error': str(e)}
+            return {'items': [], 'has_more': False, 'next_cursor': cursor, 'next_timestamp': None, 'error': str(e)}
 
     def _validate_sync_user(self, user) -> None:
         """Validate user can perform sync operations for this domain."""
@@ -117,11 +117,13 @@ class PriorityRules:
         # High priority user-facing
         'process_payment': TaskPriority.HIGH,
         'create_job': TaskPriority.HIGH,
+        'generate_job_shard': TaskPriority.HIGH,
         'ticket_escalation': TaskPriority.HIGH,
         'autoclose_job': TaskPriority.HIGH,
         
         # Medium priority background
         'create_scheduled_reports': TaskPriority.MEDIUM,
+        'generate_scheduled_report_group': TaskPriority.MEDIUM,
         'generate_analytics': TaskPriority.MEDIUM,
         
         # Low priority maintenance
@@ -112,6 +112,9 @@ CELERY_TASK_ROUTES = {
     'background_tasks.mqtt_handler_tasks.process_guard_gps': {
         'queue': 'high_priority', 'priority': 8
     },
+    'background_tasks.mqtt_handler_tasks.process_guard_gps_batch': {
+        'queue': 'high_priority', 'priority': 8
+    },
     'background_tasks.notifications.*': {
         'queue': 'high_priority', 'priority': 8
     },
@@ -135,6 +138,7 @@ CELERY_TASK_ROUTES = {
     },
     'background_tasks.personalization_tasks.*': {'queue': 'reports', 'priority': 6},
     'create_scheduled_reports': {'queue': 'reports', 'priority': 6},
+    'generate_scheduled_report_group': {'queue': 'reports', 'priority': 6},
 
     # ========================================================================
     # EXTERNAL API - With circuit breaker protection (Queue: external_api, Priority: 5-6)
@@ -149,6 +153,12 @@ CELERY_TASK_ROUTES = {
     'background_tasks.mqtt_handler_tasks.process_sensor_data': {
         'queue': 'external_api', 'priority': 6
     },
+    'background_tasks.mqtt_handler_tasks.process_device_telemetry_batch': {
+        'queue': 'external_api', 'priority': 5
+    },
+    'background_tasks.mqtt_handler_tasks.process_sensor_data_batch': {
+        'queue': 'external_api', 'priority': 6
+    },
 
     # ========================================================================
     # DEFAULT QUEUE - General tasks (Queue: default, Priority: 5-6)
@@ -170,6 +180,7 @@ CELERY_TASK_ROUTES = {
     'background_tasks.tasks.move_media_to_cloud_storage': {'queue': 'maintenance', 'priority': 2},
     'create_ppm_job': {'queue': 'maintenance', 'priority': 4},
     'create_job': {'queue': 'maintenance', 'priority': 4},
+    'generate_job_shard': {'queue': 'maintenance', 'priority': 4},
     # MQTT system health checks
     'background_tasks.mqtt_handler_tasks.process_system_health': {
         'queue': 'maintenance', 'priority': 2
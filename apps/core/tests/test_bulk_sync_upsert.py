@@ -0,0 +1,143 @@
+"""
+Tests for the set-based sync upsert path.
+
+Uses in-memory stand-ins for the model and serializer so the planning
+logic (one fetch, in-memory conflicts, bulk writes, per-item fallback)
+is exercised without a database.
+"""
+import uuid
+from contextlib import nullcontext
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.db import IntegrityError
+
+from apps.core.services.sync.base_sync_service import BaseSyncService
+from apps.core.services.sync.bulk_upsert import BulkSyncUpserter
+
+
+class FakeRecord:
+    _meta = SimpleNamespace(concrete_fields=[
+        SimpleNamespace(name=name, attname=name, auto_now=(name == 'updated_at'))
+        for name in ('mobile_id', 'version', 'sync_status', 'last_sync_timestamp', 'title', 'updated_at')
+    ])
+    objects = None
+
+    def __init__(self, **fields):
+        self.version = 1
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+
+class FakeSerializer:
+    FIELDS = {'mobile_id', 'version', 'sync_status', 'last_sync_timestamp', 'title'}
+
+    def __init__(self, instance=None, data=None, partial=False):
+        self.data = data
+
+    def is_valid(self):
+        self.validated_data = {key: value for key, value in self.data.items() if key in self.FIELDS}
+        return self.data.get('title') != 'invalid'
+
+
+@pytest.fixture
+def service():
+    return BaseSyncService()
+
+
+@pytest.fixture
+def objects():
+    manager = MagicMock()
+    FakeRecord.objects = manager
+    with patch('apps.core.services.sync.bulk_upsert.transaction.atomic', return_value=nullcontext()), \
+            patch('apps.core.services.sync.bulk_upsert.get_current_db_name', return_value='default'):
+        yield manager
+    FakeRecord.objects = None
+
+
+def _existing(manager, *records):
+    manager.filter.return_value.select_for_update.return_value = list(records)
+
+
+def _run(service, entries):
+    return BulkSyncUpserter(service, SimpleNamespace(), FakeRecord, FakeSerializer).run(entries)
+
+
+def test_creates_and_updates_in_one_write_each(service, objects):
+    existing_id = str(uuid.uuid4())
+    _existing(objects, FakeRecord(mobile_id=existing_id, version=3, title='old'))
+
+    results = _run(service, [
+        {'mobile_id': existing_id, 'version': 3, 'title': 'new'},
+        {'title': 'fresh'},
+    ])
+
+    assert [result['status'] for result in results] == ['updated', 'created']
+    assert results[0]['server_version'] == 4
+    assert results[1]['server_version'] == 1
+    objects.filter.assert_called_once()
+    objects.bulk_create.assert_called_once()
+    updated, fields = objects.bulk_update.call_args.args
+    assert updated[0].title == 'new'
+    assert {'title', 'version', 'updated_at'} <= set(fields)
+
+
+def test_conflict_detected_in_memory(service, objects):
+    existing_id = str(uuid.uuid4())
+    _existing(objects, FakeRecord(mobile_id=existing_id, version=5))
+
+    results = _run(service, [{'mobile_id': existing_id, 'version': 2, 'title': 'stale'}])
+
+    assert results[0]['status'] == 'conflict'
+    assert results[0]['server_version'] == 5
+    objects.bulk_update.assert_not_called()
+
+
+def test_invalid_mobile_id_reported_without_blocking_batch(service, objects):
+    _existing(objects)
+
+    results = _run(service, [{'mobile_id': 'not-a-uuid'}, {'title': 'ok'}])
+
+    assert results[0]['status'] == 'error'
+    assert results[1]['status'] == 'created'
+
+
+def test_invalid_and_duplicate_items_replayed_per_item(service, objects):
+    _existing(objects)
+    duplicate_id = str(uuid.uuid4())
+    entries = [
+        {'mobile_id': duplicate_id, 'title': 'first'},
+        {'title': 'invalid'},
+        {'mobile_id': duplicate_id, 'title': 'second'},
+    ]
+
+    with patch.object(BaseSyncService, '_upsert_item', side_effect=lambda user, entry, *args: {
+        'mobile_id': entry['mobile_id'], 'status': 'updated', 'server_version': 2
+    }) as mock_upsert:
+        results = _run(service, entries)
+
+    assert mock_upsert.call_count == 2
+    assert [result['status'] for result in results] == ['created', 'updated', 'updated']
+
+
+def test_failed_bulk_write_falls_back_per_item(service, objects):
+    _existing(objects)
+    objects.bulk_create.side_effect = IntegrityError('duplicate key')
+
+    with patch.object(BaseSyncService, '_upsert_item', side_effect=IntegrityError('duplicate key')):
+        results = _run(service, [{'title': 'a'}, {'title': 'b'}])
+
+    assert [result['status'] for result in results] == ['error', 'error']
+    assert 'duplicate key' in results[0]['error_message']
+
+
+def test_customised_upsert_disables_bulk_mode():
+    class CustomService(BaseSyncService):
+        def _upsert_item(self, *args, **kwargs):
+            return super()._upsert_item(*args, **kwargs)
+
+    from rest_framework.serializers import ModelSerializer
+
+    assert BaseSyncService()._supports_bulk_upsert(ModelSerializer)
+    assert not CustomService()._supports_bulk_upsert(ModelSerializer)
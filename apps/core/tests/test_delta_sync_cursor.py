@@ -0,0 +1,127 @@
+"""
+Tests for keyset-paginated delta sync.
+
+Covers the opaque cursor format, timestamp column resolution, and the
+single limit+1 page query of BaseSyncService.get_changes_since
+(queryset mocked, no database).
+"""
+from datetime import datetime, timezone as dt_timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured, ValidationError
+
+from apps.core.services.sync.base_sync_service import BaseSyncService
+from apps.core.services.sync.delta_cursor import (
+    after_cursor,
+    change_timestamp_field,
+    decode_sync_cursor,
+    encode_sync_cursor,
+)
+
+STAMP = datetime(2025, 10, 30, 10, 0, 0, tzinfo=dt_timezone.utc)
+
+
+def _model(field_names, nullable=()):
+    fields = {name: SimpleNamespace(name=name, concrete=True, null=name in nullable) for name in field_names}
+
+    def get_field(name):
+        if name not in fields:
+            raise FieldDoesNotExist(name)
+        return fields[name]
+
+    return SimpleNamespace(
+        __name__='SyncedModel',
+        _meta=SimpleNamespace(concrete_fields=list(fields.values()), get_field=get_field),
+        objects=MagicMock()
+    )
+
+
+def _rows(count):
+    return [SimpleNamespace(pk=index, mdtz=STAMP) for index in range(1, count + 1)]
+
+
+def test_cursor_round_trip():
+    cursor = encode_sync_cursor(SimpleNamespace(pk=42, mdtz=STAMP), 'mdtz')
+
+    assert '=' not in cursor
+    assert decode_sync_cursor(cursor) == (STAMP, '42')
+
+
+@pytest.mark.parametrize('cursor', ['not-base64!', 'e30', 'eyJ0IjoieCIsImlkIjoxfQ'])
+def test_malformed_cursor_rejected(cursor):
+    with pytest.raises(ValidationError):
+        decode_sync_cursor(cursor)
+
+
+def test_after_cursor_breaks_timestamp_ties_by_id():
+    cursor = encode_sync_cursor(SimpleNamespace(pk=7, mdtz=STAMP), 'mdtz')
+
+    predicate = str(after_cursor(cursor, 'mdtz'))
+
+    assert "('mdtz__gte'" in predicate
+    assert "('pk__gt', '7')" in predicate
+
+
+def test_timestamp_field_resolution():
+    assert change_timestamp_field(_model(['id', 'updated_at'])) == 'updated_at'
+    assert change_timestamp_field(_model(['id', 'mdtz', 'cdtz'])) == 'mdtz'
+    assert change_timestamp_field(_model(['id', 'receiveddate']), 'receiveddate') == 'receiveddate'
+
+
+def test_model_without_timestamp_column_rejected():
+    with pytest.raises(ImproperlyConfigured):
+        change_timestamp_field(_model(['id', 'receiveddate']))
+
+
+def test_service_timestamp_field_excludes_unstamped_rows():
+    from apps.attendance.services.attendance_sync_service import AttendanceSyncService
+
+    model = _model(['id', 'receiveddate'], nullable=['receiveddate'])
+    page = model.objects.filter.return_value.order_by.return_value.__getitem__.return_value
+    page.iterator.return_value = iter([])
+
+    AttendanceSyncService().get_changes_since(None, None, model)
+
+    predicate = str(model.objects.filter.call_args.args[0])
+    assert "('receiveddate__isnull', False)" in predicate
+    model.objects.filter.return_value.order_by.assert_called_once_with('receiveddate', 'pk')
+
+
+def test_page_uses_single_ascending_query():
+    model = _model(['id', 'mdtz'])
+    page = model.objects.filter.return_value.order_by.return_value.__getitem__.return_value
+    page.iterator.return_value = iter(_rows(3))
+
+    result = BaseSyncService().get_changes_since(None, None, model, limit=2)
+
+    model.objects.filter.return_value.order_by.assert_called_once_with('mdtz', 'pk')
+    model.objects.filter.return_value.order_by.return_value.__getitem__.assert_called_once_with(slice(None, 3))
+    assert [item.pk for item in result['items']] == [1, 2]
+    assert result['has_more'] is True
+    assert decode_sync_cursor(result['next_cursor']) == (STAMP, '2')
+
+
+def test_page_serializes_while_streaming():
+    model = _model(['id', 'mdtz'])
+    page = model.objects.filter.return_value.order_by.return_value.__getitem__.return_value
+    page.iterator.return_value = iter(_rows(1))
+    serializer_class = lambda obj: SimpleNamespace(data={'id': obj.pk})
+
+    result = BaseSyncService().get_changes_since(None, None, model, serializer_class=serializer_class)
+
+    assert result['items'] == [{'id': 1}]
+    assert result['has_more'] is False
+
+
+def test_empty_page_keeps_cursor():
+    model = _model(['id', 'mdtz'])
+    page = model.objects.filter.return_value.order_by.return_value.__getitem__.return_value
+    page.iterator.return_value = iter([])
+    cursor = encode_sync_cursor(SimpleNamespace(pk=9, mdtz=STAMP), 'mdtz')
+
+    result = BaseSyncService().get_changes_since(None, None, model, cursor=cursor)
+
+    assert result['items'] == []
+    assert result['next_cursor'] == cursor
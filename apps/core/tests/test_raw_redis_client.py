@@ -0,0 +1,36 @@
+"""
+Tests for get_raw_redis_client().
+
+The helper must see through django.core.cache.cache (a ConnectionProxy) to
+the configured backend, so shared Redis buffers are used in production.
+"""
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from apps.core.caching.utils import get_raw_redis_client
+
+REDIS_CACHES = {
+    'default': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': 'redis://127.0.0.1:6379/15',
+        'OPTIONS': {'CLIENT_CLASS': 'django_redis.client.DefaultClient'},
+    }
+}
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class GetRawRedisClientTestCase(SimpleTestCase):
+
+    @override_settings(CACHES=REDIS_CACHES)
+    def test_default_alias_behind_proxy_returns_client(self):
+        import redis
+
+        client = get_raw_redis_client()
+
+        self.assertIsInstance(client, redis.Redis)
+        self.assertIs(client, cache.client.get_client(write=True))
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_non_redis_backend_returns_none(self):
+        self.assertIsNone(get_raw_redis_client())
@@ -26,7 +26,7 @@ def save_capsinfo_inside_session(people, request, admin):
         admin: Boolean indicating admin status
     """
     import apps.peoples.utils as putils
-    from apps.peoples.models import Capability
+    from apps.peoples.services.capability_tree_service import CapabilityTreeService
     from apps.core.queries import get_query
 
     logger.info("save_capsinfo_inside_session... STARTED")
@@ -53,30 +53,21 @@ def save_capsinfo_inside_session(people, request, admin):
         request.session["client_mobcaps"] = []
         request.session["client_portletcaps"] = []
         request.session["client_reportcaps"] = []
-        request.session["people_webcaps"] = list(
-            Capability.objects.filter(
-                capscode__in=people.people_extras["webcapability"], cfor="WEB"
-            ).values_list("capscode", "capsname")
+        tree = CapabilityTreeService.get_tree()
+        request.session["people_webcaps"] = tree.caps_for_codes(
+            people.people_extras["webcapability"], "WEB"
         )
-        request.session["people_mobcaps"] = list(
-            Capability.objects.filter(
-                capscode__in=people.people_extras["mobilecapability"], cfor="MOB"
-            ).values_list("capscode", "capsname")
+        request.session["people_mobcaps"] = tree.caps_for_codes(
+            people.people_extras["mobilecapability"], "MOB"
         )
-        request.session["people_reportcaps"] = list(
-            Capability.objects.filter(
-                capscode__in=people.people_extras["reportcapability"], cfor="REPORT"
-            ).values_list("capscode", "capsname")
+        request.session["people_reportcaps"] = tree.caps_for_codes(
+            people.people_extras["reportcapability"], "REPORT"
         )
-        request.session["people_portletcaps"] = list(
-            Capability.objects.filter(
-                capscode__in=people.people_extras["portletcapability"], cfor="PORTLET"
-            ).values_list("capscode", "capsname")
+        request.session["people_portletcaps"] = tree.caps_for_codes(
+            people.people_extras["portletcapability"], "PORTLET"
         )
-        request.session["people_noccaps"] = list(
-            Capability.objects.filter(
-                capscode__in=people.people_extras.get("noccapability", ""), cfor="NOC"
-            ).values_list("capscode", "capsname")
+        request.session["people_noccaps"] = tree.caps_for_codes(
+            people.people_extras.get("noccapability", ""), "NOC"
         )
         logger.info("save_capsinfo_inside_session... DONE")
 
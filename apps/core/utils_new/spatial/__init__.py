@@ -23,6 +23,7 @@ from .geofencing import (
 from .distance import (
     haversine_distance,
     haversine_distance_bulk,
+    haversine_distance_array,
     normalize_longitude,
     antimeridian_safe_distance,
 )
@@ -60,6 +61,7 @@ __all__ = [
     # Distance
     'haversine_distance',
     'haversine_distance_bulk',
+    'haversine_distance_array',
     'normalize_longitude',
     'antimeridian_safe_distance',
     # Math
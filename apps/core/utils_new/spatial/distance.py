@@ -19,6 +19,8 @@ from functools import lru_cache
 from math import radians, sin, cos, sqrt, atan2, degrees
 from typing import Tuple, List, Optional
 
+import numpy as np
+
 from apps.core.constants.spatial_constants import (
     EARTH_RADIUS_KM,
     EARTH_RADIUS_M,
@@ -131,6 +133,36 @@ def haversine_distance_bulk(
     return distances
 
 
+def haversine_distance_array(
+    lats1,
+    lons1,
+    lats2,
+    lons2,
+    unit: str = 'km'
+) -> np.ndarray:
+    """
+    Vectorized haversine distance over NumPy arrays (broadcasting).
+
+    No per-element validation: callers are expected to mask out invalid
+    coordinates. Use haversine_distance() for single validated pairs.
+
+    Args:
+        lats1, lons1: Latitudes/longitudes of first points (scalar or array)
+        lats2, lons2: Latitudes/longitudes of second points (scalar or array)
+        unit: Distance unit - 'km', 'm', or 'miles'
+
+    Returns:
+        Array of distances in specified unit
+    """
+    radius = {'km': EARTH_RADIUS_KM, 'm': EARTH_RADIUS_M, 'miles': EARTH_RADIUS_MILES}.get(unit)
+    if radius is None:
+        raise ValueError(f"Unsupported unit '{unit}'. Use 'km', 'm', or 'miles'")
+
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(value, dtype=np.float64)) for value in (lats1, lons1, lats2, lons2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return radius * 2 * np.arctan2(np.sqrt(a), np.sqrt(np.clip(1 - a, 0.0, None)))
+
+
 def normalize_longitude(lon: float) -> float:
     """
     Normalize longitude to -180 to 180 range.
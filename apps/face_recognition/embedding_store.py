@@ -0,0 +1,201 @@
+"""
+Packed Face Embedding Store
+
+Keeps each user's validated embeddings as one contiguous float32 matrix per
+extraction model, L2-normalized once when the store is built. Verification
+then scores an input vector against all of a model's embeddings with a
+single matrix-vector product instead of rebuilding arrays from ORM rows.
+
+Stores are cached under fr_embeddings:<user_id> as base64 text of a fixed
+binary layout (no pickled model instances; the cache backends use the JSON
+serializer, which rejects bytes):
+
+    b'FEMB' | version:u8 | model_count:u16
+    per model: name_len:u16 | name | rows:u32 | dim:u32 | ids:int64[rows] | vectors:float32[rows*dim]
+
+Following .claude/rules.md:
+- Rule #11: Specific exception handling
+- Rule #12: Database query optimization (one values_list query per miss)
+"""
+
+import base64
+import binascii
+import logging
+import struct
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+from django.core.cache import cache
+
+from apps.core.exceptions.patterns import CACHE_EXCEPTIONS
+from apps.face_recognition.models import FaceEmbedding
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['ModelEmbeddings', 'UserEmbeddingSet', 'FaceEmbeddingStore']
+
+_MAGIC = b'FEMB'
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct('<4sBH')
+_MODEL_HEADER = struct.Struct('<H')
+_MATRIX_HEADER = struct.Struct('<II')
+NORM_EPSILON = 1e-8
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize each row (zero rows stay zero)."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return (vectors / (norms + NORM_EPSILON)).astype(np.float32, copy=False)
+
+
+@dataclass(frozen=True)
+class ModelEmbeddings:
+    """Normalized embeddings of one extraction model: ids[i] owns vectors[i]."""
+
+    ids: np.ndarray
+    vectors: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def similarities(self, features: np.ndarray) -> np.ndarray:
+        """Cosine similarity of features against every embedding, clipped to [0, 1]."""
+        query = normalize_rows(np.asarray(features, dtype=np.float32).reshape(-1))
+        if query.shape[0] != self.vectors.shape[1]:
+            raise ValueError(
+                f"Feature dimension {query.shape[0]} does not match embeddings ({self.vectors.shape[1]})"
+            )
+        return np.clip(self.vectors @ query, 0.0, 1.0)
+
+    def best_match(self, features: np.ndarray) -> Tuple[float, int]:
+        """(best similarity, embedding id) for an input feature vector."""
+        scores = self.similarities(features)
+        best = int(np.argmax(scores))
+        return float(scores[best]), int(self.ids[best])
+
+
+class UserEmbeddingSet:
+    """All validated embeddings of one user, grouped by model type."""
+
+    def __init__(self, models: Optional[Dict[str, ModelEmbeddings]] = None):
+        self.models = models or {}
+
+    def __len__(self) -> int:
+        return sum(len(embeddings) for embeddings in self.models.values())
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def for_model(self, model_type: str) -> Optional[ModelEmbeddings]:
+        return self.models.get(model_type)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[int, str, Iterable[float]]]) -> 'UserEmbeddingSet':
+        """Build from (embedding_id, model_type, vector) rows."""
+        grouped: Dict[str, Tuple[list, list]] = {}
+        for embedding_id, model_type, vector in rows:
+            ids, vectors = grouped.setdefault(model_type, ([], []))
+            ids.append(embedding_id)
+            vectors.append(vector)
+
+        models = {}
+        for model_type, (ids, vectors) in grouped.items():
+            lengths = {len(vector) for vector in vectors}
+            if len(lengths) != 1:
+                logger.warning(f"Skipping {model_type} embeddings with mixed dimensions: {sorted(lengths)}")
+                continue
+            models[model_type] = ModelEmbeddings(
+                ids=np.asarray(ids, dtype=np.int64),
+                vectors=normalize_rows(np.asarray(vectors, dtype=np.float32))
+            )
+        return cls(models)
+
+    def to_bytes(self) -> bytes:
+        parts = [_HEADER.pack(_MAGIC, _FORMAT_VERSION, len(self.models))]
+        for model_type, embeddings in self.models.items():
+            name = model_type.encode()
+            parts.append(_MODEL_HEADER.pack(len(name)) + name)
+            parts.append(_MATRIX_HEADER.pack(*embeddings.vectors.shape))
+            parts.append(embeddings.ids.astype('<i8').tobytes())
+            parts.append(embeddings.vectors.astype('<f4').tobytes())
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> 'UserEmbeddingSet':
+        """
+        Decode a cached store.
+
+        Raises:
+            ValueError: If the payload is not a store of the current format
+        """
+        try:
+            magic, version, model_count = _HEADER.unpack_from(payload, 0)
+            if magic != _MAGIC or version != _FORMAT_VERSION:
+                raise ValueError("Unknown embedding store format")
+            offset, models = _HEADER.size, {}
+            for _ in range(model_count):
+                (name_length,) = _MODEL_HEADER.unpack_from(payload, offset)
+                offset += _MODEL_HEADER.size
+                model_type = payload[offset:offset + name_length].decode()
+                offset += name_length
+                rows, dim = _MATRIX_HEADER.unpack_from(payload, offset)
+                offset += _MATRIX_HEADER.size
+                ids = np.frombuffer(payload, dtype='<i8', count=rows, offset=offset)
+                offset += ids.nbytes
+                vectors = np.frombuffer(payload, dtype='<f4', count=rows * dim, offset=offset).reshape(rows, dim)
+                offset += vectors.nbytes
+                models[model_type] = ModelEmbeddings(ids=ids, vectors=vectors)
+        except (struct.error, UnicodeDecodeError, TypeError) as e:
+            raise ValueError(f"Corrupt embedding store: {e}")
+        return cls(models)
+
+
+class FaceEmbeddingStore:
+    """Cache-backed loader of UserEmbeddingSet instances."""
+
+    CACHE_PREFIX = 'fr_embeddings'
+    CACHE_TTL = 300
+
+    @classmethod
+    def cache_key(cls, user_id: int) -> str:
+        return f"{cls.CACHE_PREFIX}:{user_id}"
+
+    @classmethod
+    def get_cached(cls, user_id: int) -> Optional[UserEmbeddingSet]:
+        """Cached store for a user, or None on a miss or unreadable entry."""
+        try:
+            payload = cache.get(cls.cache_key(user_id))
+        except CACHE_EXCEPTIONS as e:
+            logger.warning(f"Embedding cache unavailable for user {user_id}: {e}")
+            return None
+        if not isinstance(payload, str):
+            return None
+        try:
+            return UserEmbeddingSet.from_bytes(base64.b64decode(payload, validate=True))
+        except (binascii.Error, ValueError) as e:
+            logger.warning(f"Discarding cached embeddings for user {user_id}: {e}")
+            return None
+
+    @classmethod
+    def load(cls, user_id: int) -> UserEmbeddingSet:
+        """Build a user's store from the database (one query) and cache it when non-empty."""
+        rows = FaceEmbedding.objects.filter(
+            user_id=user_id,
+            is_validated=True
+        ).order_by('id').values_list('id', 'extraction_model__model_type', 'embedding_vector')
+
+        store = UserEmbeddingSet.from_rows(rows)
+        if store:
+            payload = base64.b64encode(store.to_bytes()).decode('ascii')
+            try:
+                cache.set(cls.cache_key(user_id), payload, timeout=cls.CACHE_TTL)
+            except (CACHE_EXCEPTIONS + (TypeError, ValueError)) as e:
+                # The store built from the database is still good
+                logger.warning(f"Could not cache embeddings for user {user_id}: {e}")
+        return store
+
+    @classmethod
+    def invalidate(cls, user_id: int):
+        cache.delete(cls.cache_key(user_id))
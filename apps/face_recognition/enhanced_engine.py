@@ -9,16 +9,18 @@ import cv2
 import os
 import time
 import hashlib
-from typing import Optional, Dict, Any, List
+from typing import Callable, Optional, Dict, Any, List
 from django.core.exceptions import ValidationError, ObjectDoesNotExist
 from django.db import DatabaseError, IntegrityError
 from django.utils import timezone
 
 from apps.face_recognition.models import (
-    FaceRecognitionModel, FaceEmbedding, FaceVerificationLog,
+    FaceRecognitionModel, FaceVerificationLog,
     AntiSpoofingModel, FaceQualityMetrics
 )
-from apps.core.exceptions import SecurityException, IntegrationException
+from apps.face_recognition.embedding_store import FaceEmbeddingStore, UserEmbeddingSet
+from apps.face_recognition.image_buffer import DecodedImage
+from apps.core.exceptions import SecurityException, IntegrationException, LLMServiceException
 
 logger = logging.getLogger(__name__)
 
@@ -119,73 +121,21 @@ class EnhancedFaceRecognitionEngine:
         try:
             logger.info(f"Starting enhanced face verification for user {user_id}")
             
-            result = {
-                'user_id': user_id,
-                'image_path': image_path,
-                'verified': False,
-                'confidence': 0.0,
-                'similarity_score': 0.0,
-                'processing_time_ms': 0.0,
-                'model_results': {},
-                'anti_spoofing_result': {},
-                'quality_metrics': {},
-                'fraud_indicators': [],
-                'recommendations': []
-            }
-            
-            # 1. Image quality assessment
-            quality_result = self._assess_image_quality(image_path)
-            result['quality_metrics'] = quality_result
-            
-            if quality_result['overall_quality'] < 0.3:
-                result['verified'] = False
-                result['fraud_indicators'].append('LOW_IMAGE_QUALITY')
-                result['recommendations'].append('Capture image with better lighting and focus')
-                return self._finalize_result(result, start_time, user_id, attendance_record_id)
-            
-            # 2. Anti-spoofing detection (if enabled)
-            if enable_anti_spoofing and self.config.get('enable_anti_spoofing', True):
-                anti_spoof_result = self._detect_spoofing(image_path)
-                result['anti_spoofing_result'] = anti_spoof_result
-                
-                if anti_spoof_result['spoof_detected']:
-                    result['verified'] = False
-                    result['fraud_indicators'].extend(anti_spoof_result.get('fraud_indicators', []))
-                    result['recommendations'].append('Use live face for verification')
-                    return self._finalize_result(result, start_time, user_id, attendance_record_id)
-            
-            # 3. Get user embeddings
-            user_embeddings = self._get_user_embeddings(user_id)
-            if not user_embeddings:
-                result['verified'] = False
-                result['fraud_indicators'].append('NO_REGISTERED_EMBEDDINGS')
-                result['recommendations'].append('Complete face enrollment process')
-                return self._finalize_result(result, start_time, user_id, attendance_record_id)
-            
-            # 4. Extract features from input image
-            input_features = self._extract_features(image_path)
-            if not input_features:
-                result['verified'] = False
-                result['fraud_indicators'].append('FEATURE_EXTRACTION_FAILED')
-                result['recommendations'].append('Capture clearer image')
-                return self._finalize_result(result, start_time, user_id, attendance_record_id)
-            
-            # 5. Perform ensemble verification
-            if self.config.get('enable_ensemble', True):
-                verification_result = self._ensemble_verification(input_features, user_embeddings)
-            else:
-                # Fallback to single model (FaceNet512)
-                verification_result = self._single_model_verification(input_features, user_embeddings, 'FACENET512')
-            
-            result.update(verification_result)
-            
-            # 6. Fraud risk assessment
-            fraud_assessment = self._assess_fraud_risk(result, user_id)
-            result['fraud_risk_score'] = fraud_assessment['fraud_risk_score']
-            result['fraud_indicators'].extend(fraud_assessment.get('fraud_indicators', []))
-            
-            # 7. Final verification decision
-            result['verified'] = self._make_verification_decision(result)
+            # Decode once; quality, anti-spoofing and extraction share the buffer
+            decode_started = time.perf_counter()
+            image = DecodedImage.load(image_path)
+            result = self._new_verification_result(user_id, image_path)
+            result['image_hash'] = image.content_hash
+            result['stage_timings_ms'] = {'decode': round((time.perf_counter() - decode_started) * 1000, 3)}
+            run_anti_spoofing = enable_anti_spoofing and self.config.get('enable_anti_spoofing', True)
+            
+            self._run_verification_stages(
+                result,
+                quality=lambda: self._assess_image_quality(image_path, image=image),
+                anti_spoofing=(lambda: self._detect_spoofing(image_path, image=image)) if run_anti_spoofing else None,
+                embeddings=lambda: self._get_user_embeddings(user_id),
+                features=lambda: self._extract_features(image_path, image=image)
+            )
             
             return self._finalize_result(result, start_time, user_id, attendance_record_id)
             
@@ -202,138 +152,269 @@ class EnhancedFaceRecognitionEngine:
                 'fraud_indicators': ['VERIFICATION_ERROR']
             }
     
-    def _assess_image_quality(self, image_path: str) -> Dict[str, Any]:
+    def _new_verification_result(self, user_id: int, image_path: str) -> Dict[str, Any]:
+        """Empty verification result"""
+        return {
+            'user_id': user_id,
+            'image_path': image_path,
+            'verified': False,
+            'confidence': 0.0,
+            'similarity_score': 0.0,
+            'processing_time_ms': 0.0,
+            'model_results': {},
+            'anti_spoofing_result': {},
+            'quality_metrics': {},
+            'fraud_indicators': [],
+            'recommendations': []
+        }
+    
+    def _run_verification_stages(
+        self,
+        result: Dict[str, Any],
+        quality: Callable[[], Dict[str, Any]],
+        anti_spoofing: Optional[Callable[[], Dict[str, Any]]],
+        embeddings: Callable[[], UserEmbeddingSet],
+        features: Callable[[], Dict[str, np.ndarray]]
+    ) -> Dict[str, Any]:
+        """
+        Apply the verification stages in order, stopping at the first rejection.
+        
+        Each stage is a zero-argument callable, so the caller decides whether
+        it runs inline (and is skipped after an early rejection) or was already
+        scheduled on a worker pool and only needs collecting. Time spent in
+        each stage is recorded in result['stage_timings_ms'] unless the caller
+        already measured it.
+        """
+        user_id = result['user_id']
+        timings = result.setdefault('stage_timings_ms', {})
+        
+        def run_stage(name, stage):
+            started = time.perf_counter()
+            value = stage()
+            timings.setdefault(name, round((time.perf_counter() - started) * 1000, 3))
+            return value
+        
+        # 1. Image quality assessment
+        quality_result = run_stage('quality', quality)
+        result['quality_metrics'] = quality_result
+        
+        if quality_result['overall_quality'] < 0.3:
+            result['verified'] = False
+            result['fraud_indicators'].append('LOW_IMAGE_QUALITY')
+            result['recommendations'].append('Capture image with better lighting and focus')
+            return result
+        
+        # 2. Anti-spoofing detection (if enabled)
+        if anti_spoofing is not None:
+            anti_spoof_result = run_stage('anti_spoofing', anti_spoofing)
+            result['anti_spoofing_result'] = anti_spoof_result
+            
+            if anti_spoof_result['spoof_detected']:
+                result['verified'] = False
+                result['fraud_indicators'].extend(anti_spoof_result.get('fraud_indicators', []))
+                result['recommendations'].append('Use live face for verification')
+                return result
+        
+        # 3. Get user embeddings
+        user_embeddings = run_stage('embeddings', embeddings)
+        if not user_embeddings:
+            result['verified'] = False
+            result['fraud_indicators'].append('NO_REGISTERED_EMBEDDINGS')
+            result['recommendations'].append('Complete face enrollment process')
+            return result
+        
+        # 4. Extract features from input image
+        input_features = run_stage('feature_extraction', features)
+        if not input_features:
+            result['verified'] = False
+            result['fraud_indicators'].append('FEATURE_EXTRACTION_FAILED')
+            result['recommendations'].append('Capture clearer image')
+            return result
+        
+        # 5. Perform ensemble verification
+        started = time.perf_counter()
+        if self.config.get('enable_ensemble', True):
+            verification_result = self._ensemble_verification(input_features, user_embeddings)
+        else:
+            # Fallback to single model (FaceNet512)
+            verification_result = self._single_model_verification(input_features, user_embeddings, 'FACENET512')
+        timings['matching'] = round((time.perf_counter() - started) * 1000, 3)
+        
+        result.update(verification_result)
+        
+        # 6. Fraud risk assessment
+        fraud_assessment = self._assess_fraud_risk(result, user_id)
+        result['fraud_risk_score'] = fraud_assessment['fraud_risk_score']
+        result['fraud_indicators'].extend(fraud_assessment.get('fraud_indicators', []))
+        
+        # 7. Final verification decision
+        result['verified'] = self._make_verification_decision(result)
+        
+        return result
+    
+    def _assess_image_quality(self, image_path: str, image: Optional[DecodedImage] = None) -> Dict[str, Any]:
         """Assess image quality for face recognition"""
         try:
             # Calculate image hash
-            image_hash = self._calculate_image_hash(image_path)
+            image_hash = image.content_hash if image is not None else self._calculate_image_hash(image_path)
             
             # Check if already analyzed
-            try:
-                quality_metrics = FaceQualityMetrics.objects.get(image_hash=image_hash)
-                return {
-                    'overall_quality': quality_metrics.overall_quality,
-                    'sharpness_score': quality_metrics.sharpness_score,
-                    'brightness_score': quality_metrics.brightness_score,
-                    'contrast_score': quality_metrics.contrast_score,
-                    'face_size_score': quality_metrics.face_size_score,
-                    'quality_issues': quality_metrics.quality_issues,
-                    'cached': True
-                }
-            except FaceQualityMetrics.DoesNotExist:
-                pass
+            cached = self._lookup_quality_metrics([image_hash]).get(image_hash)
+            if cached is not None:
+                return cached
             
             # Perform quality assessment
-            if not os.path.exists(image_path):
-                return {
-                    'overall_quality': 0.0,
-                    'error': 'Image file not found'
-                }
-            
-            # Load image
-            image = cv2.imread(image_path)
             if image is None:
-                return {
-                    'overall_quality': 0.0,
-                    'error': 'Could not load image'
-                }
-            
-            # Convert to grayscale for analysis
-            height, width = image.shape[:2]
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-
-            # Detect face first for ROI-based quality assessment
-            face_roi, face_confidence = self._detect_face_roi(image)
-
-            if face_roi is not None:
-                # Extract face region for quality assessment
-                x, y, w, h = face_roi
-                face_gray = gray[y:y+h, x:x+w]
-                face_color = image[y:y+h, x:x+w]
-
-                # Face-specific quality metrics
-                sharpness_score = self._calculate_roi_sharpness(face_gray)
-                brightness_score = self._calculate_roi_brightness(face_gray)
-                contrast_score = self._calculate_roi_contrast(face_gray)
-                face_size_score = self._calculate_face_size_score(w, h, width, height)
-                pose_score = self._estimate_face_pose_quality(face_color)
-                eye_visibility = self._check_eye_visibility(face_color, face_roi)
-
-                overall_quality = np.mean([
-                    sharpness_score, brightness_score, contrast_score,
-                    face_size_score, pose_score, eye_visibility
-                ])
-            else:
-                # Fallback to whole-image assessment if no face detected
-                sharpness_score = self._calculate_roi_sharpness(gray)
-                brightness_score = self._calculate_roi_brightness(gray)
-                contrast_score = self._calculate_roi_contrast(gray)
-                face_size_score = 0.0  # No face detected
-                pose_score = 0.0
-                eye_visibility = 0.0
-                face_confidence = 0.0
-
-                overall_quality = 0.1  # Very low quality if no face
-            
-            # Identify issues based on face ROI assessment
-            quality_issues = []
-            if face_roi is None:
-                quality_issues.append('NO_FACE_DETECTED')
-            else:
-                if sharpness_score < 0.5:
-                    quality_issues.append('LOW_SHARPNESS')
-                if brightness_score < 0.5:
-                    quality_issues.append('POOR_LIGHTING')
-                if contrast_score < 0.4:
-                    quality_issues.append('LOW_CONTRAST')
-                if face_size_score < 0.7:
-                    quality_issues.append('SMALL_FACE_SIZE')
-                if pose_score < 0.6:
-                    quality_issues.append('POOR_FACE_POSE')
-                if eye_visibility < 0.5:
-                    quality_issues.append('EYES_NOT_VISIBLE')
-                if face_confidence < 0.7:
-                    quality_issues.append('LOW_DETECTION_CONFIDENCE')
-            
-            # Save quality metrics
-            try:
-                FaceQualityMetrics.objects.create(
-                    image_path=image_path,
-                    image_hash=image_hash,
-                    overall_quality=overall_quality,
-                    sharpness_score=sharpness_score,
-                    brightness_score=brightness_score,
-                    contrast_score=contrast_score,
-                    face_size_score=face_size_score,
-                    face_pose_score=pose_score if face_roi else 0.0,
-                    eye_visibility_score=eye_visibility if face_roi else 0.0,
-                    resolution_width=width,
-                    resolution_height=height,
-                    file_size_bytes=os.path.getsize(image_path) if os.path.exists(image_path) else 0,
-                    face_detection_confidence=face_confidence,
-                    landmark_quality={'detected': face_roi is not None},
-                    quality_issues=quality_issues,
-                    improvement_suggestions=self._generate_improvement_suggestions(quality_issues)
-                )
-            except (DatabaseError, IntegrityError, ObjectDoesNotExist) as e:
-                logger.warning(f"Could not save quality metrics: {str(e)}")
+                image = DecodedImage.load(image_path)
+            measured = self._measure_image_quality(image)
+            if 'error' in measured:
+                return measured
             
-            return {
-                'overall_quality': overall_quality,
-                'sharpness_score': sharpness_score,
-                'brightness_score': brightness_score,
-                'contrast_score': contrast_score,
-                'face_size_score': face_size_score,
-                'quality_issues': quality_issues,
-                'cached': False
-            }
+            self._store_quality_metrics(image, measured)
+            return self._quality_result(measured)
             
-        except (AttributeError, ConnectionError, DatabaseError, IntegrityError, LLMServiceException, ObjectDoesNotExist, TimeoutError, TypeError, ValueError) as e:
+        except (AttributeError, ConnectionError, DatabaseError, IntegrityError, LLMServiceException, ObjectDoesNotExist, TimeoutError, TypeError, ValueError, cv2.error) as e:
             logger.error(f"Error assessing image quality: {str(e)}")
             return {
                 'overall_quality': 0.0,
                 'error': str(e)
             }
+    
+    def _lookup_quality_metrics(self, image_hashes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Previously stored quality assessments keyed by image hash (one query)"""
+        rows = FaceQualityMetrics.objects.filter(image_hash__in=image_hashes).values(
+            'image_hash', 'overall_quality', 'sharpness_score', 'brightness_score',
+            'contrast_score', 'face_size_score', 'quality_issues'
+        )
+        return {
+            row.pop('image_hash'): {**row, 'cached': True}
+            for row in rows
+        }
+    
+    def _measure_image_quality(self, image: DecodedImage) -> Dict[str, Any]:
+        """
+        Compute quality scores from a decoded image.
+        
+        Pure computation (no database access), safe to run on worker threads.
+        """
+        if not image.exists:
+            return {
+                'overall_quality': 0.0,
+                'error': 'Image file not found'
+            }
+        if image.pixels is None:
+            return {
+                'overall_quality': 0.0,
+                'error': 'Could not load image'
+            }
+        
+        # Convert to grayscale for analysis
+        height, width = image.pixels.shape[:2]
+        gray = cv2.cvtColor(image.pixels, cv2.COLOR_BGR2GRAY)
+
+        # Detect face first for ROI-based quality assessment
+        face_roi, face_confidence = self._detect_face_roi(image.pixels)
+
+        if face_roi is not None:
+            # Extract face region for quality assessment
+            x, y, w, h = face_roi
+            face_gray = gray[y:y+h, x:x+w]
+            face_color = image.pixels[y:y+h, x:x+w]
+
+            # Face-specific quality metrics
+            sharpness_score = self._calculate_roi_sharpness(face_gray)
+            brightness_score = self._calculate_roi_brightness(face_gray)
+            contrast_score = self._calculate_roi_contrast(face_gray)
+            face_size_score = self._calculate_face_size_score(w, h, width, height)
+            pose_score = self._estimate_face_pose_quality(face_color)
+            eye_visibility = self._check_eye_visibility(face_color, face_roi)
+
+            overall_quality = np.mean([
+                sharpness_score, brightness_score, contrast_score,
+                face_size_score, pose_score, eye_visibility
+            ])
+        else:
+            # Fallback to whole-image assessment if no face detected
+            sharpness_score = self._calculate_roi_sharpness(gray)
+            brightness_score = self._calculate_roi_brightness(gray)
+            contrast_score = self._calculate_roi_contrast(gray)
+            face_size_score = 0.0  # No face detected
+            pose_score = 0.0
+            eye_visibility = 0.0
+            face_confidence = 0.0
+
+            overall_quality = 0.1  # Very low quality if no face
+        
+        # Identify issues based on face ROI assessment
+        quality_issues = []
+        if face_roi is None:
+            quality_issues.append('NO_FACE_DETECTED')
+        else:
+            if sharpness_score < 0.5:
+                quality_issues.append('LOW_SHARPNESS')
+            if brightness_score < 0.5:
+                quality_issues.append('POOR_LIGHTING')
+            if contrast_score < 0.4:
+                quality_issues.append('LOW_CONTRAST')
+            if face_size_score < 0.7:
+                quality_issues.append('SMALL_FACE_SIZE')
+            if pose_score < 0.6:
+                quality_issues.append('POOR_FACE_POSE')
+            if eye_visibility < 0.5:
+                quality_issues.append('EYES_NOT_VISIBLE')
+            if face_confidence < 0.7:
+                quality_issues.append('LOW_DETECTION_CONFIDENCE')
+        
+        return {
+            'overall_quality': overall_quality,
+            'sharpness_score': sharpness_score,
+            'brightness_score': brightness_score,
+            'contrast_score': contrast_score,
+            'face_size_score': face_size_score,
+            'face_pose_score': pose_score if face_roi else 0.0,
+            'eye_visibility_score': eye_visibility if face_roi else 0.0,
+            'face_detection_confidence': face_confidence,
+            'face_detected': face_roi is not None,
+            'resolution_width': width,
+            'resolution_height': height,
+            'quality_issues': quality_issues
+        }
+    
+    def _quality_result(self, measured: Dict[str, Any]) -> Dict[str, Any]:
+        """Public quality result for a fresh measurement"""
+        return {
+            'overall_quality': measured['overall_quality'],
+            'sharpness_score': measured['sharpness_score'],
+            'brightness_score': measured['brightness_score'],
+            'contrast_score': measured['contrast_score'],
+            'face_size_score': measured['face_size_score'],
+            'quality_issues': measured['quality_issues'],
+            'cached': False
+        }
+    
+    def _store_quality_metrics(self, image: DecodedImage, measured: Dict[str, Any]):
+        """Save quality metrics for reuse by later verifications of the same image"""
+        try:
+            FaceQualityMetrics.objects.create(
+                image_path=image.path,
+                image_hash=image.content_hash,
+                overall_quality=measured['overall_quality'],
+                sharpness_score=measured['sharpness_score'],
+                brightness_score=measured['brightness_score'],
+                contrast_score=measured['contrast_score'],
+                face_size_score=measured['face_size_score'],
+                face_pose_score=measured['face_pose_score'],
+                eye_visibility_score=measured['eye_visibility_score'],
+                resolution_width=measured['resolution_width'],
+                resolution_height=measured['resolution_height'],
+                file_size_bytes=image.file_size,
+                face_detection_confidence=measured['face_detection_confidence'],
+                landmark_quality={'detected': measured['face_detected']},
+                quality_issues=measured['quality_issues'],
+                improvement_suggestions=self._generate_improvement_suggestions(measured['quality_issues'])
+            )
+        except (DatabaseError, IntegrityError, ObjectDoesNotExist) as e:
+            logger.warning(f"Could not save quality metrics: {str(e)}")
 
     def _detect_face_roi(self, image) -> tuple:
         """Detect face region of interest using Haar cascades"""
@@ -472,7 +553,7 @@ class EnhancedFaceRecognitionEngine:
 
         return suggestions
 
-    def _detect_spoofing(self, image_path: str) -> Dict[str, Any]:
+    def _detect_spoofing(self, image_path: str, image: Optional[DecodedImage] = None) -> Dict[str, Any]:
         """Detect spoofing attempts using anti-spoofing models"""
         try:
             spoof_scores = {}
@@ -480,7 +561,7 @@ class EnhancedFaceRecognitionEngine:
             
             # Run texture-based anti-spoofing
             if 'TEXTURE_BASED' in self.anti_spoofing_models:
-                texture_result = self.anti_spoofing_models['TEXTURE_BASED'].detect_spoof(image_path)
+                texture_result = self._call_with_image(self.anti_spoofing_models['TEXTURE_BASED'].detect_spoof, image_path, image)
                 spoof_scores['texture'] = texture_result['spoof_score']
                 
                 if texture_result['spoof_detected']:
@@ -488,7 +569,7 @@ class EnhancedFaceRecognitionEngine:
             
             # Run motion-based anti-spoofing (if video/sequence available)
             if 'MOTION_BASED' in self.anti_spoofing_models:
-                motion_result = self.anti_spoofing_models['MOTION_BASED'].detect_spoof(image_path)
+                motion_result = self._call_with_image(self.anti_spoofing_models['MOTION_BASED'].detect_spoof, image_path, image)
                 spoof_scores['motion'] = motion_result['spoof_score']
                 
                 if motion_result['spoof_detected']:
@@ -515,60 +596,40 @@ class EnhancedFaceRecognitionEngine:
                 'error': str(e)
             }
     
-    def _get_user_embeddings(self, user_id: int) -> List[FaceEmbedding]:
-        """Get face embeddings for a user with caching"""
-        from django.core.cache import cache
-
-        # Cache key with user ID and version for cache invalidation
-        cache_key = f"fr_embeddings:{user_id}"
-
+    def _get_user_embeddings(self, user_id: int) -> UserEmbeddingSet:
+        """Get a user's packed, pre-normalized embeddings with caching"""
         try:
-            # Try to get from cache first
-            cached_embeddings = cache.get(cache_key)
+            cached_embeddings = FaceEmbeddingStore.get_cached(user_id)
             if cached_embeddings is not None:
                 logger.debug(f"Cache hit for user embeddings: {user_id}")
                 return cached_embeddings
 
             # Cache miss - query database
             logger.debug(f"Cache miss for user embeddings: {user_id}")
-            embeddings = FaceEmbedding.objects.filter(
-                user_id=user_id,
-                is_validated=True
-            ).select_related('extraction_model')
-
-            embedding_list = list(embeddings)
+            embeddings = FaceEmbeddingStore.load(user_id)
+            if embeddings:
+                logger.debug(f"Cached {len(embeddings)} embeddings for user {user_id}")
 
-            # Cache for 5 minutes (300 seconds)
-            if embedding_list:
-                cache.set(cache_key, embedding_list, timeout=300)
-                logger.debug(f"Cached {len(embedding_list)} embeddings for user {user_id}")
-
-            return embedding_list
+            return embeddings
 
         except (AttributeError, ConnectionError, DatabaseError, IntegrityError, LLMServiceException, ObjectDoesNotExist, TimeoutError, TypeError, ValidationError, ValueError) as e:
             logger.error(f"Error getting user embeddings: {str(e)}")
-            return []
+            return UserEmbeddingSet()
 
     def invalidate_user_embedding_cache(self, user_id: int):
         """Invalidate cached embeddings for a user"""
-        from django.core.cache import cache
-        cache_key = f"fr_embeddings:{user_id}"
-        cache.delete(cache_key)
+        FaceEmbeddingStore.invalidate(user_id)
         logger.debug(f"Invalidated embedding cache for user {user_id}")
 
-    def _extract_features(self, image_path: str) -> Dict[str, np.ndarray]:
+    def _extract_features(self, image_path: str, image: Optional[DecodedImage] = None) -> Dict[str, np.ndarray]:
         """Extract features using multiple models"""
         try:
             features = {}
             
-            for model_name, model in self.models.items():
-                try:
-                    feature_vector = model.extract_features(image_path)
-                    if feature_vector is not None:
-                        features[model_name] = feature_vector
-                except (AttributeError, TypeError, ValueError) as e:
-                    logger.warning(f"Error extracting features with {model_name}: {str(e)}")
-                    continue
+            for model_name in self.models:
+                feature_vector = self._extract_model_features(model_name, image_path, image)
+                if feature_vector is not None:
+                    features[model_name] = feature_vector
             
             return features
             
@@ -576,10 +637,30 @@ class EnhancedFaceRecognitionEngine:
             logger.error(f"Error extracting features: {str(e)}")
             return {}
     
+    def _extract_model_features(
+        self,
+        model_name: str,
+        image_path: str,
+        image: Optional[DecodedImage] = None
+    ) -> Optional[np.ndarray]:
+        """Extract features with one model; None when the model fails"""
+        try:
+            return self._call_with_image(self.models[model_name].extract_features, image_path, image)
+        except (AttributeError, ConnectionError, DatabaseError, IntegrityError, LLMServiceException, ObjectDoesNotExist, TimeoutError, TypeError, ValidationError, ValueError, cv2.error) as e:
+            logger.warning(f"Error extracting features with {model_name}: {str(e)}")
+            return None
+    
+    @staticmethod
+    def _call_with_image(method: Callable, image_path: str, image: Optional[DecodedImage]):
+        """Hand the shared decoded image to models that accept it"""
+        if image is not None and getattr(getattr(method, '__self__', None), 'accepts_decoded_image', False) is True:
+            return method(image_path, image=image)
+        return method(image_path)
+    
     def _ensemble_verification(
         self, 
         input_features: Dict[str, np.ndarray], 
-        user_embeddings: List[FaceEmbedding]
+        user_embeddings: UserEmbeddingSet
     ) -> Dict[str, Any]:
         """Perform ensemble verification using multiple models"""
         try:
@@ -590,27 +671,12 @@ class EnhancedFaceRecognitionEngine:
                 if model_name not in self.ensemble_weights:
                     continue
                 
-                # Find matching embeddings for this model
-                model_embeddings = [
-                    emb for emb in user_embeddings 
-                    if emb.extraction_model.model_type == model_name
-                ]
-                
-                if not model_embeddings:
+                # Score against all of this model's embeddings in one product
+                model_embeddings = user_embeddings.for_model(model_name)
+                if model_embeddings is None:
                     continue
-                
-                # Calculate similarities with all embeddings from this model
-                similarities = []
-                for embedding in model_embeddings:
-                    similarity = self._calculate_cosine_similarity(
-                        features, np.array(embedding.embedding_vector)
-                    )
-                    similarities.append(similarity)
-                
-                # Take the best match
-                best_similarity = max(similarities) if similarities else 0.0
-                best_embedding_idx = similarities.index(best_similarity) if similarities else 0
-                
+                best_similarity, best_embedding_id = model_embeddings.best_match(features)
+
                 # Use distance threshold consistently
                 distance_threshold = self.config.get('similarity_threshold', 0.3)
                 best_distance = 1.0 - best_similarity
@@ -618,7 +684,7 @@ class EnhancedFaceRecognitionEngine:
                 model_results[model_name] = {
                     'similarity': best_similarity,
                     'distance': best_distance,
-                    'matched_embedding_id': model_embeddings[best_embedding_idx].id if similarities else None,
+                    'matched_embedding_id': best_embedding_id,
                     'threshold_met': best_distance <= distance_threshold
                 }
                 
@@ -675,7 +741,7 @@ class EnhancedFaceRecognitionEngine:
     def _single_model_verification(
         self, 
         input_features: Dict[str, np.ndarray], 
-        user_embeddings: List[FaceEmbedding],
+        user_embeddings: UserEmbeddingSet,
         model_name: str
     ) -> Dict[str, Any]:
         """Perform verification using a single model"""
@@ -691,12 +757,9 @@ class EnhancedFaceRecognitionEngine:
             features = input_features[model_name]
             
             # Find embeddings for this model
-            model_embeddings = [
-                emb for emb in user_embeddings 
-                if emb.extraction_model.model_type == model_name
-            ]
-            
-            if not model_embeddings:
+            model_embeddings = user_embeddings.for_model(model_name)
+
+            if model_embeddings is None:
                 return {
                     'similarity_score': 0.0,
                     'confidence': 0.0,
@@ -704,15 +767,7 @@ class EnhancedFaceRecognitionEngine:
                     'error': f'No embeddings found for {model_name}'
                 }
             
-            # Calculate similarities
-            similarities = []
-            for embedding in model_embeddings:
-                similarity = self._calculate_cosine_similarity(
-                    features, np.array(embedding.embedding_vector)
-                )
-                similarities.append(similarity)
-            
-            best_similarity = max(similarities)
+            best_similarity, _ = model_embeddings.best_match(features)
             distance = 1.0 - best_similarity
             
             return {
@@ -963,7 +1018,7 @@ class EnhancedFaceRecognitionEngine:
                 liveness_score=result.get('anti_spoofing_result', {}).get('liveness_score'),
                 spoof_detected=result.get('anti_spoofing_result', {}).get('spoof_detected', False),
                 input_image_path=result.get('image_path'),
-                input_image_hash=self._calculate_image_hash(result.get('image_path', '')),
+                input_image_hash=result.get('image_hash') or self._calculate_image_hash(result.get('image_path', '')),
                 processing_time_ms=result.get('processing_time_ms', 0),
                 error_message=result.get('error'),
                 verification_metadata=result,
@@ -1021,15 +1076,19 @@ class EnhancedFaceRecognitionEngine:
 class MockFaceNetModel:
     """Mock FaceNet model for development"""
 
-    def extract_features(self, image_path: str) -> Optional[np.ndarray]:
+    accepts_decoded_image = True
+
+    def extract_features(self, image_path: str, image: Optional[DecodedImage] = None) -> Optional[np.ndarray]:
         """Extract features using mock FaceNet model with image-dependent seeds"""
         try:
             # Generate image-dependent seed from image path/content hash
-            image_hash = self._calculate_image_dependent_seed(image_path)
-            np.random.seed(image_hash)  # Different seed for different images
+            image_hash = self._calculate_image_dependent_seed(image_path, image)
+            # Private generator (different seed for different images); the global
+            # np.random state is not safe under concurrent extraction
+            rng = np.random.RandomState(image_hash)
 
             # Generate mock 512-dimensional vector
-            features = np.random.normal(0, 1, 512)
+            features = rng.normal(0, 1, 512)
             # Normalize
             features = features / np.linalg.norm(features)
             return features
@@ -1037,11 +1096,13 @@ class MockFaceNetModel:
             logger.warning(f"Failed to extract features (FaceNet): {e}")
             return None
 
-    def _calculate_image_dependent_seed(self, image_path: str) -> int:
+    def _calculate_image_dependent_seed(self, image_path: str, image: Optional[DecodedImage] = None) -> int:
         """Calculate a deterministic seed based on image content or path"""
         import hashlib
         try:
-            if os.path.exists(image_path):
+            if image is not None and image.exists:
+                hash_obj = hashlib.sha256(image.raw[:1024])
+            elif os.path.exists(image_path):
                 # Use first 1KB of file for hash (efficient for large images)
                 with open(image_path, 'rb') as f:
                     content = f.read(1024)
@@ -1061,26 +1122,30 @@ class MockFaceNetModel:
 class MockArcFaceModel:
     """Mock ArcFace model for development"""
 
-    def extract_features(self, image_path: str) -> Optional[np.ndarray]:
+    accepts_decoded_image = True
+
+    def extract_features(self, image_path: str, image: Optional[DecodedImage] = None) -> Optional[np.ndarray]:
         """Extract features using mock ArcFace model with image-dependent seeds"""
         try:
             # Generate image-dependent seed (offset by 100 for model differentiation)
-            image_hash = self._calculate_image_dependent_seed(image_path) + 100
-            np.random.seed(image_hash)
+            image_hash = self._calculate_image_dependent_seed(image_path, image) + 100
+            rng = np.random.RandomState(image_hash)
 
             # Generate mock 512-dimensional vector
-            features = np.random.normal(0, 1, 512)
+            features = rng.normal(0, 1, 512)
             features = features / np.linalg.norm(features)
             return features
         except (ValueError, TypeError, AttributeError, OSError) as e:
             logger.warning(f"Failed to extract features (ArcFace): {e}")
             return None
 
-    def _calculate_image_dependent_seed(self, image_path: str) -> int:
+    def _calculate_image_dependent_seed(self, image_path: str, image: Optional[DecodedImage] = None) -> int:
         """Calculate a deterministic seed based on image content or path"""
         import hashlib
         try:
-            if os.path.exists(image_path):
+            if image is not None and image.exists:
+                hash_obj = hashlib.sha256(image.raw[:1024])
+            elif os.path.exists(image_path):
                 with open(image_path, 'rb') as f:
                     content = f.read(1024)
                 hash_obj = hashlib.sha256(content)
@@ -1096,26 +1161,30 @@ class MockArcFaceModel:
 class MockInsightFaceModel:
     """Mock InsightFace model for development"""
 
-    def extract_features(self, image_path: str) -> Optional[np.ndarray]:
+    accepts_decoded_image = True
+
+    def extract_features(self, image_path: str, image: Optional[DecodedImage] = None) -> Optional[np.ndarray]:
         """Extract features using mock InsightFace model with image-dependent seeds"""
         try:
             # Generate image-dependent seed (offset by 200 for model differentiation)
-            image_hash = self._calculate_image_dependent_seed(image_path) + 200
-            np.random.seed(image_hash)
+            image_hash = self._calculate_image_dependent_seed(image_path, image) + 200
+            rng = np.random.RandomState(image_hash)
 
             # Generate mock 512-dimensional vector
-            features = np.random.normal(0, 1, 512)
+            features = rng.normal(0, 1, 512)
             features = features / np.linalg.norm(features)
             return features
         except (ValueError, TypeError, AttributeError, OSError) as e:
             logger.warning(f"Failed to extract features (InsightFace): {e}")
             return None
 
-    def _calculate_image_dependent_seed(self, image_path: str) -> int:
+    def _calculate_image_dependent_seed(self, image_path: str, image: Optional[DecodedImage] = None) -> int:
         """Calculate a deterministic seed based on image content or path"""
         import hashlib
         try:
-            if os.path.exists(image_path):
+            if image is not None and image.exists:
+                hash_obj = hashlib.sha256(image.raw[:1024])
+            elif os.path.exists(image_path):
                 with open(image_path, 'rb') as f:
                     content = f.read(1024)
                 hash_obj = hashlib.sha256(content)
@@ -1131,7 +1200,9 @@ class MockInsightFaceModel:
 class MockAntiSpoofingModel:
     """Mock anti-spoofing model for development"""
     
-    def detect_spoof(self, image_path: str) -> Dict[str, Any]:
+    accepts_decoded_image = True
+
+    def detect_spoof(self, image_path: str, image: Optional[DecodedImage] = None) -> Dict[str, Any]:
         """Mock spoof detection"""
         return {
             'spoof_detected': False,
@@ -1143,7 +1214,9 @@ class MockAntiSpoofingModel:
 class MockMotionAntiSpoofingModel:
     """Mock motion-based anti-spoofing model for development"""
     
-    def detect_spoof(self, image_path: str) -> Dict[str, Any]:
+    accepts_decoded_image = True
+
+    def detect_spoof(self, image_path: str, image: Optional[DecodedImage] = None) -> Dict[str, Any]:
         """Mock motion-based spoof detection"""
         return {
             'spoof_detected': False,
@@ -0,0 +1,399 @@
+"""
+1:N Face Identification Index
+
+In-memory vector index answering "who is this?" over a site's or tenant's
+enrolled embeddings for one extraction model.
+
+- Vectors are L2-normalized float32 rows, so cosine similarity is a dot product
+- Small sets are searched exactly with one matrix-vector product
+- Sets of at least FACE_IDENTIFICATION_IVF_THRESHOLD embeddings get an
+  inverted-file (IVF) layer: spherical k-means centroids partition the rows
+  and a query only scores the rows of its nprobe nearest partitions
+- Embeddings are added/removed incrementally; the IVF layer is retrained
+  when the set doubles since the last training
+- Results are the top-k users (best embedding per user) with distances
+
+IdentificationIndexRegistry keeps one index per (tenant, site, model) per
+process. Enrollment signals update loaded indexes in place and bump a
+per-tenant version in the cache so other processes rebuild on next use.
+
+Following .claude/rules.md:
+- Rule #11: Specific exception handling
+- Rule #12: Database query optimization (one streamed query per build)
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from math import isqrt
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.face_recognition.embedding_store import normalize_rows
+from apps.face_recognition.models import FaceEmbedding
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['IdentificationCandidate', 'FaceIdentificationIndex', 'IdentificationIndexRegistry']
+
+DEFAULT_IVF_THRESHOLD = 20000
+DEFAULT_NPROBE = 8
+KMEANS_ITERATIONS = 10
+TRAINING_SAMPLES_PER_LIST = 64
+ASSIGN_CHUNK_ROWS = 8192
+TOP_K_OVERSAMPLE = 4
+
+
+@dataclass(frozen=True)
+class IdentificationCandidate:
+    user_id: int
+    embedding_id: int
+    similarity: float
+    distance: float
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            'user_id': self.user_id,
+            'embedding_id': self.embedding_id,
+            'similarity': self.similarity,
+            'distance': self.distance,
+        }
+
+
+class FaceIdentificationIndex:
+    """
+    Growable matrix of normalized embeddings with an optional IVF layer.
+
+    Rows are appended; removed rows are tombstoned and compacted once they
+    make up half the matrix. All methods are thread-safe.
+    """
+
+    def __init__(self, dimension: int, ivf_threshold: Optional[int] = None, nprobe: Optional[int] = None):
+        self.dimension = dimension
+        self.ivf_threshold = ivf_threshold or getattr(
+            settings, 'FACE_IDENTIFICATION_IVF_THRESHOLD', DEFAULT_IVF_THRESHOLD
+        )
+        self.nprobe = nprobe or getattr(settings, 'FACE_IDENTIFICATION_IVF_NPROBE', DEFAULT_NPROBE)
+        self._lock = threading.RLock()
+        self._vectors = np.empty((0, dimension), dtype=np.float32)
+        self._embedding_ids = np.empty(0, dtype=np.int64)
+        self._user_ids = np.empty(0, dtype=np.int64)
+        self._alive = np.empty(0, dtype=bool)
+        self._lists = np.empty(0, dtype=np.int32)
+        self._size = 0
+        self._rows: Dict[int, int] = {}
+        self._centroids: Optional[np.ndarray] = None
+        self._trained_size = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def is_approximate(self) -> bool:
+        return self._centroids is not None
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def add(self, embedding_id: int, user_id: int, vector) -> None:
+        self.add_many([embedding_id], [user_id], np.asarray(vector, dtype=np.float32).reshape(1, -1))
+
+    def add_many(self, embedding_ids: Iterable[int], user_ids: Iterable[int], vectors) -> None:
+        """Insert or replace embeddings (rows of vectors)."""
+        embedding_ids = np.asarray(list(embedding_ids), dtype=np.int64)
+        user_ids = np.asarray(list(user_ids), dtype=np.int64)
+        vectors = normalize_rows(np.asarray(vectors, dtype=np.float32).reshape(len(embedding_ids), -1))
+        if vectors.shape[1] != self.dimension:
+            raise ValueError(f"Expected {self.dimension}-d embeddings, got {vectors.shape[1]}-d")
+
+        with self._lock:
+            for embedding_id in embedding_ids:
+                self._tombstone(int(embedding_id))
+            start = self._reserve(len(embedding_ids))
+            end = start + len(embedding_ids)
+            self._vectors[start:end] = vectors
+            self._embedding_ids[start:end] = embedding_ids
+            self._user_ids[start:end] = user_ids
+            self._alive[start:end] = True
+            self._rows.update((int(embedding_id), row) for row, embedding_id in enumerate(embedding_ids, start))
+            if self._centroids is not None:
+                self._lists[start:end] = self._assign(vectors)
+            self._maybe_retrain()
+
+    def remove(self, embedding_id: int) -> bool:
+        with self._lock:
+            removed = self._tombstone(embedding_id)
+            if removed and len(self._rows) * 2 < self._size:
+                self._compact()
+            if removed and self._centroids is not None and len(self._rows) < self.ivf_threshold // 2:
+                self._centroids = None
+            return removed
+
+    def _tombstone(self, embedding_id: int) -> bool:
+        row = self._rows.pop(embedding_id, None)
+        if row is None:
+            return False
+        self._alive[row] = False
+        return True
+
+    def _reserve(self, count: int) -> int:
+        """Grow storage (doubling) so count more rows fit; returns the first free row."""
+        needed = self._size + count
+        if needed > len(self._alive):
+            capacity = max(needed, 2 * len(self._alive), 64)
+            self._vectors = self._resized(self._vectors, capacity)
+            self._embedding_ids = self._resized(self._embedding_ids, capacity)
+            self._user_ids = self._resized(self._user_ids, capacity)
+            self._alive = self._resized(self._alive, capacity)
+            self._lists = self._resized(self._lists, capacity)
+        start, self._size = self._size, needed
+        return start
+
+    @staticmethod
+    def _resized(array: np.ndarray, capacity: int) -> np.ndarray:
+        grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+        grown[:len(array)] = array
+        return grown
+
+    def _compact(self):
+        keep = np.nonzero(self._alive[:self._size])[0]
+        for name in ('_vectors', '_embedding_ids', '_user_ids', '_alive', '_lists'):
+            setattr(self, name, getattr(self, name)[keep].copy())
+        self._size = len(keep)
+        self._rows = {int(embedding_id): row for row, embedding_id in enumerate(self._embedding_ids)}
+
+    # ------------------------------------------------------------------
+    # IVF layer
+    # ------------------------------------------------------------------
+
+    def _maybe_retrain(self):
+        if len(self._rows) < self.ivf_threshold:
+            return
+        if self._centroids is None or len(self._rows) >= 2 * self._trained_size:
+            self._train()
+
+    def _train(self):
+        """Spherical k-means over a sample of live rows, then reassign every row."""
+        live = np.nonzero(self._alive[:self._size])[0]
+        list_count = max(1, isqrt(len(live)))
+        rng = np.random.default_rng(len(live))
+        sample_size = min(len(live), list_count * TRAINING_SAMPLES_PER_LIST)
+        sample = self._vectors[rng.choice(live, sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, list_count, replace=False)].copy()
+
+        for _ in range(KMEANS_ITERATIONS):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            filled = np.bincount(assignment, minlength=list_count) > 0
+            centroids[filled] = normalize_rows(sums[filled])
+
+        self._centroids = centroids
+        self._lists[:self._size] = self._assign(self._vectors[:self._size])
+        self._trained_size = len(live)
+        logger.info(f"Trained identification IVF layer: {len(live)} embeddings, {list_count} lists")
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        lists = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), ASSIGN_CHUNK_ROWS):
+            chunk = vectors[start:start + ASSIGN_CHUNK_ROWS]
+            lists[start:start + len(chunk)] = np.argmax(chunk @ self._centroids.T, axis=1)
+        return lists
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def search(self, features, top_k: int = 5, nprobe: Optional[int] = None) -> List[IdentificationCandidate]:
+        """
+        Top-k enrolled users most similar to the query features.
+
+        Args:
+            features: Query embedding from the index's extraction model
+            top_k: Number of distinct users to return
+            nprobe: IVF partitions to scan (ignored for exact search)
+
+        Returns:
+            Candidates ordered by descending similarity
+        """
+        query = normalize_rows(np.asarray(features, dtype=np.float32).reshape(-1))
+        if query.shape[0] != self.dimension:
+            raise ValueError(f"Expected {self.dimension}-d features, got {query.shape[0]}-d")
+
+        with self._lock:
+            if not self._rows:
+                return []
+            rows, scores = self._score(query, nprobe or self.nprobe)
+            best_rows, best_scores = self._top_users(rows, scores, top_k)
+            return [
+                IdentificationCandidate(
+                    user_id=int(self._user_ids[row]),
+                    embedding_id=int(self._embedding_ids[row]),
+                    similarity=float(np.clip(score, 0.0, 1.0)),
+                    distance=float(1.0 - np.clip(score, 0.0, 1.0)),
+                )
+                for row, score in zip(best_rows, best_scores)
+            ]
+
+    def _score(self, query: np.ndarray, nprobe: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(candidate rows, similarities) for the query."""
+        if self._centroids is None:
+            scores = self._vectors[:self._size] @ query
+            rows = np.nonzero(self._alive[:self._size])[0]
+            return rows, scores[rows]
+
+        nprobe = min(nprobe, len(self._centroids))
+        probed = np.argpartition(self._centroids @ query, -nprobe)[-nprobe:]
+        candidates = self._alive[:self._size] & np.isin(self._lists[:self._size], probed)
+        rows = np.nonzero(candidates)[0]
+        return rows, self._vectors[rows] @ query
+
+    def _top_users(self, rows: np.ndarray, scores: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Best-scoring row per user, top_k users, descending."""
+        shortlist = min(len(rows), top_k * TOP_K_OVERSAMPLE)
+        while True:
+            if shortlist < len(rows):
+                picked = np.argpartition(scores, -shortlist)[-shortlist:]
+            else:
+                picked = np.arange(len(rows))
+            picked = picked[np.argsort(-scores[picked], kind='stable')]
+            _, first = np.unique(self._user_ids[rows[picked]], return_index=True)
+            if len(first) >= top_k or shortlist >= len(rows):
+                chosen = picked[np.sort(first)][:top_k]
+                return rows[chosen], scores[chosen]
+            shortlist = min(len(rows), shortlist * TOP_K_OVERSAMPLE)
+
+
+@dataclass
+class _RegistryEntry:
+    index: FaceIdentificationIndex
+    version: int
+    built_at: float
+
+
+class IdentificationIndexRegistry:
+    """Process-local indexes keyed by (tenant_id, site_id, model_type)."""
+
+    VERSION_KEY = 'fr_identification_version:{tenant_id}'
+    DEFAULT_TTL = 900
+    BUILD_CHUNK_ROWS = 2000
+
+    _entries: Dict[Tuple[int, Optional[int], str], _RegistryEntry] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, tenant_id: int, model_type: str, site_id: Optional[int] = None) -> FaceIdentificationIndex:
+        """Loaded index for the scope, rebuilt when stale or changed elsewhere."""
+        key = (tenant_id, site_id, model_type)
+        version = cache.get(cls.VERSION_KEY.format(tenant_id=tenant_id), 0)
+        ttl = getattr(settings, 'FACE_IDENTIFICATION_INDEX_TTL', cls.DEFAULT_TTL)
+        entry = cls._entries.get(key)
+        if entry and entry.version == version and time.monotonic() - entry.built_at < ttl:
+            return entry.index
+
+        index = cls._build(tenant_id, model_type, site_id)
+        with cls._lock:
+            cls._entries[key] = _RegistryEntry(index=index, version=version, built_at=time.monotonic())
+        return index
+
+    @classmethod
+    def _build(cls, tenant_id: int, model_type: str, site_id: Optional[int]) -> FaceIdentificationIndex:
+        start = time.perf_counter()
+        queryset = FaceEmbedding.objects.for_tenant(tenant_id).filter(
+            is_validated=True,
+            extraction_model__model_type=model_type
+        )
+        if site_id is not None:
+            queryset = queryset.filter(user__organizational__bu_id=site_id)
+
+        index = None
+        rows = queryset.values_list('id', 'user_id', 'embedding_vector').iterator(chunk_size=cls.BUILD_CHUNK_ROWS)
+        for chunk in _chunks(rows, cls.BUILD_CHUNK_ROWS):
+            embedding_ids, user_ids, vectors = zip(*chunk)
+            if index is None:
+                index = FaceIdentificationIndex(dimension=len(vectors[0]))
+            index.add_many(embedding_ids, user_ids, np.asarray(vectors, dtype=np.float32))
+
+        index = index or FaceIdentificationIndex(dimension=0)
+        logger.info(
+            f"Built identification index tenant={tenant_id} site={site_id} model={model_type}: "
+            f"{len(index)} embeddings in {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+        return index
+
+    @classmethod
+    def bump_version(cls, tenant_id: Optional[int]) -> Optional[int]:
+        """Mark every process's indexes for the tenant as stale; returns the new version."""
+        if tenant_id is None:
+            return None
+        return _bump_version(cls.VERSION_KEY.format(tenant_id=tenant_id))
+
+    @classmethod
+    def apply_embedding_change(cls, embedding, deleted: bool = False, version: Optional[int] = None) -> None:
+        """
+        Add, replace or remove an embedding in every loaded index that covers it.
+
+        Pass the version returned by bump_version() when the caller already
+        bumped it; otherwise the tenant version is bumped here.
+        """
+        if embedding.tenant_id is None:
+            return
+        if version is None:
+            version = cls.bump_version(embedding.tenant_id)
+        model_type = embedding.extraction_model.model_type
+        keep = embedding.is_validated and not deleted
+
+        for (tenant_id, site_id, index_model), entry in list(cls._entries.items()):
+            if tenant_id != embedding.tenant_id or index_model != model_type:
+                continue
+            if keep and entry.index.dimension in (0, len(embedding.embedding_vector)) and \
+                    cls._user_in_site(embedding.user_id, site_id):
+                if entry.index.dimension == 0:
+                    entry.index = FaceIdentificationIndex(dimension=len(embedding.embedding_vector))
+                entry.index.add(embedding.id, embedding.user_id, embedding.embedding_vector)
+            else:
+                entry.index.remove(embedding.id)
+            entry.version = version
+
+    @staticmethod
+    def _user_in_site(user_id: int, site_id: Optional[int]) -> bool:
+        if site_id is None:
+            return True
+        return FaceEmbedding.user.field.related_model.objects.filter(
+            pk=user_id, organizational__bu_id=site_id
+        ).exists()
+
+    @classmethod
+    def has_loaded_indexes(cls) -> bool:
+        return bool(cls._entries)
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._entries.clear()
+
+
+def _bump_version(key: str) -> int:
+    cache.add(key, 0, timeout=None)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Key evicted between add() and incr()
+        cache.set(key, 1, timeout=None)
+        return 1
+
+
+def _chunks(rows: Iterable, size: int):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,68 @@
+"""
+Shared decoded image buffer for face verification.
+
+A verification image is read from disk and decoded once; quality
+assessment, anti-spoofing and every extraction model read the same
+buffer instead of re-opening the file.
+
+Following .claude/rules.md:
+- Rule #11: Specific exception handling
+"""
+
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['DecodedImage']
+
+
+@dataclass(frozen=True)
+class DecodedImage:
+    """Raw bytes, content hash and BGR pixels of one image file."""
+
+    path: str
+    raw: bytes
+    pixels: Optional[np.ndarray]
+    content_hash: str
+    exists: bool
+
+    @property
+    def file_size(self) -> int:
+        return len(self.raw)
+
+    @classmethod
+    def load(cls, image_path: str) -> 'DecodedImage':
+        """
+        Read and decode an image file.
+
+        Missing or unreadable files yield exists=False and a hash of the
+        path, matching EnhancedFaceRecognitionEngine._calculate_image_hash.
+        Undecodable content yields pixels=None.
+        """
+        try:
+            with open(image_path, 'rb') as f:
+                raw = f.read()
+        except (OSError, TypeError, ValueError) as e:
+            logger.debug(f"Could not read image {image_path}: {e}")
+            return cls(
+                path=image_path,
+                raw=b'',
+                pixels=None,
+                content_hash=hashlib.sha256(str(image_path).encode()).hexdigest()[:16],
+                exists=False
+            )
+
+        pixels = cv2.imdecode(np.frombuffer(raw, dtype=np.uint8), cv2.IMREAD_COLOR) if raw else None
+        return cls(
+            path=image_path,
+            raw=raw,
+            pixels=pixels,
+            content_hash=hashlib.sha256(raw).hexdigest()[:16],
+            exists=True
+        )
@@ -6,6 +6,7 @@ Provides performance optimizations including:
 - Batch embedding extraction
 - Query optimization
 - Connection pooling
+- 1:N identification against per-site embedding indexes
 
 Author: Development Team
 Date: October 2025
@@ -22,6 +23,7 @@ from apps.core.exceptions.patterns import (
     PARSING_EXCEPTIONS,
     BUSINESS_LOGIC_EXCEPTIONS
 )
+from apps.face_recognition.identification_index import IdentificationIndexRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -227,6 +229,57 @@ class BiometricPerformanceOptimizer:
             logger.error(f"Error warming cache: {e}", exc_info=True)
             return 0
 
+    def identify_face(
+        self,
+        features: np.ndarray,
+        tenant_id: int,
+        model_type: str = 'FACENET512',
+        site_id: Optional[int] = None,
+        top_k: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Identify a face (1:N) against the enrolled workforce of a site or tenant.
+
+        Args:
+            features: Query embedding extracted with model_type
+            tenant_id: Tenant whose embeddings are searched
+            model_type: Extraction model of the indexed embeddings
+            site_id: Restrict candidates to people of this site (bu)
+            top_k: Number of distinct candidate users
+
+        Returns:
+            Candidates (user_id, embedding_id, similarity, distance), best first
+        """
+        try:
+            index = IdentificationIndexRegistry.get(tenant_id, model_type, site_id=site_id)
+            return [candidate.to_dict() for candidate in index.search(features, top_k=top_k)]
+
+        except ValueError as e:
+            logger.warning(f"Identification query rejected for tenant {tenant_id}: {e}")
+            return []
+        except BUSINESS_LOGIC_EXCEPTIONS as e:
+            logger.error(f"Error identifying face: {e}", exc_info=True)
+            return []
+
+    def warm_identification_index(
+        self,
+        tenant_id: int,
+        model_type: str = 'FACENET512',
+        site_id: Optional[int] = None
+    ) -> int:
+        """
+        Load the identification index for a site or tenant ahead of use.
+
+        Returns:
+            Number of indexed embeddings
+        """
+        try:
+            return len(IdentificationIndexRegistry.get(tenant_id, model_type, site_id=site_id))
+
+        except BUSINESS_LOGIC_EXCEPTIONS as e:
+            logger.error(f"Error warming identification index: {e}", exc_info=True)
+            return 0
+
     def get_performance_stats(self) -> Dict[str, Any]:
         """
         Get performance statistics.
@@ -6,12 +6,16 @@ import logging
 from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.utils import timezone
-from django.db import models
+from django.db import DatabaseError, IntegrityError
 
 from apps.attendance.models import PeopleEventlog
+from apps.core.exceptions import LLMServiceException
 from apps.peoples.models import People
 from apps.face_recognition.models import FaceEmbedding, FaceVerificationLog, FaceQualityMetrics
+from apps.face_recognition.embedding_store import FaceEmbeddingStore
+from apps.face_recognition.identification_index import IdentificationIndexRegistry
 from apps.face_recognition.integrations import process_attendance_async
 
 logger = logging.getLogger(__name__)
@@ -218,6 +222,9 @@ def clear_face_recognition_cache(sender, instance, **kwargs):
         
         for cache_key in user_cache_keys:
             cache.delete(cache_key)
+
+        # Packed embedding store used by verification
+        FaceEmbeddingStore.invalidate(instance.user_id)
         
         # Clear model-specific caches
         if hasattr(instance, 'extraction_model') and instance.extraction_model:
@@ -228,6 +235,23 @@ def clear_face_recognition_cache(sender, instance, **kwargs):
         logger.error(f"Error clearing face recognition cache: {str(e)}")
 
 
+@receiver([post_save, post_delete], sender=FaceEmbedding)
+def update_identification_indexes(sender, instance, **kwargs):
+    """Invalidate 1:N identification indexes in every process, patch the ones loaded here"""
+    try:
+        # The version bump is what tells other workers to rebuild, so it must
+        # happen even when this process has no index loaded
+        version = IdentificationIndexRegistry.bump_version(instance.tenant_id)
+        if version is not None and IdentificationIndexRegistry.has_loaded_indexes():
+            IdentificationIndexRegistry.apply_embedding_change(
+                instance,
+                deleted=kwargs.get('signal') is post_delete,
+                version=version
+            )
+    except (AttributeError, ConnectionError, DatabaseError, ObjectDoesNotExist, TypeError, ValueError) as e:
+        logger.error(f"Error updating identification indexes for embedding {instance.id}: {str(e)}")
+
+
 # Performance monitoring signals
 @receiver(post_save, sender=FaceVerificationLog)
 def monitor_performance(sender, instance, created, **kwargs):
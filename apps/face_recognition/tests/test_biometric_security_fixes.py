@@ -426,7 +426,24 @@ class TestEmbeddingCaching(BiometricSecurityFixesTestCase):
         # Results should be identical
         self.assertEqual(len(embeddings1), len(embeddings2))
         if embeddings1:
-            self.assertEqual(embeddings1[0].id, embeddings2[0].id)
+            self.assertEqual(
+                list(embeddings1.for_model('FACENET512').ids),
+                list(embeddings2.for_model('FACENET512').ids)
+            )
+
+    def test_cache_stores_packed_bytes(self):
+        """Cached value is the packed float32 store, not pickled model instances"""
+        engine = EnhancedFaceRecognitionEngine()
+        engine._get_user_embeddings(self.user.id)
+
+        cached_data = cache.get(f"fr_embeddings:{self.user.id}")
+        self.assertIsInstance(cached_data, bytes)
+
+        embeddings = engine._get_user_embeddings(self.user.id)
+        model_embeddings = embeddings.for_model('FACENET512')
+        self.assertEqual(list(model_embeddings.ids), [self.embedding.id])
+        self.assertEqual(model_embeddings.vectors.dtype, np.float32)
+        self.assertAlmostEqual(float(np.linalg.norm(model_embeddings.vectors[0])), 1.0, places=5)
 
     def test_cache_invalidation(self):
         """Test cache invalidation functionality"""
@@ -574,12 +591,11 @@ class TestPerformanceOptimizations(BiometricSecurityFixesTestCase):
         # Clear cache to ensure database hit
         cache.clear()
 
-        with self.assertNumQueries(1):  # Should be exactly 1 query with select_related
+        with self.assertNumQueries(1):  # Should be exactly 1 query joining the model type
             embeddings = engine._get_user_embeddings(self.user.id)
 
-            # Access related model to verify select_related worked
-            if embeddings:
-                _ = embeddings[0].extraction_model.name  # Should not trigger additional query
+            # Embeddings are grouped by model type without further queries
+            self.assertIsNotNone(embeddings.for_model('FACENET512'))
 
     def test_feature_extraction_error_handling(self):
         """Test robust error handling in feature extraction"""
@@ -0,0 +1,130 @@
+"""
+Tests for the packed face embedding store.
+
+Checks that batched matrix scoring matches the per-embedding cosine
+similarity it replaces, and that the cache format round-trips through the
+JSON cache serializer.
+"""
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from apps.face_recognition.embedding_store import FaceEmbeddingStore, UserEmbeddingSet
+
+MODULE = 'apps.face_recognition.embedding_store'
+
+
+def _reference_similarity(vec1, vec2):
+    """Per-pair cosine similarity as computed by the engine before batching"""
+    vec1_norm = vec1 / (np.linalg.norm(vec1) + 1e-8)
+    vec2_norm = vec2 / (np.linalg.norm(vec2) + 1e-8)
+    return max(0.0, min(1.0, float(np.dot(vec1_norm, vec2_norm))))
+
+
+@pytest.fixture
+def rows():
+    rng = np.random.default_rng(7)
+    return (
+        [(10 + index, 'FACENET512', rng.normal(0, 1, 512).tolist()) for index in range(6)]
+        + [(50 + index, 'ARCFACE', rng.normal(0, 1, 256).tolist()) for index in range(3)]
+    )
+
+
+class TestUserEmbeddingSet:
+
+    def test_groups_rows_by_model(self, rows):
+        store = UserEmbeddingSet.from_rows(rows)
+
+        assert len(store) == 9
+        assert store.for_model('FACENET512').vectors.shape == (6, 512)
+        assert store.for_model('ARCFACE').vectors.dtype == np.float32
+        assert store.for_model('INSIGHTFACE') is None
+
+    def test_best_match_equals_pairwise_cosine(self, rows):
+        store = UserEmbeddingSet.from_rows(rows)
+        probe = np.asarray(rows[3][2]) + np.random.default_rng(1).normal(0, 0.3, 512)
+
+        similarity, embedding_id = store.for_model('FACENET512').best_match(probe)
+
+        expected = [_reference_similarity(probe, np.asarray(vector)) for _, model, vector in rows if model == 'FACENET512']
+        assert embedding_id == 13
+        assert similarity == pytest.approx(max(expected), abs=1e-5)
+
+    def test_bytes_round_trip(self, rows):
+        store = UserEmbeddingSet.from_rows(rows)
+
+        restored = UserEmbeddingSet.from_bytes(store.to_bytes())
+
+        for model_type in ('FACENET512', 'ARCFACE'):
+            np.testing.assert_array_equal(restored.for_model(model_type).ids, store.for_model(model_type).ids)
+            np.testing.assert_array_equal(restored.for_model(model_type).vectors, store.for_model(model_type).vectors)
+
+    def test_corrupt_payload_rejected(self, rows):
+        payload = UserEmbeddingSet.from_rows(rows).to_bytes()
+
+        with pytest.raises(ValueError):
+            UserEmbeddingSet.from_bytes(payload[:40])
+        with pytest.raises(ValueError):
+            UserEmbeddingSet.from_bytes(b'XXXX' + payload[4:])
+
+    def test_dimension_mismatch_raises(self, rows):
+        store = UserEmbeddingSet.from_rows(rows)
+
+        with pytest.raises(ValueError):
+            store.for_model('ARCFACE').best_match(np.ones(512))
+
+    def test_empty_set_is_falsy(self):
+        assert not UserEmbeddingSet.from_rows([])
+
+
+class JSONCache:
+    """Cache double that serializes like the repo's django-redis JSONSerializer."""
+
+    def __init__(self):
+        from django_redis.serializers.json import JSONSerializer
+
+        self.serializer = JSONSerializer({})
+        self.data = {}
+
+    def get(self, key):
+        return self.serializer.loads(self.data[key]) if key in self.data else None
+
+    def set(self, key, value, timeout=None):
+        self.data[key] = self.serializer.dumps(value)
+
+
+class TestFaceEmbeddingStore:
+
+    def _load(self, rows, cache):
+        with patch(f'{MODULE}.FaceEmbedding') as model, patch(f'{MODULE}.cache', cache):
+            model.objects.filter.return_value.order_by.return_value.values_list.return_value = rows
+            return FaceEmbeddingStore.load(7)
+
+    def test_load_round_trips_through_json_cache(self, rows):
+        cache = JSONCache()
+        store = self._load(rows, cache)
+
+        with patch(f'{MODULE}.cache', cache):
+            cached = FaceEmbeddingStore.get_cached(7)
+
+        assert cached is not None
+        np.testing.assert_array_equal(cached.for_model('ARCFACE').ids, store.for_model('ARCFACE').ids)
+        np.testing.assert_allclose(cached.for_model('FACENET512').vectors, store.for_model('FACENET512').vectors)
+
+    def test_cache_failure_still_returns_database_store(self, rows):
+        from redis.exceptions import ConnectionError as RedisConnectionError
+
+        cache = JSONCache()
+        with patch.object(cache, 'set', side_effect=RedisConnectionError('down')):
+            store = self._load(rows, cache)
+
+        assert len(store.for_model('FACENET512')) == 6
+
+    def test_unreadable_entry_is_a_miss(self):
+        cache = JSONCache()
+        cache.set(FaceEmbeddingStore.cache_key(7), 'not base64!')
+
+        with patch(f'{MODULE}.cache', cache):
+            assert FaceEmbeddingStore.get_cached(7) is None
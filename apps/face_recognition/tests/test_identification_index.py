@@ -0,0 +1,134 @@
+"""
+Tests for the 1:N face identification index.
+
+Checks exact search against brute force, IVF recall on a clustered
+workforce, incremental enroll/removal, per-user top-k deduplication, and
+that enrollment changes invalidate indexes held by other processes.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from apps.face_recognition.identification_index import FaceIdentificationIndex, IdentificationIndexRegistry
+
+
+def _workforce(users=300, per_user=3, dimension=128, seed=3):
+    """Enrolled embeddings: a few noisy captures around one identity vector per user"""
+    rng = np.random.default_rng(seed)
+    identities = rng.normal(0, 1, (users, dimension))
+    vectors = np.repeat(identities, per_user, axis=0) + rng.normal(0, 0.2, (users * per_user, dimension))
+    user_ids = np.repeat(np.arange(1, users + 1), per_user)
+    embedding_ids = np.arange(1000, 1000 + users * per_user)
+    return identities, embedding_ids, user_ids, vectors
+
+
+def _probe(identities, user_id, seed=11):
+    return identities[user_id - 1] + np.random.default_rng(seed).normal(0, 0.2, identities.shape[1])
+
+
+class TestFaceIdentificationIndex:
+
+    def test_exact_search_matches_brute_force(self):
+        identities, embedding_ids, user_ids, vectors = _workforce()
+        index = FaceIdentificationIndex(dimension=128)
+        index.add_many(embedding_ids, user_ids, vectors)
+        probe = _probe(identities, 42)
+
+        candidates = index.search(probe, top_k=3)
+
+        normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        scores = normalized @ (probe / np.linalg.norm(probe))
+        best = int(np.argmax(scores))
+        assert not index.is_approximate
+        assert candidates[0].user_id == 42
+        assert candidates[0].embedding_id == embedding_ids[best]
+        assert candidates[0].similarity == pytest.approx(scores[best], abs=1e-5)
+        assert candidates[0].distance == pytest.approx(1 - scores[best], abs=1e-5)
+
+    def test_top_k_returns_distinct_users_in_order(self):
+        identities, embedding_ids, user_ids, vectors = _workforce()
+        index = FaceIdentificationIndex(dimension=128)
+        index.add_many(embedding_ids, user_ids, vectors)
+
+        candidates = index.search(_probe(identities, 7), top_k=5)
+
+        assert len({candidate.user_id for candidate in candidates}) == 5
+        similarities = [candidate.similarity for candidate in candidates]
+        assert similarities == sorted(similarities, reverse=True)
+
+    def test_ivf_layer_keeps_recall(self):
+        identities, embedding_ids, user_ids, vectors = _workforce(users=1500)
+        index = FaceIdentificationIndex(dimension=128, ivf_threshold=1000, nprobe=8)
+        index.add_many(embedding_ids, user_ids, vectors)
+
+        hits = sum(
+            index.search(_probe(identities, user_id, seed=user_id), top_k=1)[0].user_id == user_id
+            for user_id in range(1, 101)
+        )
+
+        assert index.is_approximate
+        assert hits >= 95
+
+    def test_incremental_enroll_and_removal(self):
+        identities, embedding_ids, user_ids, vectors = _workforce(users=50)
+        index = FaceIdentificationIndex(dimension=128)
+        index.add_many(embedding_ids, user_ids, vectors)
+        newcomer = np.random.default_rng(99).normal(0, 1, 128)
+
+        index.add(9999, 777, newcomer)
+        assert index.search(newcomer, top_k=1)[0].user_id == 777
+
+        assert index.remove(9999)
+        assert not index.remove(9999)
+        assert index.search(newcomer, top_k=1)[0].user_id != 777
+        assert len(index) == len(embedding_ids)
+
+    def test_removals_compact_storage(self):
+        _, embedding_ids, user_ids, vectors = _workforce(users=20)
+        index = FaceIdentificationIndex(dimension=128)
+        index.add_many(embedding_ids, user_ids, vectors)
+
+        for embedding_id in embedding_ids[:40]:
+            index.remove(int(embedding_id))
+
+        assert len(index) == 20
+        assert index.search(vectors[50], top_k=1)[0].embedding_id == embedding_ids[50]
+
+    def test_dimension_mismatch_raises(self):
+        index = FaceIdentificationIndex(dimension=128)
+
+        with pytest.raises(ValueError):
+            index.add(1, 1, np.ones(512))
+        with pytest.raises(ValueError):
+            index.search(np.ones(512))
+
+    def test_empty_index_returns_no_candidates(self):
+        assert FaceIdentificationIndex(dimension=128).search(np.ones(128)) == []
+
+
+class TestIdentificationIndexSignal:
+
+    @patch.object(IdentificationIndexRegistry, 'apply_embedding_change')
+    @patch.object(IdentificationIndexRegistry, 'bump_version', return_value=4)
+    def test_version_bumped_without_loaded_indexes(self, bump_version, apply_change):
+        from apps.face_recognition.signals import update_identification_indexes
+
+        IdentificationIndexRegistry.clear()
+        update_identification_indexes(sender=None, instance=MagicMock(id=1, tenant_id=7))
+
+        bump_version.assert_called_once_with(7)
+        apply_change.assert_not_called()
+
+    @patch.object(IdentificationIndexRegistry, 'apply_embedding_change')
+    @patch.object(IdentificationIndexRegistry, 'bump_version', return_value=4)
+    @patch.object(IdentificationIndexRegistry, 'has_loaded_indexes', return_value=True)
+    def test_loaded_indexes_patched_with_bumped_version(self, loaded, bump_version, apply_change):
+        from apps.face_recognition.signals import update_identification_indexes
+
+        embedding = MagicMock(id=1, tenant_id=7)
+        update_identification_indexes(sender=None, instance=embedding)
+
+        bump_version.assert_called_once_with(7)
+        apply_change.assert_called_once_with(embedding, deleted=False, version=4)
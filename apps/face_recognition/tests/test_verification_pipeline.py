@@ -0,0 +1,167 @@
+"""
+Tests for the concurrent face verification pipeline.
+
+Database-facing engine hooks are patched so the tests exercise decoding,
+scheduling and decision ordering only.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import pytest
+
+from apps.face_recognition.embedding_store import UserEmbeddingSet
+from apps.face_recognition.enhanced_engine import (
+    EnhancedFaceRecognitionEngine,
+    MockAntiSpoofingModel,
+    MockArcFaceModel,
+    MockFaceNetModel,
+    MockInsightFaceModel,
+    MockMotionAntiSpoofingModel,
+)
+from apps.face_recognition.image_buffer import DecodedImage
+from apps.face_recognition.verification_pipeline import FaceVerificationPipeline, VerificationRequest
+
+GOOD_QUALITY = {'overall_quality': 0.9, 'quality_issues': [], 'cached': True}
+
+
+def _write_image(directory, name, seed):
+    path = str(directory / name)
+    pixels = np.random.default_rng(seed).integers(0, 255, (120, 120, 3), dtype=np.uint8)
+    cv2.imwrite(path, pixels)
+    return path
+
+
+@pytest.fixture
+def engine():
+    with patch.object(EnhancedFaceRecognitionEngine, 'load_configuration'):
+        engine = EnhancedFaceRecognitionEngine()
+    engine.config = {
+        'similarity_threshold': 0.3,
+        'confidence_threshold': 0.7,
+        'liveness_threshold': 0.5,
+        'enable_anti_spoofing': True,
+        'enable_ensemble': True,
+    }
+    engine.models = {
+        'FACENET512': MockFaceNetModel(),
+        'ARCFACE': MockArcFaceModel(),
+        'INSIGHTFACE': MockInsightFaceModel()
+    }
+    engine.anti_spoofing_models = {
+        'TEXTURE_BASED': MockAntiSpoofingModel(),
+        'MOTION_BASED': MockMotionAntiSpoofingModel()
+    }
+    with patch.object(engine, '_finalize_result', side_effect=lambda result, *args: result), \
+            patch.object(engine, '_assess_fraud_risk', return_value={'fraud_risk_score': 0.0}), \
+            patch.object(engine, '_store_quality_metrics'):
+        yield engine
+
+
+def _enroll(engine, image_path):
+    """Embeddings equal to the mock models' features for image_path"""
+    image = DecodedImage.load(image_path)
+    rows = [
+        (index, model_name, model.extract_features(image_path).tolist())
+        for index, (model_name, model) in enumerate(engine.models.items())
+    ]
+    return UserEmbeddingSet.from_rows(rows), image
+
+
+class TestFaceVerificationPipeline:
+
+    def test_batch_matches_sequential_verification(self, engine, tmp_path):
+        enrolled_path = _write_image(tmp_path, 'enrolled.png', 1)
+        other_path = _write_image(tmp_path, 'other.png', 2)
+        user_set, image = _enroll(engine, enrolled_path)
+        cached = {image.content_hash: GOOD_QUALITY, DecodedImage.load(other_path).content_hash: GOOD_QUALITY}
+
+        with patch.object(engine, '_get_user_embeddings', return_value=user_set), \
+                patch.object(engine, '_lookup_quality_metrics', side_effect=lambda hashes: {
+                    content_hash: cached[content_hash] for content_hash in hashes
+                }):
+            sequential = [engine.verify_face(1, enrolled_path), engine.verify_face(1, other_path)]
+            batch = FaceVerificationPipeline(engine, max_workers=4).verify_batch([
+                (1, enrolled_path), (1, other_path)
+            ])
+
+        assert [result['verified'] for result in batch] == [result['verified'] for result in sequential]
+        assert batch[0]['similarity_score'] == pytest.approx(sequential[0]['similarity_score'])
+        assert batch[0]['similarity_score'] == pytest.approx(1.0, abs=1e-5)
+        assert batch[1]['similarity_score'] < 0.5
+
+    def test_each_distinct_image_decoded_and_measured_once(self, engine, tmp_path):
+        path = _write_image(tmp_path, 'shared.png', 3)
+        copy_path = str(tmp_path / 'copy.png')
+        with open(path, 'rb') as source, open(copy_path, 'wb') as target:
+            target.write(source.read())
+        measured = dict.fromkeys(('sharpness_score', 'brightness_score', 'contrast_score', 'face_size_score'), 0.1)
+        measured.update(overall_quality=0.1, quality_issues=['NO_FACE_DETECTED'])
+
+        with patch.object(engine, '_get_user_embeddings', return_value=UserEmbeddingSet()) as mock_embeddings, \
+                patch.object(engine, '_lookup_quality_metrics', return_value={}) as mock_lookup, \
+                patch.object(engine, '_measure_image_quality', return_value=measured) as mock_measure, \
+                patch('apps.face_recognition.verification_pipeline.DecodedImage.load',
+                      wraps=DecodedImage.load) as mock_load:
+            results = FaceVerificationPipeline(engine).verify_batch([
+                VerificationRequest(1, path), VerificationRequest(2, path), VerificationRequest(1, copy_path)
+            ])
+
+        assert mock_load.call_count == 2
+        assert mock_measure.call_count == 1
+        mock_lookup.assert_called_once()
+        assert mock_embeddings.call_count == 2
+        assert [result['user_id'] for result in results] == [1, 2, 1]
+        assert all('LOW_IMAGE_QUALITY' in result['fraud_indicators'] for result in results)
+
+    def test_stage_timings_reported(self, engine, tmp_path):
+        path = _write_image(tmp_path, 'timed.png', 4)
+        user_set, image = _enroll(engine, path)
+
+        with patch.object(engine, '_get_user_embeddings', return_value=user_set), \
+                patch.object(engine, '_lookup_quality_metrics', return_value={image.content_hash: GOOD_QUALITY}):
+            result = FaceVerificationPipeline(engine).verify(1, path)
+
+        timings = result['stage_timings_ms']
+        for stage in ('decode', 'quality', 'anti_spoofing', 'embeddings', 'feature_extraction', 'matching'):
+            assert stage in timings
+        assert set(timings['feature_extraction_by_model']) == set(engine.models)
+
+    def test_mock_models_deterministic_under_concurrency(self, engine, tmp_path):
+        paths = [_write_image(tmp_path, f'img{index}.png', index) for index in range(8)]
+        expected = [engine.models['FACENET512'].extract_features(path) for path in paths]
+
+        images = [DecodedImage.load(path) for path in paths]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            concurrent = list(pool.map(
+                lambda image: engine._extract_model_features('FACENET512', image.path, image), images * 4
+            ))
+
+        for index, vector in enumerate(concurrent):
+            np.testing.assert_array_equal(vector, expected[index % len(paths)])
+
+    def test_worker_stage_errors_match_verify_face(self, engine, tmp_path):
+        broken_path = _write_image(tmp_path, 'broken.png', 5)
+        good_path = _write_image(tmp_path, 'good.png', 6)
+        user_set, good_image = _enroll(engine, good_path)
+        real_measure = engine._measure_image_quality
+
+        def measure(image):
+            if image.path == broken_path:
+                raise cv2.error('bad image')
+            return real_measure(image)
+
+        with patch.object(engine, '_get_user_embeddings', return_value=user_set), \
+                patch.object(engine, '_lookup_quality_metrics', side_effect=lambda hashes: {
+                    content_hash: GOOD_QUALITY for content_hash in hashes if content_hash == good_image.content_hash
+                }), \
+                patch.object(engine, '_measure_image_quality', side_effect=measure), \
+                patch.object(engine.models['ARCFACE'], 'extract_features', side_effect=ConnectionError('down')):
+            sequential = engine.verify_face(1, broken_path)
+            broken, good = FaceVerificationPipeline(engine).verify_batch([(1, broken_path), (1, good_path)])
+
+        assert broken['fraud_indicators'] == sequential['fraud_indicators'] == ['LOW_IMAGE_QUALITY']
+        assert 'VERIFICATION_ERROR' not in good['fraud_indicators']
+        assert set(good['model_results']) == {'FACENET512', 'INSIGHTFACE'}
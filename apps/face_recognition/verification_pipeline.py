@@ -0,0 +1,272 @@
+"""
+Concurrent Face Verification Pipeline
+
+Runs the stages of EnhancedFaceRecognitionEngine.verify_face concurrently
+and over many images per call:
+
+- Each distinct image is read and decoded once (DecodedImage) and shared
+  by quality assessment, anti-spoofing and every extraction model
+- Quality, anti-spoofing and per-model extraction are scheduled together
+  on a bounded thread pool (OpenCV and NumPy release the GIL)
+- Database work stays on the calling thread: one query for previously
+  stored quality metrics, one embedding load per distinct user, then
+  logging of each result
+- Decisions are applied in the engine's order, so results match
+  verify_face; stages after an early rejection are computed but unused
+- Every result carries stage_timings_ms (worker time per stage, and per
+  model for extraction)
+- Worker stages fail the way verify_face's do: a quality error is a
+  zero-quality (LOW_IMAGE_QUALITY) result, a failing model is left out of
+  the ensemble, and neither aborts the batch
+
+Following .claude/rules.md:
+- Rule #11: Specific exception handling
+- Rule #12: Database query optimization (batched lookups)
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import cv2
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import DatabaseError, IntegrityError
+
+from apps.core.exceptions import LLMServiceException
+from apps.face_recognition.enhanced_engine import EnhancedFaceRecognitionEngine
+from apps.face_recognition.image_buffer import DecodedImage
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['VerificationRequest', 'FaceVerificationPipeline']
+
+DEFAULT_MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+_executors: Dict[int, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def _shared_executor(max_workers: int) -> ThreadPoolExecutor:
+    """Process-wide pool per size, so pipelines do not spawn threads per call."""
+    with _executors_lock:
+        if max_workers not in _executors:
+            _executors[max_workers] = ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix='face-verify'
+            )
+        return _executors[max_workers]
+
+
+def _measure_quality(engine: EnhancedFaceRecognitionEngine, image: DecodedImage) -> Dict[str, Any]:
+    """Worker-side quality measurement; failures become a zero-quality result as in _assess_image_quality."""
+    try:
+        return engine._measure_image_quality(image)
+    except (AttributeError, ConnectionError, DatabaseError, IntegrityError, LLMServiceException, ObjectDoesNotExist, TimeoutError, TypeError, ValueError, cv2.error) as e:
+        logger.error(f"Error assessing image quality: {str(e)}")
+        return {
+            'overall_quality': 0.0,
+            'error': str(e)
+        }
+
+
+def _timed(func: Callable, *args, **kwargs) -> Tuple[Any, float]:
+    started = time.perf_counter()
+    value = func(*args, **kwargs)
+    return value, round((time.perf_counter() - started) * 1000, 3)
+
+
+@dataclass(frozen=True)
+class VerificationRequest:
+    user_id: int
+    image_path: str
+    attendance_record_id: Optional[int] = None
+    enable_anti_spoofing: bool = True
+
+    @classmethod
+    def coerce(cls, request: Union['VerificationRequest', Dict[str, Any], Tuple]) -> 'VerificationRequest':
+        if isinstance(request, cls):
+            return request
+        if isinstance(request, dict):
+            return cls(**request)
+        return cls(*request)
+
+
+class _ImageStages:
+    """Futures for the per-image work of one distinct image."""
+
+    def __init__(self, image: DecodedImage, decode_ms: float):
+        self.image = image
+        self.decode_ms = decode_ms
+        self.quality: Optional[Future] = None
+        self.anti_spoofing: Optional[Future] = None
+        self.features: Dict[str, Future] = {}
+        self.quality_stored = False
+
+
+class FaceVerificationPipeline:
+    """Batch, concurrent front end to EnhancedFaceRecognitionEngine."""
+
+    def __init__(
+        self,
+        engine: Optional[EnhancedFaceRecognitionEngine] = None,
+        max_workers: Optional[int] = None
+    ):
+        self.engine = engine or EnhancedFaceRecognitionEngine()
+        self.max_workers = max_workers or getattr(settings, 'FACE_VERIFICATION_MAX_WORKERS', DEFAULT_MAX_WORKERS)
+
+    def verify(
+        self,
+        user_id: int,
+        image_path: str,
+        attendance_record_id: Optional[int] = None,
+        enable_anti_spoofing: bool = True
+    ) -> Dict[str, Any]:
+        """Verify one image; same result shape as verify_face."""
+        request = VerificationRequest(user_id, image_path, attendance_record_id, enable_anti_spoofing)
+        return self.verify_batch([request])[0]
+
+    def verify_batch(
+        self,
+        requests: Iterable[Union[VerificationRequest, Dict[str, Any], Tuple]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Verify many (user, image) pairs in one call.
+
+        Args:
+            requests: VerificationRequest objects, or dicts/tuples of its fields
+
+        Returns:
+            One verify_face-style result per request, in input order
+        """
+        requests = [VerificationRequest.coerce(request) for request in requests]
+        if not requests:
+            return []
+
+        start_time = time.time()
+        executor = _shared_executor(self.max_workers)
+        engine = self.engine
+
+        # 1. Read and decode each distinct file once
+        decode_futures = {
+            path: executor.submit(_timed, DecodedImage.load, path)
+            for path in dict.fromkeys(request.image_path for request in requests)
+        }
+        stages_by_path: Dict[str, _ImageStages] = {}
+        stages_by_hash: Dict[str, _ImageStages] = {}
+        for path, future in decode_futures.items():
+            image, decode_ms = future.result()
+            # Identical content under different paths is processed once
+            stages_by_path[path] = stages_by_hash.setdefault(image.content_hash, _ImageStages(image, decode_ms))
+
+        # 2. Stored quality assessments, one query
+        try:
+            cached_quality = engine._lookup_quality_metrics(list(stages_by_hash))
+        except (DatabaseError, ObjectDoesNotExist) as e:
+            logger.warning(f"Quality metrics lookup failed: {e}")
+            cached_quality = {}
+
+        # 3. Schedule CPU stages per distinct image
+        anti_spoofing_hashes = {
+            stages_by_path[request.image_path].image.content_hash
+            for request in requests
+            if request.enable_anti_spoofing and engine.config.get('enable_anti_spoofing', True)
+        }
+        for content_hash, stages in stages_by_hash.items():
+            image = stages.image
+            if content_hash not in cached_quality:
+                stages.quality = executor.submit(_timed, _measure_quality, engine, image)
+            if content_hash in anti_spoofing_hashes:
+                stages.anti_spoofing = executor.submit(_timed, engine._detect_spoofing, image.path, image=image)
+            stages.features = {
+                model_name: executor.submit(_timed, engine._extract_model_features, model_name, image.path, image)
+                for model_name in engine.models
+            }
+
+        # 4. Embeddings load on this thread (own DB connection) while workers run
+        embeddings = {}
+        for user_id in dict.fromkeys(request.user_id for request in requests):
+            embeddings[user_id] = _timed(engine._get_user_embeddings, user_id)
+
+        # 5. Collect in request order and apply the engine's decisions
+        results = [
+            self._complete(request, stages_by_path[request.image_path], cached_quality, embeddings, start_time)
+            for request in requests
+        ]
+
+        logger.info(
+            f"Batch face verification: {len(requests)} requests, {len(stages_by_hash)} distinct images, "
+            f"{(time.time() - start_time) * 1000:.1f}ms"
+        )
+        return results
+
+    def _complete(
+        self,
+        request: VerificationRequest,
+        stages: _ImageStages,
+        cached_quality: Dict[str, Dict[str, Any]],
+        embeddings: Dict[int, Tuple[Any, float]],
+        start_time: float
+    ) -> Dict[str, Any]:
+        engine = self.engine
+        image = stages.image
+        try:
+            result = engine._new_verification_result(request.user_id, request.image_path)
+            result['image_hash'] = image.content_hash
+            timings = result['stage_timings_ms'] = {'decode': stages.decode_ms}
+
+            def quality():
+                if stages.quality is None:
+                    timings['quality'] = 0.0
+                    return dict(cached_quality[image.content_hash])
+                measured, timings['quality'] = stages.quality.result()
+                if 'error' in measured:
+                    return measured
+                if not stages.quality_stored:
+                    stages.quality_stored = True
+                    engine._store_quality_metrics(image, measured)
+                return engine._quality_result(measured)
+
+            def anti_spoofing():
+                spoof_result, timings['anti_spoofing'] = stages.anti_spoofing.result()
+                return spoof_result
+
+            def user_embeddings():
+                user_set, timings['embeddings'] = embeddings[request.user_id]
+                return user_set
+
+            def features():
+                extracted = {}
+                per_model = {}
+                for model_name, future in stages.features.items():
+                    vector, per_model[model_name] = future.result()
+                    if vector is not None:
+                        extracted[model_name] = vector
+                timings['feature_extraction'] = max(per_model.values(), default=0.0)
+                timings['feature_extraction_by_model'] = per_model
+                return extracted
+
+            use_anti_spoofing = request.enable_anti_spoofing and engine.config.get('enable_anti_spoofing', True)
+            engine._run_verification_stages(
+                result,
+                quality=quality,
+                anti_spoofing=anti_spoofing if use_anti_spoofing else None,
+                embeddings=user_embeddings,
+                features=features
+            )
+            return engine._finalize_result(result, start_time, request.user_id, request.attendance_record_id)
+
+        except (AttributeError, ConnectionError, DatabaseError, IntegrityError, ObjectDoesNotExist, TimeoutError, TypeError, ValueError) as e:
+            logger.error(f"Error in batch face verification: {str(e)}", exc_info=True)
+            return {
+                'user_id': request.user_id,
+                'verified': False,
+                'confidence': 0.0,
+                'error': str(e),
+                'processing_time_ms': (time.time() - start_time) * 1000,
+                'fraud_indicators': ['VERIFICATION_ERROR']
+            }
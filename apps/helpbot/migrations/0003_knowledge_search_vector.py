@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-16 11:00
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("helpbot", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="helpbotknowledge",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False,
+                help_text="Weighted FTS vector (title A, content B, keywords C), refreshed on save",
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="helpbotknowledge",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="hb_knowledge_search_gin_idx"
+            ),
+        ),
+    ]
@@ -10,6 +10,8 @@ import uuid
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 
 from apps.tenants.models import TenantAwareModel
 from apps.peoples.models import BaseModel
@@ -112,6 +114,11 @@ class HelpBotKnowledge(BaseModel, TenantAwareModel):
         null=True,
         help_text="Original file path if imported from documentation"
     )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        help_text="Weighted FTS vector (title A, content B, keywords C), refreshed on save"
+    )
     last_updated = models.DateTimeField(
         _("Last Updated"),
         auto_now=True,
@@ -127,6 +134,7 @@ class HelpBotKnowledge(BaseModel, TenantAwareModel):
             models.Index(fields=['category', 'knowledge_type'], name='hb_knowledge_cat_type_idx'),
             models.Index(fields=['is_active', 'effectiveness_score'], name='hb_knowledge_active_idx'),
             models.Index(fields=['usage_count'], name='hb_knowledge_usage_idx'),
+            GinIndex(fields=['search_vector'], name='hb_knowledge_search_gin_idx'),
         ]
 
     def __str__(self):
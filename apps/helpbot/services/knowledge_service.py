@@ -18,11 +18,15 @@ from django.utils import timezone
 from django.contrib.postgres.search import SearchVector, SearchQuery, SearchRank
 
 from apps.helpbot.models import HelpBotKnowledge, HelpBotAnalytics
+from apps.helpbot.services.usage_counter import KnowledgeUsageCounter
 from apps.core.exceptions.patterns import DATABASE_EXCEPTIONS, NETWORK_EXCEPTIONS
 from apps.ontology import ontology
 
 logger = logging.getLogger(__name__)
 
+# Must match TEXT_INDEX_SPECS['knowledge_base'], which maintains HelpBotKnowledge.search_vector
+KNOWLEDGE_SEARCH_CONFIG = 'english'
+
 
 @ontology(
     domain="help",
@@ -595,10 +599,15 @@ class HelpBotKnowledgeService:
             return []
 
     def _database_search(self, query: str, category: str = None, limit: int = 10) -> List[Dict[str, Any]]:
-        """Fallback database search using PostgreSQL full-text search."""
+        """
+        Fallback database search using PostgreSQL full-text search.
+
+        Read-only and index-driven: matches the stored, GIN-indexed
+        search_vector and records usage in KnowledgeUsageCounter.
+        """
         try:
-            from django.contrib.postgres.search import SearchVector, SearchQuery, SearchRank
-            from django.db.models import Q
+            from django.db import connections
+            from django.db.models import F, Q
 
             # Build base query
             knowledge_qs = HelpBotKnowledge.objects.filter(is_active=True)
@@ -606,20 +615,23 @@ class HelpBotKnowledgeService:
             if category:
                 knowledge_qs = knowledge_qs.filter(category=category)
 
-            # Use PostgreSQL full-text search
-            search_vector = SearchVector('title', weight='A') + SearchVector('content', weight='B') + SearchVector('search_keywords', weight='C')
-            search_query = SearchQuery(query)
-
-            results = (
-                knowledge_qs
-                .annotate(
-                    search=search_vector,
-                    rank=SearchRank(search_vector, search_query)
+            if connections[knowledge_qs.db].vendor == 'postgresql':
+                search_query = SearchQuery(query, config=KNOWLEDGE_SEARCH_CONFIG)
+                results = (
+                    knowledge_qs
+                    .filter(search_vector=search_query)
+                    .annotate(rank=SearchRank(F('search_vector'), search_query))
+                    .order_by('-rank', '-usage_count', '-effectiveness_score')
+                    [:limit]
+                )
+            else:
+                # SQLite (and other test databases) do not support full-text search
+                results = (
+                    knowledge_qs
+                    .filter(Q(title__icontains=query) | Q(content__icontains=query))
+                    .order_by('-usage_count', '-effectiveness_score')
+                    [:limit]
                 )
-                .filter(search=search_query)
-                .order_by('-rank', '-usage_count', '-effectiveness_score')
-                [:limit]
-            )
 
             # Convert to list of dicts
             search_results = []
@@ -636,12 +648,8 @@ class HelpBotKnowledgeService:
                 }
                 search_results.append(result)
 
-            # Update usage count
-            from django.db import models
-            knowledge_ids = [result['id'] for result in search_results]
-            HelpBotKnowledge.objects.filter(knowledge_id__in=knowledge_ids).update(
-                usage_count=models.F('usage_count') + 1
-            )
+            # Usage is buffered and flushed in bulk (helpbot.flush_knowledge_usage)
+            KnowledgeUsageCounter.record(result['id'] for result in search_results)
 
             return search_results
 
@@ -654,9 +662,8 @@ class HelpBotKnowledgeService:
         try:
             knowledge = HelpBotKnowledge.objects.get(knowledge_id=knowledge_id, is_active=True)
 
-            # Increment usage count
-            knowledge.usage_count += 1
-            knowledge.save(update_fields=['usage_count'])
+            # Usage is buffered and flushed in bulk (helpbot.flush_knowledge_usage)
+            KnowledgeUsageCounter.record([knowledge.knowledge_id])
 
             return {
                 'id': str(knowledge.knowledge_id),
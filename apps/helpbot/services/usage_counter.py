@@ -0,0 +1,198 @@
+"""
+Buffered HelpBot Knowledge Usage Counter
+
+Knowledge lookups record usage in memory instead of issuing an UPDATE on
+the read path:
+
+- Each process buffers counts per database alias and pushes them to a
+  shared Redis hash (HINCRBY pipeline) every HELPBOT_USAGE_PUSH_SECONDS
+  (background timer thread) or as soon as HELPBOT_USAGE_PUSH_MAX distinct
+  entries are pending
+- `helpbot.flush_knowledge_usage` (Celery beat) drains the shared hash
+  and applies all counts with one UPDATE per chunk of entries
+- Non-Redis caches (tests, local development) keep the shared buffer in
+  process memory
+
+Following .claude/rules.md:
+- Rule #11: Specific exception handling
+- Rule #12: Database query optimization (bulk updates)
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, F, IntegerField, Value, When
+
+from apps.core.caching.utils import get_raw_redis_client
+from apps.core.exceptions.patterns import CACHE_EXCEPTIONS, DATABASE_EXCEPTIONS
+from apps.core.utils_new.db_utils import get_current_db_name
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['KnowledgeUsageCounter']
+
+SHARED_KEY_PREFIX = 'helpbot:knowledge_usage'
+SHARED_KEY_TTL_SECONDS = 7 * 24 * 3600
+UPDATE_CHUNK_SIZE = 500
+
+
+class KnowledgeUsageCounter:
+    """Process-wide usage buffer for HelpBotKnowledge.usage_count."""
+
+    _lock = threading.Lock()
+    _pending: Dict[str, Counter] = defaultdict(Counter)
+    _shared: Dict[str, Counter] = defaultdict(Counter)
+    _pushed_at = time.monotonic()
+    _pusher: Optional[threading.Thread] = None
+
+    @classmethod
+    def record(cls, knowledge_ids: Iterable, using: Optional[str] = None):
+        """Count one access for each knowledge id; never touches the database."""
+        alias = using or get_current_db_name()
+        push_seconds = getattr(settings, 'HELPBOT_USAGE_PUSH_SECONDS', 10)
+        push_max = getattr(settings, 'HELPBOT_USAGE_PUSH_MAX', 200)
+
+        with cls._lock:
+            cls._pending[alias].update(str(knowledge_id) for knowledge_id in knowledge_ids)
+            size = sum(len(counts) for counts in cls._pending.values())
+            due = size >= push_max or time.monotonic() - cls._pushed_at >= push_seconds
+
+        cls._ensure_pusher()
+        if due:
+            cls.push()
+
+    @classmethod
+    def _ensure_pusher(cls):
+        """Start the timer thread that pushes idle processes' counts."""
+        if cls._pusher is not None and cls._pusher.is_alive():
+            return
+        with cls._lock:
+            if cls._pusher is None or not cls._pusher.is_alive():
+                cls._pusher = threading.Thread(target=cls._push_periodically, name='helpbot-usage-push', daemon=True)
+                cls._pusher.start()
+
+    @classmethod
+    def _push_periodically(cls):
+        while True:
+            time.sleep(getattr(settings, 'HELPBOT_USAGE_PUSH_SECONDS', 10))
+            cls.push()
+
+    @classmethod
+    def push(cls):
+        """Move this process's counts to the shared buffer."""
+        with cls._lock:
+            pending = {alias: counts for alias, counts in cls._pending.items() if counts}
+            cls._pending = defaultdict(Counter)
+            cls._pushed_at = time.monotonic()
+
+        if not pending:
+            return
+        try:
+            cls._add_shared(pending)
+        except CACHE_EXCEPTIONS as e:
+            # Keep counting locally until the shared buffer is reachable
+            with cls._lock:
+                for alias, counts in pending.items():
+                    cls._pending[alias].update(counts)
+            logger.warning(f"Could not push knowledge usage counts: {e}")
+
+    @classmethod
+    def flush(cls, using: Optional[str] = None) -> int:
+        """
+        Apply buffered counts to the database.
+
+        Args:
+            using: Database alias to flush (default: every configured alias)
+
+        Returns:
+            Number of knowledge rows updated
+        """
+        cls.push()
+        aliases = [using] if using else list(settings.DATABASES)
+
+        updated = 0
+        for alias in aliases:
+            counts = cls._drain_shared(alias)
+            if not counts:
+                continue
+            try:
+                updated += cls._apply(alias, counts)
+            except DATABASE_EXCEPTIONS as e:
+                # Keep the counts for the next flush
+                cls._add_shared({alias: counts})
+                logger.error(f"Failed to flush knowledge usage on {alias}: {e}", exc_info=True)
+        return updated
+
+    @classmethod
+    def pending_counts(cls, using: str) -> Dict[str, int]:
+        """Counts not yet applied for alias (local and shared), for diagnostics."""
+        with cls._lock:
+            counts = Counter(cls._pending.get(using, Counter()))
+        client = get_raw_redis_client()
+        if client is None:
+            with cls._lock:
+                counts.update(cls._shared.get(using, Counter()))
+        else:
+            stored = client.hgetall(cache.make_key(f"{SHARED_KEY_PREFIX}:{using}"))
+            counts.update({key.decode(): int(value) for key, value in stored.items()})
+        return dict(counts)
+
+    @staticmethod
+    def _apply(alias: str, counts: Dict[str, int]) -> int:
+        from apps.helpbot.models import HelpBotKnowledge
+
+        manager = HelpBotKnowledge._base_manager.using(alias)
+        items = list(counts.items())
+        updated = 0
+        for start in range(0, len(items), UPDATE_CHUNK_SIZE):
+            chunk = items[start:start + UPDATE_CHUNK_SIZE]
+            increment = Case(
+                *[When(knowledge_id=knowledge_id, then=Value(count)) for knowledge_id, count in chunk],
+                default=Value(0),
+                output_field=IntegerField()
+            )
+            updated += manager.filter(
+                knowledge_id__in=[knowledge_id for knowledge_id, _ in chunk]
+            ).update(usage_count=F('usage_count') + increment)
+        logger.debug(f"Flushed usage for {updated} knowledge entries on {alias}")
+        return updated
+
+    @classmethod
+    def _add_shared(cls, grouped: Dict[str, Counter]):
+        client = get_raw_redis_client()
+        if client is None:
+            with cls._lock:
+                for alias, counts in grouped.items():
+                    cls._shared[alias].update(counts)
+            return
+
+        pipeline = client.pipeline(transaction=False)
+        for alias, counts in grouped.items():
+            key = cache.make_key(f"{SHARED_KEY_PREFIX}:{alias}")
+            for knowledge_id, count in counts.items():
+                pipeline.hincrby(key, knowledge_id, count)
+            pipeline.expire(key, SHARED_KEY_TTL_SECONDS)
+        pipeline.execute()
+
+    @classmethod
+    def _drain_shared(cls, alias: str) -> Dict[str, int]:
+        client = get_raw_redis_client()
+        if client is None:
+            with cls._lock:
+                return dict(cls._shared.pop(alias, Counter()))
+
+        key = cache.make_key(f"{SHARED_KEY_PREFIX}:{alias}")
+        pipeline = client.pipeline(transaction=True)
+        pipeline.hgetall(key)
+        pipeline.delete(key)
+        stored, _ = pipeline.execute()
+        return {knowledge_id.decode(): int(count) for knowledge_id, count in stored.items()}
+
+
+atexit.register(KnowledgeUsageCounter.push)
@@ -3,6 +3,7 @@ Celery tasks for HelpBot background processing.
 
 Tasks:
 - update_txtai_index_task: Incremental txtai index updates (Nov 2025)
+- flush_knowledge_usage_task: Apply buffered knowledge usage counts in bulk
 
 Following CLAUDE.md:
 - Rule #8: Mandatory timeouts for network calls
@@ -128,3 +129,32 @@ def update_txtai_index_task(self, knowledge_id, operation='update'):
             exc_info=True
         )
         return {'success': False, 'error': str(e)}
+
+
+@shared_task(
+    name='helpbot.flush_knowledge_usage',
+    bind=True,
+    time_limit=120,
+    soft_time_limit=100,
+    ignore_result=True,
+)
+def flush_knowledge_usage_task(self):
+    """
+    Apply buffered HelpBotKnowledge usage counts (beat, every minute).
+
+    Lookups only count in memory/Redis (KnowledgeUsageCounter); this task
+    drains the shared buffer and issues one UPDATE per chunk of entries.
+    Counts are kept for the next run if the database write fails.
+    """
+    from apps.core.exceptions.patterns import CACHE_EXCEPTIONS
+    from apps.helpbot.services.usage_counter import KnowledgeUsageCounter
+
+    try:
+        updated = KnowledgeUsageCounter.flush()
+        if updated:
+            logger.info("helpbot_knowledge_usage_flushed", extra={'updated': updated})
+        return {'success': True, 'updated': updated}
+
+    except CACHE_EXCEPTIONS as e:
+        logger.error(f"Cache error flushing knowledge usage: {e}")
+        return {'success': False, 'error': 'Cache error'}
@@ -28,6 +28,7 @@ from apps.helpbot.models import (
 )
 from apps.helpbot.services.conversation_service import HelpBotConversationService
 from apps.helpbot.services.knowledge_service import HelpBotKnowledgeService
+from apps.helpbot.services.usage_counter import KnowledgeUsageCounter
 from apps.helpbot.services.context_service import HelpBotContextService
 from apps.peoples.models import People
 from apps.tenants.models import Client
@@ -362,6 +363,68 @@ class TestHelpBotKnowledgeService(TestCase):
         assert knowledge.related_urls == urls
 
 
+@pytest.mark.django_db
+class TestKnowledgeUsageCounter(TestCase):
+    """Test buffered knowledge usage counting."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        KnowledgeUsageCounter.flush()
+        self.service = HelpBotKnowledgeService()
+        self.knowledge = HelpBotKnowledge.objects.create(
+            title="Password Reset",
+            content="How to reset password",
+            usage_count=3,
+            is_active=True,
+        )
+
+    def test_lookup_does_not_write_usage(self):
+        """Test get_knowledge_by_id leaves usage_count to the flush."""
+        result = self.service.get_knowledge_by_id(str(self.knowledge.knowledge_id))
+
+        self.knowledge.refresh_from_db()
+        assert result['title'] == "Password Reset"
+        assert self.knowledge.usage_count == 3
+        assert KnowledgeUsageCounter.pending_counts('default') == {str(self.knowledge.knowledge_id): 1}
+
+    def test_flush_applies_counts_in_bulk(self):
+        """Test buffered counts for several entries land in one flush."""
+        other = HelpBotKnowledge.objects.create(title="Tasks", content="How to manage tasks", is_active=True)
+        knowledge_id = str(self.knowledge.knowledge_id)
+        other_id = str(other.knowledge_id)
+
+        KnowledgeUsageCounter.record([knowledge_id, other_id], using='default')
+        KnowledgeUsageCounter.record([knowledge_id], using='default')
+        updated = KnowledgeUsageCounter.flush('default')
+
+        self.knowledge.refresh_from_db()
+        other.refresh_from_db()
+        assert updated == 2
+        assert self.knowledge.usage_count == 5
+        assert other.usage_count == 1
+        assert KnowledgeUsageCounter.pending_counts('default') == {}
+
+    def test_push_uses_shared_redis_hash(self):
+        """Test counts go to the Redis hash when the cache is django-redis."""
+        client = MagicMock()
+        knowledge_id = str(self.knowledge.knowledge_id)
+        with patch('apps.helpbot.services.usage_counter.get_raw_redis_client', return_value=client):
+            KnowledgeUsageCounter.record([knowledge_id], using='default')
+            KnowledgeUsageCounter.push()
+
+        pipeline = client.pipeline.return_value
+        assert pipeline.hincrby.call_args[0][1:] == (knowledge_id, 1)
+        pipeline.execute.assert_called_once()
+
+    def test_database_search_records_usage(self):
+        """Test search results are counted through the buffer."""
+        with patch.object(KnowledgeUsageCounter, 'record') as mock_record:
+            results = self.service._database_search("password")
+
+        assert [result['id'] for result in results] == [str(self.knowledge.knowledge_id)]
+        assert list(mock_record.call_args[0][0]) == [str(self.knowledge.knowledge_id)]
+
+
 # =============================================================================
 # CONTEXT SERVICE TESTS
 # =============================================================================
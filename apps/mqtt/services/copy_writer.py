@@ -0,0 +1,134 @@
+"""
+PostgreSQL COPY Writer
+
+Bulk insert path for the high-volume MQTT tables (DeviceTelemetry,
+GuardLocation, SensorReading). bulk_create() renders one parameterized
+INSERT per batch_size rows with ~10 bind parameters per row, which Postgres
+has to parse and plan for every statement; COPY ... FROM STDIN streams the
+rows in text format through a single statement instead.
+scripts/benchmark_mqtt_bulk_writes.py compares rows/s of both paths.
+
+COPY has no ON CONFLICT, so any error (duplicate key, bad value, a database
+that is not PostgreSQL) rolls back the COPY's savepoint and the batch is
+written with bulk_create(ignore_conflicts=True) as before.
+
+Compliance: .claude/rules.md Rule #11 (specific exceptions), Rule #17 (transactions)
+"""
+
+import json
+import logging
+from typing import Iterable, List, Optional, Sequence, Tuple, Type
+
+from django.db import connections, models, router, transaction
+
+from apps.core.exceptions.patterns import DATABASE_EXCEPTIONS
+from apps.core.tasks.base import TaskMetrics
+
+logger = logging.getLogger('mqtt.batch_processor')
+
+__all__ = ['copy_insert', 'bulk_insert', 'CopyNotSupported']
+
+
+class CopyNotSupported(Exception):
+    """The database connection cannot stream rows with COPY."""
+
+
+def _copy_fields(model: Type[models.Model]) -> List[models.Field]:
+    """Concrete columns to write: everything except the serial primary key."""
+    opts = model._meta
+    return [
+        field for field in opts.concrete_fields
+        if field is not opts.auto_field and not getattr(field, 'generated', False)
+    ]
+
+
+def _copy_value(field: models.Field, obj: models.Model, connection):
+    """Python value of a column as psycopg should dump it into COPY text format."""
+    value = field.pre_save(obj, add=True)
+    if value is None:
+        return None
+    if isinstance(field, models.JSONField):
+        return json.dumps(value, cls=field.encoder)
+    if hasattr(value, 'hexewkb'):
+        # GEOS geometry -> hex EWKB, which PostGIS parses in text COPY
+        if value.srid is None:
+            value = value.clone()
+            value.srid = field.srid
+        return value.hexewkb.decode()
+    return field.get_db_prep_save(value, connection)
+
+
+def copy_insert(model: Type[models.Model], objs: Sequence[models.Model], using: Optional[str] = None) -> int:
+    """
+    Insert model instances with COPY ... FROM STDIN.
+
+    Runs in a savepoint so a failed COPY leaves the caller's transaction
+    usable. Primary keys are not set on the instances.
+
+    Raises:
+        CopyNotSupported: Not a PostgreSQL/psycopg 3 connection
+        DATABASE_EXCEPTIONS: The COPY failed (e.g. unique violation)
+    """
+    if not objs:
+        return 0
+
+    using = using or router.db_for_write(model)
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        raise CopyNotSupported(f"COPY requires PostgreSQL, database '{using}' is {connection.vendor}")
+
+    fields = _copy_fields(model)
+    qn = connection.ops.quote_name
+    sql = f"COPY {qn(model._meta.db_table)} ({', '.join(qn(field.column) for field in fields)}) FROM STDIN"
+
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        if not hasattr(cursor.cursor, 'copy'):
+            raise CopyNotSupported("COPY requires the psycopg 3 driver")
+        with connection.wrap_database_errors, cursor.copy(sql) as copy:
+            for obj in objs:
+                copy.write_row([_copy_value(field, obj, connection) for field in fields])
+    return len(objs)
+
+
+def bulk_insert(
+    model: Type[models.Model],
+    objs: Iterable[models.Model],
+    using: Optional[str] = None,
+    method: str = 'copy',
+    batch_size: int = 500,
+) -> Tuple[int, str]:
+    """
+    Insert instances with COPY, falling back to bulk_create(ignore_conflicts=True).
+
+    Args:
+        model: Model class of the instances
+        objs: Unsaved instances
+        using: Database alias (router default if None)
+        method: 'copy' or 'bulk_create'
+        batch_size: bulk_create batch size
+
+    Returns:
+        (rows written, method actually used)
+    """
+    objs = list(objs)
+    if not objs:
+        return 0, method
+
+    if method == 'copy':
+        try:
+            return copy_insert(model, objs, using=using), 'copy'
+        except CopyNotSupported as e:
+            logger.debug(f"COPY unavailable for {model._meta.db_table}: {e}")
+        except (DATABASE_EXCEPTIONS + (ValueError, TypeError)) as e:
+            logger.warning(
+                f"COPY into {model._meta.db_table} failed for {len(objs)} rows, "
+                f"falling back to bulk_create: {e}"
+            )
+            TaskMetrics.increment_counter('mqtt_copy_fallback', {
+                'table': model._meta.db_table,
+                'error_type': type(e).__name__,
+            })
+
+    manager = model.objects.using(using) if using else model.objects
+    manager.bulk_create(objs, batch_size=batch_size, ignore_conflicts=True)
+    return len(objs), 'bulk_create'
@@ -0,0 +1,208 @@
+"""
+MQTT Ingestion Buffer
+
+Subscriber-side micro-batching for the high-volume topic classes. Instead of
+one Celery apply_async per GPS ping / telemetry / sensor message, validated
+messages are accumulated per class and handed off as one batch task once a
+class holds BATCH_SIZE messages or its oldest message is BATCH_MAX_WAIT_MS
+old. The batch tasks geofence-check and bulk insert the whole batch through
+MQTTBatchProcessor.
+
+Backpressure: when BUFFER_CAPACITY messages are pending (e.g. the broker
+connection to Celery is down), add() blocks the paho network thread for up
+to BACKPRESSURE_TIMEOUT_MS, which stops it reading from the MQTT socket;
+if the buffer is still full the message is dropped and counted.
+
+Compliance: CLAUDE.md Rule #7 (file size), Rule #11 (specific exceptions)
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from kombu.exceptions import OperationalError as BrokerOperationalError
+
+from apps.core.exceptions.patterns import CELERY_EXCEPTIONS
+from apps.core.tasks.base import TaskMetrics
+
+logger = logging.getLogger("mqtt_subscriber")
+
+__all__ = ['MQTTIngestionBuffer', 'BATCH_ROUTES']
+
+# topic class -> (batch task name, queue, priority), same queues as the per-message tasks
+BATCH_ROUTES = {
+    'device': ('process_device_telemetry_batch', 'external_api', 5),
+    'guard': ('process_guard_gps_batch', 'high_priority', 8),
+    'sensor': ('process_sensor_data_batch', 'external_api', 6),
+}
+
+Message = Tuple[str, Dict[str, Any]]
+
+
+def dispatch_batch(topic_class: str, messages: List[Message]) -> None:
+    """Queue one batch task for the messages of a topic class."""
+    from background_tasks import mqtt_handler_tasks
+
+    task_name, queue, priority = BATCH_ROUTES[topic_class]
+    getattr(mqtt_handler_tasks, task_name).apply_async(args=[messages], queue=queue, priority=priority)
+
+
+class MQTTIngestionBuffer:
+    """Thread-safe per-topic-class message buffer with size/time-bounded hand-off."""
+
+    def __init__(
+        self,
+        batch_size: int = 200,
+        max_wait_ms: int = 500,
+        capacity: int = 20000,
+        backpressure_timeout_ms: int = 2000,
+        dispatch: Callable[[str, List[Message]], None] = dispatch_batch,
+    ):
+        self.batch_size = batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.capacity = capacity
+        self.backpressure_timeout = backpressure_timeout_ms / 1000
+        self.dispatch = dispatch
+
+        self.pending: Dict[str, Deque[Message]] = defaultdict(deque)
+        self.oldest: Dict[str, float] = {}
+        self.condition = threading.Condition()
+        self.running = False
+        self.flush_thread: Optional[threading.Thread] = None
+
+        self.started_at = time.monotonic()
+        self.messages_received = 0
+        self.messages_dispatched = 0
+        self.batches_dispatched = 0
+        self.dispatch_errors = 0
+        self.messages_dropped = 0
+
+    @property
+    def total_pending(self) -> int:
+        return sum(len(messages) for messages in self.pending.values())
+
+    def start(self) -> None:
+        """Start the hand-off thread."""
+        if self.running:
+            return
+        self.running = True
+        self.flush_thread = threading.Thread(target=self._run, name='mqtt-ingestion-flush', daemon=True)
+        self.flush_thread.start()
+        logger.info(
+            f"MQTT ingestion buffer started: batch_size={self.batch_size}, "
+            f"max_wait={self.max_wait}s, capacity={self.capacity}"
+        )
+
+    def stop(self, timeout: int = 30) -> None:
+        """Stop the hand-off thread and dispatch whatever is still pending."""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        if self.flush_thread and self.flush_thread.is_alive():
+            self.flush_thread.join(timeout=timeout)
+        self.flush(force=True)
+        logger.info(f"MQTT ingestion buffer stopped: {self.get_stats()}")
+
+    def add(self, topic_class: str, topic: str, data: Dict[str, Any]) -> bool:
+        """
+        Buffer a validated message. Returns False if it was dropped because
+        the buffer stayed full for the whole backpressure timeout.
+        """
+        with self.condition:
+            if self.total_pending >= self.capacity:
+                self.condition.notify_all()
+                self.condition.wait_for(lambda: self.total_pending < self.capacity, self.backpressure_timeout)
+            if self.total_pending >= self.capacity:
+                self.messages_dropped += 1
+                dropped = True
+            else:
+                dropped = False
+                self.pending[topic_class].append((topic, data))
+                self.oldest.setdefault(topic_class, time.monotonic())
+                self.messages_received += 1
+                if len(self.pending[topic_class]) >= self.batch_size:
+                    self.condition.notify_all()
+
+        if dropped:
+            logger.warning(f"MQTT ingestion buffer full, dropped message from {topic}")
+            TaskMetrics.increment_counter('mqtt_ingest_backpressure_dropped', {'topic_prefix': topic_class})
+        return not dropped
+
+    def flush(self, force: bool = False) -> int:
+        """Dispatch every batch that is full or due (all of them with force). Returns messages dispatched."""
+        dispatched = 0
+        for topic_class, batch, age in self._take_due(force):
+            try:
+                self.dispatch(topic_class, batch)
+            except (BrokerOperationalError,) + CELERY_EXCEPTIONS as e:
+                logger.error(f"Could not dispatch {len(batch)} {topic_class} messages: {e}")
+                self._requeue(topic_class, batch)
+                with self.condition:
+                    self.dispatch_errors += 1
+                TaskMetrics.increment_counter('mqtt_ingest_dispatch_error', {'topic_prefix': topic_class})
+                continue
+            dispatched += len(batch)
+            with self.condition:
+                self.messages_dispatched += len(batch)
+                self.batches_dispatched += 1
+                self.condition.notify_all()
+            TaskMetrics.increment_counter('mqtt_ingest_batch_dispatched', {'topic_prefix': topic_class})
+            TaskMetrics.record_timing('mqtt_ingest_batch_age', age * 1000, {'topic_prefix': topic_class})
+        return dispatched
+
+    def _take_due(self, force: bool) -> List[Tuple[str, List[Message], float]]:
+        """Remove and return (topic_class, batch, age of oldest message) for due classes."""
+        now = time.monotonic()
+        due = []
+        with self.condition:
+            for topic_class, messages in self.pending.items():
+                if not messages:
+                    continue
+                age = now - self.oldest.get(topic_class, now)
+                if not (force or len(messages) >= self.batch_size or age >= self.max_wait):
+                    continue
+                while messages:
+                    count = min(len(messages), self.batch_size)
+                    due.append((topic_class, [messages.popleft() for _ in range(count)], age))
+                    if len(messages) < self.batch_size and not force:
+                        break
+                if messages:
+                    self.oldest[topic_class] = now
+                else:
+                    self.oldest.pop(topic_class, None)
+        return due
+
+    def _requeue(self, topic_class: str, batch: List[Message]) -> None:
+        """Put an undelivered batch back in front, to be retried on the next pass."""
+        with self.condition:
+            self.pending[topic_class].extendleft(reversed(batch))
+            self.oldest[topic_class] = time.monotonic()
+
+    def _run(self) -> None:
+        while True:
+            with self.condition:
+                if not self.running:
+                    return
+                self.condition.wait(self.max_wait)
+                errors_before = self.dispatch_errors
+            self.flush()
+            # Back off instead of spinning while the broker refuses batches
+            if self.dispatch_errors > errors_before:
+                time.sleep(self.max_wait)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Buffer counters and throughput since start."""
+        with self.condition:
+            elapsed = max(time.monotonic() - self.started_at, 1e-6)
+            return {
+                'messages_received': self.messages_received,
+                'messages_dispatched': self.messages_dispatched,
+                'batches_dispatched': self.batches_dispatched,
+                'dispatch_errors': self.dispatch_errors,
+                'messages_dropped': self.messages_dropped,
+                'pending': {topic_class: len(messages) for topic_class, messages in self.pending.items()},
+                'messages_per_second': round(self.messages_dispatched / elapsed, 1),
+                'avg_batch_size': round(self.messages_dispatched / self.batches_dispatched, 1) if self.batches_dispatched else 0,
+            }
@@ -73,6 +73,11 @@ BROKER_PORT = MQTT_CONFIG.get("BROKER_PORT", 1883)
 BROKER_USERNAME = MQTT_CONFIG.get("BROKER_USERNAME", "")
 BROKER_PASSWORD = MQTT_CONFIG.get("BROKER_PASSWORD", "")
 
+# Ingestion mode: "per_message" (one Celery task per message) or "batched"
+# (device/guard/sensor messages buffered and queued one task per batch)
+INGESTION_MODE = MQTT_CONFIG.get("INGESTION_MODE", "per_message")
+BATCHED_TOPIC_CLASSES = ("device", "guard", "sensor")
+
 # Security Configuration
 MAX_PAYLOAD_SIZE = 1024 * 1024  # 1MB max payload
 ALLOWED_TOPIC_PREFIXES = [
@@ -170,6 +175,17 @@ class MQTTSubscriberService:
         self.validator = MQTTPayloadValidator()
         self.running = False
 
+        # Micro-batching buffer for high-volume topics (batched ingestion mode only)
+        self.ingestion_buffer = None
+        if INGESTION_MODE == "batched":
+            from apps.mqtt.services.ingestion_buffer import MQTTIngestionBuffer
+            self.ingestion_buffer = MQTTIngestionBuffer(
+                batch_size=MQTT_CONFIG.get("BATCH_SIZE", 200),
+                max_wait_ms=MQTT_CONFIG.get("BATCH_MAX_WAIT_MS", 500),
+                capacity=MQTT_CONFIG.get("BUFFER_CAPACITY", 20000),
+                backpressure_timeout_ms=MQTT_CONFIG.get("BACKPRESSURE_TIMEOUT_MS", 2000),
+            )
+
         # Setup callbacks
         self.client.on_connect = self.on_connect
         self.client.on_disconnect = self.on_disconnect
@@ -321,6 +337,12 @@ class MQTTSubscriberService:
 
         topic_lower = topic.lower()
 
+        # Batched mode: high-volume topics go through the ingestion buffer
+        topic_class = topic_lower.split('/', 1)[0]
+        if self.ingestion_buffer is not None and topic_class in BATCHED_TOPIC_CLASSES:
+            self.ingestion_buffer.add(topic_class, topic, data)
+            return
+
         # Route based on topic prefix
         if topic_lower.startswith('device/'):
             # Device telemetry (temperature, battery, connectivity, etc.)
@@ -382,8 +404,10 @@ class MQTTSubscriberService:
                      If False, runs in background thread (loop_start).
         """
         try:
-            logger.info(f"Starting MQTT subscriber (blocking={blocking})")
+            logger.info(f"Starting MQTT subscriber (blocking={blocking}, ingestion={INGESTION_MODE})")
             self.running = True
+            if self.ingestion_buffer is not None:
+                self.ingestion_buffer.start()
 
             # Connect to broker
             self.client.connect(BROKER_ADDRESS, BROKER_PORT, keepalive=60)
@@ -418,6 +442,8 @@ class MQTTSubscriberService:
             self.running = False
             self.client.loop_stop()
             self.client.disconnect()
+            if self.ingestion_buffer is not None:
+                self.ingestion_buffer.stop()  # Queue whatever is still buffered
             logger.info("MQTT subscriber stopped")
 
     def get_status(self) -> Dict[str, Any]:
@@ -427,12 +453,16 @@ class MQTTSubscriberService:
         Returns:
             Dict containing connection status and statistics
         """
-        return {
+        status = {
             'client_id': self.client_id,
             'running': self.running,
             'connected': self.client.is_connected(),
             'broker': f"{BROKER_ADDRESS}:{BROKER_PORT}",
+            'ingestion_mode': INGESTION_MODE,
         }
+        if self.ingestion_buffer is not None:
+            status['ingestion_buffer'] = self.ingestion_buffer.get_stats()
+        return status
 
 
 def main():
@@ -0,0 +1,96 @@
+"""
+COPY Writer Tests
+
+Tests the COPY-based bulk insert path:
+- Column values rendered for COPY text format (JSON, geometry, foreign keys)
+- bulk_create fallback when COPY is unavailable or fails
+
+Following .claude/rules.md:
+- Rule #11: Specific exception handling
+"""
+
+import json
+from unittest.mock import patch
+
+from django.contrib.gis.geos import Point
+from django.db import IntegrityError, connection
+from django.utils import timezone
+
+from apps.mqtt.models import DeviceTelemetry, GuardLocation
+from apps.mqtt.services import copy_writer
+
+
+def make_telemetry(**overrides):
+    fields = {
+        'device_id': 'sensor-1',
+        'battery_level': 80,
+        'timestamp': timezone.now(),
+        'raw_data': {'battery': 80},
+    }
+    fields.update(overrides)
+    return DeviceTelemetry(**fields)
+
+
+class TestCopyValues:
+    """Values handed to psycopg's COPY writer."""
+
+    def test_serial_primary_key_not_copied(self):
+        columns = [field.column for field in copy_writer._copy_fields(DeviceTelemetry)]
+        assert DeviceTelemetry._meta.pk.column not in columns
+        assert 'raw_data' in columns
+
+    def test_json_and_geometry_rendered_as_text(self):
+        location = GuardLocation(
+            guard_id=7,
+            location=Point(77.5946, 12.9716, srid=4326),
+            timestamp=timezone.now(),
+            raw_data={'lat': 12.9716},
+        )
+        values = {
+            field.name: copy_writer._copy_value(field, location, connection)
+            for field in copy_writer._copy_fields(GuardLocation)
+            if field.name in ('guard', 'location', 'raw_data')
+        }
+
+        assert values['guard'] == 7
+        assert json.loads(values['raw_data']) == {'lat': 12.9716}
+        assert values['location'] == location.location.hexewkb.decode()
+
+
+class TestBulkInsertFallback:
+    """bulk_insert() falls back to bulk_create(ignore_conflicts=True)."""
+
+    @patch.object(DeviceTelemetry, 'objects')
+    @patch.object(copy_writer, 'copy_insert', return_value=2)
+    def test_copy_used_when_it_succeeds(self, copy_insert, objects):
+        rows, method = copy_writer.bulk_insert(DeviceTelemetry, [make_telemetry(), make_telemetry()])
+
+        assert (rows, method) == (2, 'copy')
+        objects.bulk_create.assert_not_called()
+
+    @patch.object(copy_writer, 'TaskMetrics')
+    @patch.object(DeviceTelemetry, 'objects')
+    @patch.object(copy_writer, 'copy_insert', side_effect=IntegrityError('duplicate key'))
+    def test_copy_error_falls_back_to_bulk_create(self, copy_insert, objects, metrics):
+        batch = [make_telemetry()]
+        rows, method = copy_writer.bulk_insert(DeviceTelemetry, batch, batch_size=100)
+
+        assert (rows, method) == (1, 'bulk_create')
+        objects.bulk_create.assert_called_once_with(batch, batch_size=100, ignore_conflicts=True)
+        assert metrics.increment_counter.call_args.args[0] == 'mqtt_copy_fallback'
+
+    @patch.object(DeviceTelemetry, 'objects')
+    @patch.object(copy_writer, 'copy_insert', side_effect=copy_writer.CopyNotSupported('sqlite'))
+    def test_unsupported_database_uses_bulk_create(self, copy_insert, objects):
+        rows, method = copy_writer.bulk_insert(DeviceTelemetry, [make_telemetry()])
+
+        assert method == 'bulk_create'
+        objects.bulk_create.assert_called_once()
+
+    @patch.object(DeviceTelemetry, 'objects')
+    @patch.object(copy_writer, 'copy_insert')
+    def test_bulk_create_method_skips_copy(self, copy_insert, objects):
+        copy_writer.bulk_insert(DeviceTelemetry, [make_telemetry()], method='bulk_create')
+
+        copy_insert.assert_not_called()
+        objects.bulk_create.assert_called_once()
@@ -0,0 +1,199 @@
+"""
+MQTT Ingestion Buffer Tests
+
+Tests the batched ingestion mode:
+- Size- and time-bounded hand-off (one dispatch per batch)
+- Requeue of batches the broker refused
+- Backpressure drop when the buffer stays full
+- Sensor batch task: one bulk write, per-message fire alerts
+- Telemetry / sensor batch tasks: invalid readings skip only their message
+- Guard GPS batch task: per-message validation and geofence isolation
+
+Following .claude/rules.md:
+- Rule #11: Specific exception handling
+"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+from kombu.exceptions import OperationalError
+
+from apps.mqtt.services.ingestion_buffer import MQTTIngestionBuffer
+
+
+def make_buffer(**kwargs):
+    dispatch = MagicMock()
+    defaults = {'batch_size': 3, 'max_wait_ms': 50, 'capacity': 10, 'backpressure_timeout_ms': 10}
+    defaults.update(kwargs)
+    return MQTTIngestionBuffer(dispatch=dispatch, **defaults), dispatch
+
+
+@patch('apps.mqtt.services.ingestion_buffer.TaskMetrics')
+class TestMQTTIngestionBuffer:
+    """Hand-off, requeue and backpressure behaviour."""
+
+    def test_full_batches_dispatched_as_one_task_each(self, metrics):
+        buffer, dispatch = make_buffer()
+        for i in range(7):
+            buffer.add('guard', f'guard/{i}/gps', {'guard_id': i})
+
+        assert buffer.flush() == 6
+        assert dispatch.call_count == 2
+        topic_class, batch = dispatch.call_args_list[0].args
+        assert topic_class == 'guard'
+        assert [topic for topic, _ in batch] == ['guard/0/gps', 'guard/1/gps', 'guard/2/gps']
+        assert buffer.get_stats()['pending'] == {'guard': 1}
+
+    def test_partial_batch_waits_for_max_wait(self, metrics):
+        buffer, dispatch = make_buffer()
+        buffer.add('sensor', 'sensor/door-1/status', {'state': 'open'})
+
+        assert buffer.flush() == 0
+        time.sleep(0.06)
+        assert buffer.flush() == 1
+        dispatch.assert_called_once()
+
+    def test_refused_batch_is_requeued(self, metrics):
+        buffer, dispatch = make_buffer()
+        dispatch.side_effect = OperationalError('broker down')
+        for i in range(3):
+            buffer.add('device', f'device/d{i}/telemetry', {'battery': 50})
+
+        assert buffer.flush() == 0
+        stats = buffer.get_stats()
+        assert stats['pending'] == {'device': 3}
+        assert stats['dispatch_errors'] == 1
+
+        dispatch.side_effect = None
+        assert buffer.flush() == 3
+        assert [topic for topic, _ in dispatch.call_args.args[1]] == [
+            'device/d0/telemetry', 'device/d1/telemetry', 'device/d2/telemetry'
+        ]
+
+    def test_full_buffer_drops_after_backpressure_timeout(self, metrics):
+        buffer, dispatch = make_buffer(batch_size=100, capacity=2)
+
+        assert buffer.add('device', 'device/a/telemetry', {}) is True
+        assert buffer.add('device', 'device/b/telemetry', {}) is True
+        assert buffer.add('device', 'device/c/telemetry', {}) is False
+
+        assert buffer.get_stats()['messages_dropped'] == 1
+        metrics.increment_counter.assert_called_with(
+            'mqtt_ingest_backpressure_dropped', {'topic_prefix': 'device'}
+        )
+
+    def test_stop_dispatches_everything_pending(self, metrics):
+        buffer, dispatch = make_buffer(max_wait_ms=60000)
+        buffer.start()
+        buffer.add('sensor', 'sensor/s1/status', {})
+        buffer.stop()
+
+        dispatch.assert_called_once()
+        assert buffer.get_stats()['messages_dispatched'] == 1
+
+
+class TestSensorDataBatchTask:
+    """process_sensor_data_batch writes once and alerts per message."""
+
+    @patch('background_tasks.mqtt_handler_tasks.TaskMetrics')
+    @patch('background_tasks.mqtt_handler_tasks.process_device_alert')
+    @patch('background_tasks.mqtt_batch_processor.get_batch_processor')
+    def test_batch_written_once_with_fire_alert(self, get_processor, alert_task, metrics):
+        from background_tasks.mqtt_handler_tasks import process_sensor_data_batch
+
+        processor = MagicMock()
+        processor.write_batch.return_value = 2
+        get_processor.return_value = processor
+
+        process_sensor_data_batch([
+            ('sensor/smoke-1/status', {'type': 'smoke', 'value': 150}),
+            ('sensor/door-2/status', {'type': 'door', 'state': 'open'}),
+            ('sensor', {'type': 'door'}),  # invalid topic, skipped
+        ])
+
+        processor.write_batch.assert_called_once()
+        kind, rows = processor.write_batch.call_args.args
+        assert kind == 'sensor_reading'
+        assert [row['sensor_type'] for row in rows] == ['SMOKE', 'DOOR']
+        assert rows[1]['state'] == 'OPEN'
+        alert_task.apply_async.assert_called_once()
+        assert alert_task.apply_async.call_args.kwargs['args'][0] == 'alert/fire/smoke-1'
+
+    @patch('background_tasks.mqtt_handler_tasks.TaskMetrics')
+    @patch('background_tasks.mqtt_handler_tasks.process_device_alert')
+    @patch('background_tasks.mqtt_batch_processor.get_batch_processor')
+    def test_non_numeric_value_skips_only_its_message(self, get_processor, alert_task, metrics):
+        from background_tasks.mqtt_handler_tasks import process_sensor_data_batch
+
+        processor = MagicMock()
+        get_processor.return_value = processor
+
+        process_sensor_data_batch([
+            ('sensor/temp-1/status', {'type': 'temperature', 'value': 'hot'}),  # skipped
+            ('sensor/smoke-1/status', {'type': 'smoke', 'value': '150.5'}),
+        ])
+
+        rows = processor.write_batch.call_args.args[1]
+        assert [(row['sensor_id'], row['value']) for row in rows] == [('smoke-1', 150.5)]
+        alert_task.apply_async.assert_called_once()
+
+
+class TestDeviceTelemetryBatchTask:
+    """process_device_telemetry_batch coerces readings and skips bad rows."""
+
+    @patch('background_tasks.mqtt_handler_tasks.TaskMetrics')
+    @patch('background_tasks.mqtt_batch_processor.get_batch_processor')
+    def test_bad_rows_skipped_and_numbers_coerced(self, get_processor, metrics):
+        from background_tasks.mqtt_handler_tasks import process_device_telemetry_batch
+
+        processor = MagicMock()
+        get_processor.return_value = processor
+
+        process_device_telemetry_batch([
+            ('device/dev-1/telemetry', {'battery': '15', 'signal': -70}),
+            ('device/dev-2/telemetry', {'battery': 'full'}),  # skipped
+            (f"device/{'x' * 101}/telemetry", {'battery': 80}),  # device_id too long, skipped
+            ('device/dev-3/telemetry', {'battery': 90, 'signal': 'weak'}),  # skipped
+        ])
+
+        rows = processor.write_batch.call_args.args[1]
+        assert [(row['device_id'], row['battery_level']) for row in rows] == [('dev-1', 15)]
+        metrics.increment_counter.assert_any_call('mqtt_device_low_battery', {'device_id': 'dev-1'})
+
+
+class TestGuardGpsBatchTask:
+    """process_guard_gps_batch isolates bad messages and failing geofences."""
+
+    @patch('background_tasks.mqtt_handler_tasks.TaskMetrics')
+    @patch('background_tasks.mqtt_handler_tasks.process_device_alert')
+    @patch('background_tasks.mqtt_handler_tasks._approved_locations_by_client')
+    @patch('background_tasks.mqtt_batch_processor.get_batch_processor')
+    @patch('apps.peoples.models.People')
+    def test_bad_message_and_broken_geofence_keep_rest_of_batch(
+        self, people, get_processor, geofences, alert_task, metrics
+    ):
+        from background_tasks.mqtt_handler_tasks import process_guard_gps_batch
+
+        guard = MagicMock(id=1, peoplename='Guard One')
+        guard.organizational.client_id = 10
+        people.objects.select_related.return_value.in_bulk.return_value = {1: guard}
+        broken, outside = MagicMock(id=5), MagicMock(id=6)
+        broken.is_within_geofence.side_effect = ValueError('bad radius')
+        outside.is_within_geofence.return_value = False
+        geofences.return_value = {10: [broken, outside]}
+        processor = MagicMock()
+        processor.write_batch.return_value = 2
+        get_processor.return_value = processor
+
+        process_guard_gps_batch([
+            ('guard/1/gps', {'guard_id': 1, 'lat': 12.97, 'lon': 77.59}),
+            ('guard/1/gps', {'guard_id': 1, 'lat': 'north', 'lon': 77.59}),  # skipped
+            ('guard/1/gps', {'guard_id': 1, 'lat': '12.98', 'lon': '77.60'}),
+        ])
+
+        geofences.assert_called_once_with({10})
+        kind, rows = processor.write_batch.call_args.args
+        assert kind == 'guard_location'
+        assert len(rows) == 2
+        assert all(row['geofence_violation'] for row in rows)
+        assert alert_task.apply_async.call_count == 2
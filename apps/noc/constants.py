@@ -13,6 +13,10 @@ __all__ = [
     'INCIDENT_STATES',
     'DEFAULT_METRIC_WINDOW_MINUTES',
     'DEFAULT_ALERT_THRESHOLDS',
+    'SNAPSHOT_OPEN_TICKET_STATUSES',
+    'SNAPSHOT_OPEN_WORK_ORDER_STATUSES',
+    'DEVICE_OFFLINE_MINUTES',
+    'DEVICE_ALERT_MINUTES',
 ]
 
 
@@ -278,6 +282,13 @@ DEFAULT_ALERT_THRESHOLDS = {
 }
 
 
+# Metric snapshot definitions shared by the per-client and batch aggregation paths
+SNAPSHOT_OPEN_TICKET_STATUSES = ('NEW', 'OPEN', 'ONHOLD')
+SNAPSHOT_OPEN_WORK_ORDER_STATUSES = ('ASSIGNED', 'RE_ASSIGNED', 'INPROGRESS')
+DEVICE_OFFLINE_MINUTES = 30
+DEVICE_ALERT_MINUTES = 120
+
+
 DEFAULT_ESCALATION_DELAYS = {
     'CRITICAL': 15,  # minutes
     'HIGH': 30,
@@ -13,6 +13,7 @@ from channels.db import database_sync_to_async
 from django.utils import timezone
 from django.core.cache import cache
 from apps.noc.models import WebSocketConnection
+from apps.noc.services.event_broadcaster import GroupMemberCounter
 
 logger = logging.getLogger('noc.websocket')
 
@@ -220,6 +221,16 @@ class NOCDashboardConsumer(AsyncWebsocketConsumer):
             # Fallback for unknown event types
             await self.send(text_data=json.dumps(event))
 
+    async def noc_event_batch(self, event):
+        """
+        Handle a coalesced batch from NOCEventBroadcaster.
+
+        Each event is delivered to the browser exactly as if it had been
+        broadcast on its own.
+        """
+        for batched_event in event.get('events', []):
+            await self.handle_noc_event(batched_event)
+
     async def alert_created(self, event):
         """Handle alert created broadcast."""
         await self.send(text_data=json.dumps({
@@ -409,6 +420,7 @@ class NOCDashboardConsumer(AsyncWebsocketConsumer):
                 group_name=self.tenant_group,
                 consumer_type='noc_dashboard'
             )
+            GroupMemberCounter.joined(self.tenant_group)
             logger.debug(
                 f"Registered WebSocket connection: {self.channel_name}",
                 extra={'user_id': self.user.id, 'group': self.tenant_group}
@@ -429,6 +441,8 @@ class NOCDashboardConsumer(AsyncWebsocketConsumer):
             deleted_count, _ = WebSocketConnection.objects.filter(
                 channel_name=self.channel_name
             ).delete()
+            if deleted_count > 0 and hasattr(self, 'tenant_group'):
+                GroupMemberCounter.left(self.tenant_group)
             if deleted_count > 0:
                 logger.debug(
                     f"Unregistered WebSocket connection: {self.channel_name}",
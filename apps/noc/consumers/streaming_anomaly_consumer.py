@@ -13,7 +13,9 @@ Features:
 - Real-time event processing (<60 seconds from event to alert)
 - Rate limiting: Max 100 events/second per tenant
 - Graceful degradation on anomaly detection failures
-- Integration with existing AnomalyDetector service
+- Incremental detection: O(1) rolling per-site state per event, with a
+  periodic full AnomalyDetector scan for reconciliation
+  (STREAMING_ANOMALY_DETECTION_MODE = 'incremental' | 'full_scan')
 - Multi-tenant isolation and security
 
 Compliance with .claude/rules.md:
@@ -76,6 +78,11 @@ class StreamingAnomalyConsumer(AsyncWebsocketConsumer):
         )
         self.rate_limit_window = 1.0  # 1 second
         self.rate_limit_reset_time = time.time()
+        self.detection_mode = getattr(
+            settings,
+            'STREAMING_ANOMALY_DETECTION_MODE',
+            'incremental'
+        )
 
     async def connect(self):
         """Handle WebSocket connection with authentication and group subscription."""
@@ -125,6 +132,9 @@ class StreamingAnomalyConsumer(AsyncWebsocketConsumer):
         if self.group_name:
             await self.channel_layer.group_discard(self.group_name, self.channel_name)
 
+        # Push buffered metrics from the sync worker thread that recorded them
+        await self._flush_metrics()
+
         # Log connection stats
         if self.connection_start:
             duration = time.time() - self.connection_start
@@ -187,10 +197,11 @@ class StreamingAnomalyConsumer(AsyncWebsocketConsumer):
         try:
             # Process event through anomaly detector
             start_time = time.time()
-            findings = await self._detect_anomalies(event_type, event_data)
+            findings = await self._detect_anomalies(event_type, event_data, event_id)
             detection_latency_ms = (time.time() - start_time) * 1000
 
             self.event_count += 1
+            await self._record_metrics(event_type, detection_latency_ms, len(findings))
 
             # Send findings to client
             if findings:
@@ -295,29 +306,43 @@ class StreamingAnomalyConsumer(AsyncWebsocketConsumer):
         return None
 
     @sync_to_async
-    def _detect_anomalies(self, event_type: str, event_data: Dict[str, Any]) -> list:
+    def _record_metrics(self, event_type: str, detection_latency_ms: float, findings_count: int):
+        """Export per-event detection latency through StreamingAnomalyService."""
+        from apps.noc.services.streaming_anomaly_service import StreamingAnomalyService
+
+        StreamingAnomalyService.record_event_processed(
+            tenant_id=self.tenant_id,
+            event_type=event_type,
+            detection_latency_ms=detection_latency_ms,
+            findings_count=findings_count
+        )
+
+    @sync_to_async
+    def _flush_metrics(self):
+        from apps.noc.services.streaming_anomaly_service import StreamingAnomalyService
+
+        StreamingAnomalyService.flush_metrics()
+
+    @sync_to_async
+    def _detect_anomalies(self, event_type: str, event_data: Dict[str, Any], event_id: Optional[str] = None) -> list:
         """
         Run anomaly detection on event (sync operation).
 
+        In incremental mode the event updates rolling per-site state and only
+        periodically triggers a full site scan; in full_scan mode every event
+        re-runs AnomalyDetector for the site.
+
         Returns list of finding dicts.
         """
-        from apps.noc.security_intelligence.services.anomaly_detector import AnomalyDetector
-        from apps.client_onboarding.models import Bt
-
-        # Get site from event data
-        site_id = event_data.get('site_id') or event_data.get('bu_id')
-        if not site_id:
-            logger.warning("No site_id in event data")
-            return []
-
-        try:
-            site = Bt.objects.get(id=site_id, tenant_id=self.tenant_id)
-        except Bt.DoesNotExist:
-            logger.warning(f"Site {site_id} not found for tenant {self.tenant_id}")
-            return []
-
-        # Run anomaly detection
-        findings = AnomalyDetector.detect_anomalies_for_site(site)
+        if self.detection_mode == 'incremental':
+            from apps.noc.security_intelligence.services.incremental_anomaly_detector import (
+                IncrementalAnomalyDetector
+            )
+            findings = IncrementalAnomalyDetector.process_event(
+                self.tenant_id, event_type, event_data, event_id
+            )
+        else:
+            findings = self._full_scan(event_data)
 
         # Convert findings to dicts for JSON serialization
         return [
@@ -333,3 +358,22 @@ class StreamingAnomalyConsumer(AsyncWebsocketConsumer):
             }
             for finding in findings
         ]
+
+    def _full_scan(self, event_data: Dict[str, Any]) -> list:
+        """Run the full AnomalyDetector site scan for the event's site."""
+        from apps.noc.security_intelligence.services.anomaly_detector import AnomalyDetector
+        from apps.client_onboarding.models import Bt
+
+        # Get site from event data
+        site_id = event_data.get('site_id') or event_data.get('bu_id')
+        if not site_id:
+            logger.warning("No site_id in event data")
+            return []
+
+        try:
+            site = Bt.objects.get(id=site_id, tenant_id=self.tenant_id)
+        except Bt.DoesNotExist:
+            logger.warning(f"Site {site_id} not found for tenant {self.tenant_id}")
+            return []
+
+        return AnomalyDetector.detect_anomalies_for_site(site)
@@ -19,7 +19,9 @@ from .non_negotiables_service import NonNegotiablesService
 from .real_time_audit_orchestrator import RealTimeAuditOrchestrator
 from .evidence_collector import EvidenceCollector
 from .baseline_calculator import BaselineCalculator
+from .bulk_baseline_engine import BulkBaselineEngine
 from .anomaly_detector import AnomalyDetector
+from .incremental_anomaly_detector import IncrementalAnomalyDetector
 from .signal_correlation_engine import SignalCorrelationEngine
 from .finding_categorizer import FindingCategorizer
 from .runbook_matcher import RunbookMatcher
@@ -39,7 +41,9 @@ __all__ = [
     'RealTimeAuditOrchestrator',
     'EvidenceCollector',
     'BaselineCalculator',
+    'BulkBaselineEngine',
     'AnomalyDetector',
+    'IncrementalAnomalyDetector',
     'SignalCorrelationEngine',
     'FindingCategorizer',
     'RunbookMatcher',
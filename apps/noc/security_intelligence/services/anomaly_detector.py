@@ -11,10 +11,12 @@ Follows .claude/rules.md:
 """
 
 import logging
+from datetime import timedelta
+from django.db import DatabaseError
 from django.utils import timezone
 
 from apps.noc.security_intelligence.models import BaselineProfile, AuditFinding
-from apps.noc.security_intelligence.services.activity_signal_collector import ActivitySignalCollector
+from apps.noc.security_intelligence.services.bulk_baseline_engine import BulkBaselineEngine
 
 logger = logging.getLogger('noc.anomaly_detector')
 
@@ -53,21 +55,22 @@ class AnomalyDetector:
             ]
 
             findings = []
+            signals = BulkBaselineEngine.site_metric_values(site.id, now - timedelta(minutes=60), now)
 
             for metric_type in metric_types:
-                finding = cls._detect_metric_anomaly(site, metric_type, hour_of_week)
+                finding = cls._detect_metric_anomaly(site, metric_type, hour_of_week, signals)
                 if finding:
                     findings.append(finding)
 
             logger.info(f"Detected {len(findings)} anomalies for {site.buname}")
             return findings
 
-        except (ValueError, AttributeError) as e:
+        except (ValueError, AttributeError, DatabaseError) as e:
             logger.error(f"Anomaly detection error: {e}", exc_info=True)
             return []
 
     @classmethod
-    def _detect_metric_anomaly(cls, site, metric_type, hour_of_week):
+    def _detect_metric_anomaly(cls, site, metric_type, hour_of_week, signals=None):
         """
         Detect anomaly for single metric type.
 
@@ -75,6 +78,7 @@ class AnomalyDetector:
             site: Bt instance
             metric_type: String metric type
             hour_of_week: Integer 0-167
+            signals: Site-wide metric values for the last hour, if already collected
 
         Returns:
             AuditFinding or None
@@ -93,7 +97,7 @@ class AnomalyDetector:
                 return None
 
             # Get current observed value
-            observed_value = cls._get_current_metric_value(site, metric_type)
+            observed_value = cls._get_current_metric_value(site, metric_type, signals)
             if observed_value is None:
                 return None
 
@@ -117,39 +121,20 @@ class AnomalyDetector:
             return None
 
     @classmethod
-    def _get_current_metric_value(cls, site, metric_type):
-        """Get current observed value for metric."""
-        try:
-            # Get active person for this site (simplified)
-            from apps.peoples.models import People
-            person = People.objects.filter(
-                tenant=site.tenant,
-                peopleorganizational__bu=site,
-                isactive=True
-            ).first()
-
-            if not person:
-                return None
-
-            # Collect signals for last hour
-            signals = ActivitySignalCollector.collect_all_signals(
-                person=person,
-                site=site,
-                window_minutes=60
-            )
-
-            # Map metric type to signal key
-            metric_map = {
-                'phone_events': 'phone_events_count',
-                'location_updates': 'location_updates_count',
-                'movement_distance': 'movement_distance_meters',
-                'tasks_completed': 'tasks_completed_count',
-                'tour_checkpoints': 'tour_checkpoints_scanned',
-            }
+    def _get_current_metric_value(cls, site, metric_type, signals=None):
+        """
+        Site-wide value over the last 60 minutes.
 
-            return float(signals.get(metric_map.get(metric_type, metric_type), 0))
+        Counted by BulkBaselineEngine.site_metric_values, the same definition
+        the hour-of-week baselines are learned from.
+        """
+        try:
+            if signals is None:
+                now = timezone.now()
+                signals = BulkBaselineEngine.site_metric_values(site.id, now - timedelta(minutes=60), now)
+            return float(signals.get(metric_type, 0.0))
 
-        except (ValueError, AttributeError) as e:
+        except (ValueError, AttributeError, DatabaseError) as e:
             logger.error(f"Current metric value error: {e}", exc_info=True)
             return None
 
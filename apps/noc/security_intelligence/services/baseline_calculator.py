@@ -12,11 +12,12 @@ Follows .claude/rules.md:
 
 import logging
 from datetime import timedelta, date
+from django.db import DatabaseError
 from django.utils import timezone
 from django.db.models import Avg, StdDev, Min, Max, Count
 
 from apps.noc.security_intelligence.models import BaselineProfile
-from apps.noc.security_intelligence.services.activity_signal_collector import ActivitySignalCollector
+from apps.noc.security_intelligence.services.bulk_baseline_engine import BulkBaselineEngine
 
 logger = logging.getLogger('noc.baseline_calculator')
 
@@ -121,6 +122,9 @@ class BaselineCalculator:
         """
         Get actual metric value for a specific hour.
 
+        Site-wide, as counted by BulkBaselineEngine.site_metric_values, so
+        profiles learned here and by the bulk engine share one definition.
+
         Args:
             site: Bt instance
             metric_type: String metric type
@@ -131,38 +135,14 @@ class BaselineCalculator:
         """
         try:
             start_time = datetime_obj
+            if timezone.is_naive(start_time):
+                start_time = timezone.make_aware(start_time)
             end_time = start_time + timedelta(hours=1)
 
-            # Get active people for this site (simplified - using first active person)
-            from apps.peoples.models import People
-            person = People.objects.filter(
-                tenant=site.tenant,
-                peopleorganizational__bu=site,
-                isactive=True
-            ).first()
-
-            if not person:
-                return None
-
-            # Collect signals for this hour
-            signals = ActivitySignalCollector.collect_all_signals(
-                person=person,
-                site=site,
-                window_minutes=60
-            )
-
-            # Map metric type to signal key
-            metric_map = {
-                'phone_events': 'phone_events_count',
-                'location_updates': 'location_updates_count',
-                'movement_distance': 'movement_distance_meters',
-                'tasks_completed': 'tasks_completed_count',
-                'tour_checkpoints': 'tour_checkpoints_scanned',
-            }
-
-            return float(signals.get(metric_map.get(metric_type, metric_type), 0))
+            signals = BulkBaselineEngine.site_metric_values(site.id, start_time, end_time)
+            return float(signals.get(metric_type, 0.0))
 
-        except (ValueError, AttributeError) as e:
+        except (ValueError, AttributeError, DatabaseError) as e:
             logger.error(f"Metric value calculation error: {e}", exc_info=True)
             return None
 
@@ -0,0 +1,313 @@
+"""
+Incremental Anomaly Detector Service.
+
+Streaming counterpart to AnomalyDetector. Keeps rolling per-site state in
+process memory (windowed counters, EWMA mean/variance, last-seen times) and
+updates it in O(1) per event instead of re-scanning the site's history.
+
+Events can only raise activity counts, so the incremental path checks for
+ABOVE-baseline anomalies. A metric is only counted from the stream whose
+source and trigger match its baseline (BulkBaselineEngine):
+
+    phone_events     <- DeviceEventlog created ('device' events)
+    tasks_completed  <- Jobneed saved as COMPLETED ('task' events)
+
+Absence (BELOW) anomalies and metrics with no matching stream (location
+updates from attendance Tracking, tour checkpoints, movement distance) are
+covered by a periodic full AnomalyDetector scan per site (reconciliation).
+
+Follows .claude/rules.md:
+- Rule #7: Service < 150 lines (state containers kept separate)
+- Rule #8: Methods < 30 lines
+- Rule #11: Specific exception handling
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.noc.security_intelligence.models import BaselineProfile
+from apps.noc.security_intelligence.services.anomaly_detector import AnomalyDetector
+
+logger = logging.getLogger('noc.anomaly_detector')
+
+__all__ = ['IncrementalAnomalyDetector', 'RollingMetric', 'SiteStreamState']
+
+METRIC_TYPES = (
+    'phone_events',
+    'location_updates',
+    'movement_distance',
+    'tasks_completed',
+    'tour_checkpoints',
+)
+
+
+class RollingMetric:
+    """
+    Sliding one-hour event count in per-minute buckets plus an EWMA.
+
+    The EWMA mean/variance tracks the windowed count, sampled each time a
+    minute bucket closes, giving a short-term view of the metric alongside
+    the hour-of-week baseline.
+    """
+
+    __slots__ = ('buckets', 'window_total', 'current_minute', 'ewma_mean', 'ewma_var', 'samples', 'last_seen')
+
+    WINDOW_MINUTES = 60
+    EWMA_SPAN_MINUTES = 30
+    ALPHA = 2.0 / (EWMA_SPAN_MINUTES + 1)
+
+    def __init__(self):
+        self.buckets = [0.0] * self.WINDOW_MINUTES
+        self.window_total = 0.0
+        self.current_minute: Optional[int] = None
+        self.ewma_mean = 0.0
+        self.ewma_var = 0.0
+        self.samples = 0
+        self.last_seen: Optional[float] = None
+
+    def add(self, minute: int, value: float = 1.0, timestamp: Optional[float] = None):
+        """Record value at the given epoch minute."""
+        self.advance(minute)
+        self.buckets[minute % self.WINDOW_MINUTES] += value
+        self.window_total += value
+        self.last_seen = timestamp
+
+    def advance(self, minute: int) -> float:
+        """Roll the window forward to minute; returns the windowed total."""
+        if self.current_minute is None:
+            self.current_minute = minute
+            return self.window_total
+        elapsed = minute - self.current_minute
+        if elapsed <= 0:
+            return self.window_total
+
+        self._update_ewma(self.window_total)
+        if elapsed >= self.WINDOW_MINUTES:
+            self.buckets = [0.0] * self.WINDOW_MINUTES
+            self.window_total = 0.0
+        else:
+            for step in range(1, elapsed + 1):
+                index = (self.current_minute + step) % self.WINDOW_MINUTES
+                self.window_total -= self.buckets[index]
+                self.buckets[index] = 0.0
+        self.current_minute = minute
+        return self.window_total
+
+    def _update_ewma(self, value: float):
+        if self.samples == 0:
+            self.ewma_mean = value
+        else:
+            delta = value - self.ewma_mean
+            self.ewma_mean += self.ALPHA * delta
+            self.ewma_var = (1 - self.ALPHA) * (self.ewma_var + self.ALPHA * delta * delta)
+        self.samples += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            'window_count': self.window_total,
+            'ewma_mean': round(self.ewma_mean, 3),
+            'ewma_std_dev': round(self.ewma_var ** 0.5, 3),
+            'ewma_samples': self.samples,
+            'last_seen': self.last_seen,
+        }
+
+
+class SiteStreamState:
+    """Rolling detection state for one site."""
+
+    __slots__ = (
+        'site', 'metrics', 'baselines', 'baseline_hour', 'flagged_hours',
+        'recent_event_ids', 'recent_event_order', 'last_event_at', 'last_reconciled_at', 'lock',
+    )
+
+    MAX_TRACKED_EVENT_IDS = 512
+
+    def __init__(self, site):
+        self.site = site
+        self.metrics = {metric_type: RollingMetric() for metric_type in METRIC_TYPES}
+        self.baselines: Dict[str, BaselineProfile] = {}
+        self.baseline_hour: Optional[int] = None
+        self.flagged_hours: Dict[str, int] = {}
+        self.recent_event_ids = set()
+        self.recent_event_order = deque()
+        self.last_event_at: Optional[float] = None
+        self.last_reconciled_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def mark_seen(self, event_id) -> bool:
+        """Remember event_id; returns False if it was already processed."""
+        if event_id is None:
+            return True
+        if event_id in self.recent_event_ids:
+            return False
+        self.recent_event_ids.add(event_id)
+        self.recent_event_order.append(event_id)
+        if len(self.recent_event_order) > self.MAX_TRACKED_EVENT_IDS:
+            self.recent_event_ids.discard(self.recent_event_order.popleft())
+        return True
+
+    def baseline_for(self, metric_type: str, hour_of_week: int) -> Optional[BaselineProfile]:
+        """Stable baselines for the current hour, loaded with one query per hour."""
+        if self.baseline_hour != hour_of_week:
+            self.baselines = {
+                baseline.metric_type: baseline
+                for baseline in BaselineProfile.objects.filter(
+                    site=self.site,
+                    hour_of_week=hour_of_week,
+                    is_stable=True
+                )
+            }
+            self.baseline_hour = hour_of_week
+        return self.baselines.get(metric_type)
+
+
+class IncrementalAnomalyDetector:
+    """
+    Per-event anomaly detection over in-memory rolling site state.
+
+    One state object per (tenant, site) lives for the life of the process;
+    the Bt row is loaded once when a site is first seen.
+    """
+
+    _states: Dict[Tuple[int, int], SiteStreamState] = {}
+    _states_lock = threading.Lock()
+
+    @classmethod
+    def process_event(cls, tenant_id: int, event_type: str, event_data: dict, event_id=None) -> List:
+        """
+        Update site state for one event and return any new AuditFindings.
+
+        Args:
+            tenant_id: Tenant ID
+            event_type: 'attendance', 'task', 'device' or 'location'
+            event_data: Event payload from streaming_event_publishers
+            event_id: Event identifier used to ignore redelivered events
+
+        Returns:
+            list: AuditFinding instances created for this event
+        """
+        site_id = event_data.get('site_id') or event_data.get('bu_id')
+        if not site_id:
+            logger.warning("No site_id in event data")
+            return []
+
+        state = cls._get_state(tenant_id, site_id)
+        if state is None:
+            return []
+
+        now = timezone.now()
+        with state.lock:
+            if not state.mark_seen(event_id):
+                return []
+            findings = cls._update_metrics(state, event_type, event_data, now)
+            state.last_event_at = now.timestamp()
+            if cls._reconciliation_due(state):
+                findings.extend(cls._reconcile(state))
+        return findings
+
+    @classmethod
+    def get_site_state(cls, tenant_id: int, site_id: int) -> Optional[Dict]:
+        """Snapshot of a site's rolling metrics (for stats and debugging)."""
+        state = cls._states.get((tenant_id, int(site_id)))
+        if state is None:
+            return None
+        return {
+            'site_id': state.site.id,
+            'last_event_at': state.last_event_at,
+            'metrics': {name: metric.snapshot() for name, metric in state.metrics.items()},
+        }
+
+    @classmethod
+    def reset(cls):
+        """Drop all rolling state (used by tests)."""
+        with cls._states_lock:
+            cls._states.clear()
+
+    @classmethod
+    def _get_state(cls, tenant_id: int, site_id) -> Optional[SiteStreamState]:
+        from apps.client_onboarding.models import Bt
+
+        key = (tenant_id, int(site_id))
+        state = cls._states.get(key)
+        if state is not None:
+            return state
+        try:
+            site = Bt.objects.select_related('tenant').get(id=site_id, tenant_id=tenant_id)
+        except Bt.DoesNotExist:
+            logger.warning(f"Site {site_id} not found for tenant {tenant_id}")
+            return None
+        with cls._states_lock:
+            return cls._states.setdefault(key, SiteStreamState(site))
+
+    @classmethod
+    def _metrics_for_event(cls, event_type: str, event_data: dict) -> List[str]:
+        """Map a streamed event to the activity metrics it increments."""
+        if event_type == 'device':
+            return ['phone_events']
+        if event_type == 'task' and event_data.get('status') == 'COMPLETED':
+            return ['tasks_completed']
+        return []
+
+    @classmethod
+    def _update_metrics(cls, state: SiteStreamState, event_type: str, event_data: dict, now) -> List:
+        minute = int(now.timestamp() // 60)
+        hour_of_week = now.weekday() * 24 + now.hour
+        findings = []
+        for metric_type in cls._metrics_for_event(event_type, event_data):
+            rolling = state.metrics[metric_type]
+            rolling.add(minute, timestamp=now.timestamp())
+            finding = cls._check_metric(state, metric_type, rolling.window_total, hour_of_week)
+            if finding:
+                findings.append(finding)
+        return findings
+
+    @classmethod
+    def _check_metric(cls, state: SiteStreamState, metric_type: str, observed: float, hour_of_week: int):
+        """Flag an ABOVE-baseline anomaly at most once per site/metric/hour."""
+        if state.flagged_hours.get(metric_type) == hour_of_week:
+            return None
+        baseline = state.baseline_for(metric_type, hour_of_week)
+        if baseline is None:
+            return None
+
+        is_anomalous, z_score, threshold = baseline.is_anomalous(observed)
+        if not is_anomalous or z_score <= 0:
+            return None
+
+        state.flagged_hours[metric_type] = hour_of_week
+        return AnomalyDetector._create_anomaly_finding(
+            site=state.site,
+            metric_type=metric_type,
+            observed_value=observed,
+            baseline=baseline,
+            z_score=z_score,
+            threshold=threshold
+        )
+
+    @classmethod
+    def _reconciliation_due(cls, state: SiteStreamState) -> bool:
+        interval = getattr(settings, 'STREAMING_ANOMALY_RECONCILE_SECONDS', 300)
+        return time.monotonic() - state.last_reconciled_at >= interval
+
+    @classmethod
+    def _reconcile(cls, state: SiteStreamState) -> List:
+        """Run the full site scan and mark its findings so they are not repeated."""
+        started = time.monotonic()
+        findings = AnomalyDetector.detect_anomalies_for_site(state.site)
+        state.last_reconciled_at = time.monotonic()
+
+        for finding in findings:
+            metric_type = (finding.evidence or {}).get('metric_type')
+            if metric_type:
+                state.flagged_hours[metric_type] = (finding.evidence or {}).get('hour_of_week')
+
+        duration_ms = (state.last_reconciled_at - started) * 1000
+        from apps.noc.services.streaming_anomaly_service import StreamingAnomalyService
+        StreamingAnomalyService.record_reconciliation(state.site.tenant_id, duration_ms, len(findings))
+        return findings
@@ -0,0 +1,115 @@
+"""
+Unit Tests for BulkBaselineEngine.
+
+Tests hour-of-week folding, parallel variance merging, the bulk upsert and
+the shared site-wide metric values used by the detector.
+Follows .claude/rules.md testing standards.
+"""
+
+import statistics
+import pytest
+from collections import Counter
+from datetime import date, timedelta
+from django.utils import timezone
+from unittest.mock import patch
+
+from apps.noc.security_intelligence.models import BaselineProfile
+from apps.noc.security_intelligence.services.bulk_baseline_engine import (
+    BulkBaselineEngine,
+    HourOfWeekStats,
+)
+
+
+class TestHourOfWeekStats:
+    """Test accumulator statistics against the statistics module."""
+
+    def test_zero_hours_count_as_samples(self):
+        stats = HourOfWeekStats.from_values(4, [2.0, 6.0])
+        samples = [2.0, 6.0, 0.0, 0.0]
+
+        assert stats.mean == pytest.approx(statistics.mean(samples))
+        assert stats.m2 / (stats.count - 1) == pytest.approx(statistics.variance(samples))
+        assert stats.min_value == 0.0
+        assert stats.max_value == 6.0
+
+    def test_min_is_observed_when_every_hour_active(self):
+        stats = HourOfWeekStats.from_values(2, [3.0, 5.0])
+        assert stats.min_value == 3.0
+
+    def test_merge_matches_single_pass_variance(self):
+        first, second = [1.0, 4.0, 4.0], [7.0, 0.0]
+        stored = BaselineProfile(
+            mean=statistics.mean(first),
+            std_dev=statistics.stdev(first),
+            min_value=1.0,
+            max_value=4.0,
+            sample_count=len(first),
+        )
+
+        merged = BulkBaselineEngine._merged_profile(
+            (1, 'phone_events', 10), HourOfWeekStats.from_values(2, [7.0]), stored, 1, date.today()
+        )
+
+        assert merged.sample_count == 5
+        assert merged.mean == pytest.approx(statistics.mean(first + second))
+        assert merged.std_dev == pytest.approx(statistics.stdev(first + second))
+        assert (merged.min_value, merged.max_value) == (0.0, 7.0)
+
+
+@pytest.mark.django_db
+class TestBulkBaselineEngine:
+    """Test suite for BulkBaselineEngine service."""
+
+    def _observed(self, site_id, hour, value):
+        return {
+            'phone_events': {(site_id, hour): value},
+            'location_updates': {},
+            'movement_distance': {},
+            'tasks_completed': {},
+            'tour_checkpoints': {},
+        }
+
+    def test_calculate_upserts_all_hours_of_week(self, site_bt):
+        hour = timezone.localtime().replace(minute=0, second=0, microsecond=0) - timedelta(hours=1)
+        hour_of_week = hour.weekday() * 24 + hour.hour
+
+        with patch.object(BulkBaselineEngine, '_collect_hourly_values', return_value=self._observed(site_bt.id, hour, 5.0)):
+            first = BulkBaselineEngine.calculate_for_sites([site_bt.id], start_date=date.today() - timedelta(days=7))
+            second = BulkBaselineEngine.calculate_for_sites([site_bt.id], start_date=date.today() - timedelta(days=7))
+
+        assert first['errors'] == 0
+        assert first['baselines_created'] == 5 * 168
+        assert second['baselines_updated'] == 5 * 168
+        assert BaselineProfile.objects.filter(site=site_bt).count() == 5 * 168
+
+        profile = BaselineProfile.objects.get(site=site_bt, metric_type='phone_events', hour_of_week=hour_of_week)
+        assert profile.max_value == 5.0
+        assert profile.sample_count == 2 * BulkBaselineEngine._hour_slots(*BulkBaselineEngine._window(date.today() - timedelta(days=7)))[hour_of_week]
+
+    def test_upsert_uses_constant_queries(self, site_bt, django_assert_max_num_queries):
+        observed = self._observed(site_bt.id, timezone.localtime(), 1.0)
+        with patch.object(BulkBaselineEngine, '_collect_hourly_values', return_value=observed):
+            with django_assert_max_num_queries(6):
+                BulkBaselineEngine.calculate_for_sites([site_bt.id], days_lookback=30)
+
+    def test_hour_slots_cover_window(self):
+        start = timezone.make_aware(timezone.datetime(2025, 1, 6))  # Monday
+        slots = BulkBaselineEngine._hour_slots(start, start + timedelta(days=14))
+
+        assert slots == Counter({hour_of_week: 2 for hour_of_week in range(168)})
+
+    def test_empty_site_list(self):
+        assert BulkBaselineEngine.calculate_for_sites([])['sites'] == 0
+
+    def test_site_metric_values_sum_window_hours(self):
+        hour = timezone.localtime().replace(minute=0, second=0, microsecond=0)
+        observed = self._observed(3, hour, 4.0)
+        observed['phone_events'][(3, hour - timedelta(hours=1))] = 2.0
+
+        with patch.object(BulkBaselineEngine, '_collect_hourly_values', return_value=observed) as collect:
+            values = BulkBaselineEngine.site_metric_values(3, hour - timedelta(hours=1), hour + timedelta(hours=1), using='default')
+
+        assert collect.call_args.args[0] == [3]
+        assert values['phone_events'] == 6.0
+        assert values['tour_checkpoints'] == 0.0
+        assert set(values) == {'phone_events', 'location_updates', 'movement_distance', 'tasks_completed', 'tour_checkpoints'}
@@ -0,0 +1,130 @@
+"""
+Unit Tests for IncrementalAnomalyDetector.
+
+Tests rolling per-site state, ABOVE-baseline detection and reconciliation.
+Follows .claude/rules.md testing standards.
+"""
+
+import uuid
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+from unittest.mock import patch
+
+from apps.noc.security_intelligence.models import BaselineProfile
+from apps.noc.security_intelligence.services.incremental_anomaly_detector import (
+    IncrementalAnomalyDetector,
+    RollingMetric,
+)
+
+
+class TestRollingMetric:
+    """Test sliding window counters and EWMA."""
+
+    def test_window_expires_old_minutes(self):
+        metric = RollingMetric()
+        metric.add(minute=1000)
+        metric.add(minute=1000)
+        metric.add(minute=1030)
+
+        assert metric.advance(1030) == 3
+        assert metric.advance(1060) == 1  # minute 1000 left the window
+        assert metric.advance(1200) == 0
+
+    def test_ewma_tracks_window_total(self):
+        metric = RollingMetric()
+        for minute in range(100, 140):
+            metric.add(minute)
+
+        snapshot = metric.snapshot()
+        assert snapshot['ewma_samples'] == 39
+        assert 0 < snapshot['ewma_mean'] <= snapshot['window_count']
+
+
+@pytest.mark.django_db
+class TestIncrementalAnomalyDetector:
+    """Test suite for IncrementalAnomalyDetector service."""
+
+    @pytest.fixture(autouse=True)
+    def reset_state(self):
+        IncrementalAnomalyDetector.reset()
+        yield
+        IncrementalAnomalyDetector.reset()
+
+    @pytest.fixture
+    def phone_baseline(self, tenant, site_bt):
+        now = timezone.now()
+        return BaselineProfile.objects.create(
+            tenant=tenant,
+            site=site_bt,
+            metric_type='phone_events',
+            hour_of_week=now.weekday() * 24 + now.hour,
+            mean=1.0,
+            std_dev=0.5,
+            min_value=0.0,
+            max_value=2.0,
+            sample_count=50,
+            is_stable=True,
+            sensitivity='MEDIUM'
+        )
+
+    def _send(self, site, count, event_type='device', event_data=None):
+        findings = []
+        for _ in range(count):
+            findings.extend(IncrementalAnomalyDetector.process_event(
+                site.tenant_id,
+                event_type,
+                event_data or {'site_id': site.id},
+                event_id=str(uuid.uuid4())
+            ))
+        return findings
+
+    def test_above_baseline_flagged_once_per_hour(self, phone_baseline, site_bt):
+        findings = self._send(site_bt, 10)
+
+        assert len(findings) == 1
+        assert findings[0].finding_type == 'ANOMALY_PHONE_EVENTS_ABOVE'
+        state = IncrementalAnomalyDetector.get_site_state(site_bt.tenant_id, site_bt.id)
+        assert state['metrics']['phone_events']['window_count'] == 10
+
+    def test_metrics_follow_baseline_sources(self, site_bt):
+        self._send(site_bt, 2, event_type='attendance')
+        self._send(site_bt, 2, event_type='location', event_data={'site_id': site_bt.id, 'has_gps': True})
+        self._send(site_bt, 2, event_type='task', event_data={'site_id': site_bt.id, 'status': 'ASSIGNED'})
+        self._send(site_bt, 3, event_type='task', event_data={
+            'site_id': site_bt.id, 'status': 'COMPLETED', 'is_tour': True
+        })
+
+        metrics = IncrementalAnomalyDetector.get_site_state(site_bt.tenant_id, site_bt.id)['metrics']
+        assert metrics['tasks_completed']['window_count'] == 3
+        assert all(
+            metric['window_count'] == 0
+            for name, metric in metrics.items() if name != 'tasks_completed'
+        )
+
+    def test_redelivered_event_is_ignored(self, site_bt):
+        event_data = {'site_id': site_bt.id}
+        IncrementalAnomalyDetector.process_event(site_bt.tenant_id, 'device', event_data, event_id='evt-1')
+        IncrementalAnomalyDetector.process_event(site_bt.tenant_id, 'device', event_data, event_id='evt-1')
+
+        state = IncrementalAnomalyDetector.get_site_state(site_bt.tenant_id, site_bt.id)
+        assert state['metrics']['phone_events']['window_count'] == 1
+
+    def test_site_loaded_once(self, site_bt, django_assert_max_num_queries):
+        self._send(site_bt, 1)
+        with django_assert_max_num_queries(0):
+            self._send(site_bt, 5)
+
+    def test_unknown_site_returns_no_findings(self, site_bt):
+        assert IncrementalAnomalyDetector.process_event(site_bt.tenant_id, 'device', {'site_id': 999999}) == []
+        assert IncrementalAnomalyDetector.process_event(site_bt.tenant_id, 'device', {}) == []
+
+    @override_settings(STREAMING_ANOMALY_RECONCILE_SECONDS=0)
+    def test_reconciliation_runs_full_scan(self, site_bt):
+        with patch(
+            'apps.noc.security_intelligence.services.incremental_anomaly_detector.AnomalyDetector.detect_anomalies_for_site',
+            return_value=[]
+        ) as mock_scan:
+            self._send(site_bt, 2)
+
+        assert mock_scan.call_count == 2
@@ -6,6 +6,7 @@ Follows .claude/rules.md Rule #16 (controlled wildcard imports with __all__).
 """
 
 from .aggregation_service import NOCAggregationService
+from .batch_aggregation_service import NOCBatchAggregationService
 from .correlation_service import AlertCorrelationService
 from .escalation_service import EscalationService
 from .rbac_service import NOCRBACService
@@ -15,6 +16,7 @@ from .privacy_service import NOCPrivacyService
 from .incident_service import NOCIncidentService
 from .incident_context_service import IncidentContextService
 from .websocket_service import NOCWebSocketService
+from .event_broadcaster import NOCEventBroadcaster
 from .export_service import NOCExportService
 from .view_service import NOCViewService
 from .time_series_query_service import TimeSeriesQueryService
@@ -28,6 +30,7 @@ from .query_cache import QueryCache
 
 __all__ = [
     'NOCAggregationService',
+    'NOCBatchAggregationService',
     'AlertCorrelationService',
     'EscalationService',
     'NOCRBACService',
@@ -37,6 +40,7 @@ __all__ = [
     'NOCIncidentService',
     'IncidentContextService',
     'NOCWebSocketService',
+    'NOCEventBroadcaster',
     'NOCExportService',
     'NOCViewService',
     'TimeSeriesQueryService',
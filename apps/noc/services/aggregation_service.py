@@ -14,7 +14,13 @@ from django.utils import timezone
 from django.db.models import Count, Q
 from apps.core.utils_new.db_utils import get_current_db_name
 from ..models import NOCMetricSnapshot, MaintenanceWindow
-from ..constants import DEFAULT_METRIC_WINDOW_MINUTES
+from ..constants import (
+    DEFAULT_METRIC_WINDOW_MINUTES,
+    DEVICE_ALERT_MINUTES,
+    DEVICE_OFFLINE_MINUTES,
+    SNAPSHOT_OPEN_TICKET_STATUSES,
+    SNAPSHOT_OPEN_WORK_ORDER_STATUSES,
+)
 from apps.core.exceptions.patterns import DATABASE_EXCEPTIONS
 
 
@@ -70,7 +76,7 @@ class NOCAggregationService:
                     **NOCAggregationService._aggregate_tickets(sites, window_start),
                     **NOCAggregationService._aggregate_attendance(sites, window_end),
                     **NOCAggregationService._aggregate_work_orders(sites, window_start),
-                    **NOCAggregationService._aggregate_devices(sites),
+                    **NOCAggregationService._aggregate_devices(client),
                 }
 
                 snapshot = NOCMetricSnapshot.objects.create(**metrics)
@@ -104,7 +110,7 @@ class NOCAggregationService:
         site_ids = [s.id for s in sites]
         tickets = Ticket.objects.filter(bu_id__in=site_ids, mdtz__gte=window_start)
 
-        open_tickets = tickets.filter(status__in=['NEW', 'OPEN', 'ONHOLD']).count()
+        open_tickets = tickets.filter(status__in=SNAPSHOT_OPEN_TICKET_STATUSES).count()
 
         # IMPLEMENTED: SLA-based overdue calculation (Sprint 2)
         try:
@@ -148,7 +154,6 @@ class NOCAggregationService:
                 'attendance_present': metrics.get('attendance_present', 0),
                 'attendance_missing': metrics.get('attendance_missing', 0),
                 'attendance_late': metrics.get('attendance_late', 0),
-                'compliance_percentage': metrics.get('compliance_percentage', 100.0),
             }
 
         except DATABASE_EXCEPTIONS as e:
@@ -158,7 +163,7 @@ class NOCAggregationService:
             today_start = window_end.replace(hour=0, minute=0, second=0, microsecond=0)
             attendance = PeopleEventlog.objects.filter(bu_id__in=site_ids, cdtz__gte=today_start)
             present_count = attendance.filter(
-                Q(checkin__isnull=False) | Q(checkout__isnull=False)
+                Q(punchintime__isnull=False) | Q(punchouttime__isnull=False)
             ).distinct('people').count()
 
             return {
@@ -170,23 +175,29 @@ class NOCAggregationService:
 
     @staticmethod
     def _aggregate_work_orders(sites, window_start) -> Dict[str, Any]:
-        """Aggregate work order metrics."""
-        from apps.work_order_management.models import WorkOrder
+        """
+        Aggregate work order metrics.
+
+        Open work orders past their expirydatetime are overdue, the rest pending.
+        """
+        from apps.work_order_management.models import Wom
 
         site_ids = [s.id for s in sites]
-        work_orders = WorkOrder.objects.filter(bu_id__in=site_ids, mdtz__gte=window_start)
+        work_orders = Wom.objects.filter(bu_id__in=site_ids, mdtz__gte=window_start)
 
-        pending = work_orders.filter(status='PENDING').count()
-        overdue = work_orders.filter(status='OVERDUE').count()
+        open_orders = work_orders.filter(workstatus__in=SNAPSHOT_OPEN_WORK_ORDER_STATUSES)
+        overdue = open_orders.filter(expirydatetime__lt=timezone.now()).count()
+        pending = open_orders.count() - overdue
+        status_mix = dict(work_orders.values('workstatus').annotate(count=Count('id')).values_list('workstatus', 'count'))
 
         return {
             'work_orders_pending': pending,
             'work_orders_overdue': overdue,
-            'work_orders_status_mix': {},
+            'work_orders_status_mix': status_mix,
         }
 
     @staticmethod
-    def _aggregate_devices(sites) -> Dict[str, Any]:
+    def _aggregate_devices(client) -> Dict[str, Any]:
         """
         Aggregate device health metrics using onboarding.Device model.
 
@@ -196,27 +207,23 @@ class NOCAggregationService:
         - Total registered devices
         """
         from apps.client_onboarding.models import Device
-        from django.utils import timezone
-        from datetime import timedelta
-
-        site_ids = [s.id for s in sites]
 
-        # Query enabled devices for these sites
+        # Devices are registered against the client, not a site
         devices = Device.objects.filter(
-            bu_id__in=site_ids,
+            client_id=client.id,
             isdeviceon=True  # Only count administratively enabled devices
         )
 
         total_devices = devices.count()
 
         # Calculate offline devices (no communication in 30+ minutes)
-        offline_threshold = timezone.now() - timedelta(minutes=30)
+        offline_threshold = timezone.now() - timedelta(minutes=DEVICE_OFFLINE_MINUTES)
         offline_devices = devices.filter(
             lastcommunication__lt=offline_threshold
         ).count()
 
         # Calculate critical alerts (offline >2 hours)
-        alert_threshold = timezone.now() - timedelta(hours=2)
+        alert_threshold = timezone.now() - timedelta(minutes=DEVICE_ALERT_MINUTES)
         alert_devices = devices.filter(
             lastcommunication__lt=alert_threshold
         ).count()
@@ -0,0 +1,242 @@
+"""
+NOC Alert Cluster Index for Vectorized Similarity Scoring.
+
+Process-resident, per-tenant index of active AlertCluster feature vectors.
+Keeps L2-normalized vectors in a NumPy matrix so a new alert (or a batch of
+alerts) is scored against every active cluster with one matrix product
+instead of a DB load plus a pure-Python cosine loop per cluster.
+
+The index is a cache, not the source of truth: entries are validated against
+the database before use and the whole index is reloaded periodically so that
+clusters created by other worker processes are picked up.
+Follows .claude/rules.md Rule #8 (methods <50 lines), Rule #11 (specific exceptions).
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+__all__ = ['AlertClusterIndex', 'FEATURE_DIMENSIONS', 'features_to_vector']
+
+logger = logging.getLogger('noc.clustering')
+
+FEATURE_DIMENSIONS = 9
+
+
+def features_to_vector(features: Dict[str, Any]) -> np.ndarray:
+    """
+    Convert a clustering feature dict to a float64 vector.
+
+    Mirrors AlertClusteringService._to_vector so cosine scores are identical.
+    """
+    return np.array([
+        float(features.get('alert_type_encoded', 0)),
+        float(features.get('entity_type_encoded', 0)),
+        float(features.get('site_id', 0)),
+        float(features.get('severity_score', 0)),
+        float(features.get('hour_of_day', 0)),
+        float(features.get('day_of_week', 0)),
+        float(features.get('correlation_id_hash', 0)),
+        float(features.get('time_since_last_alert', 0)) / 3600,  # Normalize to hours
+        float(features.get('affected_entity_count', 0)),
+    ], dtype=np.float64)
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize rows; zero rows stay zero so they score 0.0."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class AlertClusterIndex:
+    """
+    In-memory matrix of active cluster vectors for a single tenant.
+
+    Rows are L2-normalized, so cosine similarity against a normalized query
+    is a plain dot product. Expired rows are masked at query time using the
+    per-row last_alert_at timestamp and compacted lazily.
+    """
+
+    REFRESH_SECONDS = 60  # Reload from DB to pick up other processes' clusters
+    INITIAL_CAPACITY = 64
+
+    _registry: Dict[int, 'AlertClusterIndex'] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, tenant_id: int, max_clusters: int):
+        self.tenant_id = tenant_id
+        self.max_clusters = max_clusters
+        self._lock = threading.RLock()
+        self._vectors = np.zeros((self.INITIAL_CAPACITY, FEATURE_DIMENSIONS), dtype=np.float64)
+        self._last_alert_ts = np.zeros(self.INITIAL_CAPACITY, dtype=np.float64)
+        self._ids: List[Any] = []
+        self._positions: Dict[Any, int] = {}
+        self._loaded_at = 0.0
+
+    @classmethod
+    def for_tenant(cls, tenant_id: int, max_clusters: int) -> 'AlertClusterIndex':
+        """Return the process-wide index for a tenant, creating it if needed."""
+        with cls._registry_lock:
+            index = cls._registry.get(tenant_id)
+            if index is None:
+                index = cls(tenant_id, max_clusters)
+                cls._registry[tenant_id] = index
+        return index
+
+    @classmethod
+    def reset_all(cls):
+        """Drop every tenant index (used by tests and after bulk deletes)."""
+        with cls._registry_lock:
+            cls._registry.clear()
+
+    @classmethod
+    def discard_tenant(cls, tenant_id: int):
+        """Forget a tenant's index so the next access reloads from the DB."""
+        with cls._registry_lock:
+            cls._registry.pop(tenant_id, None)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def invalidate(self):
+        """Mark the index stale so the next ensure_loaded reloads from the DB."""
+        self._loaded_at = 0.0
+
+    def ensure_loaded(self, cutoff: datetime):
+        """Load active clusters from the DB if never loaded or stale."""
+        if self._loaded_at and time.monotonic() - self._loaded_at < self.REFRESH_SECONDS:
+            return
+        from ..models.alert_cluster import AlertCluster
+
+        rows = AlertCluster.objects.filter(
+            tenant_id=self.tenant_id,
+            is_active=True,
+            last_alert_at__gte=cutoff
+        ).order_by('-last_alert_at').values_list(
+            'cluster_id', 'feature_vector', 'last_alert_at'
+        )[:self.max_clusters]
+        self.rebuild(rows)
+
+    def rebuild(self, rows: Iterable[Tuple[Any, Dict[str, Any], datetime]]):
+        """Replace index contents with (cluster_id, feature_vector, last_alert_at) rows."""
+        rows = list(rows)
+        capacity = max(self.INITIAL_CAPACITY, len(rows))
+        vectors = np.zeros((capacity, FEATURE_DIMENSIONS), dtype=np.float64)
+        timestamps = np.zeros(capacity, dtype=np.float64)
+        ids = []
+        for position, (cluster_id, features, last_alert_at) in enumerate(rows):
+            vectors[position] = features_to_vector(features or {})
+            timestamps[position] = last_alert_at.timestamp()
+            ids.append(cluster_id)
+        count = len(ids)
+        vectors[:count] = _normalize_rows(vectors[:count])
+
+        with self._lock:
+            self._vectors = vectors
+            self._last_alert_ts = timestamps
+            self._ids = ids
+            self._positions = {cluster_id: pos for pos, cluster_id in enumerate(ids)}
+            self._loaded_at = time.monotonic()
+        logger.debug(f"Cluster index rebuilt for tenant {self.tenant_id}: {count} clusters")
+
+    def upsert(self, cluster_id, features: Dict[str, Any], last_alert_at: datetime):
+        """Insert a new cluster or replace an existing cluster's vector."""
+        vector = _normalize_rows(features_to_vector(features).reshape(1, -1))[0]
+        with self._lock:
+            position = self._positions.get(cluster_id)
+            if position is None:
+                if len(self._ids) >= self.max_clusters:
+                    self._evict_oldest()
+                position = len(self._ids)
+                self._grow_to(position + 1)
+                self._ids.append(cluster_id)
+                self._positions[cluster_id] = position
+            self._vectors[position] = vector
+            self._last_alert_ts[position] = last_alert_at.timestamp()
+
+    def touch(self, cluster_id, last_alert_at: datetime):
+        """Record a new alert joining a cluster (extends its active window)."""
+        with self._lock:
+            position = self._positions.get(cluster_id)
+            if position is not None:
+                self._last_alert_ts[position] = max(
+                    self._last_alert_ts[position], last_alert_at.timestamp()
+                )
+
+    def remove(self, cluster_ids: Iterable[Any]):
+        """Remove clusters (deactivated, deleted or merged away)."""
+        with self._lock:
+            doomed = {self._positions[cid] for cid in cluster_ids if cid in self._positions}
+            if doomed:
+                self._compact(keep=[pos for pos in range(len(self._ids)) if pos not in doomed])
+
+    def expire(self, cutoff: datetime) -> int:
+        """Drop clusters whose last alert is older than cutoff; returns count removed."""
+        cutoff_ts = cutoff.timestamp()
+        with self._lock:
+            count = len(self._ids)
+            keep = np.nonzero(self._last_alert_ts[:count] >= cutoff_ts)[0].tolist()
+            removed = count - len(keep)
+            if removed:
+                self._compact(keep=keep)
+        return removed
+
+    def best_match(self, features: Dict[str, Any], cutoff: datetime) -> Tuple[Optional[Any], float]:
+        """Return (cluster_id, cosine similarity) of the most similar active cluster."""
+        query = features_to_vector(features).reshape(1, -1)
+        cluster_ids, scores = self.best_matches(query, cutoff)
+        return cluster_ids[0], scores[0]
+
+    def best_matches(self, queries: np.ndarray, cutoff: datetime) -> Tuple[List[Optional[Any]], List[float]]:
+        """
+        Score a (n_alerts x 9) matrix of raw feature vectors in one product.
+
+        Returns parallel lists of best cluster id (None if no positive match)
+        and best similarity for every query row.
+        """
+        queries = _normalize_rows(np.asarray(queries, dtype=np.float64))
+        with self._lock:
+            count = len(self._ids)
+            if count == 0:
+                return [None] * len(queries), [0.0] * len(queries)
+            scores = queries @ self._vectors[:count].T
+            scores[:, self._last_alert_ts[:count] < cutoff.timestamp()] = 0.0
+            best_positions = scores.argmax(axis=1)
+            best_scores = scores[np.arange(len(queries)), best_positions]
+            ids = self._ids
+
+        cluster_ids = [ids[pos] if score > 0 else None for pos, score in zip(best_positions, best_scores)]
+        return cluster_ids, [max(float(score), 0.0) for score in best_scores]
+
+    def _grow_to(self, size: int):
+        """Double matrix capacity until it holds at least size rows."""
+        capacity = len(self._vectors)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        vectors = np.zeros((capacity, FEATURE_DIMENSIONS), dtype=np.float64)
+        timestamps = np.zeros(capacity, dtype=np.float64)
+        vectors[:len(self._ids)] = self._vectors[:len(self._ids)]
+        timestamps[:len(self._ids)] = self._last_alert_ts[:len(self._ids)]
+        self._vectors, self._last_alert_ts = vectors, timestamps
+
+    def _evict_oldest(self):
+        """Drop the least recently active cluster to respect max_clusters."""
+        count = len(self._ids)
+        oldest = int(self._last_alert_ts[:count].argmin())
+        self._compact(keep=[pos for pos in range(count) if pos != oldest])
+
+    def _compact(self, keep: List[int]):
+        """Keep only the given row positions, preserving order."""
+        keep_array = np.asarray(keep, dtype=np.intp)
+        count = len(keep)
+        self._vectors[:count] = self._vectors[keep_array]
+        self._last_alert_ts[:count] = self._last_alert_ts[keep_array]
+        self._ids = [self._ids[pos] for pos in keep]
+        self._positions = {cluster_id: pos for pos, cluster_id in enumerate(self._ids)}
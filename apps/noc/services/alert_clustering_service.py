@@ -10,6 +10,7 @@ import hashlib
 import logging
 from datetime import timedelta
 from typing import Dict, Any, Tuple, Optional, List
+import numpy as np
 from django.db import transaction, DatabaseError, IntegrityError
 from django.utils import timezone
 from apps.core.exceptions.patterns import DATABASE_EXCEPTIONS
@@ -17,6 +18,7 @@ from apps.core.utils_new.db_utils import get_current_db_name
 from ..models import NOCAlertEvent
 from ..models.alert_cluster import AlertCluster
 from ..constants import ALERT_TYPES
+from .alert_cluster_index import AlertClusterIndex, features_to_vector
 
 __all__ = ['AlertClusteringService']
 
@@ -51,6 +53,9 @@ class AlertClusteringService:
         """
         Find or create cluster for new alert.
 
+        Scores the alert against the tenant's in-memory cluster index with a
+        single matrix-vector product; only the winning cluster is fetched.
+
         Args:
             new_alert: NOCAlertEvent instance to cluster
 
@@ -64,13 +69,8 @@ class AlertClusteringService:
         cluster_signature = cls._generate_signature(features)
 
         cutoff = timezone.now() - timedelta(minutes=cls.CLUSTERING_WINDOW_MINUTES)
-        active_clusters = AlertCluster.objects.filter(
-            tenant=new_alert.tenant,
-            is_active=True,
-            last_alert_at__gte=cutoff
-        ).prefetch_related('related_alerts')[:cls.MAX_ACTIVE_CLUSTERS]
-
-        best_cluster, best_score = cls._find_best_cluster(features, active_clusters)
+        index = cls._get_index(new_alert.tenant_id, cutoff)
+        best_cluster, best_score = cls._resolve_best_cluster(index, features, cutoff)
 
         try:
             with transaction.atomic(using=get_current_db_name()):
@@ -84,6 +84,131 @@ class AlertClusteringService:
             logger.error(f"Error clustering alert {new_alert.id}", extra={'error': str(e)}, exc_info=True)
             raise
 
+    @classmethod
+    def cluster_alerts(cls, alerts: List[NOCAlertEvent]) -> List[Tuple[AlertCluster, bool]]:
+        """
+        Cluster a batch of alerts, equivalent to calling cluster_alert in order.
+
+        Each tenant's alerts are scored against its cluster index with one
+        matrix product; clusters created earlier in the batch are also
+        considered so later alerts can join them.
+
+        Args:
+            alerts: NOCAlertEvent instances to cluster
+
+        Returns:
+            List of (cluster, created) tuples in input order
+
+        Raises:
+            DatabaseError: If database operation fails
+        """
+        results: List[Optional[Tuple[AlertCluster, bool]]] = [None] * len(alerts)
+        by_tenant: Dict[int, List[int]] = {}
+        for position, alert in enumerate(alerts):
+            by_tenant.setdefault(alert.tenant_id, []).append(position)
+
+        cutoff = timezone.now() - timedelta(minutes=cls.CLUSTERING_WINDOW_MINUTES)
+        for positions in by_tenant.values():
+            tenant_alerts = [alerts[pos] for pos in positions]
+            try:
+                with transaction.atomic(using=get_current_db_name()):
+                    tenant_results = cls._cluster_tenant_batch(tenant_alerts, cutoff)
+            except DATABASE_EXCEPTIONS as e:
+                logger.error(
+                    f"Error batch clustering {len(tenant_alerts)} alerts",
+                    extra={'tenant_id': tenant_alerts[0].tenant_id, 'error': str(e)},
+                    exc_info=True
+                )
+                raise
+            for pos, result in zip(positions, tenant_results):
+                results[pos] = result
+        return results
+
+    @classmethod
+    def _cluster_tenant_batch(cls, alerts: List[NOCAlertEvent], cutoff) -> List[Tuple[AlertCluster, bool]]:
+        """Cluster one tenant's alerts using a single alerts x clusters product."""
+        index = cls._get_index(alerts[0].tenant_id, cutoff)
+        features_list = [cls._extract_features(alert) for alert in alerts]
+        queries = np.vstack([features_to_vector(features) for features in features_list])
+        indexed_ids, indexed_scores = index.best_matches(queries, cutoff)
+
+        norms = np.linalg.norm(queries, axis=1)
+        normalized = queries / np.where(norms == 0, 1.0, norms)[:, None]
+        clusters: Dict[Any, AlertCluster] = {}  # One instance per cluster row in this batch
+        batch_clusters: List[AlertCluster] = []
+        batch_vectors: List[np.ndarray] = []
+        results = []
+
+        for position, alert in enumerate(alerts):
+            best_cluster, best_score = None, 0.0
+            cluster_id, score = indexed_ids[position], indexed_scores[position]
+            if cluster_id is not None and score >= cls.SIMILARITY_THRESHOLD:
+                best_cluster = clusters.get(cluster_id) or cls._fetch_active_cluster(cluster_id)
+                if best_cluster is None:
+                    index.remove([cluster_id])
+                    index.invalidate()
+                    best_cluster, score = cls._resolve_best_cluster(index, features_list[position], cutoff)
+                if best_cluster is not None:
+                    best_cluster = clusters.setdefault(best_cluster.cluster_id, best_cluster)
+                    best_score = score
+
+            if batch_vectors:
+                batch_scores = np.vstack(batch_vectors) @ normalized[position]
+                batch_best = int(batch_scores.argmax())
+                if batch_scores[batch_best] > best_score:
+                    best_cluster, best_score = batch_clusters[batch_best], float(batch_scores[batch_best])
+
+            if best_cluster and best_score >= cls.SIMILARITY_THRESHOLD:
+                cls._add_alert_to_cluster(alert, best_cluster, best_score)
+                results.append((best_cluster, False))
+            else:
+                features = features_list[position]
+                cluster = cls._create_new_cluster(alert, features, cls._generate_signature(features))
+                clusters[cluster.cluster_id] = cluster
+                batch_clusters.append(cluster)
+                batch_vectors.append(normalized[position])
+                results.append((cluster, True))
+        return results
+
+    @classmethod
+    def _get_index(cls, tenant_id: int, cutoff) -> AlertClusterIndex:
+        """Return the tenant's cluster index, loading it from the DB when stale."""
+        index = AlertClusterIndex.for_tenant(tenant_id, cls.MAX_ACTIVE_CLUSTERS)
+        index.ensure_loaded(cutoff)
+        return index
+
+    @classmethod
+    def _resolve_best_cluster(
+        cls, index: AlertClusterIndex, features: Dict[str, Any], cutoff
+    ) -> Tuple[Optional[AlertCluster], float]:
+        """
+        Find the best matching cluster via the index and load it from the DB.
+
+        If the winning entry no longer exists or is inactive (rolled back,
+        expired by another process) the index has drifted, so it is reloaded
+        from the DB once and the lookup repeated.
+        """
+        for attempt in range(2):
+            cluster_id, score = index.best_match(features, cutoff)
+            logger.debug(f"Best cluster similarity: {score:.3f}")
+            if cluster_id is None or score < cls.SIMILARITY_THRESHOLD:
+                return None, score
+            cluster = cls._fetch_active_cluster(cluster_id)
+            if cluster is not None:
+                return cluster, score
+            index.remove([cluster_id])
+            if attempt == 0:
+                index.invalidate()
+                index.ensure_loaded(cutoff)
+        return None, 0.0
+
+    @classmethod
+    def _fetch_active_cluster(cls, cluster_id) -> Optional[AlertCluster]:
+        """Load an active cluster by id, or None if it no longer qualifies."""
+        return AlertCluster.objects.filter(
+            pk=cluster_id, is_active=True
+        ).select_related('primary_alert').first()
+
     @classmethod
     def _extract_features(cls, alert: NOCAlertEvent) -> Dict[str, Any]:
         """
@@ -179,17 +304,7 @@ class AlertClusteringService:
     @classmethod
     def _to_vector(cls, features: Dict[str, Any]) -> List[float]:
         """Convert feature dict to numeric vector."""
-        return [
-            float(features.get('alert_type_encoded', 0)),
-            float(features.get('entity_type_encoded', 0)),
-            float(features.get('site_id', 0)),
-            float(features.get('severity_score', 0)),
-            float(features.get('hour_of_day', 0)),
-            float(features.get('day_of_week', 0)),
-            float(features.get('correlation_id_hash', 0)),
-            float(features.get('time_since_last_alert', 0)) / 3600,  # Normalize to hours
-            float(features.get('affected_entity_count', 0)),
-        ]
+        return features_to_vector(features).tolist()
 
     @classmethod
     def _add_alert_to_cluster(cls, alert: NOCAlertEvent, cluster: AlertCluster, confidence: float):
@@ -217,6 +332,9 @@ class AlertClusteringService:
             cluster.affected_sites.append(alert.bu.id)
 
         cluster.save()
+        AlertClusterIndex.for_tenant(cluster.tenant_id, cls.MAX_ACTIVE_CLUSTERS).touch(
+            cluster.cluster_id, cluster.last_alert_at
+        )
         logger.info(f"Alert {alert.id} added to cluster {cluster.cluster_id} (confidence: {confidence:.3f})")
 
     @classmethod
@@ -244,6 +362,9 @@ class AlertClusteringService:
             muser=alert.muser,
         )
         cluster.related_alerts.add(alert)
+        AlertClusterIndex.for_tenant(alert.tenant_id, cls.MAX_ACTIVE_CLUSTERS).upsert(
+            cluster.cluster_id, features, alert_time
+        )
         logger.info(f"Created new cluster {cluster.cluster_id} for alert {alert.id}")
         return cluster
 
@@ -261,6 +382,7 @@ class AlertClusteringService:
             is_active=True,
             last_alert_at__lt=cutoff
         ).update(is_active=False)
+        AlertClusterIndex.for_tenant(tenant.id, cls.MAX_ACTIVE_CLUSTERS).expire(cutoff)
 
         logger.info(f"Deactivated {updated} old clusters for tenant {tenant.id}")
         return updated
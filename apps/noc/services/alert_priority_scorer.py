@@ -12,8 +12,10 @@ Model files are generated internally by training command - not from untrusted so
 
 import logging
 import os
+from collections import Counter
 from datetime import timedelta
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+import numpy as np
 from django.utils import timezone
 from django.conf import settings
 from django.db.models import Avg, Count, Q
@@ -58,6 +60,21 @@ class AlertPriorityScorer:
         'BASIC': 1,
     }
 
+    # Column order of the feature matrix (also the trained model's input order)
+    FEATURE_ORDER = [
+        'severity_level',
+        'affected_sites_count',
+        'business_hours',
+        'client_tier',
+        'historical_impact',
+        'recurrence_rate',
+        'avg_resolution_time',
+        'current_site_workload',
+        'on_call_availability',
+    ]
+
+    ACTIVE_STATUSES = ['NEW', 'ACKNOWLEDGED', 'ASSIGNED']
+
     BUSINESS_HOURS_START = 8  # 8 AM
     BUSINESS_HOURS_END = 18   # 6 PM
 
@@ -102,6 +119,166 @@ class AlertPriorityScorer:
 
         return priority_score, features
 
+    @classmethod
+    def calculate_priorities(cls, alerts: List) -> List[tuple]:
+        """
+        Calculate priority scores for a batch of alerts created together.
+
+        Equivalent to calling calculate_priority on each alert right after it
+        was created, in list order: recurrence and site workload count the
+        earlier alerts of the batch but not the later ones. Features are
+        collected with grouped queries and the model (or heuristic) scores
+        the whole feature matrix at once.
+
+        Args:
+            alerts: Saved NOCAlertEvent instances, in creation order
+
+        Returns:
+            List of (priority_score: int 0-100, features: dict) per alert
+        """
+        if not alerts:
+            return []
+
+        feature_rows = cls._extract_features_bulk(alerts)
+        matrix = cls._feature_matrix(feature_rows)
+
+        try:
+            if os.path.exists(cls.MODEL_PATH):
+                scores = cls._predict_matrix_with_model(matrix)
+            else:
+                logger.debug("ML model not found, using heuristic scoring")
+                scores = cls._heuristic_scores(matrix)
+        except FILE_EXCEPTIONS as e:
+            logger.warning(f"Error in ML prediction, using heuristic: {e}")
+            scores = cls._heuristic_scores(matrix)
+
+        results = [
+            (max(0, min(100, int(score))), features)
+            for score, features in zip(scores, feature_rows)
+        ]
+        logger.info(f"Calculated priority for {len(results)} alerts")
+        return results
+
+    @classmethod
+    def _extract_features_bulk(cls, alerts: List) -> List[Dict[str, Any]]:
+        """Extract the 9 priority features for many alerts with grouped queries."""
+        alert_ids = [alert.id for alert in alerts]
+        type_keys = {(alert.tenant_id, alert.alert_type) for alert in alerts}
+        historical = {key: cls._get_historical_impact_for(*key) for key in type_keys}
+        resolution = cls._get_avg_resolution_times(type_keys)
+        recurrence_base = cls._get_recurrence_counts(type_keys, exclude_ids=alert_ids)
+        workload_base = cls._get_site_workloads(alerts, exclude_ids=alert_ids)
+
+        current_hour = timezone.now().hour
+        business_hours = 1 if cls.BUSINESS_HOURS_START <= current_hour < cls.BUSINESS_HOURS_END else 0
+        on_call = cls._get_on_call_availability()
+        seen_types, seen_sites = Counter(), Counter()
+        feature_rows = []
+
+        for alert in alerts:
+            type_key = (alert.tenant_id, alert.alert_type)
+            site_key = (alert.tenant_id, alert.bu_id)
+            seen_types[type_key] += 1
+            feature_rows.append({
+                'severity_level': cls.SEVERITY_SCORES.get(alert.severity, 3),
+                'affected_sites_count': 1 if alert.bu_id else 0,
+                'business_hours': business_hours,
+                'client_tier': cls.CLIENT_TIER_SCORES.get(cls._get_client_tier(alert.client), 3),
+                'historical_impact': historical[type_key],
+                'recurrence_rate': recurrence_base.get(type_key, 0) + seen_types[type_key],
+                'avg_resolution_time': resolution.get(type_key, 60.0),
+                'current_site_workload': (
+                    workload_base.get(site_key, 0) + seen_sites[site_key] if alert.bu_id else 0
+                ),
+                'on_call_availability': on_call,
+            })
+            if alert.status in cls.ACTIVE_STATUSES:
+                seen_sites[site_key] += 1
+
+        return feature_rows
+
+    @classmethod
+    def _get_historical_impact_for(cls, tenant_id, alert_type) -> float:
+        """Average resolution time (minutes) of recent resolved alerts of one type."""
+        from ..models import NOCAlertEvent
+
+        thirty_days_ago = timezone.now() - timedelta(days=30)
+        durations = [
+            td for td in NOCAlertEvent.objects.filter(
+                tenant_id=tenant_id,
+                alert_type=alert_type,
+                status='RESOLVED',
+                resolved_at__isnull=False,
+                cdtz__gte=thirty_days_ago
+            ).values_list('time_to_resolve', flat=True)[:100]
+            if td is not None
+        ]
+        if durations:
+            return sum(td.total_seconds() / 60 for td in durations) / len(durations)
+        return 30.0  # Default 30 minutes if no history
+
+    @classmethod
+    def _get_avg_resolution_times(cls, type_keys) -> Dict[tuple, float]:
+        """Historical MTTR (minutes) per (tenant_id, alert_type) in one grouped query."""
+        from ..models import NOCAlertEvent
+
+        ninety_days_ago = timezone.now() - timedelta(days=90)
+        rows = NOCAlertEvent.objects.filter(
+            tenant_id__in={tenant_id for tenant_id, _ in type_keys},
+            alert_type__in={alert_type for _, alert_type in type_keys},
+            status='RESOLVED',
+            time_to_resolve__isnull=False,
+            cdtz__gte=ninety_days_ago
+        ).values('tenant_id', 'alert_type').annotate(avg_duration=Avg('time_to_resolve')).order_by()
+
+        return {
+            (row['tenant_id'], row['alert_type']): row['avg_duration'].total_seconds() / 60
+            for row in rows
+            if row['avg_duration']
+        }
+
+    @classmethod
+    def _get_recurrence_counts(cls, type_keys, exclude_ids) -> Dict[tuple, int]:
+        """Alerts per (tenant_id, alert_type) in the last 24 hours, excluding the batch."""
+        from ..models import NOCAlertEvent
+
+        twenty_four_hours_ago = timezone.now() - timedelta(hours=24)
+        rows = NOCAlertEvent.objects.filter(
+            tenant_id__in={tenant_id for tenant_id, _ in type_keys},
+            alert_type__in={alert_type for _, alert_type in type_keys},
+            cdtz__gte=twenty_four_hours_ago
+        ).exclude(id__in=exclude_ids).values('tenant_id', 'alert_type').annotate(
+            total=Count('id')
+        ).order_by()
+
+        return {(row['tenant_id'], row['alert_type']): row['total'] for row in rows}
+
+    @classmethod
+    def _get_site_workloads(cls, alerts: List, exclude_ids) -> Dict[tuple, int]:
+        """Active alerts per (tenant_id, bu_id), excluding the batch."""
+        from ..models import NOCAlertEvent
+
+        site_keys = {(alert.tenant_id, alert.bu_id) for alert in alerts if alert.bu_id}
+        if not site_keys:
+            return {}
+        rows = NOCAlertEvent.objects.filter(
+            tenant_id__in={tenant_id for tenant_id, _ in site_keys},
+            bu_id__in={bu_id for _, bu_id in site_keys},
+            status__in=cls.ACTIVE_STATUSES
+        ).exclude(id__in=exclude_ids).values('tenant_id', 'bu_id').annotate(
+            total=Count('id')
+        ).order_by()
+
+        return {(row['tenant_id'], row['bu_id']): row['total'] for row in rows}
+
+    @classmethod
+    def _feature_matrix(cls, feature_rows: List[Dict[str, Any]]) -> np.ndarray:
+        """Stack feature dicts into an (n_alerts x 9) float matrix in FEATURE_ORDER."""
+        return np.array(
+            [[row[name] for name in cls.FEATURE_ORDER] for row in feature_rows],
+            dtype=np.float64
+        )
+
     @classmethod
     def _extract_features(cls, alert) -> Dict[str, Any]:
         """Extract 9 priority features from alert."""
@@ -245,8 +422,13 @@ class AlertPriorityScorer:
 
     @classmethod
     def _heuristic_score(cls, features: Dict[str, Any]) -> float:
+        """Fallback heuristic scoring when ML model not available."""
+        return float(cls._heuristic_scores(cls._feature_matrix([features]))[0])
+
+    @classmethod
+    def _heuristic_scores(cls, matrix: np.ndarray) -> np.ndarray:
         """
-        Fallback heuristic scoring when ML model not available.
+        Heuristic scores for an (n_alerts x 9) feature matrix.
 
         Weighted combination of features:
         - Severity: 30%
@@ -257,59 +439,47 @@ class AlertPriorityScorer:
         - Site workload: 10%
         - Other features: 5%
         """
-        score = 0.0
+        column = {name: matrix[:, i] for i, name in enumerate(cls.FEATURE_ORDER)}
+        score = np.zeros(len(matrix), dtype=np.float64)
 
         # Severity contribution (0-30)
-        score += (features['severity_level'] / 5.0) * 30
+        score += (column['severity_level'] / 5.0) * 30
 
         # Historical impact (0-20) - higher MTTR = higher priority
         # Normalize to 0-1 assuming max 240 minutes (4 hours)
-        impact_normalized = min(features['historical_impact'] / 240.0, 1.0)
-        score += impact_normalized * 20
+        score += np.minimum(column['historical_impact'] / 240.0, 1.0) * 20
 
         # Client tier (0-15)
-        score += (features['client_tier'] / 5.0) * 15
+        score += (column['client_tier'] / 5.0) * 15
 
         # Recurrence rate (0-10) - more frequent = higher priority
         # Normalize assuming max 50 alerts/day
-        recurrence_normalized = min(features['recurrence_rate'] / 50.0, 1.0)
-        score += recurrence_normalized * 10
+        score += np.minimum(column['recurrence_rate'] / 50.0, 1.0) * 10
 
         # Business hours boost (0-10)
-        score += features['business_hours'] * 10
+        score += column['business_hours'] * 10
 
         # Site workload (0-10) - more active alerts = higher priority
         # Normalize assuming max 20 concurrent alerts
-        workload_normalized = min(features['current_site_workload'] / 20.0, 1.0)
-        score += workload_normalized * 10
+        score += np.minimum(column['current_site_workload'] / 20.0, 1.0) * 10
 
         # On-call availability (0-5)
-        score += features['on_call_availability'] * 5
+        score += column['on_call_availability'] * 5
 
         return score
 
     @classmethod
     def _predict_with_model(cls, features: Dict[str, Any]) -> float:
         """Use trained XGBoost model for prediction."""
+        return float(cls._predict_matrix_with_model(cls._feature_matrix([features]))[0])
+
+    @classmethod
+    def _predict_matrix_with_model(cls, matrix: np.ndarray) -> np.ndarray:
+        """Predict scores for a whole feature matrix with one model load."""
         import pickle
-        import numpy as np
 
         # Load model (generated internally by train_priority_model command)
         with open(cls.MODEL_PATH, 'rb') as f:
             model = pickle.load(f)
 
-        # Convert features to array in correct order
-        feature_array = np.array([[
-            features['severity_level'],
-            features['affected_sites_count'],
-            features['business_hours'],
-            features['client_tier'],
-            features['historical_impact'],
-            features['recurrence_rate'],
-            features['avg_resolution_time'],
-            features['current_site_workload'],
-            features['on_call_availability'],
-        ]])
-
-        prediction = model.predict(feature_array)[0]
-        return float(prediction)
+        return np.asarray(model.predict(matrix), dtype=np.float64)
@@ -0,0 +1,322 @@
+"""
+NOC Batch Aggregation Service.
+
+Batch mode of NOCAggregationService: computes the metric snapshots of every
+client of a tenant in one pass instead of one create_snapshot_for_client()
+call per client.
+
+- The BU tree is read once and every site is mapped to the client(s) above it
+- Maintenance windows, tickets (with SLA overdue), attendance, work orders and
+  devices are each one grouped aggregation over all sites, rolled up to
+  clients in memory
+- All snapshots are written with a single bulk_create
+
+Each stage is timed; the timings are returned with the result and mirrored
+to Prometheus when available.
+
+Follows .claude/rules.md Rule #11 (specific exceptions), Rule #12 (query
+optimization), Rule #17 (transaction management).
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from datetime import datetime, time as dtime, timedelta
+from typing import Any, Dict, Iterable, List
+
+from django.db import transaction
+from django.db.models import Case, Count, DateTimeField, Q, Value, When
+from django.utils import timezone
+
+from apps.core.exceptions.patterns import DATABASE_EXCEPTIONS
+from apps.core.utils_new.db_utils import get_current_db_name
+from ..constants import (
+    DEVICE_ALERT_MINUTES,
+    DEVICE_OFFLINE_MINUTES,
+    SNAPSHOT_OPEN_TICKET_STATUSES,
+    SNAPSHOT_OPEN_WORK_ORDER_STATUSES,
+)
+from ..models import MaintenanceWindow, NOCMetricSnapshot
+
+try:
+    from monitoring.services.prometheus_metrics import prometheus
+    PROMETHEUS_ENABLED = True
+except ImportError:
+    PROMETHEUS_ENABLED = False
+
+__all__ = ['NOCBatchAggregationService']
+
+logger = logging.getLogger('noc.aggregation')
+
+
+def empty_metrics() -> Dict[str, Any]:
+    """Snapshot metrics of a client with no activity."""
+    return {
+        'tickets_open': 0,
+        'tickets_overdue': 0,
+        'tickets_by_priority': {},
+        'attendance_expected': 0,
+        'attendance_present': 0,
+        'attendance_missing': 0,
+        'attendance_late': 0,
+        'work_orders_pending': 0,
+        'work_orders_overdue': 0,
+        'work_orders_status_mix': {},
+        'device_health_offline': 0,
+        'device_health_alerts': 0,
+        'device_health_total': 0,
+    }
+
+
+class NOCBatchAggregationService:
+    """Creates the metric snapshots of all clients of a tenant at once."""
+
+    def __init__(self, window_minutes: int = 5):
+        self.window_minutes = window_minutes
+        self.timings = {}
+
+    def create_snapshots_for_tenant(self, tenant, client_ids: Iterable[int]) -> Dict[str, Any]:
+        """
+        Create one NOCMetricSnapshot per client not under maintenance.
+
+        Args:
+            tenant: Tenant the clients belong to
+            client_ids: Client business unit IDs
+
+        Returns:
+            {'created', 'skipped_maintenance', 'timings'} with timings in seconds per stage
+
+        Raises:
+            DatabaseError: If the snapshots cannot be written
+        """
+        self.timings = {}
+        client_ids = list(dict.fromkeys(client_ids))
+        window_end = timezone.now()
+        window_start = window_end - timedelta(minutes=self.window_minutes)
+
+        with self._timed('maintenance'):
+            in_maintenance = self._clients_in_maintenance(client_ids, window_start, window_end)
+        metrics = {client_id: empty_metrics() for client_id in client_ids if client_id not in in_maintenance}
+
+        if metrics:
+            with self._timed('sites'):
+                site_clients = self._map_sites(metrics)
+            with self._timed('tickets'):
+                self._aggregate_tickets(metrics, site_clients, window_start, window_end)
+            with self._timed('attendance'):
+                self._aggregate_attendance(metrics, site_clients, window_end)
+            with self._timed('work_orders'):
+                self._aggregate_work_orders(metrics, site_clients, window_start, window_end)
+            with self._timed('devices'):
+                self._aggregate_devices(metrics, window_end)
+
+        with self._timed('write'):
+            snapshots = [
+                NOCMetricSnapshot(
+                    tenant=tenant, client_id=client_id,
+                    window_start=window_start, window_end=window_end, **values
+                )
+                for client_id, values in metrics.items()
+            ]
+            with transaction.atomic(using=get_current_db_name()):
+                NOCMetricSnapshot.objects.bulk_create(snapshots)
+
+        logger.info("Batch snapshots created", extra={
+            'tenant_id': tenant.id, 'snapshots': len(snapshots),
+            'skipped_maintenance': len(in_maintenance), 'timings': self.timings,
+        })
+        return {'created': len(snapshots), 'skipped_maintenance': len(in_maintenance), 'timings': self.timings}
+
+    @contextmanager
+    def _timed(self, stage: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[stage] = round(time.perf_counter() - started, 4)
+            if PROMETHEUS_ENABLED:
+                prometheus.observe_histogram(
+                    'noc_snapshot_batch_stage_seconds',
+                    self.timings[stage],
+                    labels={'stage': stage},
+                    help_text='Duration of one stage of the batch NOC snapshot aggregation'
+                )
+
+    @staticmethod
+    def _clients_in_maintenance(client_ids: List[int], window_start, window_end) -> set:
+        return set(MaintenanceWindow.objects.filter(
+            client_id__in=client_ids,
+            is_active=True,
+            start_time__lte=window_end,
+            end_time__gte=window_start
+        ).values_list('client_id', flat=True))
+
+    @staticmethod
+    def _map_sites(client_ids: Iterable[int]) -> Dict[int, List[int]]:
+        """
+        site id -> ids of the given clients above it.
+
+        Same tree as BtManager.get_all_sites_of_client(): every SITE below
+        the client, so a site under nested clients counts for each of them.
+        """
+        from apps.client_onboarding.models import Bt
+
+        clients = set(client_ids)
+        parents, sites = {}, []
+        for bu_id, parent_id, tacode in Bt.objects.exclude(id=-1).values_list('id', 'parent_id', 'identifier__tacode'):
+            if parent_id not in (None, -1):
+                parents[bu_id] = parent_id
+            if tacode == 'SITE':
+                sites.append(bu_id)
+
+        site_clients = {}
+        for site_id in sites:
+            owners, node, seen = [], site_id, {site_id}
+            while node in parents and parents[node] not in seen:
+                node = parents[node]
+                seen.add(node)
+                if node in clients:
+                    owners.append(node)
+            if owners:
+                site_clients[site_id] = owners
+        return site_clients
+
+    @staticmethod
+    def _overdue_condition(now: datetime) -> Q:
+        """
+        SLA overdue as one condition: ticket older than the resolution time
+        of its client's policy, else the global policy, else
+        SLACalculator.DEFAULT_SLA_TARGETS - as SLACalculator.get_overdue_tickets().
+
+        The deadline is a single CASE per ticket; the first matching WHEN wins.
+        """
+        from apps.y_helpdesk.models.sla_policy import SLAPolicy
+        from apps.y_helpdesk.services.sla_calculator import SLACalculator
+
+        policies = list(
+            SLAPolicy.objects.filter(is_active=True)
+            .values_list('client_id', 'priority', 'resolution_time_minutes')
+        )
+        defaults = SLACalculator.DEFAULT_SLA_TARGETS
+
+        def deadline(minutes):
+            return Value(now - timedelta(minutes=minutes), output_field=DateTimeField())
+
+        whens = [When(client_id=c, priority=p, then=deadline(m)) for c, p, m in policies if c is not None]
+        whens += [When(priority=p, then=deadline(m)) for c, p, m in policies if c is None]
+        whens += [When(priority=p, then=deadline(target['resolution'])) for p, target in defaults.items()]
+        resolution_deadline = Case(
+            *whens, default=deadline(defaults['P3']['resolution']), output_field=DateTimeField()
+        )
+        return Q(cdtz__lt=resolution_deadline)
+
+    @classmethod
+    def _aggregate_tickets(cls, metrics: Dict, site_clients: Dict, window_start, now) -> None:
+        from apps.y_helpdesk.models import Ticket
+
+        is_open = Q(status__in=SNAPSHOT_OPEN_TICKET_STATUSES)
+        in_window = Q(mdtz__gte=window_start)
+        try:
+            overdue = is_open & cls._overdue_condition(now)
+        except DATABASE_EXCEPTIONS as e:
+            logger.warning(f"SLA policies unavailable, using fallback: {e}")
+            overdue = in_window & Q(status='OPEN')
+
+        rows = Ticket.objects.filter(
+            Q(bu_id__in=list(site_clients)) & (in_window | is_open)
+        ).values('bu_id', 'priority').annotate(
+            in_window=Count('id', filter=in_window),
+            open=Count('id', filter=in_window & is_open),
+            overdue=Count('id', filter=overdue),
+        )
+        for row in rows:
+            for client_id in site_clients[row['bu_id']]:
+                values = metrics[client_id]
+                values['tickets_open'] += row['open']
+                values['tickets_overdue'] += row['overdue']
+                if row['in_window']:
+                    by_priority = values['tickets_by_priority']
+                    by_priority[row['priority']] = by_priority.get(row['priority'], 0) + row['in_window']
+
+    @staticmethod
+    def _aggregate_attendance(metrics: Dict, site_clients: Dict, window_end) -> None:
+        """
+        Expected = active people assigned to the sites, present = distinct
+        people who checked in or out today, late = check-ins after 09:00 plus
+        AttendanceExpectationService.LATE_THRESHOLD_MINUTES.
+        """
+        from apps.peoples.models import Pgbelonging
+
+        site_ids = list(site_clients)
+        day_start = timezone.make_aware(datetime.combine(window_end.date(), dtime.min))
+        try:
+            expected = Pgbelonging.objects.filter(
+                assignsites_id__in=site_ids, people__enable=True, people__is_active=True
+            ).values('assignsites_id').annotate(count=Count('id'))
+            events = NOCBatchAggregationService._attendance_events(site_ids, day_start)
+            expected, events = list(expected), list(events)
+        except DATABASE_EXCEPTIONS as e:
+            logger.warning(f"Batch attendance aggregation failed, reporting zeros: {e}")
+            return
+
+        for row in expected:
+            for client_id in site_clients[row['assignsites_id']]:
+                metrics[client_id]['attendance_expected'] += row['count']
+        present = {}
+        for row in events:
+            for client_id in site_clients[row['bu_id']]:
+                metrics[client_id]['attendance_late'] += row['late']
+                if row['present']:
+                    present.setdefault(client_id, set()).add(row['people_id'])
+        for client_id, values in metrics.items():
+            values['attendance_present'] = len(present.get(client_id, ()))
+            values['attendance_missing'] = max(0, values['attendance_expected'] - values['attendance_present'])
+
+    @staticmethod
+    def _attendance_events(site_ids: List[int], day_start):
+        """Today's PeopleEventlog rows per (site, person) with present / late counts."""
+        from apps.attendance.models import PeopleEventlog
+        from apps.attendance.services.attendance_expectation_service import AttendanceExpectationService
+
+        late_after = dtime(9, AttendanceExpectationService.LATE_THRESHOLD_MINUTES)
+        return PeopleEventlog.objects.filter(
+            bu_id__in=site_ids, cdtz__gte=day_start, cdtz__lt=day_start + timedelta(days=1)
+        ).values('bu_id', 'people_id').annotate(
+            present=Count('id', filter=Q(punchintime__isnull=False) | Q(punchouttime__isnull=False)),
+            late=Count('id', filter=Q(punchintime__isnull=False, punchintime__time__gt=late_after)),
+        )
+
+    @staticmethod
+    def _aggregate_work_orders(metrics: Dict, site_clients: Dict, window_start, now) -> None:
+        from apps.work_order_management.models import Wom
+
+        is_open = Q(workstatus__in=SNAPSHOT_OPEN_WORK_ORDER_STATUSES)
+        rows = Wom.objects.filter(
+            bu_id__in=list(site_clients), mdtz__gte=window_start
+        ).values('bu_id', 'workstatus').annotate(
+            count=Count('id'),
+            open=Count('id', filter=is_open),
+            overdue=Count('id', filter=is_open & Q(expirydatetime__lt=now)),
+        )
+        for row in rows:
+            for client_id in site_clients[row['bu_id']]:
+                values = metrics[client_id]
+                values['work_orders_overdue'] += row['overdue']
+                values['work_orders_pending'] += row['open'] - row['overdue']
+                status_mix = values['work_orders_status_mix']
+                status_mix[row['workstatus']] = status_mix.get(row['workstatus'], 0) + row['count']
+
+    @staticmethod
+    def _aggregate_devices(metrics: Dict, now) -> None:
+        from apps.client_onboarding.models import Device
+
+        rows = Device.objects.filter(client_id__in=list(metrics), isdeviceon=True).values('client_id').annotate(
+            total=Count('id'),
+            offline=Count('id', filter=Q(lastcommunication__lt=now - timedelta(minutes=DEVICE_OFFLINE_MINUTES))),
+            alerts=Count('id', filter=Q(lastcommunication__lt=now - timedelta(minutes=DEVICE_ALERT_MINUTES))),
+        )
+        for row in rows:
+            values = metrics[row['client_id']]
+            values['device_health_total'] = row['total']
+            values['device_health_offline'] = row['offline']
+            values['device_health_alerts'] = row['alerts']
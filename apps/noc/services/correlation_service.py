@@ -9,7 +9,8 @@ Rule #17 (transaction management).
 import hashlib
 import uuid
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+from django.core.cache import cache
 from django.db import transaction, DatabaseError, IntegrityError
 from django.utils import timezone
 from apps.core.utils_new.db_utils import get_current_db_name
@@ -26,6 +27,8 @@ logger = logging.getLogger('noc.correlation')
 class AlertCorrelationService:
     """Service for alert de-duplication, correlation, and suppression."""
 
+    ACTIVE_STATUSES = ['NEW', 'ACKNOWLEDGED', 'ASSIGNED']
+
     @staticmethod
     def process_alert(alert_data: Dict[str, Any]) -> Optional[NOCAlertEvent]:
         """
@@ -116,6 +119,244 @@ class AlertCorrelationService:
             logger.error(f"Error processing alert", extra={'dedup_key': dedup_key, 'error': str(e)})
             raise
 
+    @staticmethod
+    def process_alerts_bulk(alerts: List[Dict[str, Any]]) -> List[Optional[NOCAlertEvent]]:
+        """
+        Process a burst of alerts with set-based de-duplication and correlation.
+
+        Produces the same results as calling process_alert on each item in
+        order, but per tenant uses one query each for maintenance windows,
+        dedup lookup and correlation, one bulk_update for duplicates and one
+        bulk_create for new alerts, then scores priority and clusters the
+        new alerts as batch post-steps.
+
+        Args:
+            alerts: List of alert_data dicts (same shape as process_alert)
+
+        Returns:
+            List parallel to alerts with the created or deduplicated
+            NOCAlertEvent, or None where suppressed by maintenance
+
+        Raises:
+            DatabaseError: If database operation fails
+            ValueError: If any alert_data is invalid
+        """
+        for alert_data in alerts:
+            if not alert_data.get('alert_type') or not alert_data.get('client'):
+                raise ValueError("Missing required fields: alert_type, client")
+
+        results: List[Optional[NOCAlertEvent]] = [None] * len(alerts)
+        by_tenant: Dict[Any, List[int]] = {}
+        for position, alert_data in enumerate(alerts):
+            by_tenant.setdefault(alert_data['tenant'].pk, []).append(position)
+
+        for positions in by_tenant.values():
+            batch = [alerts[pos] for pos in positions]
+            try:
+                tenant_results = AlertCorrelationService._process_tenant_batch(batch)
+            except IntegrityError as e:
+                # A concurrent writer created a conflicting active alert; replay serially
+                logger.warning(
+                    f"Bulk alert ingestion conflict, falling back to per-alert processing",
+                    extra={'batch_size': len(batch), 'error': str(e)}
+                )
+                tenant_results = [AlertCorrelationService.process_alert(alert_data) for alert_data in batch]
+            for pos, result in zip(positions, tenant_results):
+                results[pos] = result
+
+        return results
+
+    @staticmethod
+    def _process_tenant_batch(batch: List[Dict[str, Any]]) -> List[Optional[NOCAlertEvent]]:
+        """Dedup, correlate and create one tenant's alerts in a single transaction."""
+        tenant = batch[0]['tenant']
+        dedup_keys = [AlertCorrelationService._generate_dedup_key(alert_data) for alert_data in batch]
+        suppressed = AlertCorrelationService._maintenance_suppression_mask(tenant, batch)
+        results: List[Optional[NOCAlertEvent]] = [None] * len(batch)
+        now = timezone.now()
+
+        try:
+            with transaction.atomic(using=get_current_db_name()):
+                existing_by_key = {
+                    alert.dedup_key: alert
+                    for alert in NOCAlertEvent.objects.filter(
+                        tenant=tenant,
+                        dedup_key__in=set(dedup_keys),
+                        status__in=AlertCorrelationService.ACTIVE_STATUSES
+                    ).select_for_update()
+                }
+                duplicates: Dict[int, NOCAlertEvent] = {}
+                new_by_key: Dict[str, NOCAlertEvent] = {}
+                folded: Dict[str, List[int]] = {}  # Batch positions deduped onto new alerts
+
+                for position, (alert_data, dedup_key) in enumerate(zip(batch, dedup_keys)):
+                    if suppressed[position]:
+                        logger.info(f"Alert suppressed by maintenance window", extra={'dedup_key': dedup_key})
+                        continue
+                    target = existing_by_key.get(dedup_key) or new_by_key.get(dedup_key)
+                    if target is not None:
+                        target.suppressed_count += 1
+                        target.last_seen = now
+                        if target.pk:
+                            duplicates[target.pk] = target
+                        else:
+                            folded.setdefault(dedup_key, []).append(position)
+                    else:
+                        target = NOCAlertEvent(dedup_key=dedup_key, **alert_data)
+                        new_by_key[dedup_key] = target
+                    results[position] = target
+
+                if duplicates:
+                    NOCAlertEvent.objects.bulk_update(duplicates.values(), ['suppressed_count', 'last_seen'])
+
+                new_alerts = list(new_by_key.values())
+                AlertCorrelationService._assign_correlations(tenant, new_alerts)
+                created = NOCAlertEvent.objects.bulk_create(new_alerts)
+                AlertCorrelationService._invalidate_alert_caches([*duplicates.values(), *created])
+                logger.info(
+                    f"Bulk alerts processed",
+                    extra={'created': len(created), 'deduplicated': len(duplicates), 'batch_size': len(batch)}
+                )
+
+                AlertCorrelationService._score_priorities_bulk(created)
+                AlertCorrelationService._cluster_alerts_bulk(created)
+
+                # process_alert only dedups onto active alerts, so repeats of an
+                # alert that clustering just auto-suppressed become new alerts
+                replay = AlertCorrelationService._unfold_suppressed(created, folded)
+                if replay:
+                    replayed = AlertCorrelationService._process_tenant_batch([batch[pos] for pos in replay])
+                    for position, alert in zip(replay, replayed):
+                        results[position] = alert
+                return results
+
+        except DatabaseError as e:
+            logger.error(f"Error processing alert batch", extra={'batch_size': len(batch), 'error': str(e)})
+            raise
+
+    @staticmethod
+    def _unfold_suppressed(created: List[NOCAlertEvent], folded: Dict[str, List[int]]) -> List[int]:
+        """Batch positions deduped onto new alerts that are no longer active; their counts are reset."""
+        unfolded = [
+            alert for alert in created
+            if alert.dedup_key in folded and alert.status not in AlertCorrelationService.ACTIVE_STATUSES
+        ]
+        if not unfolded:
+            return []
+        for alert in unfolded:
+            alert.suppressed_count -= len(folded[alert.dedup_key])
+        NOCAlertEvent.objects.bulk_update(unfolded, ['suppressed_count'])
+        return sorted(position for alert in unfolded for position in folded[alert.dedup_key])
+
+    @staticmethod
+    def _maintenance_suppression_mask(tenant, batch: List[Dict[str, Any]]) -> List[bool]:
+        """Evaluate active maintenance windows for a whole batch with one query."""
+        client_ids = {alert_data['client'].pk for alert_data in batch}
+        now = timezone.now()
+        windows = list(MaintenanceWindow.objects.filter(
+            tenant=tenant,
+            is_active=True,
+            start_time__lte=now,
+            end_time__gte=now
+        ).filter(
+            Q(client_id__in=client_ids) | Q(client__isnull=True)
+        ))
+
+        mask = []
+        for alert_data in batch:
+            applicable = [
+                window for window in windows
+                if window.client_id is None or window.client_id == alert_data['client'].pk
+            ]
+            mask.append(any(
+                window.suppress_all or alert_data['alert_type'] in window.suppress_alerts
+                for window in applicable
+            ))
+        return mask
+
+    @staticmethod
+    def _assign_correlations(tenant, new_alerts: List[NOCAlertEvent]):
+        """
+        Set correlation_id on unsaved alerts, batch equivalent of _find_correlation.
+
+        Alerts sharing (client, alert_type) reuse the most recent correlation
+        from the last hour, or a fresh UUID shared by the whole batch.
+        """
+        from datetime import timedelta
+
+        pairs = {(alert.client_id, alert.alert_type) for alert in new_alerts}
+        if not pairs:
+            return
+
+        hour_ago = timezone.now() - timedelta(hours=1)
+        correlations: Dict[tuple, uuid.UUID] = {}
+        recent = NOCAlertEvent.objects.filter(
+            tenant=tenant,
+            client_id__in={client_id for client_id, _ in pairs},
+            alert_type__in={alert_type for _, alert_type in pairs},
+            cdtz__gte=hour_ago,
+            correlation_id__isnull=False
+        ).order_by('-cdtz').values_list('client_id', 'alert_type', 'correlation_id')
+
+        for client_id, alert_type, correlation_id in recent.iterator():
+            if (client_id, alert_type) in pairs:
+                correlations.setdefault((client_id, alert_type), correlation_id)
+                if len(correlations) == len(pairs):
+                    break
+
+        for alert in new_alerts:
+            pair = (alert.client_id, alert.alert_type)
+            alert.correlation_id = correlations.setdefault(pair, uuid.uuid4())
+
+    @staticmethod
+    def _invalidate_alert_caches(alerts: List[NOCAlertEvent]):
+        """Cache invalidation normally done by the post_save signal (bypassed by bulk writes)."""
+        cache_keys = set()
+        for alert in alerts:
+            cache_keys.update([
+                f"noc:metrics:client_{alert.client_id}",
+                f"noc:alerts:client_{alert.client_id}",
+                f"noc:dashboard:tenant_{alert.tenant_id}"
+            ])
+        if cache_keys:
+            cache.delete_many(list(cache_keys))
+
+    @staticmethod
+    def _score_priorities_bulk(alerts: List[NOCAlertEvent]):
+        """Score priority for newly created alerts and persist with one bulk_update."""
+        if not alerts:
+            return
+        try:
+            from .alert_priority_scorer import AlertPriorityScorer
+            with transaction.atomic(using=get_current_db_name()):
+                scored = AlertPriorityScorer.calculate_priorities(alerts)
+                for alert, (priority_score, priority_features) in zip(alerts, scored):
+                    alert.calculated_priority = priority_score
+                    alert.priority_features = priority_features
+                NOCAlertEvent.objects.bulk_update(alerts, ['calculated_priority', 'priority_features'])
+        except DATABASE_EXCEPTIONS as e:
+            # Don't fail alert creation if priority calculation fails
+            logger.error(f"Error calculating priority for alert batch", extra={'error': str(e)}, exc_info=True)
+
+    @staticmethod
+    def _cluster_alerts_bulk(alerts: List[NOCAlertEvent]):
+        """Cluster newly created alerts with one vectorized pass per tenant."""
+        if not alerts:
+            return
+        try:
+            from .alert_clustering_service import AlertClusteringService
+            clustered = AlertClusteringService.cluster_alerts(alerts)
+            logger.info(
+                f"Alerts clustered",
+                extra={
+                    'alert_count': len(alerts),
+                    'clusters_created': sum(1 for _, created in clustered if created)
+                }
+            )
+        except (ValueError, TypeError, AttributeError) as e:
+            # Don't fail alert creation if clustering fails
+            logger.error(f"Error clustering alert batch", extra={'error': str(e)}, exc_info=True)
+
     @staticmethod
     def _generate_dedup_key(alert_data: Dict[str, Any]) -> str:
         """
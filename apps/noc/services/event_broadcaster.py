@@ -0,0 +1,248 @@
+"""
+NOC Event Broadcaster.
+
+Coalescing alternative to the per-event path of
+NOCWebSocketService.broadcast_event(), which performs one or two channel
+layer sends, a recipient count query and an NOCEventLog insert for every
+event and so serializes the alert pipeline during alert storms.
+
+- Events are queued per channel group and flushed every
+  NOC_BROADCAST_WINDOW_MS (or as soon as a group holds NOC_BROADCAST_MAX_BATCH
+  events) as one 'noc_event_batch' message carrying all of them; a group with
+  a single pending event still receives the plain event
+- Recipient counts come from GroupMemberCounter (shared cache counters kept
+  by the dashboard consumer) instead of a query per event
+- NOCEventLog rows are written by the flush thread with one bulk_create per
+  database, after the sends
+
+Follows .claude/rules.md Rule #11 (specific exceptions).
+"""
+
+import asyncio
+import atexit
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from asgiref.sync import async_to_sync
+from channels.exceptions import ChannelFull
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.utils import timezone
+
+from apps.core.exceptions.patterns import CACHE_EXCEPTIONS, DATABASE_EXCEPTIONS
+from apps.core.utils_new.db_utils import get_current_db_name
+
+__all__ = ['NOCEventBroadcaster', 'GroupMemberCounter']
+
+logger = logging.getLogger('noc.websocket.service')
+
+BATCH_EVENT_TYPE = 'noc_event_batch'
+DEFAULT_WINDOW_MS = 50
+DEFAULT_MAX_BATCH = 50
+
+# Failures of one group_send: full channel, lost or slow Redis connection
+CHANNEL_LAYER_EXCEPTIONS = (ChannelFull, OSError, asyncio.TimeoutError) + CACHE_EXCEPTIONS
+
+
+class GroupMemberCounter:
+    """
+    Connected WebSocket count per channel group, kept in the shared cache.
+
+    The dashboard consumer increments / decrements the counter as it
+    registers / unregisters its WebSocketConnection row. Counters expire
+    after COUNTER_TTL and are then re-seeded from the table, which also
+    absorbs rows removed by the stale connection cleanup.
+    """
+
+    KEY_PREFIX = 'noc:ws:members'
+    COUNTER_TTL = 300
+
+    @classmethod
+    def key(cls, group_name: str) -> str:
+        return f"{cls.KEY_PREFIX}:{group_name}"
+
+    @classmethod
+    def joined(cls, group_name: str) -> None:
+        try:
+            cache.incr(cls.key(group_name))
+        except ValueError:
+            pass  # Not seeded yet; the next read seeds it from the table
+        except CACHE_EXCEPTIONS as e:
+            logger.warning(f"Could not update member count for {group_name}: {e}")
+
+    @classmethod
+    def left(cls, group_name: str) -> None:
+        try:
+            cache.decr(cls.key(group_name))
+        except ValueError:
+            pass
+        except CACHE_EXCEPTIONS as e:
+            logger.warning(f"Could not update member count for {group_name}: {e}")
+
+    @classmethod
+    def counts(cls, groups: Dict[str, int]) -> Dict[str, int]:
+        """
+        Member count of each group.
+
+        Args:
+            groups: {group_name: tenant_id}
+        """
+        from apps.noc.models import WebSocketConnection
+
+        keys = {cls.key(group): group for group in groups}
+        try:
+            cached = cache.get_many(list(keys))
+        except CACHE_EXCEPTIONS as e:
+            logger.warning(f"Member counts unavailable from cache: {e}")
+            cached = None
+
+        counts = {}
+        for key, group in keys.items():
+            if cached is not None and key in cached:
+                counts[group] = max(int(cached[key]), 0)
+                continue
+            counts[group] = WebSocketConnection.get_group_member_count(group_name=group, tenant_id=groups[group])
+            if cached is not None:
+                cache.add(key, counts[group], cls.COUNTER_TTL)
+        return counts
+
+
+class NOCEventBroadcaster:
+    """Per-process queue of NOC events, flushed in time-windowed batches."""
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, window_ms: Optional[int] = None, max_batch: Optional[int] = None, autostart: bool = True):
+        self.window = (window_ms or getattr(settings, 'NOC_BROADCAST_WINDOW_MS', DEFAULT_WINDOW_MS)) / 1000
+        self.max_batch = max_batch or getattr(settings, 'NOC_BROADCAST_MAX_BATCH', DEFAULT_MAX_BATCH)
+        self.autostart = autostart
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._groups: Dict[str, List[Dict]] = {}
+        self._records: List[Dict] = []
+        if autostart:
+            atexit.register(self.flush)
+
+    @classmethod
+    def get_instance(cls) -> 'NOCEventBroadcaster':
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def publish(self, event_type: str, event_data: Dict[str, Any], tenant_id: int, site_id: Optional[int] = None) -> None:
+        """Queue an event for the tenant group and, with site_id, the site group."""
+        event = {
+            "type": event_type,
+            "timestamp": timezone.now().isoformat(),
+            "tenant_id": tenant_id,
+            **event_data
+        }
+        groups = [f"noc_tenant_{tenant_id}"] + ([f"noc_site_{site_id}"] if site_id else [])
+        record = {
+            'event': event, 'event_type': event_type, 'event_data': event_data, 'tenant_id': tenant_id,
+            'using': get_current_db_name(), 'queued_at': time.monotonic(), 'error': None,
+        }
+
+        with self._lock:
+            for group in groups:
+                self._groups.setdefault(group, []).append(event)
+            self._records.append(record)
+            full = any(len(self._groups[group]) >= self.max_batch for group in groups)
+
+        if self.autostart:
+            self._ensure_worker()
+        if full:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """Send everything queued so far and write its audit rows. Returns events flushed."""
+        with self._lock:
+            groups, self._groups = self._groups, {}
+            records, self._records = self._records, []
+        if not records:
+            return 0
+
+        errors = self._send(groups)
+        sent_at = time.monotonic()
+        for record in records:
+            record['error'] = errors.get(id(record['event']))
+            record['latency_ms'] = int((sent_at - record['queued_at']) * 1000)
+        self._write_logs(records)
+
+        logger.debug(f"Flushed {len(records)} NOC events to {len(groups)} groups")
+        return len(records)
+
+    def _send(self, groups: Dict[str, List[Dict]]) -> Dict[int, str]:
+        """One channel layer message per group; returns {id(event): error} for failed sends."""
+        errors = {}
+        channel_layer = get_channel_layer()
+        if not channel_layer:
+            logger.warning("Channel layer not configured")
+            return {id(event): 'Channel layer not configured' for events in groups.values() for event in events}
+
+        for group, events in groups.items():
+            message = events[0] if len(events) == 1 else {"type": BATCH_EVENT_TYPE, "events": events}
+            try:
+                async_to_sync(channel_layer.group_send)(group, message)
+            except (CHANNEL_LAYER_EXCEPTIONS + (ValueError, AttributeError, TypeError)) as e:
+                logger.error(f"Failed to broadcast {len(events)} events to {group}: {e}")
+                errors.update((id(event), str(e)) for event in events)
+        return errors
+
+    def _write_logs(self, records: Iterable[Dict]) -> None:
+        """Bulk insert the NOCEventLog rows of a flush, per database."""
+        from apps.noc.models import NOCEventLog
+
+        records = list(records)
+        tenant_groups = {f"noc_tenant_{r['tenant_id']}": r['tenant_id'] for r in records if not r['error']}
+        counts = GroupMemberCounter.counts(tenant_groups) if tenant_groups else {}
+
+        by_alias: Dict[str, List] = {}
+        for record in records:
+            data = record['event_data']
+            success = record['error'] is None
+            by_alias.setdefault(record['using'], []).append(NOCEventLog(
+                event_type=record['event_type'],
+                tenant_id=record['tenant_id'],
+                payload=data,
+                broadcast_latency_ms=record['latency_ms'] if success else None,
+                broadcast_success=success,
+                error_message=record['error'],
+                alert_id=data.get('alert_id'),
+                finding_id=data.get('finding_id'),
+                ticket_id=data.get('ticket_id'),
+                recipient_count=counts.get(f"noc_tenant_{record['tenant_id']}", 0),
+            ))
+
+        for using, rows in by_alias.items():
+            try:
+                NOCEventLog.objects.using(using).bulk_create(rows)
+            except DATABASE_EXCEPTIONS as e:
+                logger.error(f"Failed to write {len(rows)} NOC event log rows to {using}: {e}")
+
+    def _ensure_worker(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._instance_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='noc-event-broadcaster', daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.window)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except (DATABASE_EXCEPTIONS + CACHE_EXCEPTIONS) as e:
+                logger.error(f"NOC event flush failed: {e}", exc_info=True)
+            finally:
+                close_old_connections()
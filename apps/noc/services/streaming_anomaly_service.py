@@ -6,7 +6,8 @@ Provides metrics tracking, monitoring, and management interface for
 StreamingAnomalyConsumer.
 
 Features:
-- Metrics tracking (events/sec, detection latency, findings rate)
+- Metrics tracking (events/sec, p50/p95/p99 detection latency, findings rate)
+  buffered in-process and flushed to Redis in pipelined batches
 - Consumer health monitoring
 - Configuration management
 - Statistics aggregation
@@ -21,10 +22,19 @@ import logging
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 
-from django.core.cache import cache
 from django.utils import timezone
 from django.conf import settings
 
+from apps.core.exceptions.patterns import CACHE_EXCEPTIONS
+
+from apps.noc.services.streaming_metrics import (
+    HISTOGRAM_FIELDS,
+    StreamingMetricsBuffer,
+    delete_counters,
+    histogram_percentile,
+    read_counters,
+)
+
 logger = logging.getLogger('noc.streaming_anomaly_service')
 
 __all__ = ['StreamingAnomalyService']
@@ -42,6 +52,10 @@ class StreamingAnomalyService:
     METRICS_KEY_PREFIX = 'streaming_anomaly_metrics'
     HEALTH_KEY_PREFIX = 'streaming_anomaly_health'
 
+    EVENT_TYPES = ['attendance', 'task', 'device', 'location']
+    EVENT_FIELDS = ['count', 'findings', 'latency_sum']
+    RECONCILE_FIELDS = ['count', 'duration_ms', 'findings']
+
     @classmethod
     def record_event_processed(
         cls,
@@ -53,6 +67,9 @@ class StreamingAnomalyService:
         """
         Record metrics for processed event.
 
+        Buffered in-process; written to Redis in one pipelined batch per
+        flush interval (STREAMING_ANOMALY_METRICS_FLUSH_MS).
+
         Args:
             tenant_id: Tenant ID
             event_type: Event type ('attendance', 'task', 'location')
@@ -60,38 +77,50 @@ class StreamingAnomalyService:
             findings_count: Number of findings detected
         """
         try:
-            # Update event counters
-            cache_key = f"{cls.METRICS_KEY_PREFIX}:{tenant_id}:{event_type}:count"
-            cache.incr(cache_key, delta=1)
-
-            # Track latency (rolling average)
-            latency_key = f"{cls.METRICS_KEY_PREFIX}:{tenant_id}:{event_type}:latency"
-            current_avg = cache.get(latency_key, 0)
-            event_count = cache.get(cache_key, 1)
-            new_avg = ((current_avg * (event_count - 1)) + detection_latency_ms) / event_count
-            cache.set(latency_key, new_avg, timeout=3600)
-
-            # Track findings rate
+            key = f"{cls.METRICS_KEY_PREFIX}:{tenant_id}:{event_type}"
+            StreamingMetricsBuffer.observe_latency(key, detection_latency_ms)
             if findings_count > 0:
-                findings_key = f"{cls.METRICS_KEY_PREFIX}:{tenant_id}:{event_type}:findings"
-                cache.incr(findings_key, delta=findings_count)
-
-            logger.debug(
-                f"Recorded metrics for {event_type} event",
-                extra={
-                    'tenant_id': tenant_id,
-                    'event_type': event_type,
-                    'latency_ms': detection_latency_ms,
-                    'findings_count': findings_count
-                }
-            )
+                StreamingMetricsBuffer.increment(key, 'findings', findings_count)
+            StreamingMetricsBuffer.increment(key, 'count')
 
-        except (ValueError, RuntimeError) as e:
+        except ((ValueError, RuntimeError, ConnectionError) + CACHE_EXCEPTIONS) as e:
             logger.error(
                 f"Failed to record event metrics: {e}",
                 extra={'tenant_id': tenant_id, 'event_type': event_type}
             )
 
+    @classmethod
+    def record_reconciliation(cls, tenant_id: int, duration_ms: float, findings_count: int):
+        """
+        Record a periodic full-scan reconciliation run by the incremental detector.
+
+        Args:
+            tenant_id: Tenant ID
+            duration_ms: Full scan duration in milliseconds
+            findings_count: Number of findings the scan produced
+        """
+        try:
+            key = f"{cls.METRICS_KEY_PREFIX}:{tenant_id}:reconcile"
+            StreamingMetricsBuffer.increment(key, 'duration_ms', int(duration_ms))
+            if findings_count > 0:
+                StreamingMetricsBuffer.increment(key, 'findings', findings_count)
+            StreamingMetricsBuffer.increment(key, 'count')
+
+        except ((ValueError, RuntimeError, ConnectionError) + CACHE_EXCEPTIONS) as e:
+            logger.error(
+                f"Failed to record reconciliation metrics: {e}",
+                extra={'tenant_id': tenant_id}
+            )
+
+    @classmethod
+    def flush_metrics(cls) -> int:
+        """Write this thread's buffered metrics now (e.g. on consumer disconnect)."""
+        try:
+            return StreamingMetricsBuffer.flush()
+        except ((ValueError, RuntimeError, ConnectionError) + CACHE_EXCEPTIONS) as e:
+            logger.error(f"Failed to flush streaming metrics: {e}")
+            return 0
+
     @classmethod
     def get_metrics(cls, tenant_id: int, time_window_minutes: int = 60) -> Dict[str, Any]:
         """
@@ -102,10 +131,10 @@ class StreamingAnomalyService:
             time_window_minutes: Time window for metrics (default: 60 min)
 
         Returns:
-            Dict with metrics by event type
+            Dict with metrics by event type, including p50/p95/p99 latency
         """
+        cls.flush_metrics()
         try:
-            event_types = ['attendance', 'task', 'location']
             metrics = {
                 'tenant_id': tenant_id,
                 'time_window_minutes': time_window_minutes,
@@ -113,65 +142,86 @@ class StreamingAnomalyService:
                 'by_event_type': {}
             }
 
-            total_events = 0
-            total_findings = 0
-            total_latency = 0
-
-            for event_type in event_types:
-                count_key = f"{cls.METRICS_KEY_PREFIX}:{tenant_id}:{event_type}:count"
-                latency_key = f"{cls.METRICS_KEY_PREFIX}:{tenant_id}:{event_type}:latency"
-                findings_key = f"{cls.METRICS_KEY_PREFIX}:{tenant_id}:{event_type}:findings"
+            total_events = total_findings = total_latency = 0
+            overall_histogram = [0] * len(HISTOGRAM_FIELDS)
 
-                event_count = cache.get(count_key, 0)
-                avg_latency = cache.get(latency_key, 0)
-                findings_count = cache.get(findings_key, 0)
+            for event_type in cls.EVENT_TYPES:
+                counters = read_counters(
+                    f"{cls.METRICS_KEY_PREFIX}:{tenant_id}:{event_type}",
+                    cls.EVENT_FIELDS + HISTOGRAM_FIELDS
+                )
+                histogram = [counters[field] for field in HISTOGRAM_FIELDS]
+                event_count = int(counters['count'])
+                findings_count = int(counters['findings'])
 
                 metrics['by_event_type'][event_type] = {
                     'events_processed': event_count,
-                    'avg_latency_ms': round(avg_latency, 2),
                     'findings_detected': findings_count,
-                    'finding_rate': round(findings_count / event_count, 3) if event_count > 0 else 0
+                    'finding_rate': round(findings_count / event_count, 3) if event_count > 0 else 0,
+                    **cls._latency_summary(counters['latency_sum'], histogram)
                 }
 
                 total_events += event_count
                 total_findings += findings_count
-                total_latency += avg_latency
+                total_latency += counters['latency_sum']
+                overall_histogram = [a + b for a, b in zip(overall_histogram, histogram)]
 
-            # Overall metrics
             metrics['overall'] = {
                 'total_events': total_events,
                 'total_findings': total_findings,
-                'avg_latency_ms': round(total_latency / len(event_types), 2) if event_types else 0,
                 'events_per_minute': round(total_events / time_window_minutes, 2),
-                'overall_finding_rate': round(total_findings / total_events, 3) if total_events > 0 else 0
+                'overall_finding_rate': round(total_findings / total_events, 3) if total_events > 0 else 0,
+                **cls._latency_summary(total_latency, overall_histogram)
             }
+            metrics['reconciliation'] = cls._reconciliation_metrics(tenant_id)
 
             return metrics
 
-        except (ValueError, RuntimeError) as e:
+        except ((ValueError, RuntimeError, ConnectionError) + CACHE_EXCEPTIONS) as e:
             logger.error(
                 f"Failed to get metrics: {e}",
                 extra={'tenant_id': tenant_id}
             )
             return {'error': str(e)}
 
+    @staticmethod
+    def _latency_summary(latency_sum: float, histogram: list) -> Dict[str, float]:
+        """Mean and histogram percentiles for one latency series."""
+        observations = sum(histogram)
+        return {
+            'avg_latency_ms': round(latency_sum / observations, 2) if observations else 0,
+            'p50_latency_ms': round(histogram_percentile(histogram, 0.50), 2),
+            'p95_latency_ms': round(histogram_percentile(histogram, 0.95), 2),
+            'p99_latency_ms': round(histogram_percentile(histogram, 0.99), 2),
+        }
+
+    @classmethod
+    def _reconciliation_metrics(cls, tenant_id: int) -> Dict[str, Any]:
+        counters = read_counters(f"{cls.METRICS_KEY_PREFIX}:{tenant_id}:reconcile", cls.RECONCILE_FIELDS)
+        reconcile_count = int(counters['count'])
+        return {
+            'full_scans': reconcile_count,
+            'avg_duration_ms': round(
+                counters['duration_ms'] / reconcile_count, 2
+            ) if reconcile_count > 0 else 0,
+            'findings_detected': int(counters['findings']),
+        }
+
     @classmethod
     def reset_metrics(cls, tenant_id: int):
         """Reset all metrics for tenant."""
         try:
-            event_types = ['attendance', 'task', 'location']
-            for event_type in event_types:
-                count_key = f"{cls.METRICS_KEY_PREFIX}:{tenant_id}:{event_type}:count"
-                latency_key = f"{cls.METRICS_KEY_PREFIX}:{tenant_id}:{event_type}:latency"
-                findings_key = f"{cls.METRICS_KEY_PREFIX}:{tenant_id}:{event_type}:findings"
-
-                cache.delete(count_key)
-                cache.delete(latency_key)
-                cache.delete(findings_key)
+            StreamingMetricsBuffer.discard()
+            prefix = f"{cls.METRICS_KEY_PREFIX}:{tenant_id}"
+            delete_counters(
+                [f"{prefix}:{event_type}" for event_type in cls.EVENT_TYPES],
+                cls.EVENT_FIELDS + HISTOGRAM_FIELDS
+            )
+            delete_counters([f"{prefix}:reconcile"], cls.RECONCILE_FIELDS)
 
             logger.info(f"Reset metrics for tenant {tenant_id}")
 
-        except (ValueError, RuntimeError) as e:
+        except ((ValueError, RuntimeError, ConnectionError) + CACHE_EXCEPTIONS) as e:
             logger.error(
                 f"Failed to reset metrics: {e}",
                 extra={'tenant_id': tenant_id}
@@ -230,6 +280,7 @@ class StreamingAnomalyService:
         try:
             metrics = cls.get_metrics(tenant_id)
             avg_latency_ms = metrics.get('overall', {}).get('avg_latency_ms', 0)
+            p95_latency_ms = metrics.get('overall', {}).get('p95_latency_ms', 0)
             avg_latency_sec = avg_latency_ms / 1000
 
             # Batch processing baseline (average 10 minutes)
@@ -240,6 +291,7 @@ class StreamingAnomalyService:
 
             return {
                 'streaming_latency_seconds': round(avg_latency_sec, 2),
+                'streaming_p95_latency_seconds': round(p95_latency_ms / 1000, 2),
                 'batch_latency_seconds': batch_latency_sec,
                 'improvement_factor': round(improvement_factor, 1),
                 'improvement_percentage': round(improvement_percentage, 1),
@@ -10,6 +10,7 @@ import time
 from typing import Dict, Any, Optional
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
+from django.conf import settings
 from django.utils import timezone
 from django.db import DatabaseError, IntegrityError
 from apps.noc.models import NOCAlertEvent, NOCIncident, WebSocketConnection
@@ -37,8 +38,17 @@ class NOCWebSocketService:
             tenant_id: Tenant ID for tenant-scoped broadcast
             site_id: Optional site ID for site-scoped broadcast
 
+        With NOC_COALESCE_BROADCASTS the event is handed to
+        NOCEventBroadcaster, which sends and audit-logs it with the other
+        events of the same short window.
+
         TASK 11: Gap #14 - Consolidated NOC Event Feed
         """
+        if getattr(settings, 'NOC_COALESCE_BROADCASTS', False):
+            from apps.noc.services.event_broadcaster import NOCEventBroadcaster
+            NOCEventBroadcaster.get_instance().publish(event_type, event_data, tenant_id, site_id)
+            return
+
         try:
             start_time = time.time()
 
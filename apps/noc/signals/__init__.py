@@ -7,11 +7,15 @@ Signal handlers for real-time event processing and streaming anomaly detection.
 from .streaming_event_publishers import (
     publish_attendance_event,
     publish_task_event,
+    publish_task_events,
+    publish_device_event,
     publish_location_event,
 )
 
 __all__ = [
     'publish_attendance_event',
     'publish_task_event',
+    'publish_task_events',
+    'publish_device_event',
     'publish_location_event',
 ]
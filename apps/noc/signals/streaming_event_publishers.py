@@ -1,8 +1,8 @@
 """
 Streaming Event Publishers
 
-Signal handlers that publish attendance, task, and GPS events to channel layer
-for real-time anomaly detection via StreamingAnomalyConsumer.
+Signal handlers that publish attendance, task, device and GPS events to channel
+layer for real-time anomaly detection via StreamingAnomalyConsumer.
 
 Architecture:
     Model.post_save → Signal Handler → channel_layer.group_send() →
@@ -22,7 +22,8 @@ Compliance with .claude/rules.md:
 
 import logging
 import uuid
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Optional, Dict, Any, Iterable
 
 from django.db.models.signals import post_save
 from django.dispatch import receiver
@@ -34,6 +35,8 @@ logger = logging.getLogger('noc.streaming_events')
 __all__ = [
     'publish_attendance_event',
     'publish_task_event',
+    'publish_task_events',
+    'publish_device_event',
     'publish_location_event',
 ]
 
@@ -49,7 +52,7 @@ def _publish_to_stream(
 
     Args:
         tenant_id: Tenant ID for isolation
-        event_type: Event type ('attendance', 'task', 'location')
+        event_type: Event type ('attendance', 'task', 'device', 'location')
         event_data: Event data dict
         event_id: Optional event ID (auto-generated if not provided)
     """
@@ -137,48 +140,134 @@ def publish_attendance_event(sender, instance, created, **kwargs):
         )
 
 
+def _task_event_data(instance) -> Dict[str, Any]:
+    """Event payload of a Jobneed, built from FK ids so no related rows are loaded."""
+    return {
+        'event_id': instance.id,
+        'task_id': instance.id,
+        'job_id': instance.job_id,
+        'site_id': instance.bu_id,
+        'bu_id': instance.bu_id,
+        'client_id': instance.client_id,
+        'event_time': instance.cdtz.isoformat() if instance.cdtz else None,
+        'event_type': 'task',
+        'is_tour': instance.is_tour if hasattr(instance, 'is_tour') else False,
+        'status': instance.status if hasattr(instance, 'status') else None,
+    }
+
+
 @receiver(post_save, sender='activity.Jobneed')
 def publish_task_event(sender, instance, created, **kwargs):
     """
     Publish task event for real-time anomaly detection.
 
-    Triggered on Jobneed creation (task/tour instance).
+    Triggered on Jobneed creation (task/tour instance) and when a saved
+    Jobneed is COMPLETED. The completion event gets its own event_id so it is
+    not dropped as a redelivery of the creation event; repeated saves of a
+    completed Jobneed reuse that id and are ignored by the detector.
     """
-    if not created:
-        return  # Only process new records
+    completed = getattr(instance, 'status', None) == 'COMPLETED'
+    if not created and not completed:
+        return  # Only process new or completed records
 
     try:
-        # Extract event data
-        event_data = {
-            'event_id': instance.id,
-            'task_id': instance.id,
-            'job_id': instance.job_id if instance.job else None,
-            'site_id': instance.bu_id if instance.bu else None,
-            'bu_id': instance.bu_id if instance.bu else None,
-            'client_id': instance.client_id if instance.client else None,
-            'event_time': instance.cdtz.isoformat() if instance.cdtz else None,
-            'event_type': 'task',
-            'is_tour': instance.is_tour if hasattr(instance, 'is_tour') else False,
-            'status': instance.status if hasattr(instance, 'status') else None,
-        }
-
         # Get tenant ID
         tenant_id = instance.tenant_id if hasattr(instance, 'tenant_id') else None
         if not tenant_id:
             logger.warning("No tenant_id for task event - skipping streaming")
             return
 
+        event_id = str(instance.uuid) if hasattr(instance, 'uuid') else None
+        if event_id and not created:
+            event_id = f"{event_id}:completed"
+
         # Publish to channel layer
         _publish_to_stream(
             tenant_id=tenant_id,
             event_type='task',
+            event_data=_task_event_data(instance),
+            event_id=event_id
+        )
+
+    except (ValueError, AttributeError) as e:
+        logger.error(
+            f"Error publishing task event: {e}",
+            extra={'instance_id': instance.id if hasattr(instance, 'id') else None},
+            exc_info=True
+        )
+
+
+def publish_task_events(jobneeds: Iterable) -> int:
+    """
+    Publish task events for Jobneeds written with bulk_create.
+
+    bulk_create sends no post_save, so bulk writers call this after their
+    transaction commits. Returns the number of events published.
+    """
+    published = 0
+    for jobneed in jobneeds:
+        if not jobneed.tenant_id:
+            continue
+        try:
+            _publish_to_stream(
+                tenant_id=jobneed.tenant_id,
+                event_type='task',
+                event_data=_task_event_data(jobneed),
+                event_id=str(jobneed.uuid) if getattr(jobneed, 'uuid', None) else None
+            )
+            published += 1
+        except (ValueError, AttributeError) as e:
+            logger.error(f"Error publishing task event: {e}", extra={'instance_id': jobneed.id}, exc_info=True)
+    return published
+
+
+@lru_cache(maxsize=4096)
+def _site_tenant_id(site_id: int) -> Optional[int]:
+    """Tenant of a site; cached because a site never moves between tenants."""
+    from apps.client_onboarding.models import Bt
+
+    return Bt.objects.filter(id=site_id).values_list('tenant_id', flat=True).first()
+
+
+@receiver(post_save, sender='activity.DeviceEventlog')
+def publish_device_event(sender, instance, created, **kwargs):
+    """
+    Publish device event for real-time anomaly detection.
+
+    Triggered on DeviceEventlog creation, the source of the phone_events
+    baseline. DeviceEventlog has no tenant column, so the tenant is taken
+    from the event's site.
+    """
+    if not created or not instance.bu_id:
+        return  # Only process new records with a site
+
+    try:
+        event_data = {
+            'event_id': instance.id,
+            'person_id': instance.people_id,
+            'site_id': instance.bu_id,
+            'bu_id': instance.bu_id,
+            'client_id': instance.client_id,
+            'event_time': instance.cdtz.isoformat() if instance.cdtz else None,
+            'event_type': 'device',
+            'device_event': instance.eventvalue,
+        }
+
+        tenant_id = _site_tenant_id(instance.bu_id)
+        if not tenant_id:
+            logger.warning("No tenant_id for device event - skipping streaming")
+            return
+
+        _publish_to_stream(
+            tenant_id=tenant_id,
+            event_type='device',
             event_data=event_data,
             event_id=str(instance.uuid) if hasattr(instance, 'uuid') else None
         )
 
     except (ValueError, AttributeError) as e:
         logger.error(
-            f"Error publishing task event: {e}",
+            f"Error publishing device event: {e}",
             extra={'instance_id': instance.id if hasattr(instance, 'id') else None},
             exc_info=True
         )
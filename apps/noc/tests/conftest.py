@@ -13,6 +13,15 @@ from apps.peoples.models import People
 from apps.client_onboarding.models import Bt
 from apps.core_onboarding.models import TypeAssist as Tacode
 from apps.noc.models import NOCAlertEvent, NOCIncident, NOCMetricSnapshot
+from apps.noc.services.alert_cluster_index import AlertClusterIndex
+
+
+@pytest.fixture(autouse=True)
+def reset_alert_cluster_index():
+    """Process-resident cluster indexes must not leak between test databases."""
+    AlertClusterIndex.reset_all()
+    yield
+    AlertClusterIndex.reset_all()
 
 
 @pytest.fixture
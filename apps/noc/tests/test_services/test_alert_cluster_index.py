@@ -0,0 +1,171 @@
+"""
+Tests for AlertClusterIndex and batch alert clustering.
+
+Verifies the vectorized index returns the same cosine scores as the
+reference implementation and that batch clustering matches sequential
+clustering.
+"""
+
+import pytest
+import numpy as np
+from datetime import timedelta
+from django.utils import timezone
+from apps.noc.services.alert_cluster_index import AlertClusterIndex, features_to_vector
+from apps.noc.services.alert_clustering_service import AlertClusteringService
+from apps.noc.models import NOCAlertEvent, AlertCluster
+from apps.client_onboarding.models import Bt
+from apps.tenants.models import Tenant
+
+
+def _features(alert_type_encoded, severity_score, site_id=5):
+    return {
+        'alert_type_encoded': alert_type_encoded,
+        'entity_type_encoded': 100,
+        'site_id': site_id,
+        'severity_score': severity_score,
+        'hour_of_day': 14,
+        'day_of_week': 2,
+        'correlation_id_hash': 0,
+        'time_since_last_alert': 0,
+        'affected_entity_count': 1,
+    }
+
+
+class TestAlertClusterIndex:
+    """Unit tests for the in-memory cluster matrix."""
+
+    @pytest.fixture
+    def index(self):
+        index = AlertClusterIndex(tenant_id=1, max_clusters=3)
+        index.rebuild([])
+        return index
+
+    def test_scores_match_reference_cosine(self, index):
+        now = timezone.now()
+        stored = _features(1, 4)
+        query = _features(2, 3)
+        index.upsert('a', stored, now)
+
+        cluster_id, score = index.best_match(query, now - timedelta(minutes=30))
+        expected = AlertClusteringService._calculate_similarity(query, stored)
+
+        assert cluster_id == 'a'
+        assert score == pytest.approx(expected)
+
+    def test_batch_scoring_returns_best_per_row(self, index):
+        now = timezone.now()
+        index.upsert('a', _features(1, 4), now)
+        index.upsert('b', _features(9, 1, site_id=900), now)
+
+        queries = np.vstack([
+            features_to_vector(_features(9, 1, site_id=900)),
+            features_to_vector(_features(1, 4)),
+        ])
+        cluster_ids, scores = index.best_matches(queries, now - timedelta(minutes=30))
+
+        assert cluster_ids == ['b', 'a']
+        assert scores == pytest.approx([1.0, 1.0])
+
+    def test_expired_clusters_are_ignored_and_compacted(self, index):
+        now = timezone.now()
+        index.upsert('old', _features(1, 4), now - timedelta(hours=2))
+        index.upsert('new', _features(5, 2), now)
+        cutoff = now - timedelta(minutes=30)
+
+        cluster_id, _ = index.best_match(_features(1, 4), cutoff)
+        assert cluster_id == 'new'
+
+        assert index.expire(cutoff) == 1
+        assert len(index) == 1
+
+    def test_capacity_evicts_least_recent_cluster(self, index):
+        now = timezone.now()
+        index.upsert('a', _features(1, 4), now - timedelta(minutes=10))
+        index.upsert('b', _features(2, 4), now - timedelta(minutes=5))
+        index.upsert('c', _features(3, 4), now)
+        index.upsert('d', _features(4, 4), now)
+
+        assert len(index) == 3
+        index.remove(['b'])
+        cluster_id, _ = index.best_match(_features(1, 4), now - timedelta(hours=1))
+        assert cluster_id in ('c', 'd')
+
+    def test_empty_index_returns_no_match(self, index):
+        cluster_id, score = index.best_match(_features(1, 4), timezone.now())
+        assert cluster_id is None
+        assert score == 0.0
+
+
+@pytest.mark.django_db
+class TestBatchClustering:
+    """Batch clustering must agree with sequential cluster_alert calls."""
+
+    @pytest.fixture
+    def tenant(self):
+        return Tenant.objects.create(tenantname="Test Tenant", subdomain_prefix="test")
+
+    @pytest.fixture
+    def site_bt(self, tenant):
+        from apps.core_onboarding.models import TypeAssist
+        client_type = TypeAssist.objects.create(taname="CLIENT", tacode="CLIENT", tenant=tenant)
+        client = Bt.objects.create(
+            tenant=tenant, bucode="CLIENT001", buname="Test Client", identifier=client_type
+        )
+        return Bt.objects.create(tenant=tenant, bucode="SITE001", buname="Test Site", parent=client)
+
+    def _make_alerts(self, tenant, site_bt, alert_type, entity_type, count, offset):
+        return [
+            NOCAlertEvent.objects.create(
+                tenant=tenant,
+                client=site_bt.parent,
+                bu=site_bt,
+                alert_type=alert_type,
+                severity='HIGH',
+                status='NEW',
+                dedup_key=f'{alert_type}_{offset + i}',
+                message=f'{alert_type} {i}',
+                entity_type=entity_type,
+                entity_id=offset + i,
+                metadata={}
+            )
+            for i in range(count)
+        ]
+
+    def test_batch_groups_alerts_created_in_same_batch(self, tenant, site_bt):
+        alerts = (
+            self._make_alerts(tenant, site_bt, 'DEVICE_OFFLINE', 'device', 5, 100)
+            + self._make_alerts(tenant, site_bt, 'TICKET_ESCALATED', 'ticket', 5, 200)
+        )
+
+        results = AlertClusteringService.cluster_alerts(alerts)
+
+        assert len(results) == len(alerts)
+        assert [created for _, created in results].count(True) == AlertCluster.objects.filter(tenant=tenant).count()
+        device_clusters = {cluster.cluster_id for cluster, _ in results[:5]}
+        assert len(device_clusters) == 1
+        cluster = AlertCluster.objects.get(cluster_id=device_clusters.pop())
+        assert cluster.alert_count == sum(1 for c, _ in results if c.cluster_id == cluster.cluster_id)
+
+    def test_batch_joins_existing_indexed_cluster(self, tenant, site_bt):
+        first = self._make_alerts(tenant, site_bt, 'DEVICE_OFFLINE', 'device', 1, 100)[0]
+        existing, created = AlertClusteringService.cluster_alert(first)
+        assert created is True
+
+        batch = self._make_alerts(tenant, site_bt, 'DEVICE_OFFLINE', 'device', 3, 101)
+        results = AlertClusteringService.cluster_alerts(batch)
+
+        assert all(cluster.cluster_id == existing.cluster_id for cluster, _ in results)
+        assert not any(created for _, created in results)
+        existing.refresh_from_db()
+        assert existing.alert_count == 4
+
+    def test_stale_index_entry_is_skipped(self, tenant, site_bt):
+        alert = self._make_alerts(tenant, site_bt, 'DEVICE_OFFLINE', 'device', 1, 100)[0]
+        cluster, _ = AlertClusteringService.cluster_alert(alert)
+        AlertCluster.objects.filter(cluster_id=cluster.cluster_id).update(is_active=False)
+
+        follow_up = self._make_alerts(tenant, site_bt, 'DEVICE_OFFLINE', 'device', 1, 101)[0]
+        new_cluster, created = AlertClusteringService.cluster_alert(follow_up)
+
+        assert created is True
+        assert new_cluster.cluster_id != cluster.cluster_id
@@ -0,0 +1,110 @@
+"""
+Tests for NOCBatchAggregationService.
+
+Covers the site -> client mapping and the batch flow (maintenance skip,
+single bulk_create, per-stage timings) with the aggregation queries patched.
+"""
+
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+from django.utils import timezone
+
+from apps.noc.services.batch_aggregation_service import NOCBatchAggregationService
+
+MODULE = 'apps.noc.services.batch_aggregation_service'
+
+
+class TestMapSites:
+    """Site mapping over the BU tree."""
+
+    BUS = [
+        # (id, parent_id, tacode)
+        (1, -1, 'CLIENT'),
+        (2, 1, 'CLIENT'),
+        (3, 2, 'SITE'),
+        (4, 1, 'SITE'),
+        (5, None, 'SITE'),
+        (6, 7, 'SITE'),
+        (7, 6, 'ZONE'),
+    ]
+
+    def map_sites(self, client_ids):
+        with patch('apps.client_onboarding.models.Bt.objects') as objects:
+            objects.exclude.return_value.values_list.return_value = self.BUS
+            return NOCBatchAggregationService._map_sites(client_ids)
+
+    def test_sites_belong_to_every_client_above_them(self):
+        assert self.map_sites([1, 2]) == {3: [2, 1], 4: [1]}
+
+    def test_unrequested_clients_are_ignored(self):
+        assert self.map_sites([2]) == {3: [2]}
+
+    def test_cycle_in_tree_terminates(self):
+        assert self.map_sites([7]) == {6: [7]}
+
+
+class TestAttendanceEvents:
+    """The attendance aggregate builds against the real PeopleEventlog fields."""
+
+    def test_queryset_uses_punch_columns(self):
+        day_start = timezone.make_aware(datetime(2025, 1, 6))
+        sql = str(NOCBatchAggregationService._attendance_events([3, 4], day_start).query)
+
+        assert 'punchintime' in sql
+        assert 'punchouttime' in sql
+
+
+class TestOverdueCondition:
+    """SLA overdue is one CASE over the resolution deadlines."""
+
+    def test_client_policy_before_global_policy_before_defaults(self):
+        from apps.y_helpdesk.models import Ticket
+
+        now = timezone.make_aware(datetime(2025, 1, 6, 12))
+        policies = [(None, 'P1', 60), (10, 'P1', 30), (None, 'P2', 120)]
+        with patch('apps.y_helpdesk.models.sla_policy.SLAPolicy.objects') as objects:
+            objects.filter.return_value.values_list.return_value = policies
+            condition = NOCBatchAggregationService._overdue_condition(now)
+
+        sql = str(Ticket.objects.filter(condition).query)
+        assert sql.count('CASE') == 1
+        thens = [
+            sql.index('2025-01-06 11:30:00'),  # client 10, P1
+            sql.index('2025-01-06 11:00:00'),  # global P1
+            sql.index('2025-01-06 10:00:00'),  # global P2
+            sql.index('2025-01-06 08:00:00'),  # default P1
+        ]
+        assert thens == sorted(thens)
+        assert 'ELSE' in sql
+
+
+class TestCreateSnapshotsForTenant:
+    """Batch flow with the aggregation stages patched out."""
+
+    def test_maintenance_clients_skipped_and_snapshots_bulk_created(self):
+        tenant = Mock(id=1)
+        service = NOCBatchAggregationService()
+
+        def add_tickets(metrics, site_clients, window_start, now):
+            metrics[10]['tickets_open'] = 3
+
+        with patch.object(NOCBatchAggregationService, '_clients_in_maintenance', return_value={11}), \
+                patch.object(NOCBatchAggregationService, '_map_sites', return_value={}), \
+                patch.object(NOCBatchAggregationService, '_aggregate_tickets', side_effect=add_tickets), \
+                patch.object(NOCBatchAggregationService, '_aggregate_attendance'), \
+                patch.object(NOCBatchAggregationService, '_aggregate_work_orders'), \
+                patch.object(NOCBatchAggregationService, '_aggregate_devices'), \
+                patch(f'{MODULE}.NOCMetricSnapshot') as snapshot_model, \
+                patch(f'{MODULE}.transaction'), \
+                patch(f'{MODULE}.get_current_db_name', return_value='default'):
+            result = service.create_snapshots_for_tenant(tenant, [10, 11, 10])
+
+        assert result['created'] == 1
+        assert result['skipped_maintenance'] == 1
+        assert set(result['timings']) == {'maintenance', 'sites', 'tickets', 'attendance', 'work_orders', 'devices', 'write'}
+        snapshot_model.objects.bulk_create.assert_called_once()
+        kwargs = snapshot_model.call_args.kwargs
+        assert kwargs['client_id'] == 10
+        assert kwargs['tenant'] is tenant
+        assert kwargs['tickets_open'] == 3
@@ -7,8 +7,10 @@ Follows .claude/rules.md testing guidelines with specific exceptions.
 
 import pytest
 from datetime import timedelta
+from unittest.mock import patch
 from django.utils import timezone
 from apps.noc.services import AlertCorrelationService
+from apps.noc.services.alert_clustering_service import AlertClusteringService
 from apps.noc.models import NOCAlertEvent, MaintenanceWindow
 from apps.client_onboarding.models import Bt
 from apps.tenants.models import Tenant
@@ -138,4 +140,89 @@ class TestAlertCorrelationService:
             AlertCorrelationService.process_alert({})
 
         with pytest.raises(ValueError):
-            AlertCorrelationService.process_alert({'alert_type': 'TEST'})
\ No newline at end of file
+            AlertCorrelationService.process_alert({'alert_type': 'TEST'})
+
+    def test_bulk_matches_single_path_dedup(self, alert_data):
+        """Test bulk ingestion deduplicates within the batch and against existing alerts."""
+        existing = AlertCorrelationService.process_alert(alert_data)
+        other = dict(alert_data, entity_id=456)
+
+        with patch.object(AlertClusteringService, 'AUTO_SUPPRESS_THRESHOLD', 2.0):
+            results = AlertCorrelationService.process_alerts_bulk([alert_data, other, other])
+
+        assert results[0].id == existing.id
+        assert results[1].id is not None
+        assert results[1].id == results[2].id
+        existing.refresh_from_db()
+        assert existing.suppressed_count == 1
+        assert NOCAlertEvent.objects.get(id=results[1].id).suppressed_count == 1
+        assert NOCAlertEvent.objects.count() == 2
+
+    def test_bulk_matches_serial_when_clustering_suppresses(self, tenant, client_bt, alert_data):
+        """Test repeats of an alert auto-suppressed by clustering become new alerts on both paths."""
+        bulk_tenant = Tenant.objects.create(tenantname="Bulk Tenant", subdomain_prefix="bulk")
+        bulk_client = Bt.objects.create(
+            tenant=bulk_tenant, bucode="CLIENT002", buname="Bulk Client", identifier=client_bt.identifier
+        )
+        bulk_data = dict(alert_data, tenant=bulk_tenant, client=bulk_client)
+
+        def outcome(tenant_obj):
+            return list(
+                NOCAlertEvent.objects.filter(tenant=tenant_obj).order_by('id')
+                .values_list('entity_id', 'status', 'suppressed_count')
+            )
+
+        # Every alert joining a cluster is auto-suppressed
+        with patch.object(AlertClusteringService, 'SIMILARITY_THRESHOLD', 0.0), \
+                patch.object(AlertClusteringService, 'AUTO_SUPPRESS_THRESHOLD', 0.0):
+            AlertCorrelationService.process_alert(dict(alert_data, entity_id=999))
+            serial = [AlertCorrelationService.process_alert(alert_data) for _ in range(3)]
+
+            AlertCorrelationService.process_alert(dict(bulk_data, entity_id=999))
+            bulk = AlertCorrelationService.process_alerts_bulk([bulk_data] * 3)
+
+        assert outcome(tenant)[1] == (123, 'SUPPRESSED', 0)
+        assert outcome(bulk_tenant) == outcome(tenant)
+        assert len({alert.id for alert in bulk}) == len({alert.id for alert in serial}) == 3
+
+    def test_bulk_correlation_and_priority(self, alert_data):
+        """Test bulk-created alerts share correlation and get priority scores."""
+        batch = [dict(alert_data, entity_id=entity_id) for entity_id in (1, 2, 3)]
+
+        results = AlertCorrelationService.process_alerts_bulk(batch)
+
+        assert len({alert.correlation_id for alert in results}) == 1
+        for alert in results:
+            alert.refresh_from_db()
+            assert 0 <= alert.calculated_priority <= 100
+            assert alert.priority_features['recurrence_rate'] >= 1
+        recurrence = [alert.priority_features['recurrence_rate'] for alert in results]
+        assert recurrence == sorted(recurrence)
+
+    def test_bulk_maintenance_suppression(self, tenant, client_bt, alert_data):
+        """Test maintenance windows suppress matching alerts in a batch."""
+        MaintenanceWindow.objects.create(
+            tenant=tenant,
+            client=client_bt,
+            title="Partial Suppression",
+            start_time=timezone.now() - timedelta(hours=1),
+            end_time=timezone.now() + timedelta(hours=1),
+            suppress_all=False,
+            suppress_alerts=['DEVICE_OFFLINE'],
+            reason="Network maintenance",
+            is_active=True
+        )
+
+        results = AlertCorrelationService.process_alerts_bulk([
+            alert_data,
+            dict(alert_data, alert_type='TICKET_ESCALATED'),
+        ])
+
+        assert results[0] is None
+        assert results[1] is not None
+
+    def test_bulk_invalid_alert_data(self, alert_data):
+        """Test bulk ingestion validates every item before writing."""
+        with pytest.raises(ValueError):
+            AlertCorrelationService.process_alerts_bulk([alert_data, {'alert_type': 'TEST'}])
+        assert NOCAlertEvent.objects.count() == 0
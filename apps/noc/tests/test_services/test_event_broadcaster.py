@@ -0,0 +1,108 @@
+"""
+Tests for NOCEventBroadcaster.
+
+Covers per-group coalescing, failure accounting, bulk audit logging with
+cached recipient counts, and unpacking of batches in the dashboard consumer.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from apps.noc.services.event_broadcaster import BATCH_EVENT_TYPE, NOCEventBroadcaster
+
+MODULE = 'apps.noc.services.event_broadcaster'
+
+
+@pytest.fixture
+def broadcaster():
+    with patch(f'{MODULE}.get_current_db_name', return_value='default'):
+        yield NOCEventBroadcaster(window_ms=10, max_batch=10, autostart=False)
+
+
+@pytest.fixture
+def channel_layer():
+    layer = MagicMock()
+    layer.group_send = AsyncMock()
+    with patch(f'{MODULE}.get_channel_layer', return_value=layer):
+        yield layer
+
+
+@pytest.fixture
+def event_log():
+    with patch('apps.noc.models.NOCEventLog') as model, \
+            patch(f'{MODULE}.GroupMemberCounter.counts', return_value={'noc_tenant_1': 4}):
+        yield model
+
+
+class TestCoalescing:
+
+    def test_events_of_a_window_share_one_message_per_group(self, broadcaster, channel_layer, event_log):
+        broadcaster.publish('alert_created', {'alert_id': 1}, tenant_id=1, site_id=7)
+        broadcaster.publish('alert_created', {'alert_id': 2}, tenant_id=1)
+
+        assert broadcaster.flush() == 2
+
+        sends = {call.args[0]: call.args[1] for call in channel_layer.group_send.call_args_list}
+        assert sends['noc_tenant_1']['type'] == BATCH_EVENT_TYPE
+        assert [event['alert_id'] for event in sends['noc_tenant_1']['events']] == [1, 2]
+        assert sends['noc_site_7']['type'] == 'alert_created'
+        assert sends['noc_site_7']['alert_id'] == 1
+
+    def test_audit_rows_are_bulk_created_with_cached_recipients(self, broadcaster, channel_layer, event_log):
+        broadcaster.publish('ticket_updated', {'ticket_id': 5}, tenant_id=1)
+        broadcaster.publish('alert_created', {'alert_id': 6}, tenant_id=1)
+        broadcaster.flush()
+
+        event_log.objects.using.assert_called_once_with('default')
+        event_log.objects.using.return_value.bulk_create.assert_called_once()
+        rows = [call.kwargs for call in event_log.call_args_list]
+        assert [row['recipient_count'] for row in rows] == [4, 4]
+        assert rows[0]['ticket_id'] == 5 and rows[0]['broadcast_success'] is True
+
+    def test_failed_group_marks_its_events_failed(self, broadcaster, channel_layer, event_log):
+        channel_layer.group_send.side_effect = TypeError('bad payload')
+        broadcaster.publish('alert_created', {'alert_id': 1}, tenant_id=1)
+        broadcaster.flush()
+
+        row = event_log.call_args.kwargs
+        assert row['broadcast_success'] is False
+        assert row['error_message'] == 'bad payload'
+
+    def test_channel_layer_errors_fail_only_their_group(self, broadcaster, channel_layer, event_log):
+        from channels.exceptions import ChannelFull
+
+        async def send(group, message):
+            if group == 'noc_site_7':
+                raise ChannelFull()
+            if group == 'noc_tenant_2':
+                raise ConnectionResetError('redis went away')
+
+        channel_layer.group_send.side_effect = send
+        broadcaster.publish('alert_created', {'alert_id': 1}, tenant_id=1, site_id=7)
+        broadcaster.publish('alert_created', {'alert_id': 2}, tenant_id=2)
+        broadcaster.publish('alert_created', {'alert_id': 3}, tenant_id=3)
+
+        assert broadcaster.flush() == 3
+
+        assert channel_layer.group_send.await_count == 4
+        rows = {call.kwargs['alert_id']: call.kwargs for call in event_log.call_args_list}
+        assert rows[1]['broadcast_success'] is False
+        assert rows[2]['error_message'] == 'redis went away'
+        assert rows[3]['broadcast_success'] is True
+
+    def test_empty_flush_sends_nothing(self, broadcaster, channel_layer):
+        assert broadcaster.flush() == 0
+        channel_layer.group_send.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_consumer_unpacks_batches():
+    from apps.noc.consumers.noc_dashboard_consumer import NOCDashboardConsumer
+
+    consumer = NOCDashboardConsumer()
+    consumer.handle_noc_event = AsyncMock()
+    events = [{'type': 'alert_created', 'alert_id': 1}, {'type': 'ticket_updated', 'ticket_id': 2}]
+
+    await consumer.noc_event_batch({'type': BATCH_EVENT_TYPE, 'events': events})
+
+    assert [call.args[0] for call in consumer.handle_noc_event.call_args_list] == events
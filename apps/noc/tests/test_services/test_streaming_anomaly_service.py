@@ -18,6 +18,15 @@ from django.core.cache import cache
 from django.utils import timezone
 
 from apps.noc.services.streaming_anomaly_service import StreamingAnomalyService
+from apps.noc.services.streaming_metrics import StreamingMetricsBuffer, histogram_percentile
+
+
+@pytest.fixture(autouse=True)
+def discard_buffered_metrics():
+    """Start every test with an empty in-process metrics buffer"""
+    StreamingMetricsBuffer.discard()
+    yield
+    StreamingMetricsBuffer.discard()
 
 
 @pytest.fixture
@@ -49,6 +58,7 @@ class TestMetricsRecording(TestCase):
             findings_count=2
         )
         
+        StreamingAnomalyService.flush_metrics()
         # Verify event count incremented
         cache_key = f"streaming_anomaly_metrics:{tenant_id}:attendance:count"
         count = cache.get(cache_key)
@@ -65,6 +75,7 @@ class TestMetricsRecording(TestCase):
                 findings_count=1
             )
         
+        StreamingAnomalyService.flush_metrics()
         # Verify count
         cache_key = f"streaming_anomaly_metrics:{tenant_id}:task:count"
         count = cache.get(cache_key)
@@ -86,10 +97,27 @@ class TestMetricsRecording(TestCase):
             findings_count=0
         )
         
-        # Average should be 150.0
-        latency_key = f"streaming_anomaly_metrics:{tenant_id}:location:latency"
-        avg_latency = cache.get(latency_key)
-        assert avg_latency == pytest.approx(150.0, rel=0.1)
+        # Average should be 150.0; percentiles come from the histogram buckets
+        location = StreamingAnomalyService.get_metrics(tenant_id=tenant_id)['by_event_type']['location']
+        assert location['avg_latency_ms'] == pytest.approx(150.0)
+        assert 50.0 < location['p50_latency_ms'] <= 100.0
+        assert 100.0 < location['p99_latency_ms'] <= 250.0
+
+    def test_metrics_buffered_until_flush(self, tenant_id):
+        """Events are written to the cache in one batch on flush"""
+        with patch('apps.noc.services.streaming_metrics.cache') as mock_cache:
+            mock_cache._cache = None
+            for _ in range(5):
+                StreamingAnomalyService.record_event_processed(
+                    tenant_id=tenant_id,
+                    event_type='task',
+                    detection_latency_ms=20.0,
+                    findings_count=0
+                )
+            assert not mock_cache.incr.called
+
+        StreamingAnomalyService.flush_metrics()
+        assert cache.get(f"streaming_anomaly_metrics:{tenant_id}:task:count") == 5
     
     def test_findings_count_tracked(self, tenant_id):
         """Test findings count tracking"""
@@ -106,6 +134,7 @@ class TestMetricsRecording(TestCase):
             findings_count=2
         )
         
+        StreamingAnomalyService.flush_metrics()
         # Total findings should be 5
         findings_key = f"streaming_anomaly_metrics:{tenant_id}:attendance:findings"
         findings = cache.get(findings_key)
@@ -120,6 +149,7 @@ class TestMetricsRecording(TestCase):
             findings_count=0
         )
         
+        StreamingAnomalyService.flush_metrics()
         # Findings counter should not exist or be 0
         findings_key = f"streaming_anomaly_metrics:{tenant_id}:task:findings"
         findings = cache.get(findings_key, 0)
@@ -348,9 +378,10 @@ class TestErrorHandling(TestCase):
         """Clear cache before each test"""
         cache.clear()
     
-    @patch('apps.noc.services.streaming_anomaly_service.cache')
+    @patch('apps.noc.services.streaming_metrics.cache')
     def test_cache_failure_handled(self, mock_cache, tenant_id):
         """Cache failures should be handled gracefully"""
+        mock_cache._cache = None
         mock_cache.incr.side_effect = RuntimeError("Cache unavailable")
         
         # Should not raise exception
@@ -361,13 +392,15 @@ class TestErrorHandling(TestCase):
                 detection_latency_ms=50.0,
                 findings_count=1
             )
+            StreamingAnomalyService.flush_metrics()
         except RuntimeError:
             pytest.fail("Cache failure should be handled gracefully")
     
     @patch('apps.noc.services.streaming_anomaly_service.logger')
     def test_errors_logged(self, mock_logger, tenant_id):
         """Errors should be logged"""
-        with patch('apps.noc.services.streaming_anomaly_service.cache') as mock_cache:
+        with patch('apps.noc.services.streaming_metrics.cache') as mock_cache:
+            mock_cache._cache = None
             mock_cache.incr.side_effect = ValueError("Invalid value")
             
             StreamingAnomalyService.record_event_processed(
@@ -376,6 +409,7 @@ class TestErrorHandling(TestCase):
                 detection_latency_ms=50.0,
                 findings_count=1
             )
+            StreamingAnomalyService.flush_metrics()
             
             # Error should be logged
             assert mock_logger.error.called
@@ -507,3 +541,66 @@ class TestPerformanceMetrics(TestCase):
         
         # 1000 events / 10 minutes = 100 events/min
         assert metrics['overall']['events_per_minute'] == pytest.approx(100.0)
+
+
+class TestLatencyHistogram:
+    """Test percentile estimation from fixed latency buckets"""
+
+    def test_empty_histogram(self):
+        assert histogram_percentile([0] * 15, 0.5) == 0.0
+
+    def test_percentiles_interpolate_within_bucket(self):
+        # 100 observations in the (50, 100] bucket
+        buckets = [0] * 15
+        buckets[6] = 100
+        assert histogram_percentile(buckets, 0.5) == pytest.approx(75.0)
+        assert histogram_percentile(buckets, 0.99) == pytest.approx(99.5)
+
+    def test_overflow_reported_at_largest_bound(self):
+        buckets = [0] * 15
+        buckets[-1] = 3
+        assert histogram_percentile(buckets, 0.99) == 30000.0
+
+
+class TestRedisOutage:
+    """A Redis failure during flush keeps the deltas and does not raise"""
+
+    def test_flush_keeps_deltas_on_cache_error(self, tenant_id):
+        from apps.core.exceptions.patterns import CACHE_EXCEPTIONS
+
+        StreamingMetricsBuffer.increment('streaming_anomaly_metrics:1:task', 'count', 3)
+        with patch('apps.noc.services.streaming_metrics._write_counters',
+                   side_effect=CACHE_EXCEPTIONS[0]('redis down')) as write:
+            assert StreamingMetricsBuffer.flush() == 0
+            write.side_effect = None
+            assert StreamingMetricsBuffer.flush() == 1
+
+        grouped = write.call_args[0][0]
+        assert grouped == {'streaming_anomaly_metrics:1:task': {'count': 3}}
+
+
+class TestSharedRedisCounters:
+    """Counters reach the shared Redis hash of the configured default cache"""
+
+    REDIS_CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': 'redis://127.0.0.1:6379/15',
+            'OPTIONS': {'CLIENT_CLASS': 'django_redis.client.DefaultClient'},
+        }
+    }
+
+    def test_flush_pipelines_into_default_redis_cache(self, tenant_id):
+        from django.test import override_settings
+        from django_redis import get_redis_connection
+
+        key = f"streaming_anomaly_metrics:{tenant_id}:task"
+        with override_settings(CACHES=self.REDIS_CACHES):
+            client = get_redis_connection('default')
+            with patch.object(client, 'pipeline') as pipeline:
+                StreamingMetricsBuffer.increment(key, 'count', 3)
+                StreamingMetricsBuffer.flush()
+            redis_key = cache.make_key(key)
+
+        pipeline.return_value.hincrby.assert_called_once_with(redis_key, 'count', 3)
+        pipeline.return_value.execute.assert_called_once()
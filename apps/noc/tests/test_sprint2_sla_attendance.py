@@ -232,14 +232,14 @@ class TestAttendanceExpectation(TestCase):
         from apps.attendance.models import PeopleEventlog
 
         # Create attendance records for 3 guards
-        today_start = datetime.combine(date.today(), datetime.min.time())
+        today_start = timezone.make_aware(datetime.combine(date.today(), datetime.min.time()))
 
         for user in self.users[:3]:
             PeopleEventlog.objects.create(
                 people=user,
                 bu=self.site,
                 client=self.client,
-                checkin=timezone.now(),
+                punchintime=timezone.now(),
                 cdtz=today_start
             )
 
@@ -251,6 +251,29 @@ class TestAttendanceExpectation(TestCase):
         assert metrics['attendance_present'] == 3
         assert metrics['attendance_missing'] == 2  # 5 expected - 3 present
 
+    def test_late_arrivals_use_punch_in_time(self):
+        """Check-ins after 09:00 plus the late threshold count as late."""
+        from apps.attendance.models import PeopleEventlog
+
+        today_start = timezone.make_aware(datetime.combine(date.today(), datetime.min.time()))
+        for user, punch_in in zip(self.users, (time(8, 55), time(9, 10), time(10, 0))):
+            PeopleEventlog.objects.create(
+                people=user,
+                bu=self.site,
+                client=self.client,
+                punchintime=timezone.make_aware(datetime.combine(date.today(), punch_in)),
+                cdtz=today_start
+            )
+
+        metrics = self.service.calculate_attendance_metrics(
+            sites=[self.site],
+            target_date=date.today()
+        )
+
+        assert metrics['attendance_present'] == 3
+        assert metrics['attendance_late'] == 1
+        assert metrics['actual_breakdown'] == {'checked_in': 3, 'checked_out': 0}
+
 
 @pytest.mark.django_db
 class TestNOCAggregationIntegration(TestCase):
@@ -27,6 +27,8 @@ from apps.noc.services.streaming_anomaly_service import StreamingAnomalyService
 from apps.noc.signals.streaming_event_publishers import (
     publish_attendance_event,
     publish_task_event,
+    publish_task_events,
+    publish_device_event,
     publish_location_event,
     _publish_to_stream,
 )
@@ -341,6 +343,55 @@ class TestStreamingEventPublishers:
             assert call_args['event_type'] == 'attendance'
             assert call_args['event_data']['site_id'] == 1
 
+    def test_publish_task_events_for_bulk_created_jobneeds(self, mock_channel_layer):
+        """Test bulk task events use FK ids and skip rows without a tenant."""
+        jobneeds = [
+            Mock(id=1, uuid=uuid.uuid4(), tenant_id=1, job_id=7, bu_id=3, client_id=2, cdtz=timezone.now(),
+                 spec=['id', 'uuid', 'tenant_id', 'job_id', 'bu_id', 'client_id', 'cdtz']),
+            Mock(id=2, tenant_id=None, spec=['id', 'tenant_id']),
+        ]
+
+        with patch('apps.noc.signals.streaming_event_publishers._publish_to_stream') as mock_publish:
+            assert publish_task_events(jobneeds) == 1
+
+        event_data = mock_publish.call_args[1]['event_data']
+        assert (event_data['job_id'], event_data['site_id'], event_data['client_id']) == (7, 3, 2)
+
+
+    def test_publish_task_event_on_completion(self, mock_channel_layer):
+        """Test completed Jobneeds publish with an id distinct from creation."""
+        from apps.activity.models import Jobneed
+
+        instance = Mock(id=1, uuid=uuid.uuid4(), tenant_id=1, job_id=7, bu_id=3, client_id=2,
+                        cdtz=timezone.now(), status='ASSIGNED',
+                        spec=['id', 'uuid', 'tenant_id', 'job_id', 'bu_id', 'client_id', 'cdtz', 'status'])
+
+        with patch('apps.noc.signals.streaming_event_publishers._publish_to_stream') as mock_publish:
+            publish_task_event(sender=Jobneed, instance=instance, created=False)
+            assert not mock_publish.called
+
+            instance.status = 'COMPLETED'
+            publish_task_event(sender=Jobneed, instance=instance, created=False)
+
+        call_args = mock_publish.call_args[1]
+        assert call_args['event_id'] == f"{instance.uuid}:completed"
+        assert call_args['event_data']['status'] == 'COMPLETED'
+
+    def test_publish_device_event(self, mock_channel_layer, sample_site):
+        """Test device events resolve the tenant from the event's site."""
+        from apps.activity.models import DeviceEventlog
+
+        instance = Mock(id=1, uuid=uuid.uuid4(), bu_id=sample_site.id, people_id=5, client_id=2,
+                        cdtz=timezone.now(), eventvalue='STEPCOUNT', spec=DeviceEventlog)
+
+        with patch('apps.noc.signals.streaming_event_publishers._publish_to_stream') as mock_publish:
+            publish_device_event(sender=DeviceEventlog, instance=instance, created=True)
+
+        call_args = mock_publish.call_args[1]
+        assert call_args['tenant_id'] == sample_site.tenant_id
+        assert call_args['event_type'] == 'device'
+        assert call_args['event_data']['site_id'] == sample_site.id
+
 
 @pytest.mark.django_db
 class TestStreamingAnomalyService:
@@ -406,73 +406,30 @@ class CapabilityManager(TenantAwareManager):
         )
 
     def get_child_data(self, parent, cfor):
-        return self.filter(cfor=cfor, parent__capscode=parent) if parent else None
+        """Capabilities of cfor under the parent capscode, from the cached tree."""
+        from apps.peoples.services.capability_tree_service import CapabilityTreeService
+
+        return CapabilityTreeService.get_tree().children_of(parent, cfor) if parent else None
 
     def get_caps(self, cfor):
-        qset = self.filter(cfor=cfor, enable=True).values_list("capscode", "capsname")
-        return qset or self.none()
-    
+        """Enabled (capscode, capsname) pairs of a platform, from the cached tree."""
+        from apps.peoples.services.capability_tree_service import CapabilityTreeService
+
+        return CapabilityTreeService.get_tree().caps(cfor)
+
     def get_web_caps_for_client_orm(self):
         """
         Django ORM implementation to replace get_web_caps_for_client raw SQL.
         Returns capability hierarchy with depth and path information.
+
+        Nodes come from CapabilityTreeService and are ordered by the
+        "{id}{depth}" key of the original PostgreSQL query; each node's xpath
+        is the full TreeTraversal chain ("1>22>53").
         """
-        from apps.core.queries import TreeTraversal
-        
-        # Get all WEB capabilities
-        all_caps = list(
-            self.filter(cfor='WEB')
-            .values('id', 'capscode', 'capsname', 'parent_id', 'cfor')
-        )
-        
-        if not all_caps:
-            return []
-        
-        # Build tree structure starting from root (id=1)
-        tree_data = TreeTraversal.build_tree(
-            all_caps,
-            root_id=1,
-            id_field='id',
-            code_field='capscode',
-            parent_field='parent_id'
-        )
-        
-        # Create result with all required fields
-        result = []
-        for node in tree_data:
-            # Find the original capability data
-            cap_data = next(
-                (cap for cap in all_caps if cap['id'] == node['id']),
-                None
-            )
-            
-            if cap_data:
-                # Create a mock object with required attributes
-                class CapabilityResult:
-                    def __init__(self, data, depth, path, xpath):
-                        self.id = data['id']
-                        self.capscode = data['capscode']
-                        self.capsname = data['capsname']
-                        self.parent_id = data['parent_id']
-                        self.cfor = data['cfor']
-                        self.depth = depth
-                        self.path = path
-                        self.xpath = xpath
-                
-                # Calculate xpath similar to PostgreSQL query
-                xpath = f"{node['id']}{node['depth']}"
-                
-                result.append(CapabilityResult(
-                    cap_data,
-                    node['depth'],
-                    node['path'],
-                    xpath
-                ))
-        
-        # Sort by xpath to match PostgreSQL ordering
-        result.sort(key=lambda x: x.xpath)
-        
-        return result
+        from apps.peoples.services.capability_tree_service import CapabilityTreeService
+
+        nodes = CapabilityTreeService.get_tree().menu('WEB')
+        return sorted(nodes, key=lambda node: f"{node.id}{node.depth}")
 
 
 class PgblngManager(TenantAwareManager):
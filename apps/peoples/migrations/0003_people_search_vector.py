@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-16 09:00
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("peoples", "0002_add_onboarding_tracking"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="people",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="people",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="people_search_vector_gin_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="people",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("peoplecode"),
+                    name="gin_trgm_ops",
+                ),
+                name="people_peoplecode_trgm_idx",
+            ),
+        ),
+    ]
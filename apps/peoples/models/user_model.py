@@ -11,8 +11,11 @@ Compliant with Rule #7 from .claude/rules.md (< 150 lines).
 import uuid
 import logging
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils.translation import gettext_lazy as _
 from apps.tenants.models import TenantAwareModel
 from apps.ontology import ontology
@@ -247,6 +250,10 @@ class People(PeopleCapabilityMixin, PeopleCompatibilityMixin, AbstractBaseUser,
         help_text=_("User's preferred language for conversations and content")
     )
 
+    # Stored full-text vector over name/code/login (never the encrypted
+    # email or mobile), refreshed by apps.search signals
+    search_vector = SearchVectorField(null=True, editable=False)
+
     objects = PeopleManager()
     USERNAME_FIELD = "loginid"
     REQUIRED_FIELDS = ["peoplecode", "peoplename", "email"]
@@ -262,6 +269,8 @@ class People(PeopleCapabilityMixin, PeopleCompatibilityMixin, AbstractBaseUser,
             models.Index(fields=['email'], name='people_email_idx'),
             models.Index(fields=['tenant', 'cdtz'], name='people_tenant_cdtz_idx'),
             models.Index(fields=['tenant', 'enable'], name='people_tenant_enable_idx'),
+            GinIndex(fields=['search_vector'], name='people_search_vector_gin_idx'),
+            GinIndex(OpClass(Upper('peoplecode'), name='gin_trgm_ops'), name='people_peoplecode_trgm_idx'),
         ]
 
     def __str__(self) -> str:
@@ -14,6 +14,7 @@ Service Classes:
 - EmailVerificationService: Email verification workflow
 - UserDefaultsService: Handles default field values and initialization
 - UserCapabilityService: Manages user capabilities and permissions
+- CapabilityTreeService: Process-wide cached capability trees
 - FileUploadService: Secure file upload handling with comprehensive validation
 """
 
@@ -72,3 +73,7 @@ from .user_defaults_service import UserDefaultsService
 
 __all__.append('UserCapabilityService')
 __all__.append('UserDefaultsService')
+
+from .capability_tree_service import CapabilityTreeService
+
+__all__.append('CapabilityTreeService')
@@ -0,0 +1,224 @@
+"""
+Capability tree service.
+
+Builds the WEB / MOB / REPORT / PORTLET / NOC capability trees once per
+process from a single query, into slotted nodes with id -> node and
+capscode -> nodes maps, and serves capability choices, child lookups and
+the web menu hierarchy from memory instead of re-querying (and, for the
+menu, scanning every capability per node) on each call.
+
+Trees are kept per (database alias, tenant). Capability post_save /
+post_delete bump a version counter in the shared cache once their
+transaction commits; every process compares it on access and rebuilds when
+it has moved. Entries also expire
+after CAPABILITY_TREE_MAX_AGE seconds, which covers queryset.update() and
+unavailable caches.
+
+Created: 2026-10
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.core.exceptions.patterns import CACHE_EXCEPTIONS
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['CapabilityNode', 'CapabilityTree', 'CapabilityTreeService']
+
+VERSION_KEY = 'capability_tree:version'
+ROOT_ID = 1
+
+
+class CapabilityNode:
+    """One capability with its position in the tree."""
+
+    __slots__ = ('id', 'capscode', 'capsname', 'parent_id', 'cfor', 'enable',
+                 'depth', 'path', 'xpath', 'children')
+
+    def __init__(self, row: Dict):
+        self.id = row['id']
+        self.capscode = row['capscode']
+        self.capsname = row['capsname']
+        self.parent_id = row['parent_id']
+        self.cfor = row['cfor']
+        self.enable = row['enable']
+        self.depth = None
+        self.path = None
+        self.xpath = None
+        self.children = []
+
+    def as_dict(self) -> Dict:
+        """Same keys as TreeTraversal.build_tree() rows."""
+        return {
+            'id': self.id, 'capscode': self.capscode, 'parent_id': self.parent_id,
+            'depth': self.depth, 'path': self.path, 'xpath': self.xpath,
+            'capsname': self.capsname, 'cfor': self.cfor,
+        }
+
+
+class CapabilityTree:
+    """
+    All capabilities of one tenant, indexed once.
+
+    nodes keeps query order (the model's default ordering) so choice lists
+    come out as the equivalent querysets did.
+    """
+
+    __slots__ = ('nodes', 'by_id', 'by_code', 'menus', '_lock')
+
+    def __init__(self, rows: Iterable[Dict]):
+        self.nodes = [CapabilityNode(row) for row in rows]
+        self.by_id = {node.id: node for node in self.nodes}
+        self.by_code = {}
+        for node in self.nodes:
+            self.by_code.setdefault(node.capscode, []).append(node)
+            parent = self.by_id.get(node.parent_id)
+            if parent is not None and parent is not node:
+                parent.children.append(node)
+        self.menus = {}
+        # The walk writes depth/path/xpath onto the shared nodes
+        self._lock = threading.Lock()
+
+    def get(self, node_id: int) -> Optional[CapabilityNode]:
+        return self.by_id.get(node_id)
+
+    def caps(self, cfor: str) -> List[Tuple[str, str]]:
+        """Enabled (capscode, capsname) pairs of a platform."""
+        return [(node.capscode, node.capsname) for node in self.nodes if node.cfor == cfor and node.enable]
+
+    def caps_for_codes(self, codes: Iterable[str], cfor: str) -> List[Tuple[str, str]]:
+        """(capscode, capsname) of the given codes on a platform, in tree order."""
+        codes = set(codes or ())
+        return [(node.capscode, node.capsname) for node in self.nodes if node.cfor == cfor and node.capscode in codes]
+
+    def children_of(self, parent_code: str, cfor: str) -> List[CapabilityNode]:
+        """Capabilities of cfor whose parent has capscode parent_code."""
+        return [
+            child
+            for parent in self.by_code.get(parent_code, ())
+            for child in parent.children
+            if child.cfor == cfor
+        ]
+
+    def menu(self, cfor: str = 'WEB', enabled_only: bool = False, by_id: bool = False) -> List[CapabilityNode]:
+        """
+        Depth-first hierarchy under the root capability, with depth, path
+        (capscode chain) and xpath filled in as TreeTraversal.build_tree() does.
+        Siblings keep query order, or id order with by_id.
+        """
+        key = (cfor, enabled_only, by_id)
+        menu = self.menus.get(key)
+        if menu is None:
+            with self._lock:
+                menu = self.menus.get(key)
+                if menu is None:
+                    menu = self.menus[key] = self._walk(cfor, enabled_only, by_id)
+        return menu
+
+    def _walk(self, cfor: str, enabled_only: bool, by_id: bool) -> List[CapabilityNode]:
+        """Caller holds _lock."""
+        root = self.by_id.get(ROOT_ID)
+        if root is None or root.cfor != cfor or (enabled_only and not root.enable):
+            return []
+        root.depth, root.path, root.xpath = 1, root.capscode, str(root.id)
+        ordered, stack, seen = [], [root], set()
+        while stack:
+            node = stack.pop()
+            if node.id in seen:
+                continue
+            seen.add(node.id)
+            ordered.append(node)
+            children = [
+                child for child in node.children
+                if child.cfor == cfor and (child.enable or not enabled_only)
+            ]
+            if by_id:
+                children.sort(key=lambda child: child.id)
+            for child in reversed(children):
+                child.depth = node.depth + 1
+                child.path = f"{node.path}->{child.capscode}"
+                child.xpath = f"{node.xpath}>{child.id}{child.depth}"
+                stack.append(child)
+        return ordered
+
+
+class CapabilityTreeService:
+    """Process-wide, version-checked cache of CapabilityTree per tenant."""
+
+    _trees: Dict[Tuple[str, Optional[int]], Tuple[int, float, CapabilityTree]] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_tree(cls) -> CapabilityTree:
+        """Tree of the current tenant, rebuilt when capabilities changed."""
+        key = cls._scope()
+        version = cls._version()
+        max_age = getattr(settings, 'CAPABILITY_TREE_MAX_AGE', 600)
+        entry = cls._trees.get(key)
+        if entry and entry[0] == version and time.monotonic() - entry[1] < max_age:
+            return entry[2]
+        with cls._lock:
+            # Another thread may have rebuilt it while we waited
+            entry = cls._trees.get(key)
+            if entry and entry[0] == version and time.monotonic() - entry[1] < max_age:
+                return entry[2]
+            tree = cls._build()
+            cls._trees[key] = (version, time.monotonic(), tree)
+        logger.debug(f"Built capability tree for {key} ({len(tree.nodes)} nodes, version {version})")
+        return tree
+
+    @classmethod
+    def invalidate(cls, using: Optional[str] = None) -> None:
+        """
+        Drop this process's trees and make every other process rebuild after commit.
+
+        Bumping the version before commit would let another process rebuild
+        from the old rows and cache that tree under the new version.
+        """
+        from apps.core.utils_new.db_utils import get_current_db_name
+
+        with cls._lock:
+            cls._trees.clear()
+        transaction.on_commit(cls._bump_version, using=using or get_current_db_name())
+
+    @staticmethod
+    def _bump_version() -> None:
+        try:
+            cache.add(VERSION_KEY, 0, None)
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            # Key evicted between add and incr
+            cache.set(VERSION_KEY, 1, None)
+        except CACHE_EXCEPTIONS as e:
+            logger.warning(f"Could not bump capability tree version: {e}")
+
+    @staticmethod
+    def _version() -> int:
+        try:
+            return cache.get(VERSION_KEY, 0)
+        except CACHE_EXCEPTIONS as e:
+            logger.warning(f"Capability tree version unavailable: {e}")
+            return -1
+
+    @staticmethod
+    def _scope() -> Tuple[str, Optional[int]]:
+        from apps.core.utils_new.db_utils import get_current_db_name
+        from apps.tenants.utils import get_current_tenant_cached
+
+        tenant = get_current_tenant_cached()
+        return get_current_db_name(), tenant.pk if tenant else None
+
+    @staticmethod
+    def _build() -> CapabilityTree:
+        from apps.peoples.models import Capability
+
+        return CapabilityTree(
+            Capability.objects.values('id', 'capscode', 'capsname', 'parent_id', 'cfor', 'enable')
+        )
@@ -5,14 +5,15 @@ This module contains signal handlers for People model operations including:
 - MQTT message publishing for real-time updates
 - Automatic creation of related models (PeopleProfile, PeopleOrganizational)
 - Session rotation on privilege changes (Rule #10: Session Security)
+- Capability tree invalidation on Capability changes
 """
 
 import json
 import logging
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver, Signal
 from django.db import DatabaseError, IntegrityError
-from apps.peoples.models import People
+from apps.peoples.models import Capability, People
 from apps.peoples.serializers import PeopleSerializer
 
 logger = logging.getLogger("peoples.signals")
@@ -271,3 +272,11 @@ def handle_privilege_change(sender, instance, created, **kwargs):
 
         except (AttributeError, ValueError) as e:
             logger.error(f"Error handling privilege change: {str(e)}")
+
+
+@receiver([post_save, post_delete], sender=Capability)
+def invalidate_capability_tree(sender, instance, **kwargs):
+    """Rebuild the cached capability trees after any Capability change."""
+    from apps.peoples.services.capability_tree_service import CapabilityTreeService
+
+    CapabilityTreeService.invalidate(using=kwargs.get('using'))
@@ -0,0 +1,121 @@
+"""
+Unit Tests for CapabilityTreeService.
+
+Tests tree indexing, menu traversal and version-based invalidation.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from django.core.cache import cache
+
+from apps.core.queries.base import TreeTraversal
+from apps.peoples.services.capability_tree_service import (
+    CapabilityTree,
+    CapabilityTreeService,
+)
+
+
+def cap(id, capscode, parent_id, cfor='WEB', enable=True):
+    return {
+        'id': id, 'capscode': capscode, 'capsname': capscode.title(),
+        'parent_id': parent_id, 'cfor': cfor, 'enable': enable,
+    }
+
+
+ROWS = [
+    cap(1, 'NONE', None),
+    cap(5, 'REPORTS', 1),
+    cap(2, 'PEOPLE', 1),
+    cap(3, 'PEOPLE_LIST', 2),
+    cap(4, 'PEOPLE_ADD', 2, enable=False),
+    cap(6, 'MOB_TOUR', 1, cfor='MOB'),
+    cap(7, 'MOB_TASK', 1, cfor='MOB', enable=False),
+]
+
+
+class TestCapabilityTree:
+
+    def test_caps_are_enabled_pairs_in_query_order(self):
+        tree = CapabilityTree(ROWS)
+        assert tree.caps('MOB') == [('MOB_TOUR', 'Mob_Tour')]
+        assert tree.caps('WEB')[:2] == [('NONE', 'None'), ('REPORTS', 'Reports')]
+
+    def test_children_of_filters_platform(self):
+        tree = CapabilityTree(ROWS)
+        assert [node.capscode for node in tree.children_of('NONE', 'MOB')] == ['MOB_TOUR', 'MOB_TASK']
+        assert tree.children_of('MISSING', 'WEB') == []
+
+    def test_menu_matches_tree_traversal(self):
+        enabled = [row for row in ROWS if row['enable'] and row['cfor'] == 'WEB']
+        expected = TreeTraversal.build_tree(
+            sorted(enabled, key=lambda row: row['id']), root_id=1, code_field='capscode'
+        )
+
+        menu = CapabilityTree(ROWS).menu('WEB', enabled_only=True, by_id=True)
+
+        assert [node.as_dict() for node in menu] == expected
+
+    def test_menu_keeps_query_order_and_disabled_nodes(self):
+        menu = CapabilityTree(ROWS).menu('WEB')
+        assert [node.capscode for node in menu] == ['NONE', 'REPORTS', 'PEOPLE', 'PEOPLE_LIST', 'PEOPLE_ADD']
+        assert menu[3].path == 'NONE->PEOPLE->PEOPLE_LIST'
+        assert menu[3].depth == 3
+
+    def test_self_parented_root_does_not_loop(self):
+        tree = CapabilityTree([cap(1, 'NONE', 1), cap(2, 'CHILD', 1)])
+        assert [node.id for node in tree.menu('WEB')] == [1, 2]
+
+
+class TestCapabilityTreeService:
+
+    def setup_method(self):
+        cache.clear()
+        CapabilityTreeService._trees.clear()
+
+    @pytest.mark.django_db
+    def test_tree_is_built_once_until_invalidated(self):
+        with patch.object(CapabilityTreeService, '_scope', return_value=('default', 1)), \
+                patch.object(CapabilityTreeService, '_build', side_effect=lambda: CapabilityTree(ROWS)) as build:
+            first = CapabilityTreeService.get_tree()
+            assert CapabilityTreeService.get_tree() is first
+            CapabilityTreeService.invalidate()
+            assert CapabilityTreeService.get_tree() is not first
+
+        assert build.call_count == 2
+
+    @pytest.mark.django_db
+    def test_version_bumped_only_after_commit(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            CapabilityTreeService.invalidate(using='default')
+            assert cache.get('capability_tree:version', 0) == 0
+
+        assert cache.get('capability_tree:version') == 1
+
+    def test_other_process_sees_version_bump(self):
+        with patch.object(CapabilityTreeService, '_scope', return_value=('default', 1)), \
+                patch.object(CapabilityTreeService, '_build', side_effect=lambda: CapabilityTree(ROWS)) as build:
+            CapabilityTreeService.get_tree()
+            cache.set('capability_tree:version', 42, None)
+            CapabilityTreeService.get_tree()
+
+        assert build.call_count == 2
+
+    def test_concurrent_misses_build_once(self):
+        def slow_build():
+            time.sleep(0.05)
+            return CapabilityTree(ROWS)
+
+        with patch.object(CapabilityTreeService, '_scope', return_value=('default', 1)), \
+                patch.object(CapabilityTreeService, '_build', side_effect=slow_build) as build:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                trees = list(pool.map(lambda _: CapabilityTreeService.get_tree(), range(4)))
+
+        assert build.call_count == 1
+        assert all(tree is trees[0] for tree in trees)
+        assert [node.capscode for node in trees[0].menu('WEB')] == [
+            'NONE', 'REPORTS', 'PEOPLE', 'PEOPLE_LIST', 'PEOPLE_ADD'
+        ]
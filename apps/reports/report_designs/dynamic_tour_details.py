@@ -17,6 +17,7 @@ class DynamicTourDetailReport(BaseReportsExport):
     report_name = "DYNAMICTOURDETAILS"
     unsupported_formats = ["None"]
     fields = ["site*", "fromdatetime*", "uptodatetime*"]
+    pdf_section_rows = 25
 
     def __init__(
         self,
@@ -11,6 +11,17 @@ class ListofTaskReport(BaseReportsExport):
     ytpl_applogo = "frontend/static/assets/media/images/logo.png"
     report_name = "LISTOFTASKS"
     fields = ["site*", "fromdatetime*", "uptodatetime*", "peoplegroup", "people"]
+    pdf_section_rows = 500
+    export_columns = [
+        "Planned Date Time",
+        "Description",
+        "Assigned To",
+        "Asset",
+        "Question Set",
+        "Status",
+        "Expired Date Time",
+        "Gracetime",
+    ]
     unsupported_formats = ["None"]
 
     def __init__(
@@ -77,12 +88,18 @@ class ListofTaskReport(BaseReportsExport):
         """
         self.set_args_required_for_query()
         # Use new Django ORM implementation
-        self.data = ReportQueryRepository.listoftasks_report(
+        query_args = dict(
             timezone_str=self.args["timezone"],
             siteids=self.args["siteids"],
             from_date=self.formdata["fromdatetime"],
             upto_date=self.formdata["uptodatetime"]
         )
+        if self.is_streaming_export():
+            return self.set_streaming_data(
+                ReportQueryRepository.listoftasks_queryset(**query_args),
+                ReportQueryRepository.listoftasks_row,
+            )
+        self.data = ReportQueryRepository.listoftasks_report(**query_args)
         return len(self.data) > 0
 
     def set_additional_content(self):
@@ -91,21 +108,6 @@ class ListofTaskReport(BaseReportsExport):
         uptodatetime = self.formdata.get("uptodatetime").strftime("%d/%m/%Y %H:%M:%S")
         self.additional_content = f"Client: {bt['buname']}; Report: {self.report_title}; From: {fromdatetime} To: {uptodatetime}"
 
-    def excel_columns(self, df):
-        df = df[
-            [
-                "Planned Date Time",
-                "Description",
-                "Assigned To",
-                "Asset",
-                "Question Set",
-                "Status",
-                "Expired Date Time",
-                "Gracetime",
-            ]
-        ]
-        return df
-
     def excel_layout(self, worksheet, workbook, df, writer, output):
         super().excel_layout(worksheet, workbook, df, writer, output)
         # overriding to design the excel file
@@ -12,6 +12,20 @@ class ListofTourReport(BaseReportsExport):
     report_name = "LISTOFTOURS"
     unsupported_formats = ["None"]
     fields = ["site*", "fromdatetime*", "uptodatetime*"]
+    pdf_section_rows = 500
+    export_columns = [
+        "Client",
+        "Site",
+        "Tour/Route",
+        "Planned Datetime",
+        "Expiry Datetime",
+        "Assigned To",
+        "JobType",
+        "Status",
+        "Performed On",
+        "Performed By",
+        "Is Time Bound",
+    ]
 
     def __init__(
         self,
@@ -74,12 +88,18 @@ class ListofTourReport(BaseReportsExport):
         """
         self.set_args_required_for_query()
         # Use new Django ORM implementation
-        self.data = ReportQueryRepository.listoftours_report(
+        query_args = dict(
             timezone_str=self.args["timezone"],
             siteids=self.args["siteids"],
             from_date=self.formdata["fromdatetime"],
             upto_date=self.formdata["uptodatetime"]
         )
+        if self.is_streaming_export():
+            return self.set_streaming_data(
+                ReportQueryRepository.listoftours_queryset(**query_args),
+                ReportQueryRepository.listoftours_row,
+            )
+        self.data = ReportQueryRepository.listoftours_report(**query_args)
         return len(self.data) > 0
 
     def set_additional_content(self):
@@ -88,24 +108,6 @@ class ListofTourReport(BaseReportsExport):
         uptodatetime = self.formdata.get("uptodatetime").strftime("%d/%m/%Y %H:%M:%S")
         self.additional_content = f"Client: {bt['buname']}; Report: {self.report_title}; From: {fromdatetime} To: {uptodatetime}"
 
-    def excel_columns(self, df):
-        df = df[
-            [
-                "Client",
-                "Site",
-                "Tour/Route",
-                "Planned Datetime",
-                "Expiry Datetime",
-                "Assigned To",
-                "JobType",
-                "Status",
-                "Performed On",
-                "Performed By",
-                "Is Time Bound",
-            ]
-        ]
-        return df
-
     def excel_layout(self, worksheet, workbook, df, writer, output):
         super().excel_layout(worksheet, workbook, df, writer, output)
         # overriding to design the excel file
@@ -16,6 +16,7 @@ class LogSheet(BaseReportsExport):
     ytpl_applogo = "frontend/static/assets/media/images/logo.png"
     report_name = "LOGSHEET"
     fields = ["site*", "assettype*", "asset*", "qset*", "fromdate*", "uptodate*"]
+    pdf_section_rows = 500
     unsupported_formats = ["None"]
 
     def __init__(
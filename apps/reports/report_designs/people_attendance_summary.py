@@ -12,6 +12,8 @@ class PeopleAttendanceSummaryReport(BaseReportsExport):
     report_name = "PEOPLEATTENDANCESUMMARY"
     unsupported_formats = ["html", "json", "csv"]
     fields = ["site*", "fromdatetime*", "uptodatetime*"]
+    # Departments per independently rendered PDF section
+    pdf_section_departments = 5
 
     def __init__(
         self,
@@ -76,6 +78,24 @@ class PeopleAttendanceSummaryReport(BaseReportsExport):
 
         return len(self.context["data"]) > 0
 
+    def get_pdf_sections(self):
+        """
+        Section the PDF by department; a department's rows (and rowspans)
+        always stay in one section.
+        """
+        if not self.context or not self.context.get("data"):
+            return None
+        departments = list(self.context["data"][0].items())
+        if len(departments) <= self.pdf_section_departments:
+            return None
+
+        from apps.reports.services.sectioned_pdf_service import chunk_rows
+
+        return [
+            dict(self.context, data=[dict(chunk)])
+            for chunk in chunk_rows(departments, self.pdf_section_departments)
+        ]
+
     def set_args_required_for_query(self):
         self.args = {
             "timezone": get_timezone(self.formdata["ctzoffset"]),
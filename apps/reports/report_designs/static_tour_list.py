@@ -12,6 +12,19 @@ class StaticTourList(BaseReportsExport):
     report_name = "STATICTOURLIST"
     unsupported_formats = ["None"]
     fields = ["site*", "fromdatetime*", "uptodatetime*"]
+    pdf_section_rows = 500
+    export_columns = [
+        "Client",
+        "Site",
+        "Tour/Route",
+        "Planned Datetime",
+        "Expiry Datetime",
+        "Assigned To",
+        "JobType",
+        "Status",
+        "Performed On",
+        "Performed By",
+    ]
 
     def __init__(
         self,
@@ -74,12 +87,18 @@ class StaticTourList(BaseReportsExport):
         """
         self.set_args_required_for_query()
         # Use new Django ORM implementation
-        self.data = ReportQueryRepository.statictourlist_report(
+        query_args = dict(
             timezone_str=self.args["timezone"],
             siteids=self.args["siteids"],
             from_date=self.formdata["fromdatetime"].date() if hasattr(self.formdata["fromdatetime"], 'date') else self.formdata["fromdatetime"],
             upto_date=self.formdata["uptodatetime"].date() if hasattr(self.formdata["uptodatetime"], 'date') else self.formdata["uptodatetime"]
         )
+        if self.is_streaming_export():
+            return self.set_streaming_data(
+                ReportQueryRepository.statictourlist_queryset(**query_args),
+                ReportQueryRepository.statictourlist_row,
+            )
+        self.data = ReportQueryRepository.statictourlist_report(**query_args)
         return len(self.data) > 0
 
     def set_additional_content(self):
@@ -88,23 +107,6 @@ class StaticTourList(BaseReportsExport):
         uptodatetime = self.formdata.get("uptodatetime").strftime("%d/%m/%Y %H:%M:%S")
         self.additional_content = f"Client: {bt['buname']}; Report: {self.report_title}; From: {fromdatetime} To: {uptodatetime}"
 
-    def excel_columns(self, df):
-        df = df[
-            [
-                "Client",
-                "Site",
-                "Tour/Route",
-                "Planned Datetime",
-                "Expiry Datetime",
-                "Assigned To",
-                "JobType",
-                "Status",
-                "Performed On",
-                "Performed By",
-            ]
-        ]
-        return df
-
     def excel_layout(self, worksheet, workbook, df, writer, output):
         super().excel_layout(worksheet, workbook, df, writer, output)
         # overriding to design the excel file
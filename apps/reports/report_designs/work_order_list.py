@@ -12,6 +12,19 @@ class WorkOrderList(BaseReportsExport):
     report_name = "WORKORDERLIST"
     unsupported_formats = ["None"]
     fields = ["site*", "fromdatetime*", "uptodatetime*"]
+    pdf_section_rows = 500
+    export_columns = [
+        "wo_id",
+        "Created On",
+        "Created By",
+        "Planned Date Time",
+        "Description",
+        "Completed On",
+        "Priority",
+        "Status",
+        "Site",
+        "Vendor Name",
+    ]
 
     def __init__(
         self,
@@ -74,12 +87,18 @@ class WorkOrderList(BaseReportsExport):
         """
         self.set_args_required_for_query()
         # Use new Django ORM implementation
-        self.data = ReportQueryRepository.workorderlist_report(
+        query_args = dict(
             timezone_str=self.args["timezone"],
             siteids=self.args["siteids"],
             from_date=self.formdata["fromdatetime"],
             upto_date=self.formdata["uptodatetime"]
         )
+        if self.is_streaming_export():
+            return self.set_streaming_data(
+                ReportQueryRepository.workorderlist_queryset(**query_args),
+                ReportQueryRepository.workorderlist_row,
+            )
+        self.data = ReportQueryRepository.workorderlist_report(**query_args)
         return len(self.data) > 0
 
     def set_additional_content(self):
@@ -88,23 +107,6 @@ class WorkOrderList(BaseReportsExport):
         uptodatetime = self.formdata.get("uptodatetime").strftime("%d/%m/%Y %H:%M:%S")
         self.additional_content = f"Client: {bt['buname']}; Report: {self.report_title}; From: {fromdatetime} To: {uptodatetime}"
 
-    def excel_columns(self, df):
-        df = df[
-            [
-                "wo_id",
-                "Created On",
-                "Created By",
-                "Planned Date Time",
-                "Description",
-                "Completed On",
-                "Priority",
-                "Status",
-                "Site",
-                "Vendor Name",
-            ]
-        ]
-        return df
-
     def excel_layout(self, worksheet, workbook, df, writer, output):
         super().excel_layout(worksheet, workbook, df, writer, output)
         # overriding to design the excel file
@@ -0,0 +1,137 @@
+"""
+Scheduled Report Metrics
+
+Queue depth and throughput of scheduled report fan-out, per tenant
+database alias. Counters live in the shared cache so the dispatcher
+(create_scheduled_reports) and every reports worker see the same numbers;
+values are mirrored to Prometheus when the monitoring app is available.
+
+- queue_depth: render subtasks dispatched and not yet finished
+- completed/failed: schedule records served in the last window
+  (per-minute buckets, SCHEDULED_REPORTS_METRICS_WINDOW minutes)
+- deduplicated: schedule records that shared another record's render
+
+Complies with Rule #4, #11 from .claude/rules.md
+"""
+
+import logging
+import time
+from typing import Dict, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.exceptions.patterns import CACHE_EXCEPTIONS
+
+try:
+    from monitoring.services.prometheus_metrics import prometheus
+    PROMETHEUS_ENABLED = True
+except ImportError:
+    PROMETHEUS_ENABLED = False
+
+logger = logging.getLogger("django.reports")
+
+__all__ = ['ScheduledReportMetrics']
+
+KEY_PREFIX = 'scheduled_reports:metrics'
+DEPTH_TTL_SECONDS = 24 * 3600
+BUCKET_TTL_SECONDS = 2 * 3600
+
+
+class ScheduledReportMetrics:
+    """Cache-backed counters for scheduled report fan-out."""
+
+    @classmethod
+    def record_dispatched(cls, db_alias: str, subtasks: int, deduplicated: int = 0) -> None:
+        depth = cls._incr(cls._depth_key(db_alias), subtasks, DEPTH_TTL_SECONDS)
+        if deduplicated:
+            cls._incr(cls._bucket_key(db_alias, 'deduplicated'), deduplicated, BUCKET_TTL_SECONDS)
+        cls._gauge('scheduled_report_queue_depth', depth, db_alias)
+
+    @classmethod
+    def record_finished(cls, db_alias: str, generated: int, failed: int, duration_seconds: float) -> None:
+        depth = cls._incr(cls._depth_key(db_alias), -1, DEPTH_TTL_SECONDS)
+        cls._incr(cls._bucket_key(db_alias, 'completed'), generated, BUCKET_TTL_SECONDS)
+        cls._incr(cls._bucket_key(db_alias, 'failed'), failed, BUCKET_TTL_SECONDS)
+        cls._gauge('scheduled_report_queue_depth', depth, db_alias)
+
+        if PROMETHEUS_ENABLED:
+            prometheus.observe_histogram(
+                'scheduled_report_render_seconds',
+                duration_seconds,
+                labels={'db_alias': db_alias},
+                help_text='Duration of one deduplicated scheduled report render'
+            )
+            prometheus.increment_counter(
+                'scheduled_reports_generated_total',
+                labels={'db_alias': db_alias},
+                value=generated,
+                help_text='Schedule records served by a render'
+            )
+
+    @classmethod
+    def snapshot(cls, db_aliases: Iterable[str]) -> Dict[str, Dict[str, float]]:
+        """Queue depth and throughput (records per minute) per alias."""
+        window = getattr(settings, 'SCHEDULED_REPORTS_METRICS_WINDOW', 15)
+        minutes = cls._recent_minutes(window)
+        result = {}
+        for db_alias in db_aliases:
+            try:
+                keys = {
+                    metric: [cls._bucket_key(db_alias, metric, minute) for minute in minutes]
+                    for metric in ('completed', 'failed', 'deduplicated')
+                }
+                values = cache.get_many([key for bucket in keys.values() for key in bucket])
+                totals = {metric: sum(values.get(key, 0) for key in bucket) for metric, bucket in keys.items()}
+                depth = max(cache.get(cls._depth_key(db_alias), 0), 0)
+            except CACHE_EXCEPTIONS as e:
+                logger.warning(f"Scheduled report metrics unavailable for {db_alias}: {e}")
+                continue
+            result[db_alias] = {
+                'queue_depth': depth,
+                'completed': totals['completed'],
+                'failed': totals['failed'],
+                'deduplicated': totals['deduplicated'],
+                'throughput_per_minute': round(totals['completed'] / window, 2),
+                'window_minutes': window,
+            }
+        return result
+
+    @staticmethod
+    def _depth_key(db_alias: str) -> str:
+        return f"{KEY_PREFIX}:queue_depth:{db_alias}"
+
+    @staticmethod
+    def _bucket_key(db_alias: str, metric: str, minute: int = None) -> str:
+        minute = int(time.time() // 60) if minute is None else minute
+        return f"{KEY_PREFIX}:{metric}:{db_alias}:{minute}"
+
+    @staticmethod
+    def _recent_minutes(window: int):
+        current = int(time.time() // 60)
+        return range(current - window + 1, current + 1)
+
+    @staticmethod
+    def _incr(key: str, delta: int, ttl: int) -> int:
+        if not delta:
+            return cache.get(key, 0)
+        try:
+            cache.add(key, 0, ttl)
+            return cache.incr(key, delta)
+        except ValueError:
+            # Key expired between add and incr
+            cache.set(key, delta, ttl)
+            return delta
+        except CACHE_EXCEPTIONS as e:
+            logger.warning(f"Failed to update scheduled report metric {key}: {e}")
+            return 0
+
+    @staticmethod
+    def _gauge(name: str, value: int, db_alias: str) -> None:
+        if PROMETHEUS_ENABLED:
+            prometheus.set_gauge(
+                name,
+                max(value, 0),
+                labels={'db_alias': db_alias},
+                help_text='Scheduled report render subtasks not yet finished'
+            )
@@ -0,0 +1,212 @@
+"""
+Sectioned Parallel PDF Rendering
+
+Renders a report as independent HTML sections, lays each section out to
+PDF in a worker process and concatenates the results in order.
+
+Why:
+- WeasyPrint keeps the whole layout tree of a document in memory, so a
+  multi-month tour or attendance report peaks at hundreds of MB and runs
+  on one core
+- Sections are laid out independently: peak memory per worker is one
+  section, and sections render concurrently
+
+How:
+- Report designs emit section contexts (BaseReportsExport.get_pdf_sections)
+- HTML is rendered lazily in the calling process and at most
+  `max_in_flight` sections are queued, so pending HTML stays bounded
+- Workers are forked per report and can be capped with RLIMIT_AS
+  (REPORT_PDF_WORKER_MEMORY_MB); inside daemonic processes (Celery
+  prefork workers) sections render sequentially in-process, still one
+  section at a time
+- Section PDFs are merged with pypdf; progress is reported per section
+  through ReportProgressTracker
+
+Complies with Rule #4, #11 from .claude/rules.md
+"""
+
+import logging
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import BinaryIO, Iterable, List, Optional, Sequence
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+
+logger = logging.getLogger("django.reports")
+
+__all__ = ['SectionedPDFRenderer', 'render_pdf_section', 'chunk_rows']
+
+# Section progress is reported inside the tracker's generating_pdf..streaming band
+PROGRESS_START = 55
+PROGRESS_END = 80
+
+
+def render_pdf_section(
+    html_string: str,
+    base_url: Optional[str] = None,
+    stylesheets: Sequence[str] = (),
+    presentational_hints: bool = True
+) -> bytes:
+    """Lay out one HTML section to PDF bytes (runs in worker processes)."""
+    from weasyprint import CSS, HTML
+    from weasyprint.text.fonts import FontConfiguration
+
+    font_config = FontConfiguration()
+    css = [CSS(filename=path, font_config=font_config) for path in stylesheets if path and os.path.exists(path)]
+    return HTML(string=html_string, base_url=base_url).write_pdf(
+        stylesheets=css,
+        font_config=font_config,
+        presentational_hints=presentational_hints
+    )
+
+
+def _limit_worker_memory(limit_mb: int) -> None:
+    """Pool initializer: cap the worker's address space."""
+    if not limit_mb:
+        return
+    import resource
+
+    limit = limit_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+class SectionedPDFRenderer:
+    """Render HTML sections to PDF in parallel and concatenate them."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        memory_limit_mb: Optional[int] = None
+    ):
+        self.max_workers = max_workers or getattr(
+            settings, 'REPORT_PDF_SECTION_WORKERS', min(4, os.cpu_count() or 1)
+        )
+        self.max_in_flight = max_in_flight or self.max_workers * 2
+        self.memory_limit_mb = (
+            memory_limit_mb if memory_limit_mb is not None
+            else getattr(settings, 'REPORT_PDF_WORKER_MEMORY_MB', 0)
+        )
+        self._progress_tracker = None
+
+    def render(
+        self,
+        html_sections: Iterable[str],
+        base_url: Optional[str] = None,
+        stylesheets: Sequence[str] = (),
+        presentational_hints: bool = True,
+        total_sections: Optional[int] = None,
+        progress_tracker_id: Optional[str] = None
+    ) -> bytes:
+        """Render sections and return the concatenated PDF."""
+        output = BytesIO()
+        self.write(
+            html_sections, output, base_url, stylesheets, presentational_hints,
+            total_sections, progress_tracker_id
+        )
+        return output.getvalue()
+
+    def write(
+        self,
+        html_sections: Iterable[str],
+        output: BinaryIO,
+        base_url: Optional[str] = None,
+        stylesheets: Sequence[str] = (),
+        presentational_hints: bool = True,
+        total_sections: Optional[int] = None,
+        progress_tracker_id: Optional[str] = None
+    ) -> int:
+        """
+        Render sections in order and write the concatenated PDF to output.
+
+        Args:
+            html_sections: HTML documents, one per section (consumed lazily)
+            output: Binary stream receiving the merged PDF
+            base_url: Base URL for relative links and images
+            stylesheets: CSS file paths applied to every section
+            presentational_hints: Honour HTML presentational attributes
+            total_sections: Section count for progress reporting
+            progress_tracker_id: Optional ReportProgressTracker task id
+
+        Returns:
+            Number of sections rendered
+
+        Raises:
+            ImportError: pypdf or WeasyPrint is not installed
+        """
+        from pypdf import PdfWriter
+
+        writer = PdfWriter()
+        render_args = (base_url, tuple(stylesheets), presentational_hints)
+        sections = iter(html_sections)
+        rendered = 0
+
+        def append(pdf_bytes: bytes):
+            nonlocal rendered
+            writer.append(BytesIO(pdf_bytes))
+            rendered += 1
+            self._report_progress(progress_tracker_id, rendered, total_sections)
+
+        if self._use_processes(total_sections):
+            # Workers only lay out HTML: they never use the inherited DB
+            # connections, so the caller's transaction stays open
+            executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('fork'),
+                initializer=_limit_worker_memory,
+                initargs=(self.memory_limit_mb,)
+            )
+            try:
+                pending = deque()
+                for html_string in sections:
+                    pending.append(executor.submit(render_pdf_section, html_string, *render_args))
+                    if len(pending) >= self.max_in_flight:
+                        append(pending.popleft().result())
+                while pending:
+                    append(pending.popleft().result())
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+        else:
+            for html_string in sections:
+                append(render_pdf_section(html_string, *render_args))
+
+        writer.write(output)
+        writer.close()
+        logger.info(
+            "Sectioned PDF rendered",
+            extra={'sections': rendered, 'workers': self.max_workers}
+        )
+        return rendered
+
+    def _use_processes(self, total_sections: Optional[int]) -> bool:
+        if self.max_workers <= 1 or (total_sections is not None and total_sections < 2):
+            return False
+        # Daemonic processes (Celery prefork workers) cannot have children
+        return not multiprocessing.current_process().daemon
+
+    def _report_progress(self, tracker_id: Optional[str], rendered: int, total: Optional[int]) -> None:
+        if not tracker_id:
+            return
+        try:
+            if self._progress_tracker is None:
+                from apps.reports.services.progress_tracker_service import ReportProgressTracker
+                self._progress_tracker = ReportProgressTracker()
+
+            if total:
+                progress = PROGRESS_START + int((PROGRESS_END - PROGRESS_START) * rendered / total)
+                message = f"Rendered section {rendered} of {total}"
+            else:
+                progress = PROGRESS_START
+                message = f"Rendered section {rendered}"
+            self._progress_tracker.update_progress(tracker_id, progress, stage='generating_pdf', message=message)
+        except ValidationError as e:
+            logger.debug(f"Progress update failed: {str(e)}")
+
+
+def chunk_rows(rows: Sequence, size: int) -> List[Sequence]:
+    """Split rows into consecutive chunks of at most size rows."""
+    return [rows[start:start + size] for start in range(0, len(rows), size)]
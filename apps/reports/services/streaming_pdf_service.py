@@ -6,6 +6,8 @@ incremental rendering and chunked responses.
 
 Key Features:
 - Incremental page-by-page generation
+- Sectioned mode: independent sections laid out in parallel worker
+  processes and concatenated (see sectioned_pdf_service)
 - Chunked HTTP streaming responses
 - Memory usage <100MB for 1000+ page reports
 - Progress tracking integration
@@ -22,7 +24,7 @@ Complies with Rule #4, #11 from .claude/rules.md
 import os
 import logging
 import tempfile
-from typing import Iterator, Dict, Any, Optional, Tuple
+from typing import Iterator, Dict, Any, List, Optional, Tuple
 from io import BytesIO
 from django.core.exceptions import ValidationError
 from django.http import StreamingHttpResponse, HttpResponse
@@ -165,37 +167,120 @@ class StreamingPDFService:
 
             temp_file.close()
 
-            # Stream file in chunks
-            file_size = os.path.getsize(temp_file.name)
-            bytes_sent = 0
+            yield from self._stream_file(temp_file.name, progress_tracker_id)
 
-            logger.info(
-                "PDF generated successfully, starting streaming",
-                extra={'file_size': file_size, 'chunk_size': self.chunk_size}
-            )
+        except ImportError as e:
+            error_msg = f"WeasyPrint not available: {str(e)}"
+            logger.error(error_msg)
+            yield self._create_error_pdf(error_msg)
+
+        except (OSError, IOError) as e:
+            error_msg = f"File operation failed: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            yield self._create_error_pdf(error_msg)
+
+        except (TypeError, ValueError) as e:
+            error_msg = f"PDF generation error: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            yield self._create_error_pdf(error_msg)
+
+        finally:
+            # Cleanup temporary file
+            if temp_file and os.path.exists(temp_file.name):
+                try:
+                    os.unlink(temp_file.name)
+                    logger.debug(f"Cleaned up temporary file: {temp_file.name}")
+                except OSError as e:
+                    logger.warning(f"Failed to cleanup temp file: {str(e)}")
+
+    def generate_sectioned_streaming_pdf(
+        self,
+        template_name: str,
+        section_contexts: List[Dict[str, Any]],
+        filename: str = "report.pdf",
+        progress_tracker_id: Optional[str] = None,
+        stylesheets: Optional[List[str]] = None,
+        base_url: Optional[str] = None
+    ) -> Tuple[Optional[StreamingHttpResponse], Optional[str]]:
+        """
+        Generate PDF from independent sections rendered in parallel.
+
+        Each context renders template_name to one section; sections are laid
+        out in worker processes (SectionedPDFRenderer) and concatenated, so
+        peak memory is one section per worker instead of the whole report.
+
+        Args:
+            template_name: Django template path
+            section_contexts: Template context per section, in page order
+            filename: Output filename
+            progress_tracker_id: Optional progress tracker ID (per-section progress)
+            stylesheets: CSS file paths (default: the reports stylesheet)
+            base_url: Base URL for relative links and images
 
-            with open(temp_file.name, 'rb') as pdf_file:
-                while True:
-                    chunk = pdf_file.read(self.chunk_size)
-                    if not chunk:
-                        break
+        Returns:
+            Tuple containing (streaming_response, error_message)
+        """
+        try:
+            from apps.reports.services.template_sanitization_service import sanitize_template_context
 
-                    bytes_sent += len(chunk)
+            if not template_name or not section_contexts or not all(isinstance(c, dict) for c in section_contexts):
+                raise ValidationError("Invalid template or section contexts")
 
-                    # Update progress if tracker provided
-                    if progress_tracker_id and file_size > 0:
-                        progress = int((bytes_sent / file_size) * 100)
-                        self._update_progress(progress_tracker_id, progress)
+            html_sections = (
+                render_to_string(template_name, sanitize_template_context(context, strict_mode=True))
+                for context in section_contexts
+            )
 
-                    yield chunk
+            response = StreamingHttpResponse(
+                self._generate_sectioned_pdf_chunks(
+                    html_sections, len(section_contexts), progress_tracker_id, stylesheets, base_url
+                ),
+                content_type='application/pdf'
+            )
+            response['Content-Disposition'] = f'attachment; filename="{filename}"'
+            response['X-Accel-Buffering'] = 'no'  # Disable nginx buffering
 
             logger.info(
-                "PDF streaming completed",
-                extra={'bytes_sent': bytes_sent}
+                "Sectioned streaming PDF generation initiated",
+                extra={'template': template_name, 'filename': filename, 'sections': len(section_contexts)}
+            )
+
+            return response, None
+
+        except ValidationError as e:
+            logger.warning(f"PDF generation validation error: {str(e)}")
+            return None, str(e)
+
+    def _generate_sectioned_pdf_chunks(
+        self,
+        html_sections: Iterator[str],
+        total_sections: int,
+        progress_tracker_id: Optional[str] = None,
+        stylesheets: Optional[List[str]] = None,
+        base_url: Optional[str] = None
+    ) -> Iterator[bytes]:
+        """Render sections to a temporary PDF, then stream it in chunks."""
+        temp_file = None
+        try:
+            from apps.reports.services.sectioned_pdf_service import SectionedPDFRenderer
+
+            if stylesheets is None:
+                stylesheets = ["frontend/static/assets/css/local/reports.css"]
+            temp_file = tempfile.NamedTemporaryFile(mode='wb', suffix='.pdf', delete=False)
+            SectionedPDFRenderer().write(
+                html_sections,
+                temp_file,
+                base_url=base_url,
+                stylesheets=stylesheets,
+                total_sections=total_sections,
+                progress_tracker_id=progress_tracker_id
             )
+            temp_file.close()
+
+            yield from self._stream_file(temp_file.name, progress_tracker_id)
 
         except ImportError as e:
-            error_msg = f"WeasyPrint not available: {str(e)}"
+            error_msg = f"PDF libraries not available: {str(e)}"
             logger.error(error_msg)
             yield self._create_error_pdf(error_msg)
 
@@ -210,14 +295,42 @@ class StreamingPDFService:
             yield self._create_error_pdf(error_msg)
 
         finally:
-            # Cleanup temporary file
             if temp_file and os.path.exists(temp_file.name):
                 try:
                     os.unlink(temp_file.name)
-                    logger.debug(f"Cleaned up temporary file: {temp_file.name}")
                 except OSError as e:
                     logger.warning(f"Failed to cleanup temp file: {str(e)}")
 
+    def _stream_file(self, path: str, progress_tracker_id: Optional[str] = None) -> Iterator[bytes]:
+        """Yield a generated PDF file in chunks, updating progress by bytes sent."""
+        file_size = os.path.getsize(path)
+        bytes_sent = 0
+
+        logger.info(
+            "PDF generated successfully, starting streaming",
+            extra={'file_size': file_size, 'chunk_size': self.chunk_size}
+        )
+
+        with open(path, 'rb') as pdf_file:
+            while True:
+                chunk = pdf_file.read(self.chunk_size)
+                if not chunk:
+                    break
+
+                bytes_sent += len(chunk)
+
+                # Update progress if tracker provided
+                if progress_tracker_id and file_size > 0:
+                    progress = int((bytes_sent / file_size) * 100)
+                    self._update_progress(progress_tracker_id, progress)
+
+                yield chunk
+
+        logger.info(
+            "PDF streaming completed",
+            extra={'bytes_sent': bytes_sent}
+        )
+
     def generate_pdf_with_size_estimate(
         self,
         html_content: str,
@@ -0,0 +1,96 @@
+"""
+Tests for sectioned PDF rendering.
+
+Sections must cover every row exactly once, in order, and render
+sequentially when no worker processes are available.
+"""
+
+from io import BytesIO
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from apps.reports.services.sectioned_pdf_service import SectionedPDFRenderer, chunk_rows
+from apps.reports.utils import BaseReportsExport
+
+
+class SectionedExport(BaseReportsExport):
+    pdf_section_rows = 2
+
+
+class TestPdfSections:
+    """Section contexts built by BaseReportsExport."""
+
+    def test_chunk_rows_keeps_order(self):
+        assert chunk_rows([1, 2, 3, 4, 5], 2) == [[1, 2], [3, 4], [5]]
+
+    def test_sections_disabled_by_default(self):
+        export = BaseReportsExport(filename="test", client_id=1, context={"data": [{"a": 1}] * 10})
+
+        assert export.get_pdf_sections() is None
+
+    def test_small_report_renders_in_one_pass(self):
+        export = SectionedExport(filename="test", client_id=1, context={"data": [{"a": 1}, {"a": 2}]})
+
+        assert export.get_pdf_sections() is None
+
+    def test_sections_share_header_context(self):
+        rows = [{"a": i} for i in range(5)]
+        export = SectionedExport(
+            filename="test", client_id=1, context={"data": rows, "report_title": "Tours"}
+        )
+
+        sections = export.get_pdf_sections()
+
+        assert [section["data"] for section in sections] == [rows[0:2], rows[2:4], rows[4:5]]
+        assert all(section["report_title"] == "Tours" for section in sections)
+
+    def test_download_streams_sections_with_progress(self):
+        pytest.importorskip("pypdf")
+        rows = [{"a": i} for i in range(5)]
+        export = SectionedExport(
+            filename="tours", client_id=1, design_file="reports/tours.html", context={"data": rows}
+        )
+        export.progress_tracker_id = "task-1"
+        streamed = MagicMock()
+
+        with patch(
+            "apps.reports.services.streaming_pdf_service.StreamingPDFService.generate_sectioned_streaming_pdf",
+            return_value=(streamed, None),
+        ) as generate:
+            assert export.get_pdf_output() is streamed
+
+        args, kwargs = generate.call_args
+        assert args[0] == "reports/tours.html"
+        assert [section["data"] for section in args[1]] == [rows[0:2], rows[2:4], rows[4:5]]
+        assert kwargs["filename"] == "tours.pdf"
+        assert kwargs["progress_tracker_id"] == "task-1"
+
+
+class TestSectionedPDFRenderer:
+    """Renderer fallback path (no worker processes)."""
+
+    def test_sequential_render_merges_sections_in_order(self):
+        pypdf = pytest.importorskip("pypdf")
+        rendered = []
+
+        def fake_render(html_string, *args):
+            rendered.append(html_string)
+            writer = pypdf.PdfWriter()
+            writer.add_blank_page(width=72, height=72)
+            output = BytesIO()
+            writer.write(output)
+            return output.getvalue()
+
+        renderer = SectionedPDFRenderer(max_workers=1)
+        renderer._progress_tracker = MagicMock()
+        with patch(
+            "apps.reports.services.sectioned_pdf_service.render_pdf_section", side_effect=fake_render
+        ):
+            pdf = renderer.render(iter(["<p>1</p>", "<p>2</p>", "<p>3</p>"]),
+                                  total_sections=3, progress_tracker_id="task-1")
+
+        assert rendered == ["<p>1</p>", "<p>2</p>", "<p>3</p>"]
+        assert len(pypdf.PdfReader(BytesIO(pdf)).pages) == 3
+        assert renderer._progress_tracker.update_progress.call_count == 3
+        assert renderer._progress_tracker.update_progress.call_args.args[1] == 80
@@ -0,0 +1,90 @@
+"""
+Tests for streaming CSV/XLSX exports.
+
+Rows must be written incrementally, in column order, and designs that
+declare export_columns must bypass the DataFrame path.
+"""
+
+import csv
+import io
+import zipfile
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.http import StreamingHttpResponse
+
+from apps.reports.services.streaming_export_service import iter_csv, write_csv, write_xlsx
+from apps.reports.utils import BaseReportsExport
+
+COLUMNS = ["Site", "Planned Datetime", "Amount"]
+
+
+def make_rows(count):
+    for i in range(count):
+        yield {
+            "Site": f"Site, {i}",
+            "Planned Datetime": datetime(2025, 1, 1, 10, 30, tzinfo=timezone.utc),
+            "Amount": Decimal("2.50"),
+            "internal_id": i,
+        }
+
+
+class StreamingExport(BaseReportsExport):
+    export_columns = COLUMNS
+
+
+class TestStreamingWriters:
+    """Row-by-row CSV and XLSX writers."""
+
+    def test_iter_csv_yields_header_then_one_chunk_per_row(self):
+        chunks = list(iter_csv(make_rows(3), COLUMNS))
+
+        assert len(chunks) == 4
+        parsed = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+        assert parsed[0] == COLUMNS
+        assert parsed[1] == ["Site, 0", "2025-01-01 10:30:00", "2.50"]
+
+    def test_write_csv_matches_iter_csv(self):
+        output = io.BytesIO()
+
+        assert write_csv(make_rows(5), COLUMNS, output) == 5
+        assert output.getvalue() == b"".join(iter_csv(make_rows(5), COLUMNS))
+
+    def test_write_xlsx_produces_workbook(self):
+        output = io.BytesIO()
+
+        assert write_xlsx(make_rows(100), COLUMNS, output, title="Client: A") == 100
+        assert zipfile.ZipFile(io.BytesIO(output.getvalue())).testzip() is None
+
+
+class TestStreamingExportMode:
+    """BaseReportsExport routing for designs with export_columns."""
+
+    def test_streaming_only_for_declared_designs_and_formats(self):
+        assert not BaseReportsExport(filename="r", client_id=1, formdata={"format": "csv"}).is_streaming_export()
+        assert StreamingExport(filename="r", client_id=1, formdata={"format": "xlsx"}).is_streaming_export()
+        assert not StreamingExport(filename="r", client_id=1, formdata={"format": "xls"}).is_streaming_export()
+        assert not StreamingExport(
+            filename="r", client_id=1, formdata={"format": "csv", "preview": "true"}
+        ).is_streaming_export()
+
+    def test_csv_download_is_streamed_without_dataframe(self):
+        export = StreamingExport(filename="r", client_id=1, formdata={"format": "csv"}, data=make_rows(2))
+
+        with patch("apps.reports.utils.pd.DataFrame") as dataframe:
+            response = export.get_csv_output()
+            body = b"".join(response.streaming_content)
+
+        dataframe.assert_not_called()
+        assert isinstance(response, StreamingHttpResponse)
+        assert body.decode("utf-8").splitlines()[0] == ",".join(COLUMNS)
+
+    def test_csv_returnfile_gives_rewound_file(self):
+        export = StreamingExport(
+            filename="r", client_id=1, formdata={"format": "csv"}, data=make_rows(2), returnfile=True
+        )
+
+        output = export.get_csv_output()
+
+        assert len(output.read().splitlines()) == 3
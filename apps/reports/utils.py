@@ -4,7 +4,7 @@ from io import BytesIO
 from django.template.loader import render_to_string
 from django_weasyprint.views import WeasyTemplateResponseMixin
 import pandas as pd
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
 from apps.activity.models.attachment_model import Attachment
 from django.contrib.staticfiles import finders
 from django.conf import settings
@@ -17,6 +17,7 @@ import logging, json
 from decimal import Decimal
 from datetime import datetime, timedelta
 import os
+import tempfile
 import xlsxwriter
 
 log = logging.getLogger("django")
@@ -32,6 +33,14 @@ class BaseReportsExport(WeasyTemplateResponseMixin):
     # Note: pdf_stylesheets moved to property to avoid None + str error during import
     no_data_error = "No Data"
     report_export_form = ReportForm
+    # Rows per independently rendered PDF section (None: one pass)
+    pdf_section_rows = None
+    # ReportProgressTracker task id for per-section progress
+    progress_tracker_id = None
+    # Ordered CSV/XLSX columns; designs that set it export row by row
+    # (streaming_export_service) instead of through a DataFrame
+    export_columns = None
+    streaming_export_formats = ("csv", "xlsx")
 
     @property
     def pdf_stylesheets(self):
@@ -62,16 +71,51 @@ class BaseReportsExport(WeasyTemplateResponseMixin):
         self.filename = filename
         self.returnfile = returnfile
 
+    def get_pdf_sections(self):
+        """
+        Template contexts of independently rendered PDF sections.
+
+        Designs whose template lists `data` row by row, without totals
+        across rows, opt in with pdf_section_rows; others may override.
+        Each section starts on a new page with the report header.
+        Returns None when the report renders in one pass.
+        """
+        if not self.pdf_section_rows or not self.context:
+            return None
+        data = self.context.get("data")
+        if data is None or isinstance(data, (dict, str)):
+            return None
+        rows = data if isinstance(data, (list, tuple)) else list(data)
+        if len(rows) <= self.pdf_section_rows:
+            return None
+
+        from apps.reports.services.sectioned_pdf_service import chunk_rows
+
+        return [dict(self.context, data=chunk) for chunk in chunk_rows(rows, self.pdf_section_rows)]
+
     def get_pdf_output(self):
         try:
-            html_string = render_to_string(self.design_file, context=self.context)
-            html = HTML(string=html_string, base_url=settings.HOST)
             css_path = finders.find("assets/css/local/reports.css")
-            css = CSS(filename=css_path)
-            font_config = FontConfiguration()
-            pdf_output = html.write_pdf(
-                stylesheets=[css], font_config=font_config, presentational_hints=True
-            )
+            pdf_output = None
+            sections = self.get_pdf_sections()
+            if sections:
+                try:
+                    if not self.returnfile:
+                        response = self.stream_pdf_sections(sections, css_path)
+                        if response is not None:
+                            return response
+                    else:
+                        pdf_output = self.render_pdf_sections(sections, css_path)
+                except ImportError as e:
+                    error_log.warning(f"Sectioned PDF rendering unavailable, rendering in one pass: {e}")
+            if pdf_output is None:
+                html_string = render_to_string(self.design_file, context=self.context)
+                html = HTML(string=html_string, base_url=settings.HOST)
+                css = CSS(filename=css_path)
+                font_config = FontConfiguration()
+                pdf_output = html.write_pdf(
+                    stylesheets=[css], font_config=font_config, presentational_hints=True
+                )
             if self.returnfile:
                 return pdf_output
             response = HttpResponse(pdf_output, content_type="application/pdf")
@@ -82,6 +126,40 @@ class BaseReportsExport(WeasyTemplateResponseMixin):
         except (ValueError, TypeError) as e:
             error_log.error("Error generating PDF", exc_info=True)
 
+    def render_pdf_sections(self, sections, css_path):
+        """Lay out section contexts in worker processes and concatenate the PDFs."""
+        from apps.reports.services.sectioned_pdf_service import SectionedPDFRenderer
+
+        html_sections = (
+            render_to_string(self.design_file, context=context) for context in sections
+        )
+        return SectionedPDFRenderer().render(
+            html_sections,
+            base_url=settings.HOST,
+            stylesheets=[css_path],
+            presentational_hints=True,
+            total_sections=len(sections),
+            progress_tracker_id=self.progress_tracker_id,
+        )
+
+    def stream_pdf_sections(self, sections, css_path):
+        """Download response that streams the concatenated section PDFs (None on invalid sections)."""
+        # Fall back to one pass before the response starts if pypdf is missing
+        import pypdf  # noqa: F401
+        from apps.reports.services.streaming_pdf_service import StreamingPDFService
+
+        response, error = StreamingPDFService().generate_sectioned_streaming_pdf(
+            self.design_file,
+            sections,
+            filename=f"{self.filename}.pdf",
+            progress_tracker_id=self.progress_tracker_id,
+            stylesheets=[css_path],
+            base_url=settings.HOST,
+        )
+        if error:
+            error_log.warning(f"Sectioned PDF streaming rejected, rendering in one pass: {error}")
+        return response
+
     def write_temporary_pdf(self, pdf_output, workpermit_file_name):
         home_directory = os.path.expanduser("~")
         folder_name = "temp_report"
@@ -125,6 +203,8 @@ class BaseReportsExport(WeasyTemplateResponseMixin):
 
     def get_xlsx_output(self, orm=False):
         log.info("xlsx is executing")
+        if self.is_streaming_export():
+            return self.get_streaming_xlsx_output()
         if self.formdata["report_name"] == "PEOPLEATTENDANCESUMMARY":
             output = self.create_attendance_report()
         else:
@@ -140,6 +220,8 @@ class BaseReportsExport(WeasyTemplateResponseMixin):
 
     def get_csv_output(self):
         log.info("csv is executing")
+        if self.is_streaming_export():
+            return self.get_streaming_csv_output()
         df = pd.DataFrame(data=list(self.data))
         df = self.excel_columns(df)
         output = BytesIO()
@@ -151,6 +233,56 @@ class BaseReportsExport(WeasyTemplateResponseMixin):
         response["Content-Disposition"] = f"attachment; filename={self.filename}.csv"
         return response
 
+    def is_streaming_export(self):
+        """True when this export writes CSV/XLSX rows incrementally."""
+        formdata = self.formdata or {}
+        return (
+            bool(self.export_columns)
+            and formdata.get("format") in self.streaming_export_formats
+            and formdata.get("preview") != "true"
+        )
+
+    def set_streaming_data(self, queryset, row_builder=None):
+        """
+        Use lazily read queryset rows as the export data.
+        Returns whether the report has any rows.
+        """
+        from apps.reports.services.streaming_export_service import QueryRows
+
+        self.data = QueryRows(queryset, row_builder)
+        return self.data.exists()
+
+    def get_streaming_csv_output(self):
+        from apps.reports.services.streaming_export_service import iter_csv, write_csv
+
+        if self.returnfile:
+            output = tempfile.TemporaryFile()
+            write_csv(self.data, self.export_columns, output)
+            output.seek(0)
+            return output
+        response = StreamingHttpResponse(
+            iter_csv(self.data, self.export_columns), content_type="text/csv"
+        )
+        response["Content-Disposition"] = f"attachment; filename={self.filename}.csv"
+        return response
+
+    def get_streaming_xlsx_output(self):
+        from apps.reports.services.streaming_export_service import write_xlsx
+
+        # The XLSX zip container is only complete after the last row, so
+        # rows go to a temporary file which is then streamed in chunks
+        output = tempfile.TemporaryFile()
+        write_xlsx(self.data, self.export_columns, output, title=self.additional_content)
+        output.seek(0)
+        if self.returnfile:
+            return output
+        return FileResponse(
+            output,
+            as_attachment=True,
+            filename=f"{self.filename}.xlsx",
+            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        )
+
     def get_html_output(self):
         log.info("html is executing")
         html_output = render_to_string(self.design_file, context=self.context)
@@ -201,6 +333,8 @@ class BaseReportsExport(WeasyTemplateResponseMixin):
         """
         Override this method in inherited class
         """
+        if self.export_columns:
+            return df[self.export_columns]
         return df
 
     def set_data_excel(self, orm=False):
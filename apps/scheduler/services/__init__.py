@@ -11,6 +11,8 @@ Service Classes:
 - ExternalTourService: External tour business logic
 - TaskService: Task management business logic
 - JobneedManagementService: Generic jobneed CRUD operations
+- BulkJobneedEngine: Set-based scheduled Jobneed generation
+- JobGenerationCoordinator: Sharded, resumable create_job fan-out
 
 Phase 3 AI & Intelligence Features:
 - PMOptimizerService: Adaptive PM scheduling using device health predictions
@@ -37,6 +39,8 @@ from apps.scheduler.services.task_service import (
 )
 from apps.scheduler.services.jobneed_management_service import JobneedManagementService
 from apps.scheduler.services.pm_optimizer_service import PMOptimizerService
+from apps.scheduler.services.bulk_jobneed_engine import BulkJobneedEngine
+from apps.scheduler.services.job_generation_coordinator import JobGenerationCoordinator
 
 __all__ = [
     'SchedulingService',
@@ -52,4 +56,6 @@ __all__ = [
     'TaskJobneedService',
     'JobneedManagementService',
     'PMOptimizerService',
+    'BulkJobneedEngine',
+    'JobGenerationCoordinator',
 ]
\ No newline at end of file
@@ -0,0 +1,374 @@
+"""
+Bulk Jobneed Engine.
+
+Set-based counterpart to create_job / insert_into_jn_and_jnd in
+apps/scheduler/utils.py. The legacy path materialises one occurrence at a
+time - get_or_create per parent, Asset.objects.get per child, one INSERT per
+checklist question and a select_for_update re-save to patch the parent's
+expirydatetime - all inside one transaction spanning every enabled job.
+
+This engine instead:
+
+1. Expands cron occurrences for every job in memory
+2. Prefetches assets, child checkpoints, checklists and already generated
+   occurrences with one query each for the whole batch
+3. Schedules tour checkpoints before insert, so the parent expiry is known
+   up front and never re-saved
+4. Writes Jobneed / JobneedDetails with bulk_create in one transaction per
+   job (and per chunk of occurrences), advancing lastgeneratedon with each
+   chunk so a failing job neither rolls back nor blocks the others
+
+Jobneed.save() is bypassed, so the NONE ticket and tenant are filled in here.
+bulk_create sends no post_save either: the streaming task events that
+publish_task_event would send are published in bulk once each chunk
+commits. The MQTT publishers in apps/scheduler/signals.py are never
+connected (SchedulerConfig.ready() does not import them), so the legacy
+path does not send those and neither does this one.
+
+Tour routes may call the Google Maps API, so they are resolved before each
+chunk's transaction opens rather than while it holds locks.
+
+Follows .claude/rules.md:
+- Rule #8: Methods < 30 lines
+- Rule #11: Specific exception handling
+"""
+
+import logging
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models import F, Q
+
+from apps.activity.models import Asset, Job, Jobneed, JobneedDetails, QuestionSetBelonging
+from apps.core import utils
+
+logger = logging.getLogger('scheduler.bulk_jobneed_engine')
+
+__all__ = ['BulkJobneedEngine', 'expand_occurrences', 'schedule_checkpoints']
+
+TOUR_IDENTIFIERS = (Job.Identifier.INTERNALTOUR.value, Job.Identifier.EXTERNALTOUR.value)
+
+CHILD_FIELDS = ('cplocation', 'sgroup__groupname', 'bu__solid', 'bu__buname')
+
+CHECKLIST_FIELDS = (
+    'qset_id', 'seqno', 'question_id', 'answertype', 'max', 'min',
+    'alerton', 'options', 'isavpt', 'avpttype',
+)
+
+DEFAULT_CHUNK_SIZE = 200
+
+
+def expand_occurrences(cron_exp: str, startdtz: datetime, enddtz: datetime) -> List[datetime]:
+    """
+    Cron occurrences in [startdtz, enddtz) as minute-precision UTC datetimes.
+
+    Same result as get_datetime_list() followed by to_utc() and the minute
+    truncation in insert_into_jn_and_jnd(), without the per-date logging.
+
+    Raises:
+        CroniterBadCronError: If the cron expression is invalid
+    """
+    from croniter import croniter
+
+    occurrences = []
+    itr = croniter(cron_exp, startdtz)
+    while (occurrence := itr.get_next(datetime)) < enddtz:
+        occurrences.append(
+            occurrence.astimezone(dt_timezone.utc).replace(second=0, microsecond=0)
+        )
+    return occurrences
+
+
+def schedule_checkpoints(job: Dict, pdtz: datetime, checkpoints: List[Dict]) -> List[Tuple[datetime, datetime]]:
+    """
+    Plan/expiry datetimes of each tour checkpoint, chained from pdtz.
+
+    Mirrors create_child_tasks(): each checkpoint starts expirytime minutes
+    after the previous one expires, the break is inserted before the first
+    checkpoint of the next round, and every checkpoint lasts
+    planduration + gracetime of the parent job.
+    """
+    other_info = job['other_info'] or {}
+    tour_freq = int(other_info.get('tour_frequency') or 1)
+    breaktime = int(other_info.get('breaktime') or 0)
+    break_idx = len(checkpoints) // max(tour_freq, 1)
+    duration = timedelta(minutes=job['planduration'] + job['gracetime'])
+
+    slots, prev_edtz = [], pdtz
+    for idx, checkpoint in enumerate(checkpoints):
+        gap = checkpoint['expirytime']
+        if tour_freq > 1 and breaktime and idx == break_idx:
+            gap += breaktime
+        child_pdtz = prev_edtz + timedelta(minutes=gap)
+        prev_edtz = child_pdtz + duration
+        slots.append((child_pdtz, prev_edtz))
+    return slots
+
+
+class BulkJobneedEngine:
+    """
+    Generate scheduled Jobneeds for many jobs with a constant number of
+    reads per batch and bulk writes per job.
+
+    Usage:
+        story = BulkJobneedEngine().generate(BulkJobneedEngine.fetch_jobs())
+    """
+
+    def __init__(self, using: Optional[str] = None, chunk_size: Optional[int] = None):
+        self.using = using or utils.get_current_db_name()
+        chunk_size = chunk_size or getattr(settings, 'SCHEDULER_JOBNEED_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+        self.chunk_size = max(int(chunk_size), 1)
+        self.stats = {'jobs': 0, 'jobneeds': 0, 'jobneeddetails': 0, 'failed': 0}
+
+    @staticmethod
+    def job_queryset(using: Optional[str] = None):
+        """Enabled, non-dynamic parent jobs in create_job()'s selection."""
+        return Job.objects.using(using or utils.get_current_db_name()).filter(
+            ~Q(jobname='NONE'),
+            ~Q(cron='* * * * *'),
+            ~Q(asset__runningstatus=Asset.RunningStatus.SCRAPPED),
+            Q(parent__isnull=True) | Q(parent_id=1),
+            enable=True,
+            other_info__isdynamic=False,
+        )
+
+    @classmethod
+    def fetch_jobs(cls, jobids: Optional[Iterable[int]] = None, using: Optional[str] = None,
+                   id_range: Optional[Tuple[int, int]] = None) -> List[Dict]:
+        """Job rows to generate, optionally limited to ids or an inclusive id range."""
+        jobs = cls.job_queryset(using).values(*utils.JobFields.fields, 'tenant_id')
+        if jobids:
+            jobs = jobs.filter(id__in=jobids)
+        if id_range:
+            jobs = jobs.filter(id__range=id_range)
+        return list(jobs.order_by('id'))
+
+    def generate(self, jobs: List[Dict]) -> List[Dict]:
+        """
+        Materialise every due occurrence of the given jobs.
+
+        Returns:
+            One story entry per job, shaped like insert_into_jn_and_jnd()'s resp
+        """
+        from apps.scheduler.utils import calculate_startdtz_enddtz
+
+        planned = {}
+        story = []
+        for job in jobs:
+            try:
+                occurrences = expand_occurrences(job['cron'], *calculate_startdtz_enddtz(job))
+            except (ValueError, KeyError) as exc:
+                logger.warning(f"Bad cron {job['cron']!r} for job {job['id']}: {exc}")
+                story.append({'errors': 'Bad Cron Error', 'job_id': job['id']})
+                continue
+            if occurrences:
+                planned[job['id']] = occurrences
+            else:
+                story.append({'msg': 'Please check your Valid From and Valid To dates', 'job_id': job['id']})
+        if not planned:
+            return story
+
+        context = self._prefetch([job for job in jobs if job['id'] in planned], planned)
+        for job in jobs:
+            if job['id'] in planned:
+                story.append(self._generate_job(job, planned[job['id']], context))
+        return story
+
+    def _generate_job(self, job: Dict, occurrences: List[datetime], context: Dict) -> Dict:
+        """Write one job's occurrences chunk by chunk; failures stay local to the job."""
+        seen = context['existing'].get(job['id'], set())
+        pending = [pdtz for pdtz in occurrences if pdtz not in seen]
+        created = 0
+        try:
+            for start in range(0, len(pending), self.chunk_size):
+                chunk = pending[start:start + self.chunk_size]
+                routes = self._routes(job, chunk, context)
+                with transaction.atomic(using=self.using):
+                    created += self._write_chunk(job, chunk, routes, context)
+                    self._checkpoint(job, chunk[-1])
+            if not pending or pending[-1] != occurrences[-1]:
+                self._checkpoint(job, occurrences[-1])
+        except (DatabaseError, IntegrityError, KeyError, ValueError):
+            logger.critical(f"Bulk jobneed generation failed for job {job['id']}", exc_info=True)
+            self.stats['failed'] += 1
+            return {'errors': 'Failed to schedule jobs', 'job_id': job['id'], 'count': created}
+        self.stats['jobs'] += 1
+        return {'msg': f'{len(occurrences)} tasks scheduled successfully!', 'count': len(occurrences),
+                'job_id': job['id'], 'traceback': None}
+
+    def _checkpoint(self, job: Dict, pdtz: datetime) -> None:
+        """Advance lastgeneratedon so a later run resumes after pdtz."""
+        Job.objects.using(self.using).filter(id=job['id']).update(lastgeneratedon=pdtz)
+
+    def _routes(self, job: Dict, chunk: List[datetime], context: Dict) -> List[List[Dict]]:
+        """Checkpoint order of every occurrence in the chunk, outside any transaction."""
+        if job['identifier'] not in TOUR_IDENTIFIERS:
+            return [[] for _ in chunk]
+        checkpoints = context['children'].get(job['id'], [])
+        return [self._route(job, checkpoints) for _ in chunk]
+
+    def _write_chunk(self, job: Dict, chunk: List[datetime], routes: List[List[Dict]], context: Dict) -> int:
+        """Insert parents, then their checkpoints, then every checklist row."""
+        is_tour = job['identifier'] in TOUR_IDENTIFIERS
+        parents, plans = [], []
+        for pdtz, route in zip(chunk, routes):
+            slots = schedule_checkpoints(job, pdtz, route)
+            edtz = slots[-1][1] if slots else pdtz + timedelta(
+                minutes=job['planduration'] + job['expirytime'] + job['gracetime'])
+            parents.append(self._parent(job, pdtz, edtz, context))
+            plans.append(list(zip(route, slots)))
+        parents = Jobneed.objects.using(self.using).bulk_create(parents)
+
+        children = [
+            self._child(job, checkpoint, parent, idx, slot, context)
+            for parent, plan in zip(parents, plans)
+            for idx, (checkpoint, slot) in enumerate(plan)
+        ]
+        children = Jobneed.objects.using(self.using).bulk_create(children, batch_size=1000)
+
+        details = [row for parent in parents for row in self._details(parent, job, is_tour, context)]
+        details += [row for child in children for row in self._details(child, child.source, False, context)]
+        JobneedDetails.objects.using(self.using).bulk_create(details, batch_size=1000)
+        self._publish_on_commit(parents + children)
+
+        self.stats['jobneeds'] += len(parents) + len(children)
+        self.stats['jobneeddetails'] += len(details)
+        return len(parents)
+
+    def _publish_on_commit(self, jobneeds: List[Jobneed]) -> None:
+        """Send the task events post_save would have, once the chunk is committed."""
+        from apps.noc.signals.streaming_event_publishers import publish_task_events
+
+        transaction.on_commit(lambda: publish_task_events(jobneeds), using=self.using)
+
+    @staticmethod
+    def _route(job: Dict, checkpoints: List[Dict]) -> List[Dict]:
+        """Checkpoint order for one occurrence; randomised tours reshuffle per occurrence."""
+        other_info = job['other_info'] or {}
+        if len(checkpoints) < 2:
+            return checkpoints
+        randomized = other_info.get('is_randomized') in ('True', True)
+        frequency = int(other_info.get('tour_frequency') or 1)
+        if not randomized and frequency <= 1:
+            return checkpoints
+
+        from apps.scheduler.utils import calculate_route_details
+
+        route = [dict(checkpoint) for checkpoint in checkpoints]
+        if randomized:
+            random.shuffle(route)
+        return calculate_route_details(route, job)
+
+    def _prefetch(self, jobs: List[Dict], planned: Dict[int, List[datetime]]) -> Dict:
+        """Everything _write_chunk needs, loaded with one query per relation."""
+        tour_ids = [job['id'] for job in jobs if job['identifier'] in TOUR_IDENTIFIERS]
+        children = defaultdict(list)
+        for row in Job.objects.using(self.using).annotate(cplocation=F('bu__gpslocation')).filter(
+                parent_id__in=tour_ids).order_by('parent_id', 'seqno').values(*utils.JobFields.fields, *CHILD_FIELDS):
+            children[row['parent_id']].append(row)
+
+        child_rows = [row for rows in children.values() for row in rows]
+        asset_ids = {row['asset_id'] for row in [*jobs, *child_rows]}
+        qset_ids = {row['qset_id'] for row in child_rows}
+        qset_ids |= {job['qset_id'] for job in jobs if job['identifier'] not in TOUR_IDENTIFIERS}
+
+        none_jobneed = utils.get_or_create_none_jobneed()
+        return {
+            'children': children,
+            'multifactor': self._multifactors(asset_ids),
+            'checklists': self._checklists(qset_ids),
+            'existing': self._existing_occurrences(planned, none_jobneed.id),
+            'none_jobneed_id': none_jobneed.id,
+            'none_people_id': utils.get_or_create_none_people().id,
+            'none_ticket_id': utils.get_or_create_none_ticket().id,
+            'none_qsb': utils.get_or_create_none_qsetblng(),
+        }
+
+    def _multifactors(self, asset_ids: Set[int]) -> Dict[int, object]:
+        return {
+            asset_id: (asset_json or {}).get('multifactor', 1)
+            for asset_id, asset_json in Asset.objects.using(self.using).filter(
+                id__in=asset_ids).values_list('id', 'asset_json')
+        }
+
+    def _checklists(self, qset_ids: Set[int]) -> Dict[int, List[Dict]]:
+        checklists = defaultdict(list)
+        for row in QuestionSetBelonging.objects.using(self.using).filter(
+                qset_id__in=qset_ids).order_by('qset_id', 'seqno').values(*CHECKLIST_FIELDS):
+            checklists[row['qset_id']].append(row)
+        return checklists
+
+    def _existing_occurrences(self, planned: Dict[int, List[datetime]], none_jobneed_id: int) -> Dict[int, Set[datetime]]:
+        """Parent plandatetimes already generated, so re-runs stay idempotent like get_or_create."""
+        if not planned:
+            return {}
+        earliest = min(occurrences[0] for occurrences in planned.values())
+        existing = defaultdict(set)
+        for job_id, plandatetime in Jobneed.objects.using(self.using).filter(
+                job_id__in=list(planned), parent_id=none_jobneed_id,
+                plandatetime__gte=earliest).values_list('job_id', 'plandatetime'):
+            existing[job_id].add(plandatetime)
+        return existing
+
+    @staticmethod
+    def _parent(job: Dict, pdtz: datetime, edtz: datetime, context: Dict) -> Jobneed:
+        """Same columns as insert_into_jn_for_parent()."""
+        return Jobneed(
+            job_id=job['id'], jobtype='SCHEDULE', plandatetime=pdtz, expirydatetime=edtz,
+            parent_id=context['none_jobneed_id'], ctzoffset=job['ctzoffset'], priority=job['priority'],
+            identifier=job['identifier'], gpslocation='POINT(0.0 0.0)', remarks='',
+            multifactor=context['multifactor'].get(job['asset_id'], 1), client_id=job['client_id'],
+            other_info=job['other_info'], cuser_id=job['cuser_id'], muser_id=job['muser_id'],
+            ticketcategory_id=job['ticketcategory_id'], frequency='NONE', bu_id=job['bu_id'], seqno=0,
+            scantype=job['scantype'], gracetime=job['gracetime'], performedby_id=context['none_people_id'],
+            jobstatus='ASSIGNED', jobdesc=job['jobname'], qset_id=job['qset_id'], sgroup_id=job['sgroup_id'],
+            asset_id=job['asset_id'], people_id=job['people_id'], pgroup_id=job['pgroup_id'],
+            ticket_id=context['none_ticket_id'], tenant_id=job['tenant_id'],
+        )
+
+    @staticmethod
+    def _child(job: Dict, row: Dict, parent: Jobneed, idx: int, slot: Tuple[datetime, datetime],
+               context: Dict) -> Jobneed:
+        """Same columns as insert_into_jn_for_child()."""
+        jobdesc = f"{row['asset__assetname']} - {row['jobname']}"
+        if row['identifier'] == Job.Identifier.EXTERNALTOUR.value:
+            jobdesc = f"{job['sgroup__groupname']} - {row['bu__solid']} - {row['bu__buname']}"
+        child = Jobneed(
+            job_id=job['id'], parent_id=parent.id, jobdesc=jobdesc, plandatetime=slot[0],
+            expirydatetime=slot[1], gracetime=job['gracetime'], asset_id=row['asset_id'],
+            qset_id=row['qset_id'], pgroup_id=job['pgroup_id'], frequency='NONE', priority=row['priority'],
+            jobstatus='ASSIGNED', client_id=row['client_id'], jobtype='SCHEDULE', scantype=job['scantype'],
+            identifier=job['identifier'], cuser_id=row['cuser_id'], muser_id=row['muser_id'],
+            bu_id=row['bu_id'], ticketcategory_id=row['ticketcategory_id'], gpslocation=row['cplocation'],
+            remarks='', seqno=idx, multifactor=context['multifactor'].get(row['asset_id'], 1),
+            performedby_id=context['none_people_id'], ctzoffset=row['ctzoffset'], people_id=row['people_id'],
+            other_info=parent.other_info, sgroup_id=job['sgroup_id'],
+            ticket_id=context['none_ticket_id'], tenant_id=job['tenant_id'],
+        )
+        # Checklist rows are stamped with the checkpoint job's owner, not the tour's
+        child.source = row
+        return child
+
+    @staticmethod
+    def _details(jobneed: Jobneed, source: Dict, is_parent: bool, context: Dict) -> List[JobneedDetails]:
+        """Same rows as insert_into_jnd(): NONE question for tour parents, else the checklist."""
+        if is_parent:
+            qsb = context['none_qsb']
+            questions = [{field: getattr(qsb, field) for field in CHECKLIST_FIELDS}]
+        else:
+            questions = context['checklists'].get(source['qset_id'], [])
+        answer = 'NONE' if is_parent else None
+        return [
+            JobneedDetails(
+                seqno=q['seqno'], question_id=q['question_id'], answertype=q['answertype'],
+                max=q['max'], min=q['min'], alerton=q['alerton'], options=q['options'],
+                jobneed_id=jobneed.id, cuser_id=source['cuser_id'], muser_id=source['muser_id'],
+                ctzoffset=source['ctzoffset'], answer=answer, isavpt=q['isavpt'],
+                avpttype=q['avpttype'], tenant_id=jobneed.tenant_id,
+            )
+            for q in questions
+        ]
@@ -0,0 +1,243 @@
+"""
+Job Generation Coordinator.
+
+Splits create_job() into shards - one per contiguous range of job ids
+within a tenant database alias - and generates them concurrently as
+generate_job_shard Celery subtasks, so one slow or failing tenant no longer
+holds up (or rolls back) everyone else.
+
+Resumability comes from BulkJobneedEngine: every committed chunk advances
+the job's lastgeneratedon, and occurrences that already have a parent
+Jobneed are skipped, so a shard that is interrupted and redelivered
+(acks_late) carries on where it stopped.
+
+- An in-flight cache claim per job id stops overlapping scheduler runs from
+  generating the same job twice. Shard ranges move as jobs are added or
+  disabled, so two runs' shards can overlap; claiming jobs rather than
+  ranges keeps each job in at most one shard at a time
+- Each shard reports its duration, job and row counts; the last result of
+  every shard is kept in the cache under its own key (so concurrent shards
+  never overwrite each other) and mirrored to Prometheus when available
+
+Follows .claude/rules.md:
+- Rule #8: Methods < 30 lines
+- Rule #11: Specific exception handling
+"""
+
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, IntegrityError
+
+from apps.core.exceptions.patterns import CACHE_EXCEPTIONS
+from apps.scheduler.services.bulk_jobneed_engine import BulkJobneedEngine
+from apps.tenants.constants import DEFAULT_DB_ALIAS
+from apps.tenants.utils import slug_to_db_alias, tenant_context
+
+try:
+    from monitoring.services.prometheus_metrics import prometheus
+    PROMETHEUS_ENABLED = True
+except ImportError:
+    PROMETHEUS_ENABLED = False
+
+logger = logging.getLogger('scheduler.job_generation')
+
+__all__ = ['JobGenerationCoordinator', 'plan_shards']
+
+DEFAULT_SHARD_SIZE = 100
+INFLIGHT_PREFIX = 'scheduler:job_shard:inflight'
+RESULTS_PREFIX = 'scheduler:job_shard:results'
+RESULTS_TTL_SECONDS = 24 * 3600
+
+
+def plan_shards(job_ids: Iterable[int], shard_size: int) -> List[Tuple[int, int]]:
+    """
+    Inclusive (first_id, last_id) ranges of at most shard_size jobs each.
+
+    Ranges are derived from the ids that exist, so gaps in the id sequence
+    never produce empty shards.
+    """
+    ids = sorted(set(job_ids))
+    shard_size = max(int(shard_size), 1)
+    return [
+        (ids[start], ids[min(start + shard_size, len(ids)) - 1])
+        for start in range(0, len(ids), shard_size)
+    ]
+
+
+class JobGenerationCoordinator:
+    """Plans, dispatches and runs create_job() shards."""
+
+    @staticmethod
+    def tenant_aliases() -> List[str]:
+        """Distinct database aliases of the active tenants (default if none)."""
+        from apps.tenants.models import Tenant
+
+        aliases = []
+        for slug in Tenant.objects.filter(is_active=True).values_list('subdomain_prefix', flat=True):
+            alias = slug_to_db_alias(slug) if slug else DEFAULT_DB_ALIAS
+            if alias not in settings.DATABASES:
+                logger.warning(f"Database alias '{alias}' for tenant '{slug}' not configured, using default")
+                alias = DEFAULT_DB_ALIAS
+            if alias not in aliases:
+                aliases.append(alias)
+        return aliases or [DEFAULT_DB_ALIAS]
+
+    @classmethod
+    def dispatch(cls, db_aliases: Optional[List[str]] = None) -> Dict:
+        """
+        Queue one generate_job_shard subtask per shard of unclaimed jobs, as a Celery group.
+
+        Jobs still claimed by an earlier run are left out of the plan; the
+        shards claim their jobs when they run.
+
+        Returns:
+            {db_alias: {'jobs', 'in_flight', 'shards'}} plus the previous
+            run's per-shard results under 'last_run'
+        """
+        shard_size = getattr(settings, 'SCHEDULER_JOB_SHARD_SIZE', DEFAULT_SHARD_SIZE)
+        summary, queued, plans = {}, [], {}
+        for db_alias in db_aliases or cls.tenant_aliases():
+            with tenant_context(db_alias):
+                job_ids = list(BulkJobneedEngine.job_queryset(db_alias).values_list('id', flat=True))
+            in_flight = cls._claimed(db_alias, job_ids)
+            shards = plan_shards([job_id for job_id in job_ids if job_id not in in_flight], shard_size)
+            queued += [(db_alias, *shard) for shard in shards]
+            plans[db_alias] = shards
+            summary[db_alias] = {'jobs': len(job_ids), 'in_flight': len(in_flight), 'shards': len(shards)}
+
+        summary['last_run'] = cls.last_results(list(summary))
+        for db_alias, shards in plans.items():
+            cls._remember_plan(db_alias, shards)
+        if queued:
+            cls._queue(queued, summary)
+        logger.info(f"Job generation shards dispatched: {summary}")
+        return summary
+
+    @classmethod
+    def _queue(cls, shards: List[Tuple[str, int, int]], summary: Dict) -> None:
+        """Send the shards to the workers; generate them inline if the broker is down."""
+        from celery import group
+        from kombu.exceptions import OperationalError as BrokerOperationalError
+        from apps.scheduler.utils import generate_job_shard
+
+        try:
+            group(generate_job_shard.si(*shard) for shard in shards).apply_async()
+        except BrokerOperationalError as e:
+            logger.error(f"Could not queue job generation shards, generating inline: {e}")
+            summary['inline'] = [cls.run_shard(*shard) for shard in shards]
+
+    @classmethod
+    def run_shard(cls, db_alias: str, first_id: int, last_id: int) -> Dict:
+        """
+        Generate every job with first_id <= id <= last_id in db_alias.
+
+        Each job is claimed before it is generated; jobs another shard still
+        holds are skipped and counted under 'in_flight'.
+        """
+        started = time.monotonic()
+        result = {'db_alias': db_alias, 'first_id': first_id, 'last_id': last_id}
+        claimed = []
+        try:
+            with tenant_context(db_alias):
+                engine = BulkJobneedEngine(using=db_alias)
+                jobs = engine.fetch_jobs(using=db_alias, id_range=(first_id, last_id))
+                claimed = [job for job in jobs if cls._claim(db_alias, job['id'])]
+                engine.generate(claimed)
+            result.update(engine.stats, in_flight=len(jobs) - len(claimed),
+                          status='success' if not engine.stats['failed'] else 'partial')
+        except (DatabaseError, IntegrityError, ValueError) as e:
+            logger.error(f"Job shard {db_alias}:{first_id}-{last_id} failed: {e}", exc_info=True)
+            result['status'] = 'failed'
+        finally:
+            cls._release(db_alias, [job['id'] for job in claimed])
+            result['duration_seconds'] = round(time.monotonic() - started, 3)
+            cls._record(result)
+        return result
+
+    @classmethod
+    def last_results(cls, db_aliases: Iterable[str]) -> Dict[str, List[Dict]]:
+        """Most recent result of every shard of the last planned run, per alias."""
+        try:
+            results = {}
+            for db_alias in db_aliases:
+                keys = [cls._results_key(db_alias, *shard) for shard in cache.get(cls._plan_key(db_alias), [])]
+                found = cache.get_many(keys)
+                results[db_alias] = [found[key] for key in keys if key in found]
+            return results
+        except CACHE_EXCEPTIONS as e:
+            logger.warning(f"Job shard results unavailable: {e}")
+            return {}
+
+    @staticmethod
+    def _job_key(db_alias: str, job_id: int) -> str:
+        return f"{INFLIGHT_PREFIX}:{db_alias}:{job_id}"
+
+    @staticmethod
+    def _results_key(db_alias: str, first_id: int, last_id: int) -> str:
+        return f"{RESULTS_PREFIX}:{db_alias}:{first_id}-{last_id}"
+
+    @staticmethod
+    def _plan_key(db_alias: str) -> str:
+        return f"{RESULTS_PREFIX}:{db_alias}:plan"
+
+    @classmethod
+    def _remember_plan(cls, db_alias: str, shards: List[Tuple[int, int]]) -> None:
+        """Shard ranges of the run just planned, so last_results() can find their keys."""
+        try:
+            cache.set(cls._plan_key(db_alias), shards, RESULTS_TTL_SECONDS)
+        except CACHE_EXCEPTIONS as e:
+            logger.warning(f"Could not store job shard plan for {db_alias}: {e}")
+
+    @classmethod
+    def _claimed(cls, db_alias: str, job_ids: List[int]) -> Set[int]:
+        """Ids of the jobs an earlier run still owns, read with one get_many."""
+        if not job_ids:
+            return set()
+        keys = {cls._job_key(db_alias, job_id): job_id for job_id in job_ids}
+        try:
+            return {keys[key] for key in cache.get_many(list(keys))}
+        except CACHE_EXCEPTIONS as e:
+            logger.warning(f"Could not read job claims for {db_alias}: {e}")
+            return set()
+
+    @classmethod
+    def _claim(cls, db_alias: str, job_id: int) -> bool:
+        """Claim a job for this run; False while an earlier run still owns it."""
+        ttl = getattr(settings, 'SCHEDULER_JOB_SHARD_INFLIGHT_TTL', 2 * 3600)
+        try:
+            return cache.add(cls._job_key(db_alias, job_id), time.time(), ttl)
+        except CACHE_EXCEPTIONS as e:
+            logger.warning(f"Could not claim job {db_alias}:{job_id}: {e}")
+            return True
+
+    @classmethod
+    def _release(cls, db_alias: str, job_ids: List[int]) -> None:
+        if not job_ids:
+            return
+        try:
+            cache.delete_many([cls._job_key(db_alias, job_id) for job_id in job_ids])
+        except CACHE_EXCEPTIONS as e:
+            logger.warning(f"Could not release {len(job_ids)} jobs in {db_alias}: {e}")
+
+    @classmethod
+    def _record(cls, result: Dict) -> None:
+        """Keep the shard's latest result and report its duration."""
+        db_alias = result['db_alias']
+        logger.info(f"Job shard finished: {result}")
+        try:
+            # One key per shard: a plain set, no read-modify-write shared between workers
+            cache.set(cls._results_key(db_alias, result['first_id'], result['last_id']), result, RESULTS_TTL_SECONDS)
+        except CACHE_EXCEPTIONS as e:
+            logger.warning(f"Could not store job shard result for {db_alias}: {e}")
+
+        if PROMETHEUS_ENABLED:
+            prometheus.observe_histogram(
+                'scheduler_job_shard_seconds',
+                result['duration_seconds'],
+                labels={'db_alias': db_alias, 'status': result['status']},
+                help_text='Duration of one create_job generation shard'
+            )
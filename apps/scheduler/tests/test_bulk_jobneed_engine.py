@@ -0,0 +1,140 @@
+"""
+Unit Tests for BulkJobneedEngine.
+
+Tests cron expansion, checkpoint scheduling, per-job failure isolation,
+route resolution outside the write transaction and post-commit task events.
+Follows .claude/rules.md testing standards.
+"""
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.db import DatabaseError
+
+from apps.scheduler.services.bulk_jobneed_engine import (
+    BulkJobneedEngine,
+    expand_occurrences,
+    schedule_checkpoints,
+)
+
+IST = dt_timezone(timedelta(minutes=330))
+
+
+def tour_job(**other_info):
+    return {
+        'id': 7,
+        'planduration': 10,
+        'gracetime': 5,
+        'expirytime': 0,
+        'other_info': {'tour_frequency': 1, 'breaktime': 0, 'is_randomized': False, **other_info},
+    }
+
+
+class TestExpandOccurrences:
+
+    def test_occurrences_are_utc_minutes_before_end(self):
+        start = datetime(2025, 1, 1, 0, 0, 30, tzinfo=IST)
+        occurrences = expand_occurrences('0 8 * * *', start, start + timedelta(days=2))
+
+        assert occurrences == [
+            datetime(2025, 1, 1, 2, 30, tzinfo=dt_timezone.utc),
+            datetime(2025, 1, 2, 2, 30, tzinfo=dt_timezone.utc),
+        ]
+
+    def test_empty_window(self):
+        start = datetime(2025, 1, 1, 9, 0, tzinfo=IST)
+        assert expand_occurrences('0 8 * * *', start, start + timedelta(hours=1)) == []
+
+    def test_bad_cron_raises_value_error(self):
+        start = datetime(2025, 1, 1, tzinfo=IST)
+        with pytest.raises(ValueError):
+            expand_occurrences('not a cron', start, start + timedelta(days=1))
+
+
+class TestScheduleCheckpoints:
+
+    def test_checkpoints_chain_from_parent_plan(self):
+        pdtz = datetime(2025, 1, 1, 8, 0, tzinfo=dt_timezone.utc)
+        slots = schedule_checkpoints(tour_job(), pdtz, [{'expirytime': 0}, {'expirytime': 20}])
+
+        assert slots == [
+            (pdtz, pdtz + timedelta(minutes=15)),
+            (pdtz + timedelta(minutes=35), pdtz + timedelta(minutes=50)),
+        ]
+
+    def test_break_precedes_second_round(self):
+        pdtz = datetime(2025, 1, 1, 8, 0, tzinfo=dt_timezone.utc)
+        checkpoints = [{'expirytime': 0}] * 4
+        slots = schedule_checkpoints(tour_job(tour_frequency=2, breaktime=30), pdtz, checkpoints)
+
+        assert slots[2][0] - slots[1][1] == timedelta(minutes=30)
+        assert slots[3][0] == slots[2][1]
+
+    def test_no_checkpoints(self):
+        assert schedule_checkpoints(tour_job(), datetime.now(dt_timezone.utc), []) == []
+
+
+class TestGenerateJob:
+
+    def test_failure_is_isolated_to_the_job(self):
+        engine = BulkJobneedEngine(using='default')
+        pdtz = datetime(2025, 1, 1, 8, 0, tzinfo=dt_timezone.utc)
+        context = {'existing': {}}
+
+        with patch('apps.scheduler.services.bulk_jobneed_engine.transaction.atomic'), \
+                patch.object(engine, '_routes', return_value=[[]]), \
+                patch.object(engine, '_write_chunk', side_effect=DatabaseError('boom')):
+            result = engine._generate_job(tour_job(), [pdtz], context)
+
+        assert result['errors'] == 'Failed to schedule jobs'
+        assert engine.stats['failed'] == 1
+
+    def test_existing_occurrences_are_skipped(self):
+        engine = BulkJobneedEngine(using='default', chunk_size=1)
+        first = datetime(2025, 1, 1, 8, 0, tzinfo=dt_timezone.utc)
+        second = first + timedelta(days=1)
+        context = {'existing': {7: {first}}}
+
+        with patch('apps.scheduler.services.bulk_jobneed_engine.transaction.atomic'), \
+                patch.object(engine, '_checkpoint') as checkpoint, \
+                patch.object(engine, '_routes', return_value=[[]]), \
+                patch.object(engine, '_write_chunk', return_value=1) as write_chunk:
+            result = engine._generate_job(tour_job(), [first, second], context)
+
+        write_chunk.assert_called_once_with(tour_job(), [second], [[]], context)
+        checkpoint.assert_called_once_with(tour_job(), second)
+        assert result['count'] == 2
+
+    def test_routes_resolved_before_transaction_opens(self):
+        engine = BulkJobneedEngine(using='default')
+        pdtz = datetime(2025, 1, 1, 8, 0, tzinfo=dt_timezone.utc)
+        calls = MagicMock()
+
+        with patch('apps.scheduler.services.bulk_jobneed_engine.transaction.atomic', calls.atomic), \
+                patch.object(engine, '_checkpoint'), \
+                patch.object(engine, '_routes', calls.routes), \
+                patch.object(engine, '_write_chunk', calls.write_chunk):
+            calls.write_chunk.return_value = 1
+            engine._generate_job(tour_job(), [pdtz], {'existing': {}})
+
+        names = [name for name, _, _ in calls.mock_calls]
+        assert names.index('routes') < names.index('atomic') < names.index('write_chunk')
+
+
+class TestTaskEvents:
+
+    def test_events_published_after_commit(self):
+        engine = BulkJobneedEngine(using='default')
+        jobneeds = [MagicMock(tenant_id=1), MagicMock(tenant_id=1)]
+
+        with patch('apps.scheduler.services.bulk_jobneed_engine.transaction.on_commit') as on_commit, \
+                patch('apps.noc.signals.streaming_event_publishers.publish_task_events') as publish:
+            engine._publish_on_commit(jobneeds)
+            publish.assert_not_called()
+
+            callback = on_commit.call_args.args[0]
+            assert on_commit.call_args.kwargs == {'using': 'default'}
+            callback()
+
+        publish.assert_called_once_with(jobneeds)
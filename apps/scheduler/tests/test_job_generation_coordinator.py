@@ -0,0 +1,93 @@
+"""
+Unit Tests for JobGenerationCoordinator.
+
+Tests shard planning, per-job in-flight claims and per-shard result reporting.
+Follows .claude/rules.md testing standards.
+"""
+
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.test import override_settings
+
+from apps.scheduler.services.job_generation_coordinator import (
+    JobGenerationCoordinator,
+    plan_shards,
+)
+
+MODULE = 'apps.scheduler.services.job_generation_coordinator'
+
+
+class TestPlanShards:
+
+    def test_ranges_follow_existing_ids(self):
+        assert plan_shards([9, 1, 4, 20, 21], 2) == [(1, 4), (9, 20), (21, 21)]
+
+    def test_no_jobs(self):
+        assert plan_shards([], 10) == []
+
+    def test_shard_size_is_at_least_one(self):
+        assert plan_shards([3, 5], 0) == [(3, 3), (5, 5)]
+
+
+class TestDispatch:
+
+    def setup_method(self):
+        cache.clear()
+
+    def test_claimed_jobs_are_left_out_of_the_plan(self):
+        JobGenerationCoordinator._claim('default', 2)
+        with patch(f'{MODULE}.BulkJobneedEngine.job_queryset') as job_queryset, \
+                patch(f'{MODULE}.tenant_context'), \
+                override_settings(SCHEDULER_JOB_SHARD_SIZE=2), \
+                patch.object(JobGenerationCoordinator, '_queue') as queue:
+            job_queryset.return_value.values_list.return_value = [1, 2, 3, 4]
+            summary = JobGenerationCoordinator.dispatch(['default'])
+
+        assert summary['default'] == {'jobs': 4, 'in_flight': 1, 'shards': 2}
+        assert queue.call_args[0][0] == [('default', 1, 3), ('default', 4, 4)]
+
+
+class TestRunShard:
+
+    def setup_method(self):
+        cache.clear()
+
+    def test_failed_shard_releases_claims_and_reports_duration(self):
+        JobGenerationCoordinator._remember_plan('default', [(1, 10)])
+        with patch(f'{MODULE}.tenant_context'), \
+                patch(f'{MODULE}.BulkJobneedEngine.fetch_jobs', return_value=[{'id': 1}, {'id': 5}]), \
+                patch(f'{MODULE}.BulkJobneedEngine.generate', side_effect=DatabaseError('down')):
+            result = JobGenerationCoordinator.run_shard('default', 1, 10)
+
+        assert result['status'] == 'failed'
+        assert result['duration_seconds'] >= 0
+        assert JobGenerationCoordinator._claim('default', 1)
+        assert JobGenerationCoordinator._claim('default', 5)
+        assert JobGenerationCoordinator.last_results(['default'])['default'] == [result]
+
+    def test_overlapping_shards_skip_jobs_claimed_by_the_other(self):
+        # A run planned 1-10 still owns job 5 when the next run plans 5-12
+        JobGenerationCoordinator._claim('default', 5)
+        with patch(f'{MODULE}.tenant_context'), \
+                patch(f'{MODULE}.BulkJobneedEngine.fetch_jobs', return_value=[{'id': 5}, {'id': 12}]), \
+                patch(f'{MODULE}.BulkJobneedEngine.generate') as generate:
+            result = JobGenerationCoordinator.run_shard('default', 5, 12)
+
+        generate.assert_called_once_with([{'id': 12}])
+        assert result['in_flight'] == 1
+        assert not JobGenerationCoordinator._claim('default', 5)
+        assert JobGenerationCoordinator._claim('default', 12)
+
+    def test_concurrent_shards_keep_their_own_results(self):
+        JobGenerationCoordinator._remember_plan('default', [(1, 10), (11, 20)])
+        first = {'db_alias': 'default', 'first_id': 1, 'last_id': 10, 'status': 'success', 'duration_seconds': 1.0}
+        second = {'db_alias': 'default', 'first_id': 11, 'last_id': 20, 'status': 'failed', 'duration_seconds': 2.0}
+
+        # Shards finish in any order; neither overwrites the other
+        with patch(f'{MODULE}.PROMETHEUS_ENABLED', False):
+            JobGenerationCoordinator._record(second)
+            JobGenerationCoordinator._record(first)
+
+        assert JobGenerationCoordinator.last_results(['default'])['default'] == [first, second]
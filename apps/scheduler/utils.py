@@ -1,7 +1,12 @@
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models import F, Q
 from django.http import response as rp
 import apps.activity.models as am
 from pprint import pformat
 from apps.core import utils
+from apps.core.exceptions import IntegrationException
 from datetime import datetime, timezone as dt_timezone, timedelta
 from django.utils import timezone
 from django.db.models.query import QuerySet
@@ -20,6 +25,11 @@ from apps.attendance.services.geospatial_service import GeospatialService
 
 log = get_task_logger('__main__')
 
+# Set-based generation (BulkJobneedEngine); False restores the per-occurrence path
+BULK_JOBNEED_GENERATION = getattr(settings, 'SCHEDULER_BULK_JOBNEED_GENERATION', True)
+# Full runs fan out as generate_job_shard subtasks per tenant alias and job-id range
+JOB_GENERATION_SHARDING = getattr(settings, 'SCHEDULER_JOB_GENERATION_SHARDING', True)
+
 def create_dynamic_job(jobids=None):
     try:
         # check if dynamic job already exist with the passed jobid
@@ -74,6 +84,11 @@ def create_dynamic_job(jobids=None):
 
 @shared_task(name="create_job")
 def create_job(jobids = None):
+    if BULK_JOBNEED_GENERATION and JOB_GENERATION_SHARDING and not jobids:
+        from apps.scheduler.services.job_generation_coordinator import JobGenerationCoordinator
+        return None, {'shards': JobGenerationCoordinator.dispatch()}
+    if BULK_JOBNEED_GENERATION:
+        return create_job_bulk(jobids)
     startdtz = enddtz = msg = resp = None
     result = {'story':[]}
 
@@ -120,6 +135,42 @@ def create_job(jobids = None):
             log.critical("something went wrong!", exc_info=True)
     return resp, result
 
+
+def create_job_bulk(jobids=None):
+    """
+    create_job() through BulkJobneedEngine: occurrences are expanded in
+    memory and written with bulk_create, one transaction per job.
+    """
+    from apps.scheduler.services.bulk_jobneed_engine import BulkJobneedEngine
+
+    resp, result = None, {'story': []}
+    try:
+        jobs = BulkJobneedEngine.fetch_jobs(jobids)
+        if not jobs:
+            msg = "No jobs found schedhuling terminated"
+            log.warning(msg)
+            return {'msg': msg}, result
+        log.info("bulk jobneed generation started found:= '%s' jobs", len(jobs))
+        engine = BulkJobneedEngine()
+        result['story'] = engine.generate(jobs)
+        result['stats'] = engine.stats
+        resp = result['story'][-1] if result['story'] else None
+        log.info(f"bulk jobneed generation finished {engine.stats}")
+    except (DatabaseError, IntegrityError, ObjectDoesNotExist, ValueError):
+        log.critical("something went wrong!", exc_info=True)
+    return resp, result
+
+
+@shared_task(name="generate_job_shard", acks_late=True, soft_time_limit=3300, time_limit=3600)
+def generate_job_shard(db_alias, first_id, last_id):
+    """
+    Generate the jobs of one create_job() shard (first_id <= id <= last_id
+    in db_alias). Safe to redeliver: progress is checkpointed per chunk.
+    """
+    from apps.scheduler.services.job_generation_coordinator import JobGenerationCoordinator
+    return JobGenerationCoordinator.run_shard(db_alias, first_id, last_id)
+
+
 def calculate_startdtz_enddtz(job):
     """
     this function determines or calculates what is 
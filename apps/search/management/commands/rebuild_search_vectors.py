@@ -0,0 +1,79 @@
+"""
+Management Command: Rebuild Search Vectors
+
+Backfill the stored tsvector columns used by UnifiedSemanticSearchService
+(tickets, work orders, assets, people)
+and the HelpBot knowledge base. Needed once after the columns are
+added, and after imports or bulk writes that bypass post_save signals.
+
+Usage:
+python manage.py rebuild_search_vectors [--module=tickets] [--database=default] [--all]
+
+Following CLAUDE.md:
+- Specific exception handling
+- Progress reporting
+- Batch processing for performance
+"""
+
+import logging
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+from apps.search.services.text_index import TEXT_INDEX_SPECS, rebuild_search_vectors
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Rebuild stored full-text vectors for unified search."""
+
+    help = 'Backfill stored search_vector columns for unified search modules'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            '--module',
+            choices=sorted(TEXT_INDEX_SPECS),
+            help='Limit to one module (default: all)'
+        )
+
+        parser.add_argument(
+            '--database',
+            default='default',
+            help='Database alias to rebuild (default: default)'
+        )
+
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Recompute every row, not only rows without a vector'
+        )
+
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Rows per UPDATE statement'
+        )
+
+    def handle(self, *args, **options):
+        """Execute command."""
+        database = options['database']
+        if database not in settings.DATABASES:
+            raise CommandError(f"Unknown database alias: {database}")
+
+        modules = [options['module']] if options['module'] else sorted(TEXT_INDEX_SPECS)
+
+        for module in modules:
+            try:
+                updated = rebuild_search_vectors(
+                    module,
+                    using=database,
+                    only_missing=not options['all'],
+                    batch_size=options['batch_size']
+                )
+            except DatabaseError as e:
+                logger.error(f"Failed to rebuild {module} search vectors: {e}", exc_info=True)
+                raise CommandError(f"Failed to rebuild {module} search vectors: {e}")
+
+            self.stdout.write(self.style.SUCCESS(f"{module}: {updated} rows updated"))
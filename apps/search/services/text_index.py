@@ -0,0 +1,200 @@
+"""
+Stored Full-Text Index for Unified Search
+
+Each module searched by UnifiedSemanticSearchService (and the HelpBot
+knowledge base, which shares the knowledge_base spec) keeps a stored
+tsvector column (search_vector, GIN-indexed) on its own table, plus
+trigram GIN indexes on UPPER(identifier) so identifier icontains lookups
+(ticketno, assetcode, peoplecode) are index scans too.
+
+- Vectors are refreshed by post_save signals (apps/search/signals.py)
+- Rows written without signals (bulk_create, queryset.update, imports)
+  are picked up by `manage.py rebuild_search_vectors`
+- Queries are prefix tsqueries ("pump mot" -> 'pump':* & 'mot':*), close
+  to the substring behaviour of the icontains scans they replace
+- Non-PostgreSQL databases fall back to icontains over the same fields
+
+Encrypted columns (People.email, People.mobno) are never indexed.
+
+Following .claude/rules.md:
+- Rule #11: Specific exception handling
+- Rule #12: Database query optimization
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from django.apps import apps as django_apps
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import F, Q, QuerySet
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    'TextIndexSpec', 'TEXT_INDEX_SPECS', 'spec_for_model', 'build_prefix_query',
+    'apply_text_search', 'refresh_search_vector', 'rebuild_search_vectors',
+]
+
+MAX_QUERY_TERMS = 8
+REBUILD_BATCH_SIZE = 2000
+
+
+@dataclass(frozen=True)
+class TextIndexSpec:
+    """Searchable columns of one module's table."""
+
+    model_label: str
+    weighted_fields: Tuple[Tuple[str, str], ...]
+    config: str
+    identifier_fields: Tuple[str, ...] = ()
+
+    @property
+    def model(self):
+        return django_apps.get_model(self.model_label)
+
+    @property
+    def source_fields(self) -> Tuple[str, ...]:
+        return tuple(field for field, _ in self.weighted_fields)
+
+    @property
+    def fallback_fields(self) -> Tuple[str, ...]:
+        """Source fields usable with icontains (array columns are skipped)."""
+        meta = self.model._meta
+        return tuple(
+            field for field in self.source_fields
+            if meta.get_field(field).get_internal_type() in ('CharField', 'TextField')
+        )
+
+    def vector_expression(self) -> SearchVector:
+        vector = None
+        for field, weight in self.weighted_fields:
+            part = SearchVector(field, weight=weight, config=self.config)
+            vector = part if vector is None else vector + part
+        return vector
+
+
+TEXT_INDEX_SPECS = {
+    'tickets': TextIndexSpec(
+        model_label='y_helpdesk.Ticket',
+        weighted_fields=(('ticketdesc', 'A'), ('comments', 'B')),
+        config='english',
+        identifier_fields=('ticketno',),
+    ),
+    'work_orders': TextIndexSpec(
+        model_label='work_order_management.Wom',
+        weighted_fields=(('description', 'A'),),
+        config='english',
+    ),
+    'assets': TextIndexSpec(
+        model_label='activity.Asset',
+        weighted_fields=(('assetname', 'A'), ('assetcode', 'A')),
+        config='simple',
+        identifier_fields=('assetcode',),
+    ),
+    'people': TextIndexSpec(
+        model_label='peoples.People',
+        weighted_fields=(('peoplename', 'A'), ('peoplecode', 'B'), ('loginid', 'B')),
+        config='simple',
+        identifier_fields=('peoplecode',),
+    ),
+    'knowledge_base': TextIndexSpec(
+        model_label='helpbot.HelpBotKnowledge',
+        weighted_fields=(('title', 'A'), ('content', 'B'), ('search_keywords', 'C')),
+        config='english',
+    ),
+}
+
+
+def spec_for_model(model_class) -> Optional[TextIndexSpec]:
+    label = model_class._meta.label
+    return next((spec for spec in TEXT_INDEX_SPECS.values() if spec.model_label == label), None)
+
+
+def build_prefix_query(query: str, config: str) -> Optional[SearchQuery]:
+    """
+    Prefix-matching tsquery for free text.
+
+    Only word characters reach the raw tsquery, so user input cannot
+    inject tsquery operators. Returns None when the query has no words.
+    """
+    terms = re.findall(r'\w+', query.lower())[:MAX_QUERY_TERMS]
+    if not terms:
+        return None
+    return SearchQuery(' & '.join(f'{term}:*' for term in terms), search_type='raw', config=config)
+
+
+def apply_text_search(queryset: QuerySet, module: str, query: str) -> QuerySet:
+    """
+    Filter queryset to rows matching query, best matches first on PostgreSQL.
+
+    Args:
+        queryset: Base queryset of the module's model (already tenant-scoped)
+        module: Key of TEXT_INDEX_SPECS
+        query: Raw user query
+    """
+    spec = TEXT_INDEX_SPECS[module]
+    identifier_match = Q()
+    for field in spec.identifier_fields:
+        identifier_match |= Q(**{f'{field}__icontains': query})
+
+    if connections[queryset.db].vendor != 'postgresql':
+        text_match = Q()
+        for field in spec.fallback_fields:
+            text_match |= Q(**{f'{field}__icontains': query})
+        return queryset.filter(text_match | identifier_match)
+
+    search_query = build_prefix_query(query, spec.config)
+    if search_query is None:
+        return queryset.filter(identifier_match) if spec.identifier_fields else queryset.none()
+
+    return (
+        queryset
+        .filter(Q(search_vector=search_query) | identifier_match)
+        .annotate(search_rank=SearchRank(F('search_vector'), search_query))
+        .order_by('-search_rank')
+    )
+
+
+def refresh_search_vector(instance) -> bool:
+    """Recompute the stored vector of one row; False when not applicable."""
+    spec = spec_for_model(type(instance))
+    using = instance._state.db or 'default'
+    if spec is None or connections[using].vendor != 'postgresql':
+        return False
+    type(instance)._base_manager.using(using).filter(pk=instance.pk).update(
+        search_vector=spec.vector_expression()
+    )
+    return True
+
+
+def rebuild_search_vectors(module: str, using: str = 'default', only_missing: bool = True,
+                           batch_size: int = REBUILD_BATCH_SIZE) -> int:
+    """
+    Recompute stored vectors in primary-key batches (one UPDATE per batch).
+
+    Returns:
+        Number of rows updated
+    """
+    spec = TEXT_INDEX_SPECS[module]
+    if connections[using].vendor != 'postgresql':
+        return 0
+
+    manager = spec.model._base_manager.using(using)
+    queryset = manager.filter(search_vector__isnull=True) if only_missing else manager.all()
+    updated = 0
+    last_pk = None
+    while True:
+        page = queryset.order_by('pk')
+        if last_pk is not None:
+            page = page.filter(pk__gt=last_pk)
+        pks = list(page.values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            break
+        updated += manager.filter(pk__in=pks).update(search_vector=spec.vector_expression())
+        last_pk = pks[-1]
+
+    logger.info(f"Rebuilt {updated} {module} search vectors on {using}")
+    return updated
@@ -10,6 +10,11 @@ Architecture:
 - txtai embeddings for semantic similarity
 - Hybrid ranking (semantic + keyword + recency)
 - Multi-module indexing (tickets, assets, work orders, people)
+- Module searches fan out in parallel (own connection per worker, caller's
+  tenant database, bounded by SEARCH_MODULE_TIMEOUT)
+- Tickets, work orders, assets, people and the knowledge base match
+  against stored, GIN-indexed tsvector columns
+  (apps/search/services/text_index.py) instead of per-query scans
 - Tenant isolation
 - Fuzzy matching with typo tolerance
 - Voice search support
@@ -26,14 +31,18 @@ import hashlib
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timezone as dt_timezone
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 
 from django.conf import settings
 from django.core.cache import cache
-from django.db.models import Q, F
+from django.db import close_old_connections, connections
 from django.utils import timezone
 
 from apps.core.exceptions.patterns import DATABASE_EXCEPTIONS
 from apps.core.exceptions.patterns import DATABASE_EXCEPTIONS, NETWORK_EXCEPTIONS
+from apps.core.utils_new.db_utils import get_current_db_name
+from apps.search.services.text_index import apply_text_search
+from apps.tenants.utils import tenant_context
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +64,7 @@ class UnifiedSemanticSearchService:
     def __init__(self):
         self.cache_prefix = 'unified_search'
         self.cache_timeout = getattr(settings, 'SEARCH_CACHE_TIMEOUT', 300)
+        self.search_timeout = getattr(settings, 'SEARCH_MODULE_TIMEOUT', 5)
         self.index_path = Path(settings.BASE_DIR) / 'data' / 'search_index'
         self.index_path.mkdir(parents=True, exist_ok=True)
 
@@ -146,28 +156,8 @@ class UnifiedSemanticSearchService:
             if modules is None:
                 modules = ['tickets', 'work_orders', 'assets', 'people', 'knowledge_base']
 
-            # Search each module
-            all_results = []
-
-            if 'tickets' in modules:
-                ticket_results = self._search_tickets(query, tenant_id, limit, filters)
-                all_results.extend(ticket_results)
-
-            if 'work_orders' in modules:
-                wo_results = self._search_work_orders(query, tenant_id, limit, filters)
-                all_results.extend(wo_results)
-
-            if 'assets' in modules:
-                asset_results = self._search_assets(query, tenant_id, limit, filters)
-                all_results.extend(asset_results)
-
-            if 'people' in modules:
-                people_results = self._search_people(query, tenant_id, limit, user_id, filters)
-                all_results.extend(people_results)
-
-            if 'knowledge_base' in modules:
-                kb_results = self._search_knowledge_base(query, limit, filters)
-                all_results.extend(kb_results)
+            # Search each module concurrently
+            all_results = self._run_module_searches(query, tenant_id, modules, limit, user_id, filters)
 
             # Rank and format results
             ranked_results = self._rank_results(all_results, query)[:limit]
@@ -200,6 +190,70 @@ class UnifiedSemanticSearchService:
             logger.error(f"Unexpected error in unified search: {e}", exc_info=True)
             return self._empty_result(f"Search error: {str(e)}")
 
+    def _run_module_searches(
+        self,
+        query: str,
+        tenant_id: int,
+        modules: List[str],
+        limit: int,
+        user_id: Optional[int],
+        filters: Optional[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Run the per-module searches, in parallel where possible.
+
+        Each module is an independent indexed query, so on PostgreSQL they
+        run on worker threads (own connections, caller's tenant database).
+        Inside an atomic block they run inline: worker connections cannot
+        see the caller's uncommitted rows.
+        """
+        searches = {
+            'tickets': lambda: self._search_tickets(query, tenant_id, limit, filters),
+            'work_orders': lambda: self._search_work_orders(query, tenant_id, limit, filters),
+            'assets': lambda: self._search_assets(query, tenant_id, limit, filters),
+            'people': lambda: self._search_people(query, tenant_id, user_id=user_id, limit=limit, filters=filters),
+            'knowledge_base': lambda: self._search_knowledge_base(query, limit, filters),
+        }
+        selected = [module for module in modules if module in searches]
+
+        db_alias = get_current_db_name()
+        connection = connections[db_alias]
+        if len(selected) < 2 or connection.vendor != 'postgresql' or connection.in_atomic_block:
+            results = []
+            for module in selected:
+                results.extend(searches[module]())
+            return results
+
+        def run(module):
+            close_old_connections()
+            try:
+                with tenant_context(db_alias):
+                    return searches[module]()
+            finally:
+                connections.close_all()
+
+        results_by_module = {}
+        executor = ThreadPoolExecutor(max_workers=len(selected), thread_name_prefix='unified-search')
+        try:
+            future_to_module = {executor.submit(run, module): module for module in selected}
+            for future in as_completed(future_to_module, timeout=self.search_timeout):
+                module = future_to_module[future]
+                try:
+                    results_by_module[module] = future.result()
+                except DATABASE_EXCEPTIONS as e:
+                    logger.error(f"Error searching {module}: {e}", exc_info=True)
+        except FuturesTimeoutError:
+            missing = [module for module in selected if module not in results_by_module]
+            logger.warning(f"Unified search timed out after {self.search_timeout}s; skipped {missing}")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        # Keep module order stable so ranking ties resolve as before
+        results = []
+        for module in selected:
+            results.extend(results_by_module.get(module, []))
+        return results
+
     def _search_tickets(
         self,
         query: str,
@@ -225,12 +279,8 @@ class UnifiedSemanticSearchService:
                 if 'date_to' in filters:
                     queryset = queryset.filter(cdtz__lte=filters['date_to'])
 
-            # Text search
-            queryset = queryset.filter(
-                Q(ticketdesc__icontains=query) |
-                Q(ticketno__icontains=query) |
-                Q(comments__icontains=query)
-            ).select_related(
+            # Text search (stored tsvector + ticketno trigram index)
+            queryset = apply_text_search(queryset, 'tickets', query).select_related(
                 'assignedtopeople',
                 'bu',
                 'ticketcategory'
@@ -248,7 +298,7 @@ class UnifiedSemanticSearchService:
                         'status': ticket.status,
                         'priority': ticket.priority,
                         'assigned_to': ticket.assignedtopeople.peoplename if ticket.assignedtopeople else None,
-                        'category': ticket.ticketcategory.typeasstvalue if ticket.ticketcategory else None,
+                        'category': ticket.ticketcategory.taname if ticket.ticketcategory else None,
                         'created_at': ticket.cdtz.isoformat() if ticket.cdtz else None,
                         'sentiment_score': ticket.sentiment_score,
                         'sentiment_label': ticket.sentiment_label,
@@ -282,15 +332,12 @@ class UnifiedSemanticSearchService:
             # Apply filters
             if filters:
                 if 'status' in filters:
-                    queryset = queryset.filter(status=filters['status'])
+                    queryset = queryset.filter(workstatus=filters['status'])
                 if 'priority' in filters:
                     queryset = queryset.filter(priority=filters['priority'])
 
-            # Text search
-            queryset = queryset.filter(
-                Q(desc__icontains=query) |
-                Q(other_data__icontains=query)
-            ).select_related(
+            # Text search (stored tsvector)
+            queryset = apply_text_search(queryset, 'work_orders', query).select_related(
                 'asset',
                 'location',
                 'vendor'
@@ -302,14 +349,14 @@ class UnifiedSemanticSearchService:
                     'id': str(wo.uuid),
                     'module': 'work_orders',
                     'type': 'work_order',
-                    'title': f"Work Order - {wo.asset.name if wo.asset else 'N/A'}",
-                    'text': wo.desc,
+                    'title': f"Work Order - {wo.asset.assetname if wo.asset else 'N/A'}",
+                    'text': wo.description,
                     'metadata': {
-                        'status': wo.status,
+                        'status': wo.workstatus,
                         'priority': wo.priority,
-                        'asset': wo.asset.name if wo.asset else None,
-                        'location': wo.location.name if wo.location else None,
-                        'vendor': wo.vendor.vendorname if wo.vendor else None,
+                        'asset': wo.asset.assetname if wo.asset else None,
+                        'location': wo.location.locname if wo.location else None,
+                        'vendor': wo.vendor.name if wo.vendor else None,
                         'scheduled_date': wo.plandatetime.isoformat() if wo.plandatetime else None,
                     },
                     'timestamp': wo.cdtz.isoformat() if wo.cdtz else None,
@@ -345,12 +392,8 @@ class UnifiedSemanticSearchService:
                 if 'status' in filters:
                     queryset = queryset.filter(runningstatus=filters['status'])
 
-            # Text search
-            queryset = queryset.filter(
-                Q(name__icontains=query) |
-                Q(code__icontains=query) |
-                Q(desc__icontains=query)
-            ).select_related(
+            # Text search (stored tsvector + assetcode trigram index)
+            queryset = apply_text_search(queryset, 'assets', query).select_related(
                 'type',
                 'category',
                 'location',
@@ -363,13 +406,13 @@ class UnifiedSemanticSearchService:
                     'id': str(asset.uuid),
                     'module': 'assets',
                     'type': 'asset',
-                    'title': asset.name,
-                    'text': asset.desc or f"{asset.code} - {asset.name}",
+                    'title': asset.assetname,
+                    'text': f"{asset.assetcode} - {asset.assetname}",
                     'metadata': {
-                        'code': asset.code,
-                        'type': asset.type.typeasstvalue if asset.type else None,
-                        'category': asset.category.typeasstvalue if asset.category else None,
-                        'location': asset.location.name if asset.location else None,
+                        'code': asset.assetcode,
+                        'type': asset.type.taname if asset.type else None,
+                        'category': asset.category.taname if asset.category else None,
+                        'location': asset.location.locname if asset.location else None,
                         'critical': asset.iscritical,
                         'status': asset.runningstatus,
                     },
@@ -393,7 +436,7 @@ class UnifiedSemanticSearchService:
         limit: int,
         filters: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
-        """Search people directory."""
+        """Search people directory (name, code, login; encrypted fields are not searchable)."""
         try:
             from apps.peoples.models import People
 
@@ -404,38 +447,36 @@ class UnifiedSemanticSearchService:
             if filters:
                 if 'role' in filters:
                     queryset = queryset.filter(
-                        organizational__role__icontains=filters['role']
+                        organizational__designation__taname__icontains=filters['role']
                     )
                 if 'department' in filters:
                     queryset = queryset.filter(
-                        organizational__department__icontains=filters['department']
+                        organizational__department__taname__icontains=filters['department']
                     )
 
-            # Text search
-            queryset = queryset.filter(
-                Q(peoplename__icontains=query) |
-                Q(peopleemail__icontains=query) |
-                Q(empid__icontains=query) |
-                Q(organizational__role__icontains=query)
-            ).select_related(
-                'profile',
-                'organizational'
+            # Text search (stored tsvector + peoplecode trigram index)
+            queryset = apply_text_search(queryset, 'people', query).select_related(
+                'organizational__designation',
+                'organizational__department'
             )[:limit]
 
             results = []
             for person in queryset:
+                organizational = getattr(person, 'organizational', None)
+                role = organizational.designation.taname if organizational and organizational.designation else None
+                department = organizational.department.taname if organizational and organizational.department else None
                 results.append({
                     'id': str(person.uuid),
                     'module': 'people',
                     'type': 'person',
                     'title': person.peoplename,
-                    'text': f"{person.peoplename} - {person.organizational.role if person.organizational else 'N/A'}",
+                    'text': f"{person.peoplename} - {role or 'N/A'}",
                     'metadata': {
-                        'email': person.peopleemail,
-                        'employee_id': person.empid,
-                        'role': person.organizational.role if person.organizational else None,
-                        'department': person.organizational.department if person.organizational else None,
-                        'phone': person.peoplephone,
+                        'email': person.email,
+                        'employee_id': person.peoplecode,
+                        'role': role,
+                        'department': department,
+                        'phone': person.mobno,
                     },
                     'timestamp': person.cdtz.isoformat() if person.cdtz else None,
                     'tenant_id': tenant_id,
@@ -469,22 +510,8 @@ class UnifiedSemanticSearchService:
                 if 'knowledge_type' in filters:
                     queryset = queryset.filter(knowledge_type=filters['knowledge_type'])
 
-            # Text search using PostgreSQL full-text search
-            from django.contrib.postgres.search import SearchVector, SearchQuery, SearchRank
-
-            search_vector = SearchVector('title', weight='A') + SearchVector('content', weight='B')
-            search_query = SearchQuery(query)
-
-            results_qs = (
-                queryset
-                .annotate(
-                    search=search_vector,
-                    rank=SearchRank(search_vector, search_query)
-                )
-                .filter(search=search_query)
-                .order_by('-rank', '-usage_count')
-                [:limit]
-            )
+            # Text search (stored weighted tsvector)
+            results_qs = apply_text_search(queryset, 'knowledge_base', query)[:limit]
 
             results = []
             for kb in results_qs:
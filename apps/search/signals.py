@@ -4,6 +4,7 @@ Signal handlers for automatic search index updates
 Listens to model changes and updates SearchIndex accordingly
 """
 
+from django.db import DatabaseError, transaction
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.postgres.search import SearchVector
@@ -11,6 +12,7 @@ import logging
 
 from apps.search.models import SearchIndex
 from apps.search.services.caching_service import SearchCacheService
+from apps.search.services.text_index import TEXT_INDEX_SPECS, refresh_search_vector, spec_for_model
 
 logger = logging.getLogger(__name__)
 
@@ -74,3 +76,31 @@ def invalidate_cache_on_index_delete(sender, instance, **kwargs):
             tenant_id=instance.tenant_id,
             entities=[instance.entity_type]
         )
+
+
+def refresh_stored_search_vector(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Recompute the stored tsvector of a unified-search row after it is saved.
+
+    Skipped for fixture loading and for saves that did not touch indexed text.
+    """
+    if raw:
+        return
+
+    spec = spec_for_model(sender)
+    if update_fields is not None and not set(update_fields) & set(spec.source_fields):
+        return
+
+    try:
+        with transaction.atomic(using=instance._state.db):
+            refresh_search_vector(instance)
+    except DatabaseError as e:
+        logger.error(f"Failed to refresh search vector for {sender.__name__} {instance.pk}: {e}")
+
+
+for _spec in TEXT_INDEX_SPECS.values():
+    post_save.connect(
+        refresh_stored_search_vector,
+        sender=_spec.model_label,
+        dispatch_uid=f'search_vector_{_spec.model_label}'
+    )
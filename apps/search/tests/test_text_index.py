@@ -0,0 +1,109 @@
+"""
+Tests for the stored full-text index and parallel module fan-out.
+
+Covers:
+- Prefix tsquery construction and sanitization
+- icontains fallback on non-PostgreSQL databases
+- Module searches run inline on non-PostgreSQL / inside transactions,
+  and on worker threads otherwise
+
+Follows CLAUDE.md testing standards:
+- Rule #19: pytest fixtures for setup
+- Rule #20: Descriptive test names
+"""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from apps.activity.models import Asset
+from apps.search.services.text_index import TEXT_INDEX_SPECS, apply_text_search, build_prefix_query
+from apps.search.services.unified_semantic_search_service import UnifiedSemanticSearchService
+
+MODULES = ['tickets', 'work_orders', 'assets', 'people', 'knowledge_base']
+
+
+def _raw_query(search_query):
+    return search_query.get_source_expressions()[-1].value
+
+
+class TestBuildPrefixQuery:
+
+    def test_terms_become_prefix_matches(self):
+        search_query = build_prefix_query('Pump Mot', 'english')
+
+        assert _raw_query(search_query) == 'pump:* & mot:*'
+
+    def test_tsquery_operators_are_stripped(self):
+        search_query = build_prefix_query("chiller & !(motor | 'x'):*", 'simple')
+
+        assert _raw_query(search_query) == 'chiller:* & motor:* & x:*'
+
+    def test_query_without_words_returns_none(self):
+        assert build_prefix_query('&|!()', 'english') is None
+
+
+@pytest.mark.django_db
+class TestApplyTextSearch:
+
+    def test_non_postgres_falls_back_to_icontains(self):
+        queryset = apply_text_search(Asset.objects.all(), 'assets', 'HVAC')
+
+        sql = str(queryset.query).lower()
+        for field in TEXT_INDEX_SPECS['assets'].source_fields:
+            assert field in sql
+        assert 'search_vector' not in sql
+
+
+class TestModuleFanOut:
+
+    @pytest.fixture
+    def service(self):
+        with patch.object(UnifiedSemanticSearchService, '_init_txtai'):
+            service = UnifiedSemanticSearchService()
+        threads = {}
+
+        def recorder(module):
+            def search(*args, **kwargs):
+                threads[module] = threading.current_thread().name
+                return [{'module': module}]
+            return search
+
+        for module in MODULES:
+            setattr(service, f'_search_{module}', recorder(module))
+        service.threads = threads
+        return service
+
+    def _connections(self, vendor, in_atomic_block):
+        connection = MagicMock(vendor=vendor, in_atomic_block=in_atomic_block)
+        mock_connections = MagicMock()
+        mock_connections.__getitem__.return_value = connection
+        return patch('apps.search.services.unified_semantic_search_service.connections', mock_connections)
+
+    def test_runs_inline_without_postgres(self, service):
+        with self._connections('sqlite', False):
+            results = service._run_module_searches('pump', 1, MODULES, 10, None, None)
+
+        assert [result['module'] for result in results] == MODULES
+        assert set(service.threads.values()) == {threading.current_thread().name}
+
+    def test_runs_inline_inside_transaction(self, service):
+        with self._connections('postgresql', True):
+            service._run_module_searches('pump', 1, MODULES, 10, None, None)
+
+        assert set(service.threads.values()) == {threading.current_thread().name}
+
+    def test_runs_on_worker_threads_and_keeps_module_order(self, service):
+        with self._connections('postgresql', False), \
+                patch('apps.search.services.unified_semantic_search_service.close_old_connections'):
+            results = service._run_module_searches('pump', 1, MODULES, 10, None, None)
+
+        assert [result['module'] for result in results] == MODULES
+        assert all(name.startswith('unified-search') for name in service.threads.values())
+
+    def test_unknown_modules_are_ignored(self, service):
+        with self._connections('sqlite', False):
+            results = service._run_module_searches('pump', 1, ['assets', 'reports'], 10, None, None)
+
+        assert results == [{'module': 'assets'}]
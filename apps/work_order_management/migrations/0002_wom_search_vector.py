@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-16 09:00
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("work_order_management", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="wom",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="wom",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="wom_search_vector_gin_idx"
+            ),
+        ),
+    ]
@@ -10,6 +10,8 @@ from django.forms.models import model_to_dict
 from django.contrib.gis.db.models import PointField
 from django.core.serializers.json import DjangoJSONEncoder
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.utils.translation import gettext_lazy as _
 from concurrency.fields import VersionField
 
@@ -399,6 +401,9 @@ class Wom(BaseModel, TenantAwareModel):
     )
     remarks = models.JSONField(_("Remarks"), blank=True, null=True)
 
+    # Stored full-text vector, refreshed by apps.search signals
+    search_vector = SearchVectorField(null=True, editable=False)
+
     # Optimistic locking for concurrent updates (Rule #17)
     version = VersionField()
 
@@ -423,4 +428,5 @@ class Wom(BaseModel, TenantAwareModel):
             models.Index(fields=['tenant', 'cdtz'], name='wom_tenant_cdtz_idx'),
             models.Index(fields=['tenant', 'workstatus'], name='wom_tenant_status_idx'),
             models.Index(fields=['tenant', 'workpermit'], name='wom_tenant_permit_idx'),
+            GinIndex(fields=['search_vector'], name='wom_search_vector_gin_idx'),
         ]
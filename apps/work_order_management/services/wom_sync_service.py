@@ -65,7 +65,9 @@ class WOMSyncService(BaseSyncService):
         user,
         timestamp: Optional[str] = None,
         status_filter: Optional[str] = None,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        serializer_class=None
     ) -> Dict[str, Any]:
         """
         Get work order changes since timestamp for delta sync.
@@ -75,9 +77,11 @@ class WOMSyncService(BaseSyncService):
             timestamp: ISO timestamp for delta query
             status_filter: Optional status filter (in_progress, completed, etc.)
             limit: Maximum records to return
+            cursor: Opaque keyset cursor from the previous page
+            serializer_class: Optional serializer applied while streaming rows
 
         Returns:
-            {items: [...], has_more: bool, next_timestamp: ...}
+            {items: [...], has_more: bool, next_cursor: ..., next_timestamp: ...}
         """
         if not user or not user.is_authenticated:
             raise ValidationError("User must be authenticated")
@@ -92,7 +96,9 @@ class WOMSyncService(BaseSyncService):
             timestamp=timestamp,
             model_class=Wom,
             extra_filters=extra_filters,
-            limit=limit
+            limit=limit,
+            cursor=cursor,
+            serializer_class=serializer_class
         )
 
     def _get_user_filters(self, user) -> Dict[str, Any]:
@@ -24,6 +24,9 @@ Refactored: Oct 11, 2025
 from apps.peoples.models import BaseModel
 from apps.tenants.models import TenantAwareModel
 from django.db import models
+from django.db.models.functions import Upper
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from ..managers import TicketManager, ESCManager
 from django.utils import timezone
 from django.conf import settings
@@ -224,6 +227,9 @@ class Ticket(BaseModel, TenantAwareModel):
         help_text="Timestamp of last sentiment analysis"
     )
 
+    # Stored full-text vector, refreshed by apps.search signals
+    search_vector = SearchVectorField(null=True, editable=False)
+
     # Optimistic locking for concurrent updates (Rule #17)
     version = VersionField()
 
@@ -463,6 +469,9 @@ class Ticket(BaseModel, TenantAwareModel):
             models.Index(fields=['tenant', 'status', 'priority'], name='ticket_status_priority_idx'),
             models.Index(fields=['tenant', 'cdtz', 'status'], name='ticket_created_status_idx'),
             models.Index(fields=['tenant', 'assignedtopeople', 'status'], name='ticket_assigned_status_idx'),
+            # Unified search: full-text vector and trigram lookups on ticketno icontains
+            GinIndex(fields=['search_vector'], name='ticket_search_vector_gin_idx'),
+            GinIndex(OpClass(Upper('ticketno'), name='gin_trgm_ops'), name='ticket_ticketno_trgm_idx'),
         ]
 
     def __str__(self):
@@ -66,7 +66,9 @@ class TicketSyncService(BaseSyncService):
         user,
         timestamp: Optional[str] = None,
         priority_filter: Optional[str] = None,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        serializer_class=None
     ) -> Dict[str, Any]:
         """
         Get ticket changes since timestamp for delta sync.
@@ -76,9 +78,11 @@ class TicketSyncService(BaseSyncService):
             timestamp: ISO timestamp for delta query
             priority_filter: Optional priority filter (HIGH, MEDIUM, LOW)
             limit: Maximum records to return
+            cursor: Opaque keyset cursor from the previous page
+            serializer_class: Optional serializer applied while streaming rows
 
         Returns:
-            {items: [...], has_more: bool, next_timestamp: ...}
+            {items: [...], has_more: bool, next_cursor: ..., next_timestamp: ...}
         """
         if not user or not user.is_authenticated:
             raise ValidationError("User must be authenticated")
@@ -93,7 +97,9 @@ class TicketSyncService(BaseSyncService):
             timestamp=timestamp,
             model_class=Ticket,
             extra_filters=extra_filters,
-            limit=limit
+            limit=limit,
+            cursor=cursor,
+            serializer_class=serializer_class
         )
 
     def _get_user_filters(self, user) -> Dict[str, Any]:
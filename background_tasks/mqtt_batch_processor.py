@@ -24,9 +24,11 @@ from collections import defaultdict
 from threading import Lock, Thread, Event
 import time
 from typing import Dict, List, Any, Optional
+from django.conf import settings
 from django.utils import timezone
 from django.db import transaction
 from apps.mqtt.models import DeviceTelemetry, GuardLocation, SensorReading
+from apps.mqtt.services.copy_writer import bulk_insert
 from apps.core.exceptions.patterns import DATABASE_EXCEPTIONS, VALIDATION_EXCEPTIONS
 import logging
 
@@ -58,7 +60,8 @@ class MQTTBatchProcessor:
         self,
         batch_size: int = 100,
         flush_interval: int = 10,
-        max_memory_mb: int = 100
+        max_memory_mb: int = 100,
+        write_method: Optional[str] = None
     ):
         """
         Initialize batch processor.
@@ -67,10 +70,13 @@ class MQTTBatchProcessor:
             batch_size: Number of messages to accumulate before flush
             flush_interval: Seconds between periodic flushes
             max_memory_mb: Maximum memory usage (circuit breaker)
+            write_method: 'copy' (COPY FROM STDIN, bulk_create fallback) or
+                'bulk_create'; defaults to MQTT_CONFIG['BULK_WRITE_METHOD']
         """
         self.batch_size = batch_size
         self.flush_interval = flush_interval
         self.max_memory_mb = max_memory_mb
+        self.write_method = write_method or getattr(settings, 'MQTT_CONFIG', {}).get('BULK_WRITE_METHOD', 'copy')
 
         # Batch storage (thread-safe)
         self.batches = defaultdict(list)
@@ -86,10 +92,11 @@ class MQTTBatchProcessor:
         self.messages_flushed = 0
         self.flush_count = 0
         self.flush_errors = 0
+        self.rows_by_method = defaultdict(int)
 
         logger.info(
             f"MQTT Batch Processor initialized: batch_size={batch_size}, "
-            f"flush_interval={flush_interval}s"
+            f"flush_interval={flush_interval}s, write_method={self.write_method}"
         )
 
     def start(self):
@@ -212,12 +219,9 @@ class MQTTBatchProcessor:
         batch_size = len(batch)
 
         try:
-            # Bulk insert with conflict handling
-            DeviceTelemetry.objects.bulk_create(
-                batch,
-                batch_size=100,
-                ignore_conflicts=True  # Handle duplicate timestamps gracefully
-            )
+            # COPY, or bulk_create with conflict handling (duplicate timestamps)
+            _, method = bulk_insert(DeviceTelemetry, batch, method=self.write_method, batch_size=100)
+            self.rows_by_method[method] += batch_size
 
             self.messages_flushed += batch_size
             self.flush_count += 1
@@ -256,11 +260,8 @@ class MQTTBatchProcessor:
         batch_size = len(batch)
 
         try:
-            GuardLocation.objects.bulk_create(
-                batch,
-                batch_size=100,
-                ignore_conflicts=True
-            )
+            _, method = bulk_insert(GuardLocation, batch, method=self.write_method, batch_size=100)
+            self.rows_by_method[method] += batch_size
 
             self.messages_flushed += batch_size
             self.flush_count += 1
@@ -282,11 +283,8 @@ class MQTTBatchProcessor:
         batch_size = len(batch)
 
         try:
-            SensorReading.objects.bulk_create(
-                batch,
-                batch_size=100,
-                ignore_conflicts=True
-            )
+            _, method = bulk_insert(SensorReading, batch, method=self.write_method, batch_size=100)
+            self.rows_by_method[method] += batch_size
 
             self.messages_flushed += batch_size
             self.flush_count += 1
@@ -299,6 +297,50 @@ class MQTTBatchProcessor:
             self.flush_errors += 1
             logger.error(f"Database error flushing sensor reading batch: {e}", exc_info=True)
 
+    BATCH_MODELS = {
+        'telemetry': DeviceTelemetry,
+        'guard_location': GuardLocation,
+        'sensor_reading': SensorReading,
+    }
+
+    def write_batch(self, kind: str, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert a complete batch synchronously, bypassing the in-memory batches.
+
+        Used by the *_batch tasks of the subscriber's batched ingestion mode,
+        which already hand over a full batch: the rows are committed before
+        the task returns, and database errors propagate so the task retries
+        the batch instead of losing it in a background flush.
+
+        Args:
+            kind: 'telemetry', 'guard_location' or 'sensor_reading'
+            rows: Model field dicts
+
+        Returns:
+            Number of rows written
+        """
+        if not rows:
+            return 0
+
+        model = self.BATCH_MODELS[kind]
+        instances = [model(**row) for row in rows]
+        try:
+            with transaction.atomic():
+                _, method = bulk_insert(model, instances, method=self.write_method, batch_size=500)
+        except DATABASE_EXCEPTIONS:
+            with self.lock:
+                self.flush_errors += 1
+            raise
+
+        with self.lock:
+            self.messages_received += len(instances)
+            self.messages_flushed += len(instances)
+            self.flush_count += 1
+            self.rows_by_method[method] += len(instances)
+
+        logger.info(f"Wrote {len(instances)} {kind} records in one batch ({method})")
+        return len(instances)
+
     def flush_all(self):
         """Flush all pending batches (public method, acquires lock)"""
         with self.lock:
@@ -341,6 +383,8 @@ class MQTTBatchProcessor:
                 'messages_flushed': self.messages_flushed,
                 'flush_count': self.flush_count,
                 'flush_errors': self.flush_errors,
+                'write_method': self.write_method,
+                'rows_by_method': dict(self.rows_by_method),
                 'pending_telemetry': len(self.batches['telemetry']),
                 'pending_guard_location': len(self.batches['guard_location']),
                 'pending_sensor_reading': len(self.batches['sensor_reading']),
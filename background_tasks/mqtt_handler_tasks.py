@@ -30,13 +30,14 @@ MQTT Message Handler Tasks
 """
 
 import logging
-from typing import Dict, Any, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime, timezone as dt_timezone
 from decimal import Decimal
 
 from celery import shared_task
 from django.conf import settings
 from django.contrib.gis.geos import Point
+from django.core.exceptions import ValidationError
 from django.utils import timezone
 
 from apps.core.tasks.base import BaseTask, TaskMetrics
@@ -664,3 +665,338 @@ def process_system_health(self, topic: str, data: Dict[str, Any]):
         TaskMetrics.increment_counter('mqtt_system_health_error', {
             'error_type': type(e).__name__
         })
+
+
+# ============================================================================
+# BATCHED INGESTION (MQTT_CONFIG['INGESTION_MODE'] == 'batched')
+#
+# The subscriber's MQTTIngestionBuffer hands over [(topic, data), ...] lists
+# instead of one task per message. Rows of a batch are written with a single
+# bulk insert and lookups (guards, approved locations) are done once per batch.
+# ============================================================================
+
+def _parse_timestamp(timestamp_str: Optional[str]) -> datetime:
+    """ISO-8601 message timestamp, or now if missing/invalid."""
+    if timestamp_str:
+        try:
+            return datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+        except (ValueError, AttributeError):
+            pass
+    return timezone.now()
+
+
+def _clean_row(model, row: Dict[str, Any], fields: Tuple[str, ...]) -> Dict[str, Any]:
+    """
+    Coerce the given fields of a batch row with the model fields' to_python and
+    run their validators (max_length, value ranges), so a non-numeric reading
+    or an oversized id skips its own message instead of failing the COPY /
+    bulk_create of the whole batch. Raises ValidationError.
+    """
+    for name in fields:
+        if row.get(name) is None:
+            continue
+        field = model._meta.get_field(name)
+        row[name] = field.to_python(row[name])
+        field.run_validators(row[name])
+    return row
+
+
+def _approved_locations_by_client(client_ids) -> Dict[int, List[Any]]:
+    """
+    Active approved locations applying to each client: those whose site is the
+    client itself or any business unit below it. Walks down the Bt tree from
+    the clients level by level (one query per level) and loads only the
+    locations of the sites found.
+    """
+    from apps.client_onboarding.models import Bt
+    from apps.core_onboarding.models import ApprovedLocation
+
+    owners: Dict[int, set] = {client_id: {client_id} for client_id in client_ids}
+    frontier = set(owners)
+    while frontier:
+        level = Bt.objects.filter(parent_id__in=frontier).exclude(id__in=list(owners)).values_list('id', 'parent_id')
+        frontier = set()
+        for bu_id, parent_id in level:
+            owners.setdefault(bu_id, set()).update(owners[parent_id])
+            frontier.add(bu_id)
+
+    by_client: Dict[int, List[Any]] = {client_id: [] for client_id in client_ids}
+    for location in ApprovedLocation.objects.filter(is_active=True, site_id__in=list(owners)):
+        for client_id in owners[location.site_id]:
+            by_client[client_id].append(location)
+    return by_client
+
+
+def _guard_client_id(guard) -> Optional[int]:
+    """Client of a guard loaded with select_related('organizational')."""
+    from django.core.exceptions import ObjectDoesNotExist
+
+    try:
+        return guard.organizational.client_id
+    except ObjectDoesNotExist:
+        return None
+
+
+def _check_geofence(approved_locations, lat: float, lon: float, guard_id) -> Tuple[bool, bool]:
+    """
+    (in_geofence, geofence_violation) of one fix. A location whose check
+    fails is logged and skipped, like the per-message task does.
+    """
+    checked = False
+    for location in approved_locations:
+        try:
+            if location.is_within_geofence(lat, lon):
+                return True, False
+            checked = True
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"Geofence validation error for guard {guard_id} at location {location.id}: {e}")
+    return False, checked
+
+
+@shared_task(
+    base=BaseTask,
+    bind=True,
+    name='background_tasks.mqtt_handler_tasks.process_device_telemetry_batch',
+    max_retries=3,
+    default_retry_delay=30,
+    soft_time_limit=120,
+    time_limit=240
+)
+def process_device_telemetry_batch(self, messages: List[Tuple[str, Dict[str, Any]]]):
+    """
+    Process a batch of device telemetry messages with one bulk insert.
+
+    Args:
+        messages: [(topic, data), ...] as buffered by the subscriber
+    """
+    from apps.mqtt.models import DeviceTelemetry
+    from background_tasks.mqtt_batch_processor import get_batch_processor
+
+    rows = []
+    for topic, data in messages:
+        topic_parts = topic.split('/')
+        if len(topic_parts) < 2:
+            logger.error(f"Invalid device topic format: {topic}")
+            continue
+
+        try:
+            row = _clean_row(DeviceTelemetry, {
+                'device_id': topic_parts[1],
+                'battery_level': data.get('battery'),
+                'signal_strength': data.get('signal'),
+                'temperature': data.get('temperature'),
+                'connectivity_status': data.get('connectivity'),
+                'timestamp': _parse_timestamp(data.get('timestamp')),
+                'raw_data': data
+            }, ('device_id', 'battery_level', 'signal_strength', 'temperature', 'connectivity_status'))
+        except ValidationError as e:
+            logger.error(f"Invalid telemetry in message from {topic}, skipping: {e.messages}")
+            TaskMetrics.increment_counter('mqtt_device_telemetry_error', {'error_type': 'ValidationError'})
+            continue
+        rows.append(row)
+
+        battery_level = row['battery_level']
+        if battery_level is not None and battery_level < 20:
+            logger.warning(f"Low battery alert for device {topic_parts[1]}: {battery_level}%")
+            TaskMetrics.increment_counter('mqtt_device_low_battery', {
+                'device_id': topic_parts[1][:20],
+            })
+
+    try:
+        written = get_batch_processor().write_batch('telemetry', rows)
+    except DATABASE_EXCEPTIONS as e:
+        logger.error(f"Database error writing telemetry batch ({len(rows)} rows): {e}", exc_info=True)
+        raise self.retry(exc=e)
+    except (ValueError, TypeError) as e:
+        logger.error(f"Invalid data in telemetry batch: {e}", exc_info=True)
+        TaskMetrics.increment_counter('mqtt_device_telemetry_error', {'error_type': type(e).__name__})
+        return
+
+    logger.info(f"Processed telemetry batch: {written}/{len(messages)} messages stored")
+    TaskMetrics.increment_counter('mqtt_device_telemetry_batch_processed')
+
+
+@shared_task(
+    base=BaseTask,
+    bind=True,
+    name='background_tasks.mqtt_handler_tasks.process_guard_gps_batch',
+    max_retries=3,
+    default_retry_delay=15,
+    soft_time_limit=180,
+    time_limit=360
+)
+def process_guard_gps_batch(self, messages: List[Tuple[str, Dict[str, Any]]]):
+    """
+    Process a batch of guard GPS updates.
+
+    Guards and approved locations are loaded once for the whole batch, every
+    fix is geofence-checked in memory and all GuardLocation rows are written
+    with one bulk insert. Violations are still raised one alert per fix.
+
+    Args:
+        messages: [(topic, data), ...] as buffered by the subscriber
+    """
+    from apps.mqtt.models import GuardLocation
+    from apps.peoples.models import People
+    from background_tasks.mqtt_batch_processor import get_batch_processor
+
+    fixes = []
+    for topic, data in messages:
+        try:
+            guard_id = int(data['guard_id'])
+            lat, lon = float(data['lat']), float(data['lon'])
+        except (KeyError, TypeError, ValueError) as e:
+            logger.error(f"Missing or invalid guard id / GPS coordinates in message from {topic}: {e}")
+            TaskMetrics.increment_counter('mqtt_guard_gps_error', {'error_type': type(e).__name__})
+            continue
+        if not (-90 <= lat <= 90) or not (-180 <= lon <= 180):
+            logger.error(f"Invalid GPS coordinates: lat={lat}, lon={lon}")
+            continue
+        fixes.append((guard_id, lat, lon, data))
+
+    try:
+        guards = People.objects.select_related('organizational').in_bulk({fix[0] for fix in fixes})
+        fix_clients = [fix[3].get('client_id') or _guard_client_id(guards[fix[0]]) if fix[0] in guards else None
+                       for fix in fixes]
+        geofences = _approved_locations_by_client(set(fix_clients) - {None})
+    except DATABASE_EXCEPTIONS as e:
+        logger.error(f"Database error loading guards/geofences for GPS batch: {e}", exc_info=True)
+        raise self.retry(exc=e)
+
+    rows, violations = [], []
+    for (guard_id, lat, lon, data), client_id in zip(fixes, fix_clients):
+        guard = guards.get(guard_id)
+        if guard is None:
+            logger.error(f"Guard {guard_id} not found")
+            continue
+
+        try:
+            accuracy = _clean_row(GuardLocation, {'accuracy': data.get('accuracy') or 0}, ('accuracy',))['accuracy']
+        except ValidationError as e:
+            logger.error(f"Invalid GPS accuracy for guard {guard_id}, skipping: {e.messages}")
+            TaskMetrics.increment_counter('mqtt_guard_gps_error', {'error_type': 'ValidationError'})
+            continue
+
+        timestamp = _parse_timestamp(data.get('timestamp'))
+        in_geofence, geofence_violation = _check_geofence(geofences.get(client_id, []), lat, lon, guard_id)
+        rows.append({
+            'guard': guard,
+            'location': Point(lon, lat, srid=4326),
+            'accuracy': accuracy,
+            'in_geofence': in_geofence,
+            'geofence_violation': geofence_violation,
+            'timestamp': timestamp,
+            'raw_data': data
+        })
+        if geofence_violation:
+            violations.append((guard, lat, lon, timestamp))
+
+    try:
+        written = get_batch_processor().write_batch('guard_location', rows)
+    except DATABASE_EXCEPTIONS as e:
+        logger.error(f"Database error writing guard GPS batch ({len(rows)} rows): {e}", exc_info=True)
+        raise self.retry(exc=e)
+    except (ValueError, TypeError) as e:
+        logger.error(f"Invalid data in guard GPS batch: {e}", exc_info=True)
+        TaskMetrics.increment_counter('mqtt_guard_gps_error', {'error_type': type(e).__name__})
+        return
+
+    for guard, lat, lon, timestamp in violations:
+        logger.warning(f"GEOFENCE VIOLATION: Guard {guard.id} at ({lat}, {lon})")
+        process_device_alert.apply_async(
+            args=[f"alert/geofence/guard-{guard.id}", {
+                'source_id': f"guard-{guard.id}",
+                'alert_type': 'geofence_violation',
+                'severity': 'high',
+                'message': f'Guard {guard.peoplename} ({guard.id}) is outside assigned geofence',
+                'location': {'lat': lat, 'lon': lon},
+                'timestamp': timestamp.isoformat()
+            }],
+            queue='critical',
+            priority=9
+        )
+
+    logger.info(f"Processed guard GPS batch: {written}/{len(messages)} messages stored")
+    TaskMetrics.increment_counter('mqtt_guard_gps_batch_processed')
+
+
+@shared_task(
+    base=BaseTask,
+    bind=True,
+    name='background_tasks.mqtt_handler_tasks.process_sensor_data_batch',
+    max_retries=3,
+    default_retry_delay=30,
+    soft_time_limit=120,
+    time_limit=240
+)
+def process_sensor_data_batch(self, messages: List[Tuple[str, Dict[str, Any]]]):
+    """
+    Process a batch of facility sensor readings with one bulk insert.
+
+    Args:
+        messages: [(topic, data), ...] as buffered by the subscriber
+    """
+    from apps.mqtt.models import SensorReading
+    from background_tasks.mqtt_batch_processor import get_batch_processor
+
+    rows, fire_alerts = [], []
+    for topic, data in messages:
+        topic_parts = topic.split('/')
+        if len(topic_parts) < 2:
+            logger.error(f"Invalid sensor topic format: {topic}")
+            continue
+
+        sensor_id = topic_parts[1]
+        sensor_type = data.get('type', 'unknown')
+        sensor_state = data.get('state')
+        timestamp = _parse_timestamp(data.get('timestamp'))
+
+        try:
+            row = _clean_row(SensorReading, {
+                'sensor_id': sensor_id,
+                'sensor_type': str(sensor_type).upper() if sensor_type else 'UNKNOWN',
+                'value': data.get('value'),
+                'state': str(sensor_state).upper() if sensor_state else None,
+                'timestamp': timestamp,
+                'raw_data': data
+            }, ('sensor_id', 'sensor_type', 'value', 'state'))
+        except ValidationError as e:
+            logger.error(f"Invalid sensor reading in message from {topic}, skipping: {e.messages}")
+            TaskMetrics.increment_counter('mqtt_sensor_data_error', {'error_type': 'ValidationError'})
+            continue
+        rows.append(row)
+
+        sensor_value = row['value']
+        if sensor_type == 'smoke' and sensor_value is not None and sensor_value > 100:
+            fire_alerts.append((sensor_id, sensor_value, timestamp))
+
+    try:
+        written = get_batch_processor().write_batch('sensor_reading', rows)
+    except DATABASE_EXCEPTIONS as e:
+        logger.error(f"Database error writing sensor batch ({len(rows)} rows): {e}", exc_info=True)
+        raise self.retry(exc=e)
+    except (ValueError, TypeError) as e:
+        logger.error(f"Invalid data in sensor batch: {e}", exc_info=True)
+        TaskMetrics.increment_counter('mqtt_sensor_data_error', {'error_type': type(e).__name__})
+        return
+
+    for sensor_id, sensor_value, timestamp in fire_alerts:
+        logger.critical(f"Smoke detector alert from sensor {sensor_id}: {sensor_value}")
+        TaskMetrics.increment_counter('mqtt_sensor_critical_alert', {
+            'sensor_type': 'smoke',
+            'sensor_id': sensor_id[:20],
+        })
+        process_device_alert.apply_async(
+            args=[f"alert/fire/{sensor_id}", {
+                'source_id': sensor_id,
+                'alert_type': 'fire',
+                'severity': 'critical',
+                'message': f'Fire alarm: Smoke level {sensor_value} detected at sensor {sensor_id}',
+                'timestamp': timestamp.isoformat()
+            }],
+            queue='critical',
+            priority=10
+        )
+
+    logger.info(f"Processed sensor batch: {written}/{len(messages)} messages stored")
+    TaskMetrics.increment_counter('mqtt_sensor_data_batch_processed')
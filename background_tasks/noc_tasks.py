@@ -9,8 +9,10 @@ Rule #15 (no PII in logs).
 import logging
 from datetime import timedelta
 from celery import shared_task
+from django.conf import settings
 from django.utils import timezone
 from django.core.cache import cache
+from django.core.exceptions import FieldError
 from django.db import transaction, DatabaseError
 
 logger = logging.getLogger('noc.tasks')
@@ -34,10 +36,14 @@ def noc_aggregate_snapshot_task(self):
     """
     Create metric snapshots for all active clients.
     Runs every 5 minutes via Celery Beat.
+
+    With NOC_BATCH_SNAPSHOTS (default on) each tenant's clients are
+    aggregated together by NOCBatchAggregationService; a tenant whose batch
+    fails is retried client by client.
     """
     from apps.tenants.models import Tenant
     from apps.client_onboarding.models import Bt
-    from apps.noc.services import NOCAggregationService
+    from apps.noc.services import NOCAggregationService, NOCBatchAggregationService
 
     success_count = 0
     error_count = 0
@@ -57,16 +63,28 @@ def noc_aggregate_snapshot_task(self):
             )
         )
 
+        batch_mode = getattr(settings, 'NOC_BATCH_SNAPSHOTS', True)
         for tenant in tenants:
-            # Batch client IDs for potential bulk processing
             client_ids = [client.id for client in tenant.active_clients]
+            if not client_ids:
+                continue
+
+            if batch_mode:
+                try:
+                    result = NOCBatchAggregationService().create_snapshots_for_tenant(tenant, client_ids)
+                    success_count += result['created'] + result['skipped_maintenance']
+                    continue
+                except (ValueError, FieldError, DatabaseError) as e:
+                    logger.error(
+                        f"Batch snapshot failed for tenant, falling back to per-client",
+                        extra={'tenant_id': tenant.id, 'error': str(e)}
+                    )
 
-            # Process each client (consider adding bulk method to NOCAggregationService)
             for client_id in client_ids:
                 try:
                     NOCAggregationService.create_snapshot_for_client(client_id)
                     success_count += 1
-                except (ValueError, DatabaseError) as e:
+                except (ValueError, FieldError, DatabaseError) as e:
                     error_count += 1
                     logger.error(
                         f"Snapshot failed for client",
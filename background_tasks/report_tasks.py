@@ -13,6 +13,7 @@ from django.db import DatabaseError, IntegrityError
 from django.db.models import Q
 from django.core.exceptions import ValidationError, ObjectDoesNotExist
 from apps.core.exceptions import IntegrationException
+from apps.core.exceptions.patterns import CACHE_EXCEPTIONS
 from apps.tenants.constants import DEFAULT_DB_ALIAS
 from apps.tenants.models import Tenant
 from apps.tenants.utils import tenant_context, slug_to_db_alias
@@ -21,11 +22,18 @@ from pprint import pformat
 import json
 import traceback as tb
 import os
+import shutil
+import time
 from io import BytesIO
 
 # Celery task imports
-from celery import shared_task
+from celery import group, shared_task
+from django.core.cache import cache
+from kombu.exceptions import OperationalError as BrokerOperationalError
 from apps.core.tasks.base import IdempotentTask
+from apps.reports.services.progress_tracker_service import ReportProgressTracker
+from apps.reports.services.scheduled_report_metrics import ScheduledReportMetrics
+from background_tasks.task_keys import scheduled_report_key
 
 
 # make it false when u deploy
@@ -72,6 +80,11 @@ def set_state(state_map, reset=False, set=""):
 
 
 REPORTS_PER_TENANT_PER_RUN = getattr(settings, "SCHEDULED_REPORTS_PER_RUN", 25)
+# Fan due reports out as one Celery subtask per distinct render
+SCHEDULED_REPORTS_FANOUT = getattr(settings, "SCHEDULED_REPORTS_FANOUT", True)
+# A render stays claimed this long, so overlapping runs don't queue it twice
+SCHEDULED_REPORT_INFLIGHT_TTL = getattr(settings, "SCHEDULED_REPORTS_INFLIGHT_TTL", 3600)
+SCHEDULED_REPORT_INFLIGHT_PREFIX = "scheduled_report:inflight"
 REPORT_VALUE_FIELDS = [
     "id",
     "report_type",
@@ -172,6 +185,11 @@ def _process_reports_for_tenant(tenant_label: str, db_alias: str, per_tenant_lim
                 log.debug("No scheduled reports due for tenant %s (db=%s)", tenant_label, db_alias)
                 return state_map
 
+            if SCHEDULED_REPORTS_FANOUT:
+                return _dispatch_reports_for_tenant(
+                    tenant_label, db_alias, scheduled_reports, story, state_map
+                )
+
             for record in scheduled_reports:
                 try:
                     state_map = generate_scheduled_report(record, state_map)
@@ -234,6 +252,96 @@ def _process_reports_for_tenant(tenant_label: str, db_alias: str, per_tenant_lim
     return state_map
 
 
+def _group_due_reports(db_alias: str, records: list, state_map: dict) -> dict:
+    """
+    Plan due records and group those that render identical output.
+
+    Returns:
+        {scheduled_report_key: [records]} in due order
+    """
+    groups = {}
+    for record in records:
+        try:
+            plan, state = prepare_scheduled_report(record)
+        except (DatabaseError, ValidationError, ValueError, TypeError, KeyError) as e:
+            log.error("Could not plan scheduled report %s: %s", record.get("id"), e, exc_info=True)
+            plan, state = None, "not_generated"
+        if plan is None:
+            set_state(state_map, set=state)
+            continue
+        key = scheduled_report_key(db_alias, record["report_type"], record["client_id"], plan["formdata"])
+        groups.setdefault(key, []).append(record)
+    return groups
+
+
+def _claim_render(key: str, db_alias: str) -> bool:
+    """Claim a render for this run; False while an earlier run still owns it."""
+    try:
+        return cache.add(f"{SCHEDULED_REPORT_INFLIGHT_PREFIX}:{key}", db_alias, SCHEDULED_REPORT_INFLIGHT_TTL)
+    except CACHE_EXCEPTIONS as e:
+        log.warning("Could not claim scheduled report render %s: %s", key, e)
+        return True
+
+
+def _release_render(key: str) -> None:
+    try:
+        cache.delete(f"{SCHEDULED_REPORT_INFLIGHT_PREFIX}:{key}")
+    except CACHE_EXCEPTIONS as e:
+        log.warning("Could not release scheduled report render %s: %s", key, e)
+
+
+def _dispatch_reports_for_tenant(tenant_label: str, db_alias: str, records: list,
+                                 story: dict, state_map: dict) -> dict:
+    """
+    Queue one generate_scheduled_report_group subtask per distinct render
+    of a tenant, as a Celery group. Renders still claimed by an earlier
+    run are left to it.
+    """
+    tenant_summary = story['tenants'][tenant_label]
+    groups = _group_due_reports(db_alias, records, state_map)
+
+    claimed = {}
+    in_flight = 0
+    for key, group_records in groups.items():
+        if _claim_render(key, db_alias):
+            claimed[key] = group_records
+        else:
+            in_flight += len(group_records)
+
+    deduplicated = sum(len(group_records) - 1 for group_records in claimed.values())
+    tenant_summary.update({
+        'dispatched': len(claimed),
+        'deduplicated': deduplicated,
+        'in_flight': in_flight,
+    })
+    if not claimed:
+        return state_map
+
+    try:
+        group(
+            generate_scheduled_report_group.si(db_alias, [record["id"] for record in group_records], key)
+            for key, group_records in claimed.items()
+        ).apply_async()
+    except BrokerOperationalError as e:
+        log.error(
+            "Could not queue scheduled reports for tenant %s (db=%s), rendering inline: %s",
+            tenant_label, db_alias, e
+        )
+        for key, group_records in claimed.items():
+            _release_render(key)
+            render_scheduled_report_group(group_records, state_map)
+        tenant_summary['dispatched'] = 0
+        return state_map
+
+    ScheduledReportMetrics.record_dispatched(db_alias, len(claimed), deduplicated)
+    state_map['dispatched'] = state_map.get('dispatched', 0) + len(claimed)
+    log.info(
+        "Queued %s scheduled report renders for tenant %s (db=%s, %s deduplicated, %s in flight)",
+        len(claimed), tenant_label, db_alias, deduplicated, in_flight
+    )
+    return state_map
+
+
 def remove_star(li):
     return [item.replace("*", "") for item in li]
 
@@ -338,18 +446,49 @@ def build_form_data(data, report_params, behaviour):
     return None, None, None
 
 
-def generate_filename(report_type, date_range, sendtime):
+def generate_filename(report_type, date_range, sendtime, record_id=None):
     # eg: filename = TaskSummary__2023-DEC-1--2023-DEC-30__23-34-23.pdf
+    # record_id keeps copies of a shared render apart: TaskSummary__...__42__23-34-23.pdf
+    # (check_time_of_report reads the send time from the last part)
+    if record_id is not None:
+        return f"{report_type}__{date_range}__{record_id}__{sendtime.strftime(TIME_FORMAT)}"
     return f"{report_type}__{date_range}__{sendtime.strftime(TIME_FORMAT)}"
 
 
-def execute_report(RE, report_type, client_id, formdata):
+def execute_report(RE, report_type, client_id, formdata, progress_tracker_id=None):
     report_export = RE(
         filename=report_type, client_id=client_id, returnfile=True, formdata=formdata
     )
+    # Sectioned PDF designs report per-section progress against this record
+    report_export.progress_tracker_id = progress_tracker_id
     return report_export.execute()
 
 
+def _start_report_progress(progress_tracker_id, report_type):
+    """Open the progress record of a render; returns None when untracked."""
+    if not progress_tracker_id:
+        return None
+    try:
+        ReportProgressTracker().create_progress_record(progress_tracker_id, None, report_type)
+    except (ValidationError,) + CACHE_EXCEPTIONS as e:
+        log.warning(f"Progress tracking unavailable for {report_type}: {e}")
+        return None
+    return progress_tracker_id
+
+
+def _finish_report_progress(progress_tracker_id, report_output):
+    if not progress_tracker_id:
+        return
+    tracker = ReportProgressTracker()
+    try:
+        if report_output:
+            tracker.update_progress(progress_tracker_id, 100, stage="completed", message="Report generated")
+        else:
+            tracker.mark_failed(progress_tracker_id, "No report output")
+    except (ValidationError,) + CACHE_EXCEPTIONS as e:
+        log.warning(f"Could not finish progress record {progress_tracker_id}: {e}")
+
+
 def save_report_to_tmp_folder(filename, ext, report_output, dir=None):
     if report_output:
         directory = dir or settings.TEMP_REPORTS_GENERATED
@@ -358,18 +497,24 @@ def save_report_to_tmp_folder(filename, ext, report_output, dir=None):
         if not os.path.exists(directory):
             os.makedirs(directory)
 
-        mode = "wb" if ext in ["pdf", "xlsx"] else "w"
+        # Streaming exports (csv/xlsx) hand back a rewound temporary file
+        streamed = hasattr(report_output, "read") and not isinstance(report_output, BytesIO)
+        mode = "wb" if streamed or ext in ["pdf", "xlsx"] else "w"
         try:
             with open(filepath, mode) as f:
-                if isinstance(report_output, BytesIO):
-                    report_output = report_output.getvalue()
-                    if ext in ["csv", "json", "html"] and report_output:
-                        report_output = report_output.decode("utf-8")
-                if report_output:  # Check if report_output is not empty
-                    f.write(report_output)
+                if streamed:
+                    with report_output:
+                        shutil.copyfileobj(report_output, f)
                 else:
-                    log.error(f"No data to write for {filename}.{ext}")
-                    return None  # Return None to indicate no file was saved
+                    if isinstance(report_output, BytesIO):
+                        report_output = report_output.getvalue()
+                        if ext in ["csv", "json", "html"] and report_output:
+                            report_output = report_output.decode("utf-8")
+                    if report_output:  # Check if report_output is not empty
+                        f.write(report_output)
+                    else:
+                        log.error(f"No data to write for {filename}.{ext}")
+                        return None  # Return None to indicate no file was saved
         except (DatabaseError, FileNotFoundError, IOError, IntegrityError, OSError, ObjectDoesNotExist, PermissionError, TypeError, ValidationError, ValueError) as e:
             log.error(f"Error while saving file {filename}.{ext}: {e}")
             return None  # Return None on error
@@ -387,73 +532,168 @@ def update_report_record(record, updatevalues, filename):
     return isupdated
 
 
-def generate_scheduled_report(record, state_map):
+def prepare_scheduled_report(record):
     """
-    Generate a scheduled report based on the provided data.
-
-    Args:
-        data (dict): A dictionary containing information about the scheduled report.
+    Work out what a due schedule record renders.
 
     Returns:
-        None: This method generates and saves the report but does not return any value.
+        (plan, state): plan holds RE, formdata, date_range, updatevalues and
+        ext; when there is nothing to render plan is None and state is
+        "not_generated" (invalid params) or "skipped" (out of range).
+    """
+    report_params_raw = record.get("report_params")
+    if isinstance(report_params_raw, str):
+        try:
+            report_params = json.loads(report_params_raw)
+        except (TypeError, ValueError, json.JSONDecodeError) as exc:
+            log.error(
+                "Invalid report_params payload for schedule_report %s: %s",
+                record.get("id"),
+                exc,
+            )
+            return None, "not_generated"
+    elif isinstance(report_params_raw, dict):
+        report_params = report_params_raw
+    else:
+        report_params = {}
+
+    re = ReportEssentials(record["report_type"])
+    behaviour = re.behaviour_json
+    RE = re.get_report_export_object()
+    log.info(f"Got RE of type {type(RE)}")
+    formdata, date_range, updatevalues = build_form_data(
+        record, report_params, behaviour
+    )
+    if not (formdata and date_range and updatevalues):
+        return None, "skipped"
+    log.info(f"formdata: {pformat(formdata)} {date_range = }")
+    return {
+        "RE": RE,
+        "formdata": formdata,
+        "date_range": date_range,
+        "updatevalues": updatevalues,
+        "ext": report_params["format"],
+    }, None
+
 
-    Raises:
-        Any relevant exceptions: Document any exceptions that may be raised during report generation.
+def render_scheduled_reports(records, plan, state_map, progress_tracker_id=None):
     """
-    resp = dict()
-    if record:
-        report_params_raw = record.get("report_params")
-        if isinstance(report_params_raw, str):
-            try:
-                report_params = json.loads(report_params_raw)
-            except (TypeError, ValueError, json.JSONDecodeError) as exc:
-                log.error(
-                    "Invalid report_params payload for schedule_report %s: %s",
-                    record.get("id"),
-                    exc,
-                )
-                set_state(state_map, set="not_generated")
-                return state_map
-        elif isinstance(report_params_raw, dict):
-            report_params = report_params_raw
-        else:
-            report_params = {}
-
-        re = ReportEssentials(record["report_type"])
-        behaviour = re.behaviour_json
-        RE = re.get_report_export_object()
-        log.info(f"Got RE of type {type(RE)}")
-        formdata, date_range, updatevalues = build_form_data(
-            record, report_params, behaviour
+    Render plan once and give every schedule record sharing it its own file.
+
+    Returns:
+        dict: {record id: filepath} of the saved reports
+    """
+    first = records[0]
+    progress_tracker_id = _start_report_progress(progress_tracker_id, first["report_type"])
+    report_output = execute_report(
+        plan["RE"], first["report_type"], first["client_id"], plan["formdata"],
+        progress_tracker_id=progress_tracker_id,
+    )
+    _finish_report_progress(progress_tracker_id, report_output)
+    ext = plan["ext"]
+    log.info(f"file extension {ext = }")
+
+    filepaths = {}
+    source = None
+    for record in records:
+        filename = generate_filename(
+            record["report_type"], plan["date_range"], record["report_sendtime"],
+            record_id=record["id"] if source is not None else None,
         )
-        if formdata and date_range and updatevalues:
-            log.info(f"formdata: {pformat(formdata)} {date_range = }")
-            report_output = execute_report(
-                RE, record["report_type"], record["client_id"], formdata
-            )
-            sendtime = record["report_sendtime"]
-            report_type = record["report_type"]
-            filename = generate_filename(report_type, date_range, sendtime)
-            log.info(f"filename generated {filename = }")
-            ext = report_params["format"]
-            log.info(f"file extension {ext = }")
+        log.info(f"filename generated {filename = }")
+        if source is None:
             filepath = save_report_to_tmp_folder(filename, ext, report_output)
-            if report_output and filepath:
-                if isupdated := update_report_record(record, updatevalues, filename):
-                    log.info(f"Reoprt Record updated successfully")
-                log.info(f"file saved at location {filepath =}")
-                resp[str(record["id"])] = filepath
-                set_state(state_map, set="generated")
-            else:
+            if not (report_output and filepath):
                 set_state(state_map, set="not_generated")
+                continue
+            source = filepath
         else:
-            set_state(state_map, set="skipped")
-            resp["msg"] = "Report cannot be generated due to out of range"
+            # The mail task deletes each file after sending, so every schedule gets a copy
+            filepath = os.path.join(os.path.dirname(source), f"{filename}.{ext}")
+            shutil.copyfile(source, filepath)
+        if update_report_record(record, plan["updatevalues"], filename):
+            log.info(f"Reoprt Record updated successfully")
+        log.info(f"file saved at location {filepath =}")
+        filepaths[str(record["id"])] = filepath
+        set_state(state_map, set="generated")
+    return filepaths
+
+
+def render_scheduled_report_group(records, state_map, progress_tracker_id=None):
+    """Plan the first record of a deduplicated group and render it for all of them."""
+    plan, state = prepare_scheduled_report(records[0])
+    if plan is None:
+        for _ in records:
+            set_state(state_map, set=state)
+        return {}
+    return render_scheduled_reports(records, plan, state_map, progress_tracker_id)
+
+
+def generate_scheduled_report(record, state_map):
+    """
+    Generate a scheduled report based on the provided data.
+
+    CSV/XLSX output of designs with export_columns is streamed row by row
+    into a temporary file and copied to the report folder in chunks.
+
+    Args:
+        record (dict): A schedule_report row (REPORT_VALUE_FIELDS).
+        state_map (dict): Counters of generated/skipped/not_generated reports.
+
+    Returns:
+        dict: The updated state_map.
+    """
+    if record:
+        render_scheduled_report_group([record], state_map)
     else:
-        resp["msg"] = "No reports are currently due for being generated"
+        log.info("No reports are currently due for being generated")
     return state_map
 
 
+@shared_task(
+    bind=True,
+    name='generate_scheduled_report_group',
+    queue='reports',
+    priority=6,
+    soft_time_limit=1200,
+    time_limit=1500
+)
+def generate_scheduled_report_group(self, db_alias, report_ids, dedupe_key):
+    """
+    Render one deduplicated scheduled report and share it with every
+    schedule record in report_ids (dispatched by create_scheduled_reports).
+
+    Returns:
+        dict: db_alias, report_ids and generated/skipped/not_generated counts
+    """
+    state_map = {'generated': 0, 'skipped': 0, 'not_generated': 0}
+    started = time.monotonic()
+    try:
+        with tenant_context(db_alias):
+            records = list(
+                ScheduleReport.objects.filter(id__in=report_ids)
+                .order_by("id")
+                .values(*REPORT_VALUE_FIELDS)
+            )
+            if records:
+                render_scheduled_report_group(records, state_map, progress_tracker_id=self.request.id)
+    except (DatabaseError, IntegrityError, ValidationError, ValueError, TypeError, KeyError, OSError) as e:
+        log.error(
+            "Error generating scheduled reports %s (db=%s): %s", report_ids, db_alias, e, exc_info=True
+        )
+        state_map['not_generated'] = len(report_ids) - state_map['generated'] - state_map['skipped']
+    finally:
+        _release_render(dedupe_key)
+        ScheduledReportMetrics.record_finished(
+            db_alias,
+            generated=state_map['generated'],
+            failed=state_map['not_generated'],
+            duration_seconds=time.monotonic() - started,
+        )
+
+    return {'db_alias': db_alias, 'report_ids': report_ids, **state_map}
+
+
 def walk_directory(directory):
     for root, dirs, files in os.walk(directory):
         for file in files:
@@ -598,13 +838,16 @@ def create_scheduled_reports(self):
     Generate scheduled reports based on database configuration.
 
     Runs every 15 minutes (scheduled in celery.py) and:
-    1. Queries database for reports due for generation
-    2. For each report:
-       - Calculates date range based on cron configuration
-       - Executes report generation
-       - Saves output to temp directory
-       - Updates database record
-    3. Returns summary of reports generated
+    1. Queries each tenant database for reports due for generation
+    2. Calculates each report's date range and groups reports with the
+       same report type, client, parameters and date range
+    3. Queues one generate_scheduled_report_group subtask per group (a
+       Celery group per tenant database alias); the subtask renders once,
+       saves a copy per schedule and updates the records
+    4. Returns a summary with queue depth and throughput per alias
+
+    With SCHEDULED_REPORTS_FANOUT disabled reports render inline, one at a
+    time.
 
     Returns:
         dict: Summary with counts of generated, skipped, and failed reports
@@ -663,6 +906,9 @@ def create_scheduled_reports(self):
 
         # Update story with final counts
         story.update(state_map)
+        story['metrics'] = ScheduledReportMetrics.snapshot(
+            {summary['db_alias'] for summary in story['tenants'].values()}
+        )
 
     except (DatabaseError, IntegrityError, ValidationError, ValueError, TypeError) as e:
         error_info = handle_error(e)
@@ -674,8 +920,8 @@ def create_scheduled_reports(self):
 
     log.info(
         f"create_scheduled_reports completed: "
-        f"{story['generated']} generated, {story['skipped']} skipped, "
-        f"{story['not_generated']} failed in {duration:.2f}s"
+        f"{story['generated']} generated, {story.get('dispatched', 0)} renders queued, "
+        f"{story['skipped']} skipped, {story['not_generated']} failed in {duration:.2f}s"
     )
 
     return story
@@ -14,13 +14,14 @@ from datetime import timedelta
 from typing import List, Dict, Any
 
 from celery import Task
+from django.conf import settings
 from django.db import DatabaseError
 from django.utils import timezone
 
 from apps.core.tasks.base import IdempotentTask
 from apps.noc.security_intelligence.models import SiteAuditSchedule
 from apps.noc.security_intelligence.services.real_time_audit_orchestrator import RealTimeAuditOrchestrator
-from apps.noc.security_intelligence.services.baseline_calculator import BaselineCalculator
+from apps.noc.security_intelligence.services.bulk_baseline_engine import BulkBaselineEngine
 from apps.noc.security_intelligence.services.anomaly_detector import AnomalyDetector
 from apps.client_onboarding.models import Bt
 from apps.tenants.models import Tenant
@@ -221,16 +222,20 @@ class SiteDeepAnalysisTask(IdempotentTask):
                 'errors': []
             }
 
-            for schedule in schedules:
-                try:
-                    # Update baselines with recent data
-                    baseline_summary = BaselineCalculator.calculate_baselines_for_site(
-                        site=schedule.site,
-                        days_lookback=7  # Last 7 days for incremental updates
-                    )
+            schedules = list(schedules)
 
-                    results['baselines_updated'] += baseline_summary.get('baselines_updated', 0)
+            # Update baselines with recent data for all sites in one set-based pass
+            baseline_summary = BulkBaselineEngine.calculate_for_sites(
+                [schedule.site_id for schedule in schedules],
+                days_lookback=7,  # Last 7 days for incremental updates
+                workers=getattr(settings, 'BASELINE_ENGINE_WORKERS', 1)
+            )
+            results['baselines_updated'] += baseline_summary['baselines_updated']
+            if baseline_summary['errors']:
+                results['errors'].append(f"Baseline calculation failed for {baseline_summary['errors']} site batch(es)")
 
+            for schedule in schedules:
+                try:
                     # Detect anomalies
                     anomaly_findings = AnomalyDetector.detect_anomalies_for_site(schedule.site)
                     results['anomalies_detected'] += len(anomaly_findings)
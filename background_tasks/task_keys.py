@@ -124,6 +124,33 @@ def report_generation_key(
     return f"report:{report_name}:{params_hash}:U{user_id}:{format}"
 
 
+def scheduled_report_key(
+    db_alias: str,
+    report_type: str,
+    client_id: int,
+    formdata: Dict[str, Any]
+) -> str:
+    """
+    Unique key for one scheduled report render.
+
+    Ensures: Schedules asking for the same report, client, parameters,
+    format and date range render once and share the output
+
+    Args:
+        db_alias: Tenant database alias
+        report_type: Report design name (e.g. TASKSUMMARY)
+        client_id: Client business unit id
+        formdata: Resolved report form data (params and date range)
+
+    Returns:
+        Idempotency key
+    """
+    params_str = json.dumps(formdata, sort_keys=True, default=str)
+    params_hash = hashlib.sha256(params_str.encode()).hexdigest()[:16]
+
+    return f"scheduled_report:{db_alias}:{report_type}:C{client_id}:{params_hash}"
+
+
 def bulk_insert_key(
     table_name: str,
     record_uuids: list,
@@ -56,7 +56,7 @@ from background_tasks.job_tasks import (
 )
 
 # Scheduler tasks (imported from scheduler app for Celery discovery)
-from apps.scheduler.utils import create_job
+from apps.scheduler.utils import create_job, generate_job_shard
 
 # Ticketing tasks
 from background_tasks.ticket_tasks import (
@@ -104,9 +104,11 @@ __all__ = [
     "auto_close_jobs",
     "cache_warming_scheduled",
     "cleanup_expired_pdf_tasks",
+    "create_job",
     "create_ppm_job",
     "create_save_report_async",
     "external_api_call_async",
+    "generate_job_shard",
     "insert_json_records_async",
     "publish_mqtt",
     "move_media_to_cloud_storage",
@@ -1,5 +1,6 @@
+import os
 import pytest
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from unittest.mock import patch, MagicMock
 from background_tasks.report_tasks import set_state
 
@@ -25,3 +26,115 @@ class ReportTasksSimpleTest(TestCase):
         self.assertEqual(result["total"], 0)
         self.assertEqual(result["processed"], 0)
         self.assertEqual(result["failed"], 0)
+
+
+class ScheduledReportFanoutTest(TestCase):
+    """Fan-out of due scheduled reports into deduplicated subtasks"""
+
+    def _record(self, record_id, report_type="TASKSUMMARY", client_id=1, sendtime=None):
+        from datetime import time
+
+        return {
+            "id": record_id,
+            "report_type": report_type,
+            "client_id": client_id,
+            "report_sendtime": sendtime or time(9, 0),
+        }
+
+    def _plan(self, formdata):
+        return {
+            "RE": MagicMock(),
+            "formdata": formdata,
+            "date_range": "01-Jan-2025--02-Jan-2025",
+            "updatevalues": {},
+            "ext": "csv",
+        }, None
+
+    def test_identical_requests_are_grouped(self):
+        from background_tasks.report_tasks import _group_due_reports
+
+        records = [self._record(1), self._record(2), self._record(3, client_id=2)]
+        state_map = {"generated": 0, "skipped": 0, "not_generated": 0}
+        with patch(
+            "background_tasks.report_tasks.prepare_scheduled_report",
+            side_effect=lambda record: self._plan({"format": "csv", "site": "5"}),
+        ):
+            groups = _group_due_reports("default", records, state_map)
+
+        self.assertEqual(sorted(len(group) for group in groups.values()), [1, 2])
+
+    def test_dispatch_queues_one_subtask_per_render(self):
+        from background_tasks.report_tasks import _dispatch_reports_for_tenant
+
+        story = {"tenants": {"t1": {"db_alias": "default", "queued": 3}}}
+        state_map = {"generated": 0, "skipped": 0, "not_generated": 0}
+        groups = {"k1": [self._record(1), self._record(2)], "k2": [self._record(3)]}
+        with patch("background_tasks.report_tasks._group_due_reports", return_value=groups), \
+                patch("background_tasks.report_tasks._claim_render", side_effect=lambda key, alias: key == "k1"), \
+                patch("background_tasks.report_tasks.group") as celery_group, \
+                patch("background_tasks.report_tasks.ScheduledReportMetrics") as metrics:
+            _dispatch_reports_for_tenant("t1", "default", [], story, state_map)
+
+        signatures = list(celery_group.call_args.args[0])
+        self.assertEqual(len(signatures), 1)
+        self.assertEqual(signatures[0].args, ("default", [1, 2], "k1"))
+        celery_group.return_value.apply_async.assert_called_once()
+        self.assertEqual(story["tenants"]["t1"]["deduplicated"], 1)
+        self.assertEqual(story["tenants"]["t1"]["in_flight"], 1)
+        metrics.record_dispatched.assert_called_once_with("default", 1, 1)
+
+    def test_shared_render_saves_a_file_per_schedule(self):
+        import tempfile
+        from datetime import time
+        from background_tasks.report_tasks import render_scheduled_reports
+
+        records = [self._record(1, sendtime=time(9, 0)), self._record(2, sendtime=time(10, 0))]
+        state_map = {"generated": 0, "skipped": 0, "not_generated": 0}
+        with tempfile.TemporaryDirectory() as directory, \
+                override_settings(TEMP_REPORTS_GENERATED=directory), \
+                patch("background_tasks.report_tasks.execute_report", return_value="a,b\n") as execute, \
+                patch("background_tasks.report_tasks.update_report_record", return_value=1):
+            filepaths = render_scheduled_reports(records, self._plan({})[0], state_map)
+
+            self.assertEqual(execute.call_count, 1)
+            self.assertEqual(len(set(filepaths.values())), 2)
+            for filepath in filepaths.values():
+                with open(filepath) as report_file:
+                    self.assertEqual(report_file.read(), "a,b\n")
+        self.assertEqual(state_map["generated"], 2)
+
+    def test_identical_schedules_get_their_own_file(self):
+        import tempfile
+        from background_tasks.report_tasks import render_scheduled_reports
+
+        records = [self._record(1), self._record(2)]
+        state_map = {"generated": 0, "skipped": 0, "not_generated": 0}
+        with tempfile.TemporaryDirectory() as directory, \
+                override_settings(TEMP_REPORTS_GENERATED=directory), \
+                patch("background_tasks.report_tasks.execute_report", return_value="a,b\n"), \
+                patch("background_tasks.report_tasks.update_report_record", return_value=1) as update:
+            filepaths = render_scheduled_reports(records, self._plan({})[0], state_map)
+
+            self.assertEqual(len(set(filepaths.values())), 2)
+            self.assertTrue(all(os.path.exists(filepath) for filepath in filepaths.values()))
+        filenames = [call.args[2] for call in update.call_args_list]
+        self.assertEqual(len(set(filenames)), 2)
+        self.assertIn("__2__", filenames[1])
+        self.assertTrue(filenames[1].endswith("__09-00-00"))
+
+    def test_render_reports_progress_to_the_task_tracker(self):
+        import tempfile
+        from background_tasks.report_tasks import render_scheduled_reports
+
+        plan = self._plan({})[0]
+        plan["RE"].return_value.execute.return_value = "a,b\n"
+        state_map = {"generated": 0, "skipped": 0, "not_generated": 0}
+        with tempfile.TemporaryDirectory() as directory, \
+                override_settings(TEMP_REPORTS_GENERATED=directory), \
+                patch("background_tasks.report_tasks.ReportProgressTracker") as tracker, \
+                patch("background_tasks.report_tasks.update_report_record", return_value=1):
+            render_scheduled_reports([self._record(1)], plan, state_map, progress_tracker_id="task-1")
+
+        tracker.return_value.create_progress_record.assert_called_once_with("task-1", None, "TASKSUMMARY")
+        self.assertEqual(plan["RE"].return_value.progress_tracker_id, "task-1")
+        self.assertEqual(tracker.return_value.update_progress.call_args.args[:2], ("task-1", 100))
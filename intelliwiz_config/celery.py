@@ -547,6 +547,20 @@ app.conf.beat_schedule = {
         }
     },
 
+    # HelpBot Knowledge Usage Flush
+    # Runs: Every minute
+    # Rationale: Knowledge lookups buffer usage counts instead of writing on
+    # the read path; this applies them with bulk UPDATEs
+    "helpbot_flush_knowledge_usage": {
+        'task': 'helpbot.flush_knowledge_usage',
+        'schedule': crontab(minute='*'),
+        'options': {
+            'expires': 55,  # Skip if the next run is already due
+            'queue': 'default',
+            'priority': 3,
+        }
+    },
+
     # ============================================================================
     # ✅ SCHEDULE HEALTH SUMMARY & VALIDATION
     # ============================================================================
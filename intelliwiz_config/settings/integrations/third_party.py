@@ -74,6 +74,15 @@ MQTT_CONFIG = {
     "BROKER_PORT": env.int("MQTT_BROKER_PORT", default=1883),
     "BROKER_USERNAME": env("MQTT_BROKER_USERNAME", default=""),
     "BROKER_PASSWORD": env("MQTT_BROKER_PASSWORD", default=""),
+    # "per_message": one Celery task per device/guard/sensor message
+    # "batched": subscriber buffers those messages and queues one task per batch
+    "INGESTION_MODE": env("MQTT_INGESTION_MODE", default="per_message"),
+    "BATCH_SIZE": env.int("MQTT_BATCH_SIZE", default=200),
+    "BATCH_MAX_WAIT_MS": env.int("MQTT_BATCH_MAX_WAIT_MS", default=500),
+    "BUFFER_CAPACITY": env.int("MQTT_BUFFER_CAPACITY", default=20000),
+    "BACKPRESSURE_TIMEOUT_MS": env.int("MQTT_BACKPRESSURE_TIMEOUT_MS", default=2000),
+    # "copy": COPY FROM STDIN for telemetry/GPS/sensor rows (bulk_create on error)
+    "BULK_WRITE_METHOD": env("MQTT_BULK_WRITE_METHOD", default="copy"),
 }
 
 # ============================================================================
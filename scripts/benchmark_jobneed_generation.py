@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""
+Benchmark Jobneed Generation.
+
+Runs create_job() once through the legacy per-occurrence path and once
+through BulkJobneedEngine against the same jobs, and compares wall time
+and Jobneed + JobneedDetails rows written per second. Each run happens
+inside a transaction that is rolled back, so both start from the same
+state and the database is left untouched.
+
+Randomised and multi-round tours call the Google Maps directions API in
+both paths; pass --jobids to leave them out.
+
+Usage:
+    python scripts/benchmark_jobneed_generation.py [--jobids 12 15 18] [--chunk-size 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import django
+
+# Setup Django
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'intelliwiz_config.settings.development')
+django.setup()
+
+from django.conf import settings
+from django.db import transaction
+
+from apps.activity.models import Jobneed, JobneedDetails
+from apps.core.utils_new.db_utils import get_current_db_name
+from apps.scheduler import utils as sutils
+
+
+class Rollback(Exception):
+    """Raised to discard a benchmark run."""
+
+
+def row_count(using):
+    return (
+        Jobneed.objects.using(using).cross_tenant_query().count(),
+        JobneedDetails.objects.using(using).cross_tenant_query().count(),
+    )
+
+
+def measure(jobids, bulk, using):
+    """Generate inside a rolled-back transaction: (seconds, jobneeds, details)."""
+    sutils.BULK_JOBNEED_GENERATION = bulk
+    result = None
+    try:
+        with transaction.atomic(using=using):
+            before = row_count(using)
+            start = time.perf_counter()
+            sutils.create_job(jobids)
+            elapsed = time.perf_counter() - start
+            after = row_count(using)
+            result = (elapsed, after[0] - before[0], after[1] - before[1])
+            raise Rollback
+    except Rollback:
+        pass
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--jobids', type=int, nargs='*', default=None, help='Restrict to these job ids')
+    parser.add_argument('--chunk-size', type=int, default=None, help='Occurrences per bulk transaction')
+    args = parser.parse_args()
+
+    if args.chunk_size:
+        settings.SCHEDULER_JOBNEED_CHUNK_SIZE = args.chunk_size
+
+    using = get_current_db_name()
+    print("=" * 72)
+    print(f"JOBNEED GENERATION BENCHMARK ({'all jobs' if not args.jobids else len(args.jobids)} jobs)")
+    print("=" * 72)
+    print(f"{'Mode':<12}{'Time (s)':>12}{'Jobneeds':>12}{'Details':>12}{'Rows/s':>14}")
+
+    results = {}
+    for mode, bulk in (('legacy', False), ('bulk', True)):
+        elapsed, jobneeds, details = results[mode] = measure(args.jobids, bulk, using)
+        rate = (jobneeds + details) / elapsed if elapsed else 0.0
+        print(f"{mode:<12}{elapsed:>12.2f}{jobneeds:>12}{details:>12}{rate:>14.0f}")
+
+    legacy, bulk = results['legacy'], results['bulk']
+    if bulk[0]:
+        print(f"{'speedup':<12}{legacy[0] / bulk[0]:>11.2f}x")
+    if (legacy[1], legacy[2]) != (bulk[1], bulk[2]):
+        print("WARNING: paths wrote different row counts (existing occurrences are skipped by the bulk path)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+"""
+Benchmark MQTT Bulk Writes.
+
+Inserts synthetic DeviceTelemetry, GuardLocation and SensorReading rows in
+batches through bulk_create(ignore_conflicts=True) and through COPY FROM
+STDIN (apps.mqtt.services.copy_writer), and reports rows/s for each path.
+Every run happens inside a transaction that is rolled back, so the database
+is left untouched.
+
+Usage:
+    python scripts/benchmark_mqtt_bulk_writes.py [--rows 20000] [--batch-size 500] [--repeat 3]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import django
+
+# Setup Django
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'intelliwiz_config.settings.development')
+django.setup()
+
+from django.contrib.gis.geos import Point
+from django.db import router, transaction
+from django.utils import timezone
+
+from apps.mqtt.models import DeviceTelemetry, GuardLocation, SensorReading
+from apps.mqtt.services.copy_writer import bulk_insert
+from apps.peoples.models import People
+
+
+class Rollback(Exception):
+    """Raised to discard a benchmark run."""
+
+
+def telemetry_rows(count, guard_id):
+    now = timezone.now()
+    return [
+        DeviceTelemetry(
+            device_id=f"device-{i % 1000}", battery_level=random.randint(0, 100),
+            signal_strength=random.randint(-110, -40), temperature=random.uniform(15, 45),
+            connectivity_status='ONLINE', timestamp=now, raw_data={'battery': 50, 'seq': i},
+        )
+        for i in range(count)
+    ]
+
+
+def guard_location_rows(count, guard_id):
+    now = timezone.now()
+    return [
+        GuardLocation(
+            guard_id=guard_id, location=Point(77.59 + random.random() / 100, 12.97 + random.random() / 100, srid=4326),
+            accuracy=random.uniform(3, 30), in_geofence=True, geofence_violation=False,
+            timestamp=now, raw_data={'lat': 12.97, 'lon': 77.59, 'seq': i},
+        )
+        for i in range(count)
+    ]
+
+
+def sensor_reading_rows(count, guard_id):
+    now = timezone.now()
+    return [
+        SensorReading(
+            sensor_id=f"sensor-{i % 500}", sensor_type='TEMPERATURE', value=random.uniform(15, 45),
+            state=None, timestamp=now, raw_data={'value': 21.5, 'seq': i},
+        )
+        for i in range(count)
+    ]
+
+
+TABLES = (
+    (DeviceTelemetry, telemetry_rows),
+    (GuardLocation, guard_location_rows),
+    (SensorReading, sensor_reading_rows),
+)
+
+
+def measure(model, objs, method, batch_size):
+    """Insert objs in batches inside a rolled-back transaction: (seconds, method actually used)."""
+    using = router.db_for_write(model)
+    used = set()
+    elapsed = None
+    try:
+        with transaction.atomic(using=using):
+            start = time.perf_counter()
+            for offset in range(0, len(objs), batch_size):
+                _, actual = bulk_insert(model, objs[offset:offset + batch_size], using=using,
+                                        method=method, batch_size=batch_size)
+                used.add(actual)
+            elapsed = time.perf_counter() - start
+            raise Rollback
+    except Rollback:
+        pass
+    return elapsed, '/'.join(sorted(used))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000, help='Rows per table')
+    parser.add_argument('--batch-size', type=int, default=500, help='Rows per write call')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per path; the fastest is reported')
+    args = parser.parse_args()
+
+    guard_id = People.objects.values_list('id', flat=True).first()
+
+    print("=" * 72)
+    print(f"MQTT BULK WRITE BENCHMARK ({args.rows} rows/table, batches of {args.batch_size})")
+    print("=" * 72)
+    print(f"{'Table':<24}{'Path':<14}{'Time (s)':>10}{'Rows/s':>12}{'Speedup':>10}")
+
+    for model, build in TABLES:
+        if model is GuardLocation and guard_id is None:
+            print(f"{model._meta.db_table:<24}skipped (no People row for the guard FK)")
+            continue
+
+        baseline = None
+        for method in ('bulk_create', 'copy'):
+            runs = [
+                measure(model, build(args.rows, guard_id), method, args.batch_size)
+                for _ in range(max(args.repeat, 1))
+            ]
+            elapsed, used = min(runs, key=lambda run: run[0])
+            rate = args.rows / elapsed if elapsed else 0.0
+            baseline = baseline or elapsed
+            print(f"{model._meta.db_table:<24}{used:<14}{elapsed:>10.3f}{rate:>12.0f}{baseline / elapsed:>9.2f}x")
+            if used != method:
+                print(f"  WARNING: '{method}' fell back to '{used}' (see log for the COPY error)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+"""
+Benchmark NOC Snapshot Aggregation.
+
+Creates the metric snapshots of one tenant's clients once through the
+per-client NOCAggregationService.create_snapshot_for_client() loop and once
+through NOCBatchAggregationService, and compares wall time, queries and the
+snapshot values. Each run happens inside a transaction that is rolled back,
+so the database is left untouched.
+
+Usage:
+    python scripts/benchmark_noc_snapshots.py [--tenant-id 1] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import django
+
+# Setup Django
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'intelliwiz_config.settings.development')
+django.setup()
+
+from django.db import connections, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.client_onboarding.models import Bt
+from apps.core.utils_new.db_utils import get_current_db_name
+from apps.noc.models import NOCMetricSnapshot
+from apps.noc.services import NOCAggregationService, NOCBatchAggregationService
+from apps.tenants.models import Tenant
+
+METRICS = (
+    'tickets_open', 'tickets_overdue', 'tickets_by_priority',
+    'attendance_expected', 'attendance_present', 'attendance_missing', 'attendance_late',
+    'work_orders_pending', 'work_orders_overdue', 'work_orders_status_mix',
+    'device_health_offline', 'device_health_alerts', 'device_health_total',
+)
+
+
+class Rollback(Exception):
+    """Raised to discard a benchmark run."""
+
+
+def per_client(tenant, client_ids):
+    for client_id in client_ids:
+        NOCAggregationService.create_snapshot_for_client(client_id)
+    return {}
+
+
+def batch(tenant, client_ids):
+    return NOCBatchAggregationService().create_snapshots_for_tenant(tenant, client_ids)['timings']
+
+
+def measure(run, tenant, client_ids, using):
+    """Run inside a rolled-back transaction: (seconds, queries, stage timings, {client: metrics})."""
+    result = None
+    try:
+        with transaction.atomic(using=using):
+            with CaptureQueriesContext(connections[using]) as queries:
+                start = time.perf_counter()
+                timings = run(tenant, client_ids)
+                elapsed = time.perf_counter() - start
+            snapshots = NOCMetricSnapshot.objects.filter(client_id__in=client_ids).order_by('client_id', '-id')
+            values = {}
+            for snapshot in snapshots:
+                values.setdefault(snapshot.client_id, {name: getattr(snapshot, name) for name in METRICS})
+            result = (elapsed, len(queries), timings, values)
+            raise Rollback
+    except Rollback:
+        pass
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tenant-id', type=int, default=None, help='Tenant to benchmark (first enabled by default)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per mode; the fastest is reported')
+    args = parser.parse_args()
+
+    tenants = Tenant.objects.filter(enable=True)
+    tenant = tenants.get(id=args.tenant_id) if args.tenant_id else tenants.first()
+    client_ids = list(Bt.objects.filter(
+        tenant=tenant, identifier__tacode='CLIENT', enable=True
+    ).values_list('id', flat=True))
+    using = get_current_db_name()
+
+    print("=" * 72)
+    print(f"NOC SNAPSHOT BENCHMARK (tenant {tenant.id}, {len(client_ids)} clients)")
+    print("=" * 72)
+    print(f"{'Mode':<12}{'Time (s)':>12}{'Queries':>12}{'Clients/s':>14}")
+
+    results = {}
+    for mode, run in (('per-client', per_client), ('batch', batch)):
+        runs = [measure(run, tenant, client_ids, using) for _ in range(max(args.repeat, 1))]
+        elapsed, queries, timings, values = results[mode] = min(runs, key=lambda r: r[0])
+        rate = len(client_ids) / elapsed if elapsed else 0.0
+        print(f"{mode:<12}{elapsed:>12.3f}{queries:>12}{rate:>14.0f}")
+
+    slow, fast = results['per-client'], results['batch']
+    if fast[0]:
+        print(f"{'speedup':<12}{slow[0] / fast[0]:>11.2f}x")
+    print("\nBatch stage timings (s):")
+    for stage, seconds in fast[2].items():
+        print(f"  {stage:<14}{seconds:>10.4f}")
+
+    mismatched = [client_id for client_id in client_ids if slow[3].get(client_id) != fast[3].get(client_id)]
+    if mismatched:
+        print(f"\nWARNING: {len(mismatched)} clients differ between modes, e.g. {mismatched[:5]}")
+
+
+if __name__ == "__main__":
+    main()
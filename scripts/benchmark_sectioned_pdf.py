@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+"""
+Benchmark Sectioned PDF Rendering.
+
+Renders every report design that opts into sectioned PDFs with synthetic
+rows, once in a single WeasyPrint pass and once sectioned, and compares
+wall time and peak RSS. Each run happens in a forked child so peak RSS
+is measured per run.
+
+Usage:
+    python scripts/benchmark_sectioned_pdf.py [--rows 5000] [--workers 4]
+"""
+
+import argparse
+import os
+import re
+import resource
+import sys
+import time
+
+import django
+
+# Setup Django
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'intelliwiz_config.settings.development')
+django.setup()
+
+from django.conf import settings
+from django.template.loader import get_template
+
+from apps.reports.report_designs.dynamic_tour_details import DynamicTourDetailReport
+from apps.reports.report_designs.list_of_task import ListofTaskReport
+from apps.reports.report_designs.list_of_tours import ListofTourReport
+from apps.reports.report_designs.log_sheet import LogSheet
+from apps.reports.report_designs.static_tour_list import StaticTourList
+from apps.reports.report_designs.work_order_list import WorkOrderList
+
+DESIGNS = [
+    ListofTourReport,
+    StaticTourList,
+    ListofTaskReport,
+    WorkOrderList,
+    LogSheet,
+    DynamicTourDetailReport,
+]
+
+ROW_KEY_PATTERN = re.compile(r"row\[['\"]([^'\"]+)['\"]\]")
+
+
+def synthetic_rows(design, count):
+    """Rows carrying every key the design's template reads."""
+    with open(get_template(design.design_file).origin.name) as template_file:
+        source = template_file.read()
+    keys = sorted(set(ROW_KEY_PATTERN.findall(source))) or ["value"]
+    rows = []
+    for i in range(count):
+        row = {key: f"{key} {i}" for key in keys}
+        row["checkpoints"] = [
+            {"assetname": f"Checkpoint {j}", "jobstatus": "COMPLETED", "starttime": None, "endtime": None}
+            for j in range(10)
+        ]
+        rows.append(row)
+    return rows
+
+
+def render(design, rows, sectioned):
+    """Render one report and return the PDF size in bytes."""
+    report = design(filename="benchmark", client_id=1, returnfile=True, formdata={})
+    report.context = {
+        "base_path": settings.BASE_DIR,
+        "data": rows,
+        "report_title": design.report_title,
+        "client_logo": "",
+        "app_logo": design.ytpl_applogo,
+        "report_subtitle": "Benchmark",
+    }
+    if not sectioned:
+        report.pdf_section_rows = None
+    pdf = report.get_pdf_output()
+    return len(pdf or b"")
+
+
+def measure(design, rows, sectioned):
+    """Run render() in a forked child: (seconds, peak RSS MB, PDF bytes)."""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        start = time.perf_counter()
+        size = render(design, rows, sectioned)
+        elapsed = time.perf_counter() - start
+        peak_kb = max(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+        )
+        os.write(write_fd, f"{elapsed} {peak_kb} {size}".encode())
+        os._exit(0)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd) as pipe:
+        result = pipe.read()
+    os.waitpid(pid, 0)
+    elapsed, peak_kb, size = result.split()
+    return float(elapsed), int(peak_kb) / 1024, int(size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000, help='Rows per report')
+    parser.add_argument('--workers', type=int, default=None, help='REPORT_PDF_SECTION_WORKERS override')
+    args = parser.parse_args()
+
+    if args.workers:
+        settings.REPORT_PDF_SECTION_WORKERS = args.workers
+
+    print("=" * 88)
+    print(f"SECTIONED PDF BENCHMARK ({args.rows} rows per report)")
+    print("=" * 88)
+    print(f"{'Design':<28}{'Mode':<12}{'Time (s)':>12}{'Peak RSS (MB)':>16}{'PDF (KB)':>12}")
+
+    for design in DESIGNS:
+        rows = synthetic_rows(design, args.rows)
+        results = {}
+        for mode, sectioned in (('one-pass', False), ('sectioned', True)):
+            results[mode] = measure(design, rows, sectioned)
+            elapsed, peak_mb, size = results[mode]
+            print(f"{design.__name__:<28}{mode:<12}{elapsed:>12.2f}{peak_mb:>16.1f}{size / 1024:>12.1f}")
+
+        one_pass, sectioned = results['one-pass'], results['sectioned']
+        if sectioned[0] and sectioned[1]:
+            print(
+                f"{'':<28}{'speedup':<12}{one_pass[0] / sectioned[0]:>11.2f}x"
+                f"{one_pass[1] / sectioned[1]:>15.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()